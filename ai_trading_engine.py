@@ -11,11 +11,31 @@ import json
 import pickle
 import os
 
+from indicators import kernels
+from options import pricing
+from utils.trade_ledger import TradeLedger
+
 
 class MarketConditionAnalyzer:
     """Analyzes market conditions using multiple indicators"""
     
-    def __init__(self):
+    # Volatility score cutoffs (LOW_VOLATILE below, HIGHLY_VOLATILE above)
+    # and confidence bands (full credit inside the first, half inside the second)
+    
+    # ATR score: latest ATR / the window's average ATR, ~1.0 on a typical day
+    ATR_REGIME_THRESHOLDS = (0.7, 1.5)
+    ATR_CONFIDENCE_BANDS = ((0.8, 1.5), (0.5, 2.0))
+    
+    # IV score: ATM implied / the window's realized volatility. Options
+    # normally price a premium over realized volatility, so a calm market
+    # sits slightly above 1.0, and the ratio swings much less than a
+    # single day's ATR - hence the tighter cutoffs
+    IV_REGIME_THRESHOLDS = (0.85, 1.35)
+    IV_CONFIDENCE_BANDS = ((0.95, 1.35), (0.75, 1.7))
+    
+    def __init__(self, smoothing: str = 'simple'):
+        # RSI/ATR smoothing: 'simple' (rolling mean) or 'wilder'
+        self.smoothing = smoothing
         self.conditions = {
             'BULLISH': 1,
             'BEARISH': -1,
@@ -24,8 +44,20 @@ class MarketConditionAnalyzer:
             'LOW_VOLATILE': -2
         }
     
-    def analyze_market(self, data: pd.DataFrame) -> Dict:
-        """Analyze current market conditions"""
+    def analyze_market(self, data: pd.DataFrame, implied_volatility: Optional[float] = None) -> Dict:
+        """
+        Analyze current market conditions
+        
+        Args:
+            data: Index OHLCV history
+            implied_volatility: ATM implied volatility from the option chain;
+                when given, volatility is classified as implied vs. the
+                window's realized volatility (IV_* cutoffs) instead of the
+                ATR ratio
+        
+        Returns:
+            Dictionary with trend, volatility, strength, confidence, indicators
+        """
         if data.empty or len(data) < 50:
             return {
                 'trend': 'NEUTRAL',
@@ -71,7 +103,14 @@ class MarketConditionAnalyzer:
             trend_score += 1
         
         # Determine volatility
-        volatility_score = atr.iloc[-1] / avg_atr if avg_atr > 0 else 1
+        baseline_volatility = pricing.realized_volatility(data['Close'], window=len(data))
+        if implied_volatility and np.isfinite(implied_volatility) and baseline_volatility > 0:
+            volatility_score = implied_volatility / baseline_volatility
+            thresholds, bands = self.IV_REGIME_THRESHOLDS, self.IV_CONFIDENCE_BANDS
+        else:
+            implied_volatility = None
+            volatility_score = atr.iloc[-1] / avg_atr if avg_atr > 0 else 1
+            thresholds, bands = self.ATR_REGIME_THRESHOLDS, self.ATR_CONFIDENCE_BANDS
         
         # Map to conditions
         if trend_score >= 3:
@@ -84,16 +123,11 @@ class MarketConditionAnalyzer:
             trend = 'NEUTRAL'
             strength = 0.5
         
-        if volatility_score > 1.5:
-            volatility = 'HIGHLY_VOLATILE'
-        elif volatility_score < 0.7:
-            volatility = 'LOW_VOLATILE'
-        else:
-            volatility = 'MODERATE'
+        volatility = self._classify_volatility(volatility_score, thresholds)
         
         # Calculate confidence
         confidence = self._calculate_confidence(
-            trend_score, rsi, volume_ratio, volatility_score
+            trend_score, rsi, volume_ratio, volatility_score, bands
         )
         
         return {
@@ -108,32 +142,150 @@ class MarketConditionAnalyzer:
                 'sma_20': sma_20,
                 'sma_50': sma_50,
                 'atr': atr.iloc[-1],
+                'atr_volatility': pricing.atr_volatility(atr.iloc[-1], current_price),
+                'realized_volatility': pricing.realized_volatility(data['Close']),
+                'implied_volatility': implied_volatility,
+                'volatility_score': volatility_score,
                 'volume_ratio': volume_ratio,
                 'current_price': current_price
             }
         }
     
+    def analyze_history(self, data: pd.DataFrame, lookback: int = 62) -> pd.DataFrame:
+        """
+        analyze_market for every bar in one vectorized pass
+        
+        Row i equals analyze_market(data.iloc[i - lookback + 1:i + 1]), i.e.
+        what the engine saw with a trailing `lookback`-bar history (62 daily
+        bars ~ the 90 calendar days the app fetches). The window-seeded MACD
+        EMAs and the window's average ATR are recovered exactly from
+        full-history arrays. With 'wilder' smoothing the RSI/ATR are the
+        full-history values, which differ slightly from a window-seeded run.
+        
+        Args:
+            data: OHLCV history (Date column or DatetimeIndex)
+            lookback: Bars per analysis window (>= 50, like analyze_market)
+        
+        Returns:
+            DataFrame indexed by bar date from the first full window, with
+            trend, volatility, strength, confidence, trend_score,
+            volatility_score and the indicator columns of analyze_market
+        """
+        if lookback < 50:
+            raise ValueError("lookback must be at least 50 bars")
+        if len(data) < lookback:
+            raise ValueError(f"Need at least {lookback} bars, got {len(data)}")
+        
+        close = kernels.as_float_array(data['Close'])
+        high = kernels.as_float_array(data['High'])
+        low = kernels.as_float_array(data['Low'])
+        volume = kernels.as_float_array(data['Volume'])
+        bars = np.arange(lookback - 1, len(close))
+        starts = bars - (lookback - 1)
+        
+        sma_20 = kernels.rolling_mean(close, 20)[bars]
+        sma_50 = kernels.rolling_mean(close, 50)[bars]
+        current_price = close[bars]
+        rsi = kernels.rsi(close, 14, self.smoothing)[bars]
+        
+        # ATR, and its mean over each window: the window's first true range
+        # has no previous close, which only changes the window's first ATR
+        tr = kernels.true_range(high, low, close)
+        atr_full = kernels.atr(high, low, close, 14, self.smoothing)
+        atr_sum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(atr_full))])
+        window_sum = atr_sum[bars + 1] - atr_sum[starts + 13]
+        if self.smoothing == 'simple':
+            window_sum -= (tr[starts] - (high[starts] - low[starts])) / 14
+        avg_atr = window_sum / (lookback - 13)
+        atr = atr_full[bars]
+        
+        avg_volume = kernels.rolling_mean(volume, 20)[bars]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(avg_volume > 0, volume[bars] / avg_volume, 1.0)
+        
+        macd, signal = self._windowed_macd(close, starts, lookback)
+        
+        trend_score = ((sma_20 > sma_50).astype(np.int64) + (current_price > sma_20)
+                       + (macd > signal) + (rsi > 50))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volatility_score = np.where(avg_atr > 0, atr / avg_atr, 1.0)
+        
+        trend = np.select([trend_score >= 3, trend_score <= 1], ['BULLISH', 'BEARISH'], 'NEUTRAL')
+        strength = np.select([trend_score >= 3, trend_score <= 1],
+                             [np.minimum(trend_score / 4.0, 1.0), np.minimum((4 - trend_score) / 4.0, 1.0)], 0.5)
+        volatility = self._classify_volatility(volatility_score)
+        confidence = self._calculate_confidence(trend_score, rsi, volume_ratio, volatility_score)
+        
+        log_returns = kernels.diff(np.log(close))
+        realized_volatility = kernels.rolling_std(log_returns, 20)[bars] * np.sqrt(pricing.TRADING_DAYS)
+        
+        dates = data['Date'] if 'Date' in data.columns else data.index
+        return pd.DataFrame({
+            'trend': trend,
+            'volatility': volatility,
+            'strength': strength,
+            'confidence': confidence,
+            'trend_score': trend_score,
+            'volatility_score': volatility_score,
+            'rsi': rsi,
+            'macd': macd,
+            'signal': signal,
+            'sma_20': sma_20,
+            'sma_50': sma_50,
+            'atr': atr,
+            'atr_volatility': pricing.atr_volatility(atr, current_price),
+            'realized_volatility': realized_volatility,
+            'volume_ratio': volume_ratio,
+            'current_price': current_price
+        }, index=pd.DatetimeIndex(np.asarray(dates)[bars], name='Date'))
+    
+    @staticmethod
+    def _windowed_macd(close: np.ndarray, starts: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Last MACD and signal values of _calculate_macd over each window
+        
+        An adjust=False EMA seeded at the window start s differs from the
+        full-history EMA E by decay^(i - s) * (E[s] - x[s]), so every window's
+        EMAs follow from the full-history ones in closed form.
+        """
+        n = lookback - 1
+        alpha = {span: 2.0 / (span + 1.0) for span in (12, 26, 9)}
+        decay = {span: 1.0 - a for span, a in alpha.items()}
+        
+        ema_12 = kernels.ema(close, 12)
+        ema_26 = kernels.ema(close, 26)
+        macd_full = ema_12 - ema_26
+        signal_full = kernels.ema(macd_full, 9)
+        
+        seed_12 = ema_12[starts] - close[starts]
+        seed_26 = ema_26[starts] - close[starts]
+        bars = starts + n
+        macd = macd_full[bars] - decay[12] ** n * seed_12 + decay[26] ** n * seed_26
+        
+        # The windowed MACD is the full one minus two decaying geometric
+        # terms; the 9-EMA of r^k seeded at 1 is b^n + a r (r^n - b^n) / (r - b)
+        a, b = alpha[9], decay[9]
+        geometric = {span: b ** n + a * decay[span] * (decay[span] ** n - b ** n) / (decay[span] - b)
+                     for span in (12, 26)}
+        signal = (signal_full[bars] - b ** n * (signal_full[starts] - macd_full[starts])
+                  - seed_12 * geometric[12] + seed_26 * geometric[26])
+        
+        return macd, signal
+    
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1] if len(rsi) > 0 else 50.0
+        rsi = kernels.rsi(kernels.as_float_array(prices), period, self.smoothing)
+        return rsi[-1] if len(rsi) > 0 else 50.0
     
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range"""
-        high = data['High']
-        low = data['Low']
-        close = data['Close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(period).mean()
-        return atr
+        atr = kernels.atr(
+            kernels.as_float_array(data['High']),
+            kernels.as_float_array(data['Low']),
+            kernels.as_float_array(data['Close']),
+            period, self.smoothing
+        )
+        return pd.Series(atr, index=data.index)
     
     def _calculate_macd(self, prices: pd.Series) -> Tuple[pd.Series, pd.Series]:
         """Calculate MACD"""
@@ -143,39 +295,51 @@ class MarketConditionAnalyzer:
         signal = macd.ewm(span=9, adjust=False).mean()
         return macd, signal
     
-    def _calculate_confidence(self, trend_score: int, rsi: float, 
-                            volume_ratio: float, volatility_score: float) -> float:
-        """Calculate confidence score (0-1)"""
-        confidence = 0.0
+    def _classify_volatility(self, volatility_score, thresholds: Optional[Tuple[float, float]] = None):
+        """Volatility score -> regime - scalars or arrays of bars (default: ATR cutoffs)"""
+        low, high = thresholds or self.ATR_REGIME_THRESHOLDS
+        volatility = np.select([volatility_score > high, volatility_score < low],
+                               ['HIGHLY_VOLATILE', 'LOW_VOLATILE'], 'MODERATE')
+        return str(volatility) if volatility.ndim == 0 else volatility
+    
+    def _calculate_confidence(self, trend_score, rsi, volume_ratio, volatility_score, bands=None):
+        """Calculate confidence score (0-1) - scalars or arrays of bars (default: ATR bands)"""
+        (normal_low, normal_high), (wide_low, wide_high) = bands or self.ATR_CONFIDENCE_BANDS
+        trend_score = np.asarray(trend_score)
         
         # Trend clarity (40% weight)
-        if trend_score in [0, 4]:
-            confidence += 0.4
-        elif trend_score in [1, 3]:
-            confidence += 0.2
+        confidence = np.select([np.isin(trend_score, [0, 4]), np.isin(trend_score, [1, 3])], [0.4, 0.2], 0.0)
         
         # RSI confirmation (20% weight)
-        if (trend_score >= 3 and rsi > 50) or (trend_score <= 1 and rsi < 50):
-            confidence += 0.2
+        confirmed = ((trend_score >= 3) & (rsi > 50)) | ((trend_score <= 1) & (rsi < 50))
+        confidence = confidence + np.where(confirmed, 0.2, 0.0)
         
         # Volume confirmation (20% weight)
-        if volume_ratio > 1.2:
-            confidence += 0.2
-        elif volume_ratio > 0.9:
-            confidence += 0.1
+        confidence = confidence + np.select([volume_ratio > 1.2, volume_ratio > 0.9], [0.2, 0.1], 0.0)
         
         # Volatility factor (20% weight)
-        if 0.8 <= volatility_score <= 1.5:
-            confidence += 0.2
-        elif 0.5 <= volatility_score <= 2.0:
-            confidence += 0.1
+        confidence = confidence + np.select(
+            [(normal_low <= volatility_score) & (volatility_score <= normal_high),
+             (wide_low <= volatility_score) & (volatility_score <= wide_high)],
+            [0.2, 0.1], 0.0
+        )
         
-        return min(confidence, 1.0)
+        confidence = np.minimum(confidence, 1.0)
+        return float(confidence) if confidence.ndim == 0 else confidence
 
 
 class AIStrategySelector:
     """AI-based strategy selector for options trading"""
     
+    # Market-state vocabulary of MarketConditionAnalyzer
+    TRENDS = ('BULLISH', 'BEARISH', 'NEUTRAL')
+    VOLATILITY_REGIMES = ('LOW_VOLATILE', 'MODERATE', 'HIGHLY_VOLATILE')
+    
+    # Score weights: trend match (x strength), volatility match, confidence
+    TREND_WEIGHT = 0.5
+    VOLATILITY_WEIGHT = 0.3
+    CONFIDENCE_WEIGHT = 0.2
+    
     def __init__(self):
         self.strategies = {
             'BUY_CALL': {'trend': 'BULLISH', 'volatility': ['LOW_VOLATILE', 'MODERATE']},
@@ -186,26 +350,23 @@ class AIStrategySelector:
             'BEAR_PUT_SPREAD': {'trend': 'BEARISH', 'volatility': ['MODERATE', 'HIGHLY_VOLATILE']},
             'IRON_CONDOR': {'trend': 'NEUTRAL', 'volatility': ['LOW_VOLATILE']},
         }
+        self._compiled = None  # (requirements snapshot, scoring table)
     
     def select_strategy(self, market_conditions: Dict, capital: float) -> Dict:
         """Select best options strategy based on market conditions"""
-        trend = market_conditions['trend']
-        volatility = market_conditions['volatility']
         confidence = market_conditions['confidence']
-        strength = market_conditions['strength']
         
         # Score each strategy
-        strategy_scores = {}
-        for strategy_name, requirements in self.strategies.items():
-            score = self._score_strategy(
-                strategy_name, requirements, trend, volatility, 
-                confidence, strength
-            )
-            strategy_scores[strategy_name] = score
+        table = self.scoring_table()
+        strategy_scores = self._score_matrix(
+            table, [market_conditions['trend']], [market_conditions['volatility']],
+            [market_conditions['strength']], [confidence]
+        )[0]
         
         # Select best strategy
-        best_strategy = max(strategy_scores, key=strategy_scores.get)
-        best_score = strategy_scores[best_strategy]
+        best = int(strategy_scores.argmax())
+        best_strategy = table['strategies'][best]
+        best_score = float(strategy_scores[best])
         
         # Only proceed if confidence is high enough
         if best_score < 0.5:
@@ -235,24 +396,137 @@ class AIStrategySelector:
             'reason': action_details['reason']
         }
     
-    def _score_strategy(self, strategy_name: str, requirements: Dict,
-                       trend: str, volatility: str, confidence: float,
-                       strength: float) -> float:
-        """Score strategy based on market fit"""
-        score = 0.0
-        
-        # Trend match (50% weight)
-        if requirements['trend'] == trend:
-            score += 0.5 * strength
-        
-        # Volatility match (30% weight)
-        if volatility in requirements.get('volatility', []):
-            score += 0.3
-        
-        # Confidence boost (20% weight)
-        score += 0.2 * confidence
+    def scoring_table(self) -> Dict:
+        """
+        Strategy requirements compiled into a feature-weight matrix
+        
+        A market state becomes the feature row [trend one-hot x strength,
+        volatility one-hot, confidence]; its strategy scores are that row
+        times the weight matrix. Recompiled whenever self.strategies changes.
+        
+        Returns:
+            Dict with strategies (names), trends and volatility_regimes
+            (feature vocabularies as pd.Index) and weights
+            (features x strategies)
+        """
+        snapshot = tuple(
+            (name, requirements['trend'], tuple(requirements.get('volatility', [])))
+            for name, requirements in self.strategies.items()
+        )
+        if self._compiled is not None and self._compiled[0] == snapshot:
+            return self._compiled[1]
+        
+        # Requirement labels outside the analyzer's vocabulary still get a feature
+        trends = list(self.TRENDS)
+        regimes = list(self.VOLATILITY_REGIMES)
+        for _, trend, volatility in snapshot:
+            trends += [trend] if trend not in trends else []
+            regimes += [regime for regime in volatility if regime not in regimes]
+        
+        weights = np.zeros((len(trends) + len(regimes) + 1, len(snapshot)))
+        for column, (_, trend, volatility) in enumerate(snapshot):
+            weights[trends.index(trend), column] = self.TREND_WEIGHT
+            for regime in volatility:
+                weights[len(trends) + regimes.index(regime), column] = self.VOLATILITY_WEIGHT
+        weights[-1] = self.CONFIDENCE_WEIGHT
+        
+        table = {
+            'strategies': [name for name, _, _ in snapshot],
+            'trends': pd.Index(trends),
+            'volatility_regimes': pd.Index(regimes),
+            'weights': weights
+        }
+        self._compiled = (snapshot, table)
+        return table
+    
+    @staticmethod
+    def _label_codes(values, vocabulary: pd.Index) -> np.ndarray:
+        """Position of each label in the vocabulary (-1 if absent)"""
+        if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            return np.append(vocabulary.get_indexer(values.cat.categories), -1)[codes]
+        
+        # A few vectorized equality passes beat hashing every label
+        values = values if isinstance(values, pd.Series) else np.asarray(values, dtype=object)
+        codes = np.full(len(values), -1, dtype=np.int64)
+        for code, label in enumerate(vocabulary):
+            codes[np.asarray(values == label, dtype=bool)] = code
+        return codes
+    
+    @classmethod
+    def _score_matrix(cls, table: Dict, trend, volatility, strength, confidence) -> np.ndarray:
+        """Scores (states x strategies) of market-state arrays against a scoring table"""
+        trend_codes = cls._label_codes(trend, table['trends'])
+        regime_codes = cls._label_codes(volatility, table['volatility_regimes'])
+        strength = np.asarray(strength, dtype=float)
+        n_trends = len(table['trends'])
+        
+        features = np.zeros((len(trend_codes), len(table['weights'])))
+        rows = np.flatnonzero(trend_codes >= 0)
+        features[rows, trend_codes[rows]] = strength[rows]
+        rows = np.flatnonzero(regime_codes >= 0)
+        features[rows, n_trends + regime_codes[rows]] = 1.0
+        features[:, -1] = confidence
+        
+        return features @ table['weights']
+    
+    @staticmethod
+    def _conditions_frame(conditions) -> pd.DataFrame:
+        """Batch of market conditions as a DataFrame (one row per state)"""
+        if isinstance(conditions, pd.DataFrame):
+            return conditions
+        
+        fields = ['trend', 'volatility', 'strength', 'confidence']
+        if isinstance(conditions, dict) and 'trend' in conditions:
+            conditions = [conditions]
+        if isinstance(conditions, dict):
+            # Keyed batch, e.g. one state per index of a multi-index scan
+            return pd.DataFrame([[state[field] for field in fields] for state in conditions.values()],
+                                index=list(conditions), columns=fields)
+        return pd.DataFrame([[state[field] for field in fields] for state in conditions], columns=fields)
+    
+    def score_strategies(self, conditions) -> pd.DataFrame:
+        """
+        Score a batch of market states against every strategy
+        
+        Args:
+            conditions: MarketConditionAnalyzer.analyze_history() output (or
+                any DataFrame with trend, volatility, strength and confidence
+                columns), a list of analyze_market() results, or a dict of them
+                keyed by index name
+        
+        Returns:
+            DataFrame of scores, one column per strategy, indexed like the batch
+        """
+        frame = self._conditions_frame(conditions)
+        table = self.scoring_table()
+        scores = self._score_matrix(
+            table, frame['trend'], frame['volatility'],
+            frame['strength'].to_numpy(), frame['confidence'].to_numpy()
+        )
         
-        return score
+        return pd.DataFrame(scores, index=frame.index, columns=table['strategies'])
+    
+    def select_strategies(self, conditions) -> pd.DataFrame:
+        """
+        Best strategy per market state, like select_strategy without action details
+        
+        Args:
+            conditions: Batch of market states (see score_strategies)
+        
+        Returns:
+            DataFrame with strategy ('WAIT' below a 0.5 score) and score columns
+        """
+        scores = self.score_strategies(conditions)
+        values = scores.to_numpy()
+        best = values.argmax(axis=1)
+        best_score = values[np.arange(len(values)), best]
+        names = scores.columns.to_numpy()[best]
+        
+        return pd.DataFrame({
+            'strategy': np.where(best_score < 0.5, 'WAIT', names),
+            'score': best_score
+        }, index=scores.index)
     
     def _get_action_details(self, strategy: str, conditions: Dict, 
                            capital: float) -> Dict:
@@ -351,18 +625,32 @@ class AIStrategySelector:
 class AITradingEngine:
     """Main AI trading engine for automated options trading"""
     
+    # Option legs per strategy: (side, option type, strike offset in strike intervals)
+    STRATEGY_LEGS = {
+        'BUY_CALL': [(1, 'CALL', 0)],
+        'BUY_PUT': [(1, 'PUT', 0)],
+        'STRADDLE': [(1, 'CALL', 0), (1, 'PUT', 0)],
+        'STRANGLE': [(1, 'CALL', 2), (1, 'PUT', -2)],
+        'BULL_CALL_SPREAD': [(1, 'CALL', 0), (-1, 'CALL', 4)],
+        'BEAR_PUT_SPREAD': [(1, 'PUT', 0), (-1, 'PUT', -4)],
+        'IRON_CONDOR': [(-1, 'CALL', 4), (1, 'CALL', 8), (-1, 'PUT', -4), (1, 'PUT', -8)]
+    }
+    
+    # Credit structures block their wing width (in strike intervals) as margin
+    STRATEGY_MARGIN = {'IRON_CONDOR': 4}
+    
     def __init__(self, capital: float = 100000, max_positions: int = 5):
         self.capital = capital
         self.available_capital = capital
         self.max_positions = max_positions
         self.positions = []
-        self.trade_history = []
+        self.trade_history = TradeLedger()  # Row = trade id - 1
         
         self.analyzer = MarketConditionAnalyzer()
         self.selector = AIStrategySelector()
         
         # AI learning parameters
-        self.performance_data = []
+        self.performance_data = TradeLedger()
         self.winning_strategies = {}
         self.losing_strategies = {}
         
@@ -377,15 +665,29 @@ class AITradingEngine:
         self.max_trades_per_day = 10
         self.last_trade_time = None
         self.min_trade_interval = 60  # seconds between trades
+        
+        # Latest underlying price and pricing volatility
+        self.last_spot = None
+        self.last_volatility = None
+        
+        # Implied volatilities of the latest option chain quotes
+        self.iv_surface = pricing.ImpliedVolatilitySurface()
     
     def analyze_and_decide(self, nifty_data: pd.DataFrame, 
                           index: str = 'NIFTY') -> Optional[Dict]:
         """Analyze market and make trading decision"""
+        # Open positions are repriced off the latest close even while not trading
+        if not nifty_data.empty:
+            self.last_spot = float(nifty_data['Close'].iloc[-1])
+        
         if not self.can_trade():
             return None
         
         # Analyze market conditions
-        market_conditions = self.analyzer.analyze_market(nifty_data)
+        market_conditions = self.analyzer.analyze_market(
+            nifty_data, self.iv_surface.atm_volatility(self.last_spot) if self.last_spot else None
+        )
+        self.last_volatility = pricing.volatility_estimate(market_conditions['indicators'])
         
         # Select strategy
         strategy_decision = self.selector.select_strategy(
@@ -427,6 +729,57 @@ class AITradingEngine:
         
         return trade
     
+    def scan_markets(self, market_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Score several indices (e.g. NIFTY, BANKNIFTY, FINNIFTY) in one batch
+        
+        Read-only: no trade limits are consumed and no positions are opened.
+        
+        Args:
+            market_data: OHLCV history per index name
+        
+        Returns:
+            DataFrame indexed by index name with trend, volatility, strength,
+            confidence, current_price, one score column per strategy, and the
+            selected strategy and its score
+        """
+        conditions = {
+            index: self.analyzer.analyze_market(data)
+            for index, data in market_data.items() if not data.empty
+        }
+        frame = pd.DataFrame(
+            [[state['trend'], state['volatility'], state['strength'], state['confidence'],
+              state['indicators'].get('current_price', np.nan)] for state in conditions.values()],
+            index=pd.Index(list(conditions), name='index'),
+            columns=['trend', 'volatility', 'strength', 'confidence', 'current_price']
+        )
+        
+        return frame.join(self.selector.score_strategies(frame)).join(self.selector.select_strategies(frame))
+    
+    def update_option_chain(self, chain: pd.DataFrame, spot: float,
+                            now: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Solve implied volatilities for fresh option chain premiums
+        
+        Call on every quote refresh (KiteFetcher.get_quotes_bulk or a replay
+        file); the solver warm-starts from the previous refresh and the ATM
+        volatility drives the next analyze_and_decide's volatility regime.
+        
+        Args:
+            chain: DataFrame with expiry, strike, option_type (CALL/PUT or
+                CE/PE) and premium columns
+            spot: Underlying price at the quote time
+            now: Quote time (default: now)
+        
+        Returns:
+            The chain with an 'iv' column (NaN where no volatility fits)
+        """
+        self.last_spot = spot
+        is_call = chain['option_type'].isin(['CALL', 'CE']).to_numpy()
+        iv = self.iv_surface.update(spot, chain['expiry'], chain['strike'], chain['premium'].to_numpy(),
+                                    is_call, now)
+        return chain.assign(iv=iv)
+    
     def execute_trade(self, trade_signal: Dict) -> Dict:
         """Execute the trade (simulate or real)"""
         if not self.is_active:
@@ -439,21 +792,35 @@ class AITradingEngine:
         if len(self.positions) >= self.max_positions:
             return {'status': 'MAX_POSITIONS', 'message': f'Already have {self.max_positions} open positions'}
         
-        # Simulate trade execution
+        # Price the structure off the analyzed market (paper execution)
+        indicators = trade_signal['market_conditions']['indicators']
+        spot = indicators.get('current_price') or self.last_spot
+        if not spot:
+            return {'status': 'NO_PRICE', 'message': 'No underlying price to value the options'}
+        
+        interval = pricing.strike_interval(trade_signal['index'])
         trade = {
             'id': len(self.trade_history) + 1,
             'timestamp': datetime.now(),
             'index': trade_signal['index'],
             'strategy': trade_signal['strategy'],
             'option_type': trade_signal['option_type'],
-            'quantity': trade_signal['quantity'],
-            'entry_premium': self._simulate_premium(trade_signal),
+            'underlying': spot,
+            'strike': round(spot / interval) * interval,
+            'strike_interval': interval,
+            'expiry': pricing.next_expiry(),
+            'sigma': pricing.volatility_estimate(indicators),
             'stop_loss': trade_signal['stop_loss_pct'],
             'target': trade_signal['target_pct'],
             'confidence': trade_signal['confidence'],
             'status': 'OPEN',
             'pnl': 0
         }
+        trade['entry_premium'] = self._price_position(trade, spot)
+        trade['current_premium'] = trade['entry_premium']
+        
+        # Size to the risk budget with the priced premium
+        trade['quantity'] = max(1, int(trade_signal['max_premium'] / trade['entry_premium']))
         
         # Calculate cost
         total_cost = trade['entry_premium'] * trade['quantity']
@@ -479,16 +846,25 @@ class AITradingEngine:
             'trade': trade
         }
     
-    def monitor_positions(self) -> List[Dict]:
-        """Monitor open positions and apply risk management"""
+    def monitor_positions(self, spot: Optional[float] = None) -> List[Dict]:
+        """
+        Monitor open positions and apply risk management
+        
+        Args:
+            spot: Current underlying price (default: last analyzed close)
+        
+        Returns:
+            List of actions taken
+        """
         actions = []
+        spot = spot or self.last_spot
         
         for position in self.positions[:]:  # Copy list to modify during iteration
             if position['status'] != 'OPEN':
                 continue
             
-            # Simulate current premium (in real trading, fetch from market)
-            current_premium = self._simulate_current_premium(position)
+            # Reprice at the current spot and time to expiry (in real trading, fetch from market)
+            current_premium = self._price_position(position, spot or position['underlying'])
             
             # Calculate P&L
             entry_cost = position['entry_premium'] * position['quantity']
@@ -499,6 +875,7 @@ class AITradingEngine:
             position['current_premium'] = current_premium
             position['pnl'] = pnl
             position['pnl_pct'] = pnl_pct
+            self._record(position, 'current_premium', 'pnl', 'pnl_pct')
             
             # Check stop loss
             if pnl_pct <= -position['stop_loss']:
@@ -516,6 +893,7 @@ class AITradingEngine:
                 new_stop = max(position['stop_loss'], -10)  # Protect with -10% max loss
                 if new_stop != position['stop_loss']:
                     position['stop_loss'] = new_stop
+                    self._record(position, 'stop_loss')
                     actions.append({
                         'action': 'TRAIL_STOP',
                         'trade_id': position['id'],
@@ -530,6 +908,7 @@ class AITradingEngine:
         position['status'] = 'CLOSED'
         position['exit_time'] = datetime.now()
         position['exit_reason'] = reason
+        self._record(position, 'status', 'exit_time', 'exit_reason')
         
         # Return capital
         exit_value = position['current_premium'] * position['quantity']
@@ -553,6 +932,10 @@ class AITradingEngine:
             'pnl_pct': position['pnl_pct']
         }
     
+    def _record(self, position: Dict, *fields):
+        """Copy changed fields of an open position into its trade_history row"""
+        self.trade_history.update(position['id'] - 1, {field: position[field] for field in fields})
+    
     def _learn_from_trade(self, trade: Dict):
         """Learn from completed trade"""
         strategy = trade['strategy']
@@ -606,33 +989,60 @@ class AITradingEngine:
         
         return True
     
-    def _simulate_premium(self, trade_signal: Dict) -> float:
-        """Simulate option premium (in real trading, fetch from market)"""
-        # Simulate based on strategy and market conditions
-        base_premium = 150  # Base premium
-        
-        # Adjust based on confidence
-        confidence_multiplier = 0.8 + (trade_signal['confidence'] * 0.4)
-        premium = base_premium * confidence_multiplier
-        
-        # Add some randomness
-        premium *= (0.9 + np.random.random() * 0.2)
+    @classmethod
+    def structure_value(cls, strategy: str, strike: float, interval: float, sigma: float, spot, t):
+        """
+        Value one unit of a strategy's option structure
+        
+        All legs are priced in one vectorized Black-Scholes call. Credit
+        structures are valued as their blocked margin less the cost to close,
+        so every position has a positive value and the P&L arithmetic is shared.
+        
+        Args:
+            strategy: Strategy name (STRATEGY_LEGS key)
+            strike: At-the-money strike the legs are offset from
+            interval: Strike interval
+            sigma: Pricing volatility
+            spot: Underlying price(s)
+            t: Years to expiry
+        
+        strike, sigma, spot and t may be arrays that broadcast together,
+        e.g. one row per trade and one column per bar.
+        
+        Returns:
+            Premium per unit rounded to the 0.05 tick (an array for array inputs)
+        """
+        legs = cls.STRATEGY_LEGS.get(strategy, [(1, 'CALL', 0)])
+        sides, types, offsets = (np.array(column) for column in zip(*legs))
+        
+        quotes = pricing.black_scholes(
+            np.asarray(spot, dtype=np.float64)[..., None],
+            np.asarray(strike, dtype=np.float64)[..., None] + offsets * interval,
+            np.asarray(t, dtype=np.float64)[..., None],
+            np.asarray(sigma, dtype=np.float64)[..., None],
+            is_call=types == 'CALL'
+        )
+        value = quotes['price'] @ sides + cls.STRATEGY_MARGIN.get(strategy, 0) * interval
         
-        return round(premium, 2)
+        value = np.maximum(0.05, np.round(value * 20) / 20)
+        return float(value) if value.ndim == 0 else value
     
-    def _simulate_current_premium(self, position: Dict) -> float:
-        """Simulate current premium movement"""
-        entry_premium = position['entry_premium']
-        
-        # Simulate price movement (-30% to +50%)
-        movement = -0.3 + (np.random.random() * 0.8)
-        
-        # Bias based on confidence
-        confidence_bias = (position['confidence'] - 0.5) * 0.2
-        movement += confidence_bias
-        
-        current_premium = entry_premium * (1 + movement)
-        return max(1, round(current_premium, 2))
+    def _price_position(self, position: Dict, spot: float, now: Optional[datetime] = None) -> float:
+        """
+        Value one unit of an open position at the given spot and time
+        
+        Args:
+            position: Trade dict with strategy, strike, strike_interval, expiry, sigma
+            spot: Underlying price
+            now: Valuation time (default: now)
+        
+        Returns:
+            Premium per unit
+        """
+        return self.structure_value(
+            position['strategy'], position['strike'], position['strike_interval'], position['sigma'],
+            spot, pricing.years_to_expiry(position['expiry'], now)
+        )
     
     def get_status(self) -> Dict:
         """Get current engine status"""
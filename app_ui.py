@@ -21,8 +21,12 @@ st.set_page_config(
 from data.free_fetcher import FreeFetcher
 from strategies.ma_crossover import MACrossoverStrategy
 from strategies.rsi_strategy import RSIStrategy
-from indicators.technical import TechnicalIndicators
+from indicators.cache import get_indicator_cache
+from backtest.monte_carlo import MonteCarloSimulator, trade_returns
 from utils.database import TradingDatabase
+from utils.performance import trade_statistics
+from options import pricing
+from trading_daemon import DaemonClient, trader_snapshot
 
 # Initialize session state
 if 'fetcher' not in st.session_state:
@@ -367,7 +371,7 @@ elif page == "🤖 Auto-Trader":
                 trader.positions = {}
                 trader.trades_today = 0
                 trader.daily_pnl = 0
-                trader.all_trades = []
+                trader.all_trades.clear()
                 trader.total_trades = 0
                 trader.winning_trades = 0
                 trader.total_profit = 0
@@ -499,12 +503,25 @@ elif page == "📊 NIFTY Trading":
     
     nifty_trader = st.session_state.nifty_trader
     
+    # While the background daemon runs it owns the trader; this page sends
+    # it commands and reads its snapshots
+    daemon = DaemonClient(st.session_state.db)
+    daemon_alive = daemon.is_alive()
+    
     # Mode indicator
     if nifty_trader.mode == "SIMULATION":
         st.success("🟢 **SIMULATION MODE** - Testing NIFTY strategies with virtual money")
     else:
         st.error("🔴 **LIVE MODE** - Real trading on NIFTY stocks!")
     
+    if daemon_alive:
+        st.info("🛰️ **Trading daemon connected** - positions are monitored in the background, even with this tab closed")
+        busy = daemon.busy()
+        if busy:
+            st.caption(f"⏳ Daemon is running `{busy['job']}` ({busy['seconds']:.0f}s) - commands are applied when it finishes")
+    else:
+        st.caption("💡 Run `python trading_daemon.py` to keep monitoring positions when this tab is closed")
+    
     st.markdown("---")
     
     # NIFTY Indices Overview
@@ -1304,6 +1321,112 @@ elif page == "📊 NIFTY Trading":
                     for strategy, count in sorted(ai_status['losing_strategies'].items(), key=lambda x: x[1], reverse=True):
                         st.write(f"- {strategy}: {count} losses")
     
+    # Score the tradeable indices together
+    with st.expander("🔎 Scan NIFTY / BANKNIFTY / FINNIFTY"):
+        if st.button("🔎 Scan Indices", key="ai_scan_indices"):
+            with st.spinner("🧠 AI scoring strategies across indices..."):
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=90)
+                scan_symbols = {'NIFTY 50': '^NSEI', 'BANK NIFTY': '^NSEBANK', 'FIN NIFTY': 'NIFTY_FIN_SERVICE.NS'}
+                
+                scan_data = {
+                    index_name: st.session_state.fetcher.get_historical_data(
+                        symbol,
+                        start_date.strftime('%Y-%m-%d'),
+                        end_date.strftime('%Y-%m-%d')
+                    )
+                    for index_name, symbol in scan_symbols.items()
+                }
+                scan = ai_engine.scan_markets(scan_data)
+                
+                if scan.empty:
+                    st.error("❌ Could not fetch index data")
+                else:
+                    st.dataframe(scan, use_container_width=True)
+                    best_index = scan['score'].idxmax()
+                    st.info(f"🎯 Best setup: **{best_index}** → {scan.loc[best_index, 'strategy']} "
+                            f"(score {scan.loc[best_index, 'score']:.2f})")
+    
+    # AI engine hosted by the trading daemon
+    with st.expander("🛰️ Run AI Engine in the Background Daemon"):
+        if not daemon_alive:
+            st.warning("⚠️ Trading daemon not running - start it with `python trading_daemon.py`")
+        else:
+            daemon_ai = daemon.status('ai') or {}
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Daemon AI", "🟢 ACTIVE" if daemon_ai.get('is_active') else "🔴 STOPPED")
+            with col2:
+                st.metric("Open Positions", daemon_ai.get('open_positions', 0))
+            with col3:
+                st.metric("Today's P&L", f"₹{daemon_ai.get('daily_pnl', 0):,.0f}")
+            with col4:
+                st.metric("Trades Today", daemon_ai.get('trades_today', 0))
+            
+            last_decision = daemon_ai.get('last_decision')
+            if last_decision:
+                st.caption(f"Last decision ({last_decision['time'][:19]}): **{last_decision['decision']}** "
+                           f"{last_decision.get('strategy') or ''} - {last_decision.get('reason') or ''}")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("▶️ Start in Daemon", use_container_width=True, key="daemon_ai_start"):
+                    daemon.send('ai', 'start', settings={
+                        'capital': ai_capital,
+                        'min_confidence': min_confidence / 100,
+                        'max_positions': max_positions_ai,
+                        'max_trades_per_day': max_trades_day,
+                        'max_loss_per_day': ai_capital * (max_loss_pct / 100),
+                        'max_loss_per_trade': ai_capital * (max_trade_loss_pct / 100)
+                    })
+                    st.success("✅ AI engine start queued on the daemon")
+            with col2:
+                if st.button("⏹️ Stop in Daemon", use_container_width=True, key="daemon_ai_stop"):
+                    daemon.send('ai', 'stop')
+                    st.info("⏹️ AI engine stop queued on the daemon")
+    
+    # Historical replay of the engine's decisions
+    with st.expander("📜 Replay AI Engine on NIFTY History"):
+        replay_years = st.slider("Years of history", 1, 15, 5, key="ai_replay_years")
+        
+        if st.button("▶️ Run Replay", key="ai_replay_run"):
+            with st.spinner(f"🧠 Replaying {replay_years} years of AI decisions..."):
+                from ai_trading_engine import AITradingEngine
+                from backtest.ai_replay import AIEngineReplay
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=365 * replay_years + 90)
+                
+                history = st.session_state.fetcher.get_historical_data(
+                    "^NSEI",
+                    start_date.strftime('%Y-%m-%d'),
+                    end_date.strftime('%Y-%m-%d')
+                )
+                
+                if len(history) < 62:
+                    st.error("❌ Not enough NIFTY history to replay")
+                else:
+                    replay = AIEngineReplay(AITradingEngine(
+                        capital=ai_engine.capital, max_positions=ai_engine.max_positions
+                    ))
+                    replay_result = replay.run(history, 'NIFTY')
+                    performance = replay_result['performance']
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Final Capital", f"₹{replay_result['final_capital']:,.0f}",
+                                  f"{replay_result['return_percent']:+.2f}%")
+                    with col2:
+                        st.metric("Trades", performance['total_trades'], f"{performance['win_rate']:.1f}% win")
+                    with col3:
+                        st.metric("Max Drawdown", f"{performance['max_drawdown']:.2f}%")
+                    with col4:
+                        st.metric("Sharpe", f"{performance['sharpe_ratio']:.2f}")
+                    
+                    st.line_chart(replay_result['equity'])
+                    st.write("**By Strategy:**")
+                    st.dataframe(replay_result['strategy_breakdown'], use_container_width=True)
+    
     # Auto-Run AI Trading
     if ai_status['is_active']:
         st.info("""
@@ -1372,7 +1495,7 @@ elif page == "📊 NIFTY Trading":
     # Live NIFTY Trading Status
     st.subheader("📊 NIFTY Trading Status")
     
-    nifty_status = nifty_trader.get_status()
+    nifty_status = (daemon.status('nifty') if daemon_alive else None) or nifty_trader.get_status()
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -1466,16 +1589,22 @@ elif page == "📊 NIFTY Trading":
     
     with col1:
         if st.button("🔍 Scan NIFTY Stocks", type="primary", use_container_width=True):
-            with st.spinner("Scanning NIFTY stocks for signals..."):
-                nifty_trader.run_once()
-                st.success("✅ Scan complete!")
-                st.rerun()
+            if daemon_alive:
+                daemon.send('nifty', 'scan', config=nifty_trader.config)
+                st.success("✅ Scan queued on the trading daemon!")
+            else:
+                with st.spinner("Scanning NIFTY stocks for signals..."):
+                    nifty_trader.run_once()
+                    st.success("✅ Scan complete!")
+                    st.rerun()
     
     with col2:
         # Position monitoring toggle
         if nifty_status['positions_count'] > 0:
             if not st.session_state.position_monitor_active:
                 if st.button("👁️ Monitor Positions", use_container_width=True, type="primary", help="Auto-check positions every second"):
+                    if daemon_alive:
+                        daemon.send('nifty', 'monitor', enabled=True, interval=st.session_state.monitor_interval)
                     st.session_state.position_monitor_active = True
                     st.session_state.monitor_check_count = 0
                     st.session_state.last_monitor_check = datetime.now()
@@ -1483,6 +1612,8 @@ elif page == "📊 NIFTY Trading":
                     st.rerun()
             else:
                 if st.button("⏸️ Stop Monitoring", use_container_width=True, type="secondary"):
+                    if daemon_alive:
+                        daemon.send('nifty', 'monitor', enabled=False)
                     st.session_state.position_monitor_active = False
                     st.info("⏸️ Position monitoring stopped!")
                     st.rerun()
@@ -1497,14 +1628,10 @@ elif page == "📊 NIFTY Trading":
     with col4:
         if st.button("🔄 Reset Trader", use_container_width=True):
             if st.session_state.get('confirm_nifty_reset', False):
-                nifty_trader.available_capital = nifty_trader.capital
-                nifty_trader.positions = {}
-                nifty_trader.trades_today = 0
-                nifty_trader.daily_pnl = 0
-                nifty_trader.all_trades = []
-                nifty_trader.total_trades = 0
-                nifty_trader.winning_trades = 0
-                nifty_trader.total_profit = 0
+                if daemon_alive:
+                    daemon.send('nifty', 'reset')
+                else:
+                    nifty_trader.reset()
                 st.session_state.position_monitor_active = False  # Stop monitoring on reset
                 st.success("✅ NIFTY trader reset!")
                 st.session_state.confirm_nifty_reset = False
@@ -1513,133 +1640,115 @@ elif page == "📊 NIFTY Trading":
                 st.session_state.confirm_nifty_reset = True
                 st.warning("⚠️ Click again to confirm reset")
     
+    # Keep the daemon's check interval in step with the slider
+    if (daemon_alive and st.session_state.position_monitor_active
+            and nifty_status.get('monitor_interval') != st.session_state.monitor_interval):
+        daemon.send('nifty', 'monitor', enabled=True, interval=st.session_state.monitor_interval)
+    
     # Position Monitoring Section
     if st.session_state.position_monitor_active:
         st.markdown("---")
         
-        # Create containers for partial updates
-        monitoring_section = st.container()
-        
-        with monitoring_section:
+        # Only this fragment reruns every interval - the rest of the page is
+        # not re-executed and the script thread never sleeps
+        @st.fragment(run_every=st.session_state.monitor_interval)
+        def position_monitor():
             # Monitoring status display
             st.subheader("👁️ Position Monitoring Active")
             
-            # Create placeholders for dynamic content
-            metrics_placeholder = st.empty()
-            info_placeholder = st.empty()
-            positions_placeholder = st.empty()
-            alert_placeholder = st.empty()
+            st.info(f"""
+            👁️ **Position Monitoring Active**
             
-            # Show static info
-            with info_placeholder.container():
-                st.info(f"""
-                👁️ **Position Monitoring Active**
-                
-                ✅ Checking positions every {st.session_state.monitor_interval} second(s)
-                ✅ Auto-exits when stop-loss hit
-                ✅ Auto-exits when target reached
-                ✅ Updates in real-time
-                
-                Click "Stop Monitoring" to pause
-                """)
+            ✅ Checking positions every {st.session_state.monitor_interval} second(s)
+            ✅ Auto-exits when stop-loss hit
+            ✅ Auto-exits when target reached
+            ✅ Updates in real-time
             
-            # Check if positions exist
-            if nifty_trader.positions:
-                # Execute position check
-                # Get current status before check
-                positions_before = len(nifty_trader.positions)
-                
-                # Check all positions for stop-loss/target
-                nifty_trader.check_positions()
-                
-                # Update check count and time
-                st.session_state.monitor_check_count += 1
-                st.session_state.last_monitor_check = datetime.now()
-                
-                # Check if any positions were closed
-                positions_after = len(nifty_trader.positions)
-                
-                # Update metrics
-                with metrics_placeholder.container():
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("🟢 Status", "MONITORING", delta="Active")
-                    
-                    with col2:
-                        st.metric("🔄 Checks Done", st.session_state.monitor_check_count)
-                    
-                    with col3:
-                        if st.session_state.last_monitor_check:
-                            time_since = (datetime.now() - st.session_state.last_monitor_check).seconds
-                            st.metric("⏱️ Last Check", f"{time_since}s ago")
-                    
-                    with col4:
-                        st.metric("💼 Positions", positions_after)
-                
-                # Show alert if positions were closed
-                if positions_before > positions_after:
-                    with alert_placeholder.container():
-                        st.success(f"🎯 {positions_before - positions_after} position(s) closed automatically!")
-                
-                # Update positions table
-                with positions_placeholder.container():
-                    st.write("**Current Positions:**")
-                    
-                    positions_data = []
-                    for symbol, pos in nifty_trader.positions.items():
-                        try:
-                            quote = st.session_state.fetcher.get_quote(symbol)
-                            current_price = quote['last_price']
-                            unrealized_pnl = (current_price - pos['entry_price']) * pos['quantity']
-                            unrealized_pnl_pct = (unrealized_pnl / pos['cost']) * 100
-                            
-                            # Calculate distance to stop-loss and target
-                            sl_distance = ((current_price - pos['stop_loss']) / current_price * 100)
-                            target_distance = ((pos['target'] - current_price) / current_price * 100)
-                            
-                            # Status indicator
-                            if current_price <= pos['stop_loss']:
-                                status = "🔴 AT STOP-LOSS"
-                            elif current_price >= pos['target']:
-                                status = "🟢 AT TARGET"
-                            elif sl_distance < 0.5:
-                                status = "🟠 NEAR STOP-LOSS"
-                            elif target_distance < 0.5:
-                                status = "🟡 NEAR TARGET"
-                            else:
-                                status = "⚪ SAFE"
-                            
-                            positions_data.append({
-                                'Symbol': symbol,
-                                'Entry': f"₹{pos['entry_price']:.2f}",
-                                'Current': f"₹{current_price:.2f}",
-                                'Stop-Loss': f"₹{pos['stop_loss']:.2f}",
-                                'Target': f"₹{pos['target']:.2f}",
-                                'P&L': f"₹{unrealized_pnl:.2f} ({unrealized_pnl_pct:+.2f}%)",
-                                'Status': status
-                            })
-                        except Exception as e:
-                            # If error fetching price, skip this position
-                            pass
-                    
-                    if positions_data:
-                        df = pd.DataFrame(positions_data)
-                        st.dataframe(df, use_container_width=True, hide_index=True)
-                
-                # Wait for the configured interval before next check
-                import time
-                time.sleep(st.session_state.monitor_interval)
-                
-                # Use experimental_rerun to refresh only this section
-                st.rerun()
+            Click "Stop Monitoring" to pause
+            """)
+            
+            if daemon_alive:
+                # The daemon checks on its own schedule - just read its snapshot
+                monitor_status = daemon.status('nifty') or trader_snapshot(nifty_trader)
+                checks_done = monitor_status.get('checks', 0)
             else:
+                # No daemon: one in-process check per fragment run
+                if nifty_trader.positions:
+                    nifty_trader.check_positions()
+                    st.session_state.monitor_check_count += 1
+                monitor_status = trader_snapshot(nifty_trader)
+                checks_done = st.session_state.monitor_check_count
+            
+            positions = monitor_status['positions']
+            positions_before = st.session_state.get('monitor_positions_seen', len(positions))
+            st.session_state.monitor_positions_seen = len(positions)
+            
+            if not positions:
                 # No positions left
-                with alert_placeholder.container():
-                    st.warning("✅ All positions closed. Monitoring stopped.")
+                st.warning("✅ All positions closed. Monitoring stopped.")
                 st.session_state.position_monitor_active = False
-                import time
-                time.sleep(2)
+                st.session_state.pop('monitor_positions_seen', None)
+                st.rerun()
+            
+            # Update metrics
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("🟢 Status", "MONITORING", delta="Active")
+            
+            with col2:
+                st.metric("🔄 Checks Done", checks_done)
+            
+            with col3:
+                if monitor_status.get('last_check'):
+                    time_since = (datetime.now() - pd.Timestamp(monitor_status['last_check'])).total_seconds()
+                    st.metric("⏱️ Last Check", f"{max(0, int(time_since))}s ago")
+            
+            with col4:
+                st.metric("💼 Positions", len(positions))
+            
+            # Show alert if positions were closed
+            if positions_before > len(positions):
+                st.success(f"🎯 {positions_before - len(positions)} position(s) closed automatically!")
+            
+            # Positions table (prices from the latest check)
+            st.write("**Current Positions:**")
+            
+            positions_data = []
+            for symbol, pos in positions.items():
+                current_price = pos['current_price']
+                
+                # Calculate distance to stop-loss and target
+                sl_distance = ((current_price - pos['stop_loss']) / current_price * 100)
+                target_distance = ((pos['target'] - current_price) / current_price * 100)
+                
+                # Status indicator
+                if current_price <= pos['stop_loss']:
+                    status = "🔴 AT STOP-LOSS"
+                elif current_price >= pos['target']:
+                    status = "🟢 AT TARGET"
+                elif sl_distance < 0.5:
+                    status = "🟠 NEAR STOP-LOSS"
+                elif target_distance < 0.5:
+                    status = "🟡 NEAR TARGET"
+                else:
+                    status = "⚪ SAFE"
+                
+                positions_data.append({
+                    'Symbol': symbol,
+                    'Entry': f"₹{pos['entry_price']:.2f}",
+                    'Current': f"₹{current_price:.2f}",
+                    'Stop-Loss': f"₹{pos['stop_loss']:.2f}",
+                    'Target': f"₹{pos['target']:.2f}",
+                    'P&L': f"₹{pos['unrealized_pnl']:.2f} ({pos['unrealized_pnl_pct']:+.2f}%)",
+                    'Status': status
+                })
+            
+            if positions_data:
+                df = pd.DataFrame(positions_data)
+                st.dataframe(df, use_container_width=True, hide_index=True)
+        
+        position_monitor()
     
     # Options Chain (if options trading is selected)
     if trading_type == "🎲 Options (Call & Put)":
@@ -1670,20 +1779,38 @@ elif page == "📊 NIFTY Trading":
                 
                 st.markdown("---")
                 
-                # Generate sample options chain
-                import random
-                
-                # Calculate ATM strike
-                strike_interval = 100 if "BANK" in selected_index else 50
-                atm_strike = round(current_price / strike_interval) * strike_interval
-                
-                # Generate strikes around ATM
-                strikes = [atm_strike + (i * strike_interval) for i in range(-5, 6)]
+                # Pricing volatility from the index's realized volatility
+                try:
+                    history = st.session_state.fetcher.get_historical_data(
+                        index_symbol,
+                        (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'),
+                        datetime.now().strftime('%Y-%m-%d')
+                    )
+                    sigma = pricing.volatility_estimate({
+                        'realized_volatility': pricing.realized_volatility(history['Close'])
+                    })
+                except:
+                    sigma = pricing.volatility_estimate({})
+                
+                # Strikes around ATM
+                strike_interval = pricing.strike_interval(selected_index)
+                strikes = pricing.strike_grid(current_price, strike_interval, 5)
+                atm_strike = strikes[5]
+                
+                # Price every strike x expiry in one vectorized call
+                expiries = [
+                    datetime.strptime(expiry.split(': ')[1], '%d-%b-%Y').replace(hour=15, minute=30)
+                    for expiry in expiry_dates
+                ]
+                chain = pricing.chain_greeks(
+                    current_price, strikes, pricing.years_to_expiry(expiries)[:, None], sigma
+                )
+                row = expiry_dates.index(selected_expiry)
                 
                 # Create options chain data
                 options_data = []
                 
-                for strike in strikes:
+                for k, strike in enumerate(strikes):
                     # Calculate if ITM/ATM/OTM
                     if strike == atm_strike:
                         moneyness = "ATM"
@@ -1692,32 +1819,20 @@ elif page == "📊 NIFTY Trading":
                     else:
                         moneyness = "OTM (Call)"
                     
-                    # Simulate premium values (in production, fetch real data)
-                    distance_from_atm = abs(strike - current_price)
-                    
-                    # Call premium (decreases as strike increases)
-                    call_premium = max(10, 200 - (distance_from_atm / 10) + random.uniform(-20, 20))
-                    call_iv = random.uniform(15, 35)  # Implied Volatility
-                    call_oi = random.randint(10000, 100000)  # Open Interest
-                    
-                    # Put premium (increases as strike increases)
-                    put_premium = max(10, 50 + (distance_from_atm / 10) + random.uniform(-20, 20))
-                    put_iv = random.uniform(15, 35)
-                    put_oi = random.randint(10000, 100000)
-                    
                     options_data.append({
                         'Strike': f"₹{strike:.0f}",
                         'Moneyness': moneyness,
-                        'Call Premium': f"₹{call_premium:.2f}",
-                        'Call IV': f"{call_iv:.1f}%",
-                        'Call OI': f"{call_oi:,}",
-                        'Put Premium': f"₹{put_premium:.2f}",
-                        'Put IV': f"{put_iv:.1f}%",
-                        'Put OI': f"{put_oi:,}"
+                        'Call Premium': f"₹{chain['call_price'][row, k]:.2f}",
+                        'Call Delta': f"{chain['call_delta'][row, k]:.2f}",
+                        'Call Theta': f"₹{chain['call_theta'][row, k]:.2f}",
+                        'Put Premium': f"₹{chain['put_price'][row, k]:.2f}",
+                        'Put Delta': f"{chain['put_delta'][row, k]:.2f}",
+                        'Put Theta': f"₹{chain['put_theta'][row, k]:.2f}",
+                        'Vega': f"₹{chain['vega'][row, k]:.2f}"
                     })
                 
                 # Display options chain
-                st.write(f"**Options Chain for {selected_expiry}:**")
+                st.write(f"**Options Chain for {selected_expiry}** (Black-Scholes @ {sigma * 100:.1f}% volatility):")
                 
                 options_df = pd.DataFrame(options_data)
                 
@@ -1745,16 +1860,9 @@ elif page == "📊 NIFTY Trading":
                 
                 with col3:
                     st.write("**Current Analysis:**")
-                    # Calculate Put-Call Ratio (simulated)
-                    pcr = random.uniform(0.8, 1.2)
-                    if pcr < 0.9:
-                        sentiment = "🟢 Bullish"
-                    elif pcr > 1.1:
-                        sentiment = "🔴 Bearish"
-                    else:
-                        sentiment = "🟡 Neutral"
-                    
-                    st.metric("Put-Call Ratio", f"{pcr:.2f}", sentiment)
+                    # The ATM straddle prices the market's expected move to expiry
+                    straddle = chain['call_price'][row, 5] + chain['put_price'][row, 5]
+                    st.metric("ATM Straddle", f"₹{straddle:.2f}", f"±{straddle / current_price * 100:.2f}% expected move")
                 
                 # Quick Actions
                 st.write("**Quick Actions:**")
@@ -2033,89 +2141,78 @@ elif page == "💼 Positions":
     st.header("💼 Positions")
     st.write("**View and manage all your open positions**")
     
-    # Get positions from both traders
-    positions_list = []
-    
-    # From regular auto-trader
-    if 'autotrader' in st.session_state:
-        trader = st.session_state.autotrader
-        for symbol, pos in trader.positions.items():
-            try:
-                quote = st.session_state.fetcher.get_quote(symbol)
-                current_price = quote['last_price']
-                unrealized_pnl = (current_price - pos['entry_price']) * pos['quantity']
-                unrealized_pnl_pct = (unrealized_pnl / pos['cost']) * 100
-                
-                positions_list.append({
-                    'source': 'Auto-Trader',
-                    'symbol': symbol,
-                    'entry_price': pos['entry_price'],
-                    'current_price': current_price,
-                    'quantity': pos['quantity'],
-                    'cost': pos['cost'],
-                    'current_value': current_price * pos['quantity'],
-                    'unrealized_pnl': unrealized_pnl,
-                    'unrealized_pnl_pct': unrealized_pnl_pct,
-                    'stop_loss': pos['stop_loss'],
-                    'target': pos['target'],
-                    'entry_time': pos['entry_time'],
-                    'reason': pos['reason']
-                })
-            except:
-                pass
-    
-    # From NIFTY trader
-    if 'nifty_trader' in st.session_state:
-        nifty_trader = st.session_state.nifty_trader
-        for symbol, pos in nifty_trader.positions.items():
-            try:
-                quote = st.session_state.fetcher.get_quote(symbol)
-                current_price = quote['last_price']
-                unrealized_pnl = (current_price - pos['entry_price']) * pos['quantity']
-                unrealized_pnl_pct = (unrealized_pnl / pos['cost']) * 100
-                
-                positions_list.append({
-                    'source': 'NIFTY Trader',
-                    'symbol': symbol,
-                    'entry_price': pos['entry_price'],
-                    'current_price': current_price,
-                    'quantity': pos['quantity'],
-                    'cost': pos['cost'],
-                    'current_value': current_price * pos['quantity'],
-                    'unrealized_pnl': unrealized_pnl,
-                    'unrealized_pnl_pct': unrealized_pnl_pct,
-                    'stop_loss': pos['stop_loss'],
-                    'target': pos['target'],
-                    'entry_time': pos['entry_time'],
-                    'reason': pos['reason']
-                })
-            except:
-                pass
-    
-    if not positions_list:
-        st.info("📭 No open positions at the moment")
-        st.write("Start trading to see positions here!")
+    # Snapshots from the trading daemon when it runs, else the session traders
+    daemon = DaemonClient(st.session_state.db)
+    daemon_alive = daemon.is_alive()
+    
+    def collect_positions():
+        """Open positions of both traders with current prices"""
+        positions = []
+        
+        for component, source, state_key in [('autotrader', 'Auto-Trader', 'autotrader'),
+                                              ('nifty', 'NIFTY Trader', 'nifty_trader')]:
+            if daemon_alive:
+                status = daemon.status(component)
+                for pos in (status['positions'] if status else {}).values():
+                    positions.append({
+                        'source': source,
+                        'symbol': pos['symbol'],
+                        'entry_price': pos['entry_price'],
+                        'current_price': pos['current_price'],
+                        'quantity': pos['quantity'],
+                        'cost': pos['cost'],
+                        'current_value': pos['current_value'],
+                        'unrealized_pnl': pos['unrealized_pnl'],
+                        'unrealized_pnl_pct': pos['unrealized_pnl_pct'],
+                        'stop_loss': pos['stop_loss'],
+                        'target': pos['target'],
+                        'entry_time': pd.Timestamp(pos['entry_time']),
+                        'reason': pos['reason']
+                    })
+                continue
+            
+            if state_key not in st.session_state:
+                continue
+            
+            trader = st.session_state[state_key]
+            for symbol, pos in trader.positions.items():
+                try:
+                    quote = st.session_state.fetcher.get_quote(symbol)
+                    current_price = quote['last_price']
+                    unrealized_pnl = (current_price - pos['entry_price']) * pos['quantity']
+                    unrealized_pnl_pct = (unrealized_pnl / pos['cost']) * 100
+                    
+                    positions.append({
+                        'source': source,
+                        'symbol': symbol,
+                        'entry_price': pos['entry_price'],
+                        'current_price': current_price,
+                        'quantity': pos['quantity'],
+                        'cost': pos['cost'],
+                        'current_value': current_price * pos['quantity'],
+                        'unrealized_pnl': unrealized_pnl,
+                        'unrealized_pnl_pct': unrealized_pnl_pct,
+                        'stop_loss': pos['stop_loss'],
+                        'target': pos['target'],
+                        'entry_time': pos['entry_time'],
+                        'reason': pos['reason']
+                    })
+                except:
+                    pass
         
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("🤖 Go to Auto-Trader", use_container_width=True):
-                st.session_state.page = "🤖 Auto-Trader"
-                st.rerun()
-        with col2:
-            if st.button("📊 Go to NIFTY Trading", use_container_width=True):
-                st.session_state.page = "📊 NIFTY Trading"
-                st.rerun()
-    else:
-        # Summary metrics
-        total_cost = sum(p['cost'] for p in positions_list)
-        total_current_value = sum(p['current_value'] for p in positions_list)
+        return positions
+    
+    def positions_summary(positions):
+        """Summary metrics row"""
+        total_cost = sum(p['cost'] for p in positions)
+        total_current_value = sum(p['current_value'] for p in positions)
         total_unrealized_pnl = total_current_value - total_cost
         total_unrealized_pnl_pct = (total_unrealized_pnl / total_cost * 100) if total_cost > 0 else 0
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Open Positions", len(positions_list))
+            st.metric("Open Positions", len(positions))
         
         with col2:
             st.metric("Total Investment", f"₹{total_cost:,.0f}")
@@ -2129,9 +2226,23 @@ elif page == "💼 Positions":
                 f"₹{total_unrealized_pnl:,.0f}",
                 f"{total_unrealized_pnl_pct:+.2f}%"
             )
+    
+    positions_list = collect_positions()
+    
+    if not positions_list:
+        st.info("📭 No open positions at the moment")
+        st.write("Start trading to see positions here!")
         
-        st.markdown("---")
-        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🤖 Go to Auto-Trader", use_container_width=True):
+                st.session_state.page = "🤖 Auto-Trader"
+                st.rerun()
+        with col2:
+            if st.button("📊 Go to NIFTY Trading", use_container_width=True):
+                st.session_state.page = "📊 NIFTY Trading"
+                st.rerun()
+    else:
         # Refresh button
         col1, col2, col3 = st.columns([1, 1, 4])
         with col1:
@@ -2141,9 +2252,16 @@ elif page == "💼 Positions":
             auto_refresh = st.checkbox("Auto-refresh", value=False)
         
         if auto_refresh:
-            import time
-            time.sleep(30)
-            st.rerun()
+            # Only the summary reruns; daemon snapshots are cheap to poll,
+            # live quotes are fetched every 30s
+            @st.fragment(run_every=5 if daemon_alive else 30)
+            def live_positions_summary():
+                positions_summary(collect_positions())
+                st.caption(f"🔄 Updated {datetime.now().strftime('%H:%M:%S')}")
+            
+            live_positions_summary()
+        else:
+            positions_summary(positions_list)
         
         st.markdown("---")
         
@@ -2344,8 +2462,8 @@ elif page == "🎯 Buy Recommendations":
                     if len(data) < 20:
                         continue
                     
-                    # Add indicators
-                    data_with_indicators = TechnicalIndicators.add_all_indicators(data)
+                    # Add indicators (shared with the other pages and the autotrader)
+                    data_with_indicators = get_indicator_cache().get(data, symbol)
                     latest = data_with_indicators.iloc[-1]
                     
                     # Calculate signals
@@ -2574,8 +2692,8 @@ elif page == "📊 Stock Details":
                     # Get quote
                     quote = st.session_state.fetcher.get_quote(stock_symbol)
                     
-                    # Add indicators
-                    data_with_indicators = TechnicalIndicators.add_all_indicators(data)
+                    # Add indicators (shared with the other pages and the autotrader)
+                    data_with_indicators = get_indicator_cache().get(data, stock_symbol)
                     latest = data_with_indicators.iloc[-1]
                     
                     # === HEADER METRICS ===
@@ -3092,9 +3210,10 @@ elif page == "💰 Live Prices":
         stocks = ['RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK']
         
         prices_data = []
+        quotes = st.session_state.fetcher.get_quotes_bulk(stocks)
         for symbol in stocks:
             try:
-                quote = st.session_state.fetcher.get_quote(symbol)
+                quote = quotes[symbol]
                 prices_data.append({
                     'Stock': symbol,
                     'Price (₹)': f"₹{quote['last_price']:.2f}",
@@ -3147,6 +3266,13 @@ elif page == "📊 Run Backtest":
         else:
             start_date = "2024-01-01"
             end_date = "2024-12-31"
+        
+        mc_simulations = st.select_slider(
+            "Monte Carlo Simulations:",
+            options=[0, 1000, 5000, 10000, 50000],
+            value=10000,
+            help="Resample the trades to see the range of possible outcomes (0 = off)"
+        )
     
     if st.button("🚀 Run Backtest", type="primary", use_container_width=True):
         with st.spinner(f"Running backtest on {stock_symbol}... This may take a minute..."):
@@ -3158,7 +3284,7 @@ elif page == "📊 Run Backtest":
                     strategy = RSIStrategy(st.session_state.fetcher)
                 
                 # Run backtest
-                strategy.backtest(stock_symbol, start_date, end_date)
+                strategy.backtest(stock_symbol, start_date, end_date, vectorized=True)
                 
                 # Get stats
                 stats = strategy.get_performance_stats()
@@ -3218,11 +3344,50 @@ elif page == "📊 Run Backtest":
                 # Trade history
                 if strategy.trades:
                     st.subheader("📜 Trade History")
-                    trades_df = pd.DataFrame(strategy.trades)
+                    trades_df = strategy.trades.to_frame()
                     trades_df['profit'] = trades_df['profit'].apply(lambda x: f"₹{x:.2f}")
                     trades_df['profit_percent'] = trades_df['profit_percent'].apply(lambda x: f"{x:.2f}%")
                     st.dataframe(trades_df[['symbol', 'entry_price', 'exit_price', 'quantity', 'profit', 'profit_percent']], use_container_width=True)
                 
+                # Monte Carlo - how lucky was this trade sequence?
+                if mc_simulations and len(strategy.trades) >= 2:
+                    st.subheader("🎲 Monte Carlo Risk Analysis")
+                    st.caption(f"{mc_simulations:,} simulations: trades drawn with replacement (bootstrap) "
+                               f"and in random order (reshuffle)")
+                    
+                    simulator = MonteCarloSimulator(n_simulations=mc_simulations)
+                    returns = trade_returns(strategy.trades, strategy.capital)
+                    bootstrap = simulator.bootstrap(returns, strategy.capital)
+                    reshuffle = simulator.reshuffle(returns, strategy.capital)
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    
+                    with col1:
+                        st.metric("Median Final Capital", f"₹{bootstrap['percentiles'].loc[50, 'final_capital']:,.0f}")
+                    with col2:
+                        st.metric("5% Worst Case", f"₹{bootstrap['percentiles'].loc[5, 'final_capital']:,.0f}")
+                    with col3:
+                        st.metric("95% Max Drawdown", f"{reshuffle['percentiles'].loc[95, 'max_drawdown']:.2f}%")
+                    with col4:
+                        st.metric("Risk of Ruin", f"{bootstrap['risk_of_ruin']:.2f}%",
+                                  f"P(loss) {bootstrap['probability_of_loss']:.1f}%", delta_color="off")
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        fig = go.Figure(go.Histogram(x=bootstrap['final_capital'], nbinsx=60, marker_color='#1f77b4'))
+                        fig.add_vline(x=stats['final_capital'], line_dash="dash", line_color="orange",
+                                      annotation_text="Backtest")
+                        fig.update_layout(title="Final Capital (bootstrap)", xaxis_title="₹",
+                                          yaxis_title="Simulations", height=350, showlegend=False)
+                        st.plotly_chart(fig, use_container_width=True)
+                    
+                    with col2:
+                        fig = go.Figure(go.Histogram(x=reshuffle['max_drawdown'], nbinsx=60, marker_color='#d62728'))
+                        fig.update_layout(title="Max Drawdown (reshuffle)", xaxis_title="%",
+                                          yaxis_title="Simulations", height=350, showlegend=False)
+                        st.plotly_chart(fig, use_container_width=True)
+                
                 # Interpretation
                 st.subheader("💡 What Does This Mean?")
                 if stats['return_percent'] > 0:
@@ -3289,14 +3454,24 @@ elif page == "📈 Compare Strategies":
                 
                 # Create comparison table
                 comparison_data = []
-                for strategy_name, stats in results.items():
+                for (strategy_name, stats), strategy in zip(results.items(), (ma_strategy, rsi_strategy)):
+                    # One-year window, so trades per year = trade count
+                    risk = trade_statistics(
+                        strategy.trades.column('profit'), strategy.capital,
+                        trades_per_year=max(stats['total_trades'], 1)
+                    )
                     comparison_data.append({
                         'Strategy': strategy_name,
                         'Return': f"₹{stats['total_profit']:,.2f}",
                         'Return %': f"{stats['return_percent']:.2f}%",
                         'Win Rate': f"{stats['win_rate']:.1f}%",
                         'Total Trades': stats['total_trades'],
-                        'Avg Profit': f"₹{stats['avg_profit']:,.2f}"
+                        'Avg Profit': f"₹{stats['avg_profit']:,.2f}",
+                        'Profit Factor': f"{stats['profit_factor']:.2f}",
+                        'Expectancy': f"₹{stats['expectancy']:,.2f}",
+                        'Max Drawdown': f"{stats['max_drawdown']:.2f}%",
+                        'Sharpe': f"{risk.get('sharpe_ratio', 0.0):.2f}",
+                        'Sortino': f"{risk.get('sortino_ratio', 0.0):.2f}"
                     })
                 
                 df = pd.DataFrame(comparison_data)
@@ -3359,6 +3534,17 @@ elif page == "📜 Trade History":
         with col4:
             st.metric("Avg Profit", f"₹{stats['avg_profit']:,.2f}")
         
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Profit Factor", f"{stats['profit_factor']:.2f}")
+        with col2:
+            st.metric("Expectancy", f"₹{stats['expectancy']:,.2f}")
+        with col3:
+            st.metric("Avg Win", f"₹{stats['avg_win']:,.2f}")
+        with col4:
+            st.metric("Avg Loss", f"₹{stats['avg_loss']:,.2f}")
+        
     else:
         st.info("No trades in database yet. Run some backtests to see results here!")
 
@@ -6,6 +6,8 @@ import time
 from datetime import datetime, timedelta
 import pandas as pd
 from threading import Thread
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 import json
 from pathlib import Path
 
@@ -13,8 +15,15 @@ from data.free_fetcher import FreeFetcher
 from strategies.rsi_strategy import RSIStrategy
 from strategies.ma_crossover import MACrossoverStrategy
 from indicators.technical import TechnicalIndicators
+from indicators.cache import get_indicator_cache
 from utils.database import TradingDatabase
 from utils.logger import get_logger
+from utils.trade_ledger import TradeLedger
+
+def _latest_indicators(data: pd.DataFrame, columns=None) -> pd.Series:
+    """Compute indicators and keep only the last row (picklable for process pools)"""
+    return TechnicalIndicators.add_all_indicators(data, columns=columns).iloc[-1]
+
 
 class AutoTrader:
     """
@@ -24,12 +33,13 @@ class AutoTrader:
     Live Mode: Real trading with Kite API (requires subscription)
     """
     
-    def __init__(self, mode="SIMULATION"):
+    def __init__(self, mode="SIMULATION", db_path="data/trading.db"):
         """
         Initialize Auto-Trader
         
         Args:
             mode: "SIMULATION" or "LIVE"
+            db_path: SQLite database for trades, signals and logs
         """
         self.mode = mode
         self.logger = get_logger("AutoTrader")
@@ -39,7 +49,8 @@ class AutoTrader:
         
         # Initialize components
         self.fetcher = FreeFetcher()
-        self.db = TradingDatabase("data/trading.db")
+        # Writes go through a background thread so the trading loop never waits on disk
+        self.db = TradingDatabase(db_path, background_writer=True)
         
         # Trading state
         self.is_running = False
@@ -48,7 +59,14 @@ class AutoTrader:
         self.available_capital = self.capital
         self.trades_today = 0
         self.daily_pnl = 0
-        self.all_trades = []
+        self.all_trades = TradeLedger()
+        
+        # Latest quotes seen by check_positions (symbol -> price)
+        self.last_prices = {}
+        self.last_check = None
+        
+        # Created on first use when scan_use_processes is enabled
+        self._process_pool = None
         
         # Statistics
         self.total_trades = 0
@@ -81,7 +99,11 @@ class AutoTrader:
             'scan_interval_minutes': 30,
             'require_confirmation': False,
             'rsi_oversold': 30,
-            'rsi_overbought': 70
+            'rsi_overbought': 70,
+            'scan_workers': 8,
+            'scan_timeout_seconds': 30,
+            'scan_use_processes': False,
+            'record_to_db': False
         }
         
         if config_file.exists():
@@ -93,6 +115,14 @@ class AutoTrader:
         
         return default_config
     
+    @property
+    def db_strategy(self):
+        """
+        Strategy name for recorded signals/trades, e.g. 'RSI (SIMULATION)'
+        Keeps live and paper trades apart from backtest trades in the database
+        """
+        return f"{self.config['strategy']} ({self.mode})"
+    
     def save_config(self, config=None):
         """Save configuration to file"""
         if config is None:
@@ -112,33 +142,47 @@ class AutoTrader:
         print(f"✅ Capital updated to ₹{new_capital:,.2f}")
     
     def scan_for_signals(self):
-        """Scan stocks for buy/sell signals"""
+        """
+        Scan stocks for buy/sell signals
+        
+        With scan_workers > 1 each symbol's history is fetched on a bounded
+        thread pool (per-symbol timeout: scan_timeout_seconds), otherwise the
+        watchlist is fetched with one bulk request. Indicators are computed
+        for the whole watchlist in one panel pass, or on a process pool
+        (scan_use_processes). Signals are always returned in stocks_to_trade
+        order.
+        """
         print(f"\n🔍 Scanning stocks at {datetime.now().strftime('%H:%M:%S')}...")
         
         signals = []
+        symbols = self.config['stocks_to_trade']
+        
+        # Fetch recent data and quotes
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=90)
+        from_date = start_date.strftime('%Y-%m-%d')
+        to_date = end_date.strftime('%Y-%m-%d')
+        
+        if self.config['scan_workers'] > 1 and len(symbols) > 1:
+            history, quotes = self._fetch_concurrent(symbols, from_date, to_date)
+        else:
+            history = self.fetcher.get_historical_data_bulk(symbols, from_date, to_date)
+            quotes = self.fetcher.get_quotes_bulk(symbols)
+        
+        # Add indicators
+        latest_rows = self._compute_latest_indicators(
+            {symbol: data for symbol, data in history.items() if len(data) >= 20}
+        )
         
-        for symbol in self.config['stocks_to_trade']:
+        for symbol in symbols:
             try:
-                # Fetch recent data
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=90)
-                
-                data = self.fetcher.get_historical_data(
-                    symbol,
-                    start_date.strftime('%Y-%m-%d'),
-                    end_date.strftime('%Y-%m-%d')
-                )
-                
-                if len(data) < 20:
+                if symbol not in latest_rows or symbol not in quotes:
                     continue
                 
-                # Add indicators
-                data_with_indicators = TechnicalIndicators.add_all_indicators(data)
-                latest = data_with_indicators.iloc[-1]
+                latest = latest_rows[symbol]
                 
                 # Get current price
-                quote = self.fetcher.get_quote(symbol)
-                current_price = quote['last_price']
+                current_price = quotes[symbol]['last_price']
                 
                 # Check for signals based on strategy
                 if self.config['strategy'] == 'RSI':
@@ -148,6 +192,14 @@ class AutoTrader:
                 
                 if signal:
                     signals.append(signal)
+                    if self.config['record_to_db']:
+                        self.db.queue_signal({
+                            'symbol': symbol,
+                            'strategy': self.db_strategy,
+                            'signal_type': signal['action'],
+                            'price': current_price,
+                            'indicators': signal['reason']
+                        })
             
             except Exception as e:
                 self.logger.error(f"Error scanning {symbol}: {str(e)}")
@@ -155,6 +207,136 @@ class AutoTrader:
         
         return signals
     
+    def _fetch_concurrent(self, symbols, from_date, to_date):
+        """
+        Fetch history per symbol on a bounded thread pool
+        
+        Args:
+            symbols: List of symbols
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+        
+        Returns:
+            Tuple of (history dict, quotes dict) - symbols that failed or
+            timed out are left out
+        """
+        timeout = self.config['scan_timeout_seconds']
+        started = {}
+        
+        def fetch(symbol):
+            started[symbol] = time.monotonic()
+            return self.fetcher.get_historical_data(symbol, from_date, to_date)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=self.config['scan_workers'],
+            thread_name_prefix="scan"
+        )
+        
+        # Quotes are one bulk request - submit first so it runs alongside the fetches
+        started['__quotes__'] = time.monotonic()
+        quotes_future = executor.submit(self.fetcher.get_quotes_bulk, symbols)
+        futures = {executor.submit(fetch, symbol): symbol for symbol in symbols}
+        futures[quotes_future] = '__quotes__'
+        
+        history = {}
+        quotes = {}
+        pending = set(futures)
+        
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                symbol = futures[future]
+                try:
+                    if future is quotes_future:
+                        quotes = future.result()
+                    else:
+                        history[symbol] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error fetching {symbol}: {str(e)}")
+            
+            # The timeout only starts once a worker picks the symbol up
+            now = time.monotonic()
+            for future in list(pending):
+                symbol = futures[future]
+                if symbol in started and now - started[symbol] > timeout:
+                    self.logger.warning(f"Timed out fetching {symbol} after {timeout}s")
+                    pending.discard(future)
+        
+        # Don't wait for timed-out requests
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        return history, quotes
+    
+    def _compute_latest_indicators(self, history):
+        """
+        Compute indicators for each symbol and return the latest row
+        
+        Symbols already in the indicator cache are served from it; the rest
+        are computed on the process pool or as one panel.
+        
+        Args:
+            history: Dictionary of symbol -> OHLCV DataFrame
+        
+        Returns:
+            Dictionary of symbol -> latest indicator row
+        """
+        if not history:
+            return {}
+        
+        columns = self._scan_indicators()
+        
+        # Symbols a UI page already computed for the same bars
+        cache = get_indicator_cache()
+        latest_rows = {}
+        for symbol, data in history.items():
+            cached = cache.lookup(data, symbol, columns=columns)
+            if cached is not None:
+                latest_rows[symbol] = cached.iloc[-1]
+        
+        symbols = [symbol for symbol in history if symbol not in latest_rows]
+        if not symbols:
+            return latest_rows
+        
+        if self.config['scan_use_processes'] and len(symbols) > 1:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.config['scan_workers'])
+            
+            try:
+                rows = self._process_pool.map(partial(_latest_indicators, columns=columns),
+                                              [history[s] for s in symbols])
+                latest_rows.update(zip(symbols, rows))
+                return latest_rows
+            except Exception as e:
+                self.logger.error(f"Process pool failed, computing in-process: {str(e)}")
+        
+        # Whole watchlist in one vectorized pass - right-aligned so each
+        # symbol's latest row equals its own add_all_indicators result
+        try:
+            panel = TechnicalIndicators.add_all_indicators_panel(
+                TechnicalIndicators.to_panel({s: history[s] for s in symbols}, align='end'),
+                columns=columns
+            )
+            snapshot = TechnicalIndicators.panel_snapshot(panel)
+            latest_rows.update((symbol, snapshot.loc[symbol]) for symbol in symbols if symbol in snapshot.index)
+            return latest_rows
+        except Exception as e:
+            self.logger.error(f"Panel indicators failed, computing per symbol: {str(e)}")
+        
+        for symbol in symbols:
+            try:
+                latest_rows[symbol] = cache.get(history[symbol], symbol, columns=columns).iloc[-1]
+            except Exception as e:
+                self.logger.error(f"Error computing indicators for {symbol}: {str(e)}")
+        
+        return latest_rows
+    
+    def _scan_indicators(self):
+        """Indicator columns the configured strategy's signal check reads"""
+        if self.config['strategy'] == 'RSI':
+            return RSIStrategy.INDICATORS
+        return MACrossoverStrategy.INDICATORS
+    
     def _check_rsi_signal(self, latest, symbol, price):
         """Check RSI-based signals"""
         rsi = latest['RSI']
@@ -330,17 +512,29 @@ class AutoTrader:
             'exit_time': datetime.now()
         }
         self.all_trades.append(trade)
+        if self.config['record_to_db']:
+            self.db.queue_trade({
+                **trade,
+                'strategy': self.db_strategy,
+                'entry_date': position['entry_time'].strftime('%Y-%m-%d %H:%M:%S'),
+                'exit_date': trade['exit_time'].strftime('%Y-%m-%d %H:%M:%S'),
+                'status': 'CLOSED'
+            })
         
         return True
     
     def check_positions(self):
         """Check open positions for stop-loss or target"""
+        quotes = self.fetcher.get_quotes_bulk(list(self.positions.keys()))
+        self.last_check = datetime.now()
+        
         for symbol in list(self.positions.keys()):
             position = self.positions[symbol]
             
             try:
-                quote = self.fetcher.get_quote(symbol)
+                quote = quotes[symbol]
                 current_price = quote['last_price']
+                self.last_prices[symbol] = current_price
                 
                 # Check stop-loss
                 if current_price <= position['stop_loss']:
@@ -398,6 +592,18 @@ class AutoTrader:
         }
         return status
     
+    def reset(self):
+        """Clear positions, trades and statistics back to the starting capital"""
+        self.available_capital = self.capital
+        self.positions = {}
+        self.trades_today = 0
+        self.daily_pnl = 0
+        self.all_trades.clear()
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.total_profit = 0
+        self.last_prices = {}
+    
     def print_status(self):
         """Print current status"""
         status = self.get_status()
@@ -484,6 +690,13 @@ class AutoTrader:
     def stop(self):
         """Stop auto-trading"""
         self.is_running = False
+        
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        
+        # Commit anything still queued for the database
+        self.db.flush()
         print(f"\n🛑 Auto-trader stopped")
         self.print_status()
         
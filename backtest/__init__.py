@@ -0,0 +1,9 @@
+"""Event-driven backtesting package"""
+from .ai_replay import AIEngineReplay
+from .costs import CostModel, IndianEquityCosts
+from .engine import BacktestEngine
+from .monte_carlo import MonteCarloSimulator, bar_returns, trade_returns
+from .portfolio import PortfolioBacktester
+from .walk_forward import WalkForwardAnalyzer, walk_forward_windows
+
+__all__ = ['BacktestEngine', 'MonteCarloSimulator', 'bar_returns', 'trade_returns', 'PortfolioBacktester', 'WalkForwardAnalyzer', 'walk_forward_windows', 'CostModel', 'IndianEquityCosts', 'AIEngineReplay']
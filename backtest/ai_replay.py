@@ -0,0 +1,418 @@
+"""
+AI Engine Replay
+Replays AITradingEngine decisions over a full price history: market
+analysis and strategy selection for every bar in one vectorized pass,
+then Black-Scholes priced entries and exits under the engine's rules
+"""
+import heapq
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ai_trading_engine import AITradingEngine
+from options import pricing
+from utils.performance import performance_report
+from utils.trade_ledger import TradeLedger
+
+
+class AIEngineReplay:
+    """
+    Historical replay of an AITradingEngine
+    
+    Every bar is analyzed as the engine would see it with a trailing
+    `lookback`-bar history. Trades are entered at the bar's close with the
+    engine's sizing, capital, position and daily limits, then marked on every
+    later close until the stop-loss, target or expiry is reached.
+    """
+    
+    def __init__(self, engine: Optional[AITradingEngine] = None, lookback: int = 62,
+                 close_time: str = "15:30"):
+        """
+        Initialize replay
+        
+        Args:
+            engine: Engine whose analyzer, selector and limits are replayed
+                (default: a fresh AITradingEngine)
+            lookback: Bars of history per decision (62 daily bars ~ the
+                90 calendar days the app fetches)
+            close_time: Valuation time for date-only (daily) bars
+        """
+        self.engine = engine or AITradingEngine()
+        self.lookback = lookback
+        self.close_time = close_time
+    
+    def _bar_times(self, data: pd.DataFrame) -> pd.DatetimeIndex:
+        """Bar timestamps, with daily bars valued at the market close"""
+        times = pd.DatetimeIndex(data['Date'] if 'Date' in data.columns else data.index)
+        if (times == times.normalize()).all():
+            times = times + pd.Timedelta(f"{self.close_time}:00")
+        return times
+    
+    def run(self, data: pd.DataFrame, index: str = 'NIFTY') -> Dict:
+        """
+        Replay the engine over an index history
+        
+        Entry and exit premiums depend only on the bar and strategy, so they
+        are priced for every trade signal up front, one strategy at a time.
+        Only the capital, position and daily-limit bookkeeping runs per trade.
+        
+        Args:
+            data: Index OHLCV history (Date column or DatetimeIndex)
+            index: Index name (sets the strike interval)
+        
+        Returns:
+            Dictionary with decisions (per-bar conditions and strategy),
+            trades, equity and open_positions Series, per-strategy
+            breakdown and a performance report
+        """
+        engine = self.engine
+        times = self._bar_times(data)
+        closes = data['Close'].to_numpy(dtype=np.float64)
+        n_bars = len(closes)
+        
+        # Every bar's decision at once
+        conditions = engine.analyzer.analyze_history(data, self.lookback)
+        decisions = conditions.join(engine.selector.select_strategies(conditions))
+        decisions['sigma'] = pricing.volatility_estimate(conditions)
+        offset = self.lookback - 1
+        
+        interval = pricing.strike_interval(index)
+        plan = self._plan_trades(decisions, offset, times, closes, interval)
+        
+        # Plain integers in the per-signal loop: nanoseconds and day numbers
+        stamps = times.as_unit('ns').asi8
+        days = times.normalize().as_unit('ns').asi8
+        min_interval = engine.min_trade_interval * 10**9
+        capital = float(engine.capital)
+        available = capital
+        
+        open_positions: List = []  # heap of (exit bar, id, exit value, pnl)
+        taken: List[int] = []
+        quantities: List[int] = []
+        trades_today: Dict = {}
+        daily_pnl: Dict = {}
+        last_trade_time = None
+        
+        for c, bar in enumerate(plan['bar'].tolist()):
+            now = stamps[bar]
+            day = days[bar]
+            
+            # Positions that closed up to this bar free their capital first
+            while open_positions and open_positions[0][0] <= bar:
+                exit_bar, _, exit_value, pnl = heapq.heappop(open_positions)
+                available += exit_value
+                daily_pnl[days[exit_bar]] = daily_pnl.get(days[exit_bar], 0.0) + pnl
+            
+            # can_trade / check_risk_limits
+            if (len(open_positions) >= engine.max_positions
+                    or trades_today.get(day, 0) >= engine.max_trades_per_day
+                    or daily_pnl.get(day, 0.0) < -engine.max_loss_per_day
+                    or available < capital * 0.3):
+                continue
+            if last_trade_time is not None and now - last_trade_time < min_interval:
+                continue
+            
+            entry = plan['entry_premium'][c]
+            details = engine.selector._get_action_details(plan['strategy'][c], {'indicators': {}}, available)
+            quantity = max(1, int(details['max_premium'] / entry))
+            if entry * quantity > available:
+                continue
+            
+            available -= entry * quantity
+            trades_today[day] = trades_today.get(day, 0) + 1
+            last_trade_time = now
+            taken.append(c)
+            quantities.append(quantity)
+            heapq.heappush(open_positions, (
+                plan['exit_bar'][c], len(taken),
+                plan['exit_premium'][c] * quantity, (plan['exit_premium'][c] - entry) * quantity
+            ))
+        
+        trades = {key: values[taken] for key, values in plan.items()}
+        trades['quantity'] = np.array(quantities, dtype=np.int64)
+        
+        return self._replay_result(decisions, trades, times, closes, interval, index, capital, offset)
+    
+    def _plan_trades(self, decisions: pd.DataFrame, offset: int, times: pd.DatetimeIndex,
+                     closes: np.ndarray, interval: float) -> Dict[str, np.ndarray]:
+        """
+        Entry and exit of a trade on every signal bar
+        
+        Returns:
+            Dictionary of arrays, one element per signal: row, bar, strategy,
+            spot, strike, expiry, sigma, confidence, score, stop_loss, target,
+            entry_premium, exit_bar, exit_premium, exit_reason
+        """
+        engine = self.engine
+        strategies = decisions['strategy'].to_numpy()
+        rows = np.flatnonzero(strategies != 'WAIT')
+        rows = rows[offset + rows < len(closes) - 1]  # the last bar has no later close
+        bars = offset + rows
+        
+        spot = closes[bars]
+        expiry = np.asarray(pricing.next_expiry(times[bars], close_time=self.close_time), dtype='datetime64[ns]')
+        times_ns = np.asarray(times, dtype='datetime64[ns]')
+        
+        plan = {
+            'row': rows,
+            'bar': bars,
+            'strategy': strategies[rows],
+            'spot': spot,
+            'strike': np.round(spot / interval) * interval,
+            'expiry': expiry,
+            'sigma': decisions['sigma'].to_numpy()[rows],
+            'confidence': decisions['confidence'].to_numpy()[rows],
+            'score': decisions['score'].to_numpy()[rows],
+            'stop_loss': np.zeros(rows.size),
+            'target': np.zeros(rows.size),
+            'entry_premium': np.zeros(rows.size),
+            'exit_bar': np.minimum(np.searchsorted(times_ns, expiry, side='left'), len(closes) - 1),
+            'exit_premium': np.zeros(rows.size),
+            'exit_reason': np.empty(rows.size, dtype=object)
+        }
+        
+        for strategy in np.unique(plan['strategy']):
+            group = np.flatnonzero(plan['strategy'] == strategy)
+            details = engine.selector._get_action_details(strategy, {'indicators': {}}, engine.capital)
+            plan['stop_loss'][group] = details['stop_loss']
+            plan['target'][group] = details['target']
+            plan['entry_premium'][group] = engine.structure_value(
+                strategy, plan['strike'][group], interval, plan['sigma'][group], spot[group],
+                pricing.years_to_expiry(expiry[group], times_ns[bars[group]])
+            )
+            self._scan_exits(plan, group, strategy, times_ns, closes, interval)
+        
+        return plan
+    
+    def _scan_exits(self, plan: Dict, group: np.ndarray, strategy: str, times_ns: np.ndarray,
+                    closes: np.ndarray, interval: float):
+        """
+        Reprice a strategy's trades on later closes until each one exits
+        
+        Applies monitor_positions' checks (stop-loss first, then target) on
+        growing chunks of bars, so trades stopped out early never price the
+        rest of their life. Trades that never hit either exit at the first
+        bar at or after expiry, or on the last bar.
+        """
+        engine = self.engine
+        entry = plan['entry_premium'][group]
+        expiry_bar = plan['exit_bar'][group]
+        expiry = plan['expiry'][group]
+        plan['exit_reason'][group] = np.where(times_ns[expiry_bar] >= expiry, 'EXPIRY', 'END_OF_DATA')
+        
+        pending = np.arange(group.size)
+        step, chunk = 1, 8
+        while pending.size:
+            last = expiry_bar[pending, None]
+            path = plan['bar'][group][pending, None] + np.arange(step, step + chunk)
+            valid = path <= last
+            path = np.minimum(path, last)
+            
+            premiums = engine.structure_value(
+                strategy, plan['strike'][group][pending, None], interval, plan['sigma'][group][pending, None],
+                closes[path], pricing.years_to_expiry(expiry[pending, None], times_ns[path])
+            )
+            pnl_pct = (premiums - entry[pending, None]) / entry[pending, None] * 100
+            stopped = pnl_pct <= -plan['stop_loss'][group][pending, None]
+            hit = (stopped | (pnl_pct >= plan['target'][group][pending, None])) & valid
+            
+            exited = hit.any(axis=1)
+            first = hit.argmax(axis=1)[exited]
+            done = group[pending[exited]]
+            plan['exit_bar'][done] = path[exited, first]
+            plan['exit_premium'][done] = premiums[exited, first]
+            plan['exit_reason'][done] = np.where(stopped[exited, first], 'STOP_LOSS', 'TARGET_HIT')
+            
+            # Reached expiry (or the data's end) without an exit: the clipped
+            # path's last premium is the one on the expiry bar
+            expired = ~exited & ~valid[:, -1]
+            plan['exit_premium'][group[pending[expired]]] = premiums[expired, -1]
+            
+            pending = pending[~exited & ~expired]
+            step, chunk = step + chunk, chunk * 4
+    
+    def _mark_to_market(self, trades: Dict, times_ns: np.ndarray, closes: np.ndarray,
+                        interval: float) -> np.ndarray:
+        """Open positions' unrealized P&L on every bar before their exit bar"""
+        engine = self.engine
+        unrealized = np.zeros(len(closes))
+        
+        for strategy in np.unique(trades['strategy']):
+            group = np.flatnonzero(trades['strategy'] == strategy)
+            lengths = trades['exit_bar'][group] - trades['bar'][group] - 1
+            owner = np.repeat(group, lengths)
+            starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+            bars = trades['bar'][owner] + 1 + (np.arange(owner.size) - starts)
+            
+            premiums = engine.structure_value(
+                strategy, trades['strike'][owner], interval, trades['sigma'][owner], closes[bars],
+                pricing.years_to_expiry(trades['expiry'][owner], times_ns[bars])
+            )
+            np.add.at(unrealized, bars, (premiums - trades['entry_premium'][owner]) * trades['quantity'][owner])
+        
+        return unrealized
+    
+    def _replay_result(self, decisions, trades, times, closes, interval, index, capital, offset) -> Dict:
+        """Trades ledger, equity, exposure and per-strategy statistics of a replay"""
+        times_ns = np.asarray(times, dtype='datetime64[ns]')
+        decisions['traded'] = False
+        decisions.iloc[trades['row'], decisions.columns.get_loc('traded')] = True
+        
+        quantity = trades['quantity']
+        cost = trades['entry_premium'] * quantity
+        pnl = (trades['exit_premium'] - trades['entry_premium']) * quantity
+        
+        realized = np.zeros(len(closes))
+        np.add.at(realized, trades['exit_bar'], pnl)
+        position_count = np.zeros(len(closes), dtype=np.int64)
+        np.add.at(position_count, trades['bar'], 1)
+        np.add.at(position_count, trades['exit_bar'], -1)
+        
+        equity = capital + np.cumsum(realized) + self._mark_to_market(trades, times_ns, closes, interval)
+        timeline = times[offset:]
+        equity_series = pd.Series(equity[offset:], index=timeline, name='Equity')
+        open_series = pd.Series(np.cumsum(position_count)[offset:], index=timeline, name='Open Positions')
+        
+        # Same fields as AITradingEngine.trade_history
+        ledger = TradeLedger()
+        ledger.extend({
+            'id': k + 1,
+            'timestamp': times[trades['bar'][k]].to_pydatetime(),
+            'index': index,
+            'strategy': trades['strategy'][k],
+            'underlying': trades['spot'][k],
+            'strike': trades['strike'][k],
+            'strike_interval': interval,
+            'expiry': pd.Timestamp(trades['expiry'][k]).to_pydatetime(),
+            'sigma': trades['sigma'][k],
+            'stop_loss': trades['stop_loss'][k],
+            'target': trades['target'][k],
+            'confidence': trades['confidence'][k],
+            'score': trades['score'][k],
+            'quantity': int(quantity[k]),
+            'entry_premium': trades['entry_premium'][k],
+            'current_premium': trades['exit_premium'][k],
+            'pnl': pnl[k],
+            'pnl_pct': pnl[k] / cost[k] * 100,
+            'status': 'CLOSED',
+            'exit_time': times[trades['exit_bar'][k]].to_pydatetime(),
+            'exit_reason': trades['exit_reason'][k],
+            'exit_bar': int(trades['exit_bar'][k])
+        } for k in range(len(quantity)))
+        
+        if len(ledger):
+            breakdown = ledger.to_frame().groupby('strategy', observed=True).agg(
+                trades=('pnl', 'size'),
+                win_rate=('pnl', lambda values: (values > 0).mean() * 100),
+                total_pnl=('pnl', 'sum'),
+                avg_pnl_pct=('pnl_pct', 'mean')
+            )
+        else:
+            breakdown = pd.DataFrame(columns=['trades', 'win_rate', 'total_pnl', 'avg_pnl_pct'])
+        
+        final_capital = float(equity[-1])
+        return {
+            'decisions': decisions,
+            'trades': ledger,
+            'equity': equity_series,
+            'open_positions': open_series,
+            'strategy_breakdown': breakdown,
+            'initial_capital': capital,
+            'final_capital': final_capital,
+            'return_percent': (final_capital / capital - 1) * 100,
+            'performance': performance_report(equity_series, pnl, capital,
+                                              in_market=open_series.to_numpy() > 0)
+        }
+    
+    def print_summary(self, result: Dict):
+        """Print replay summary"""
+        performance = result['performance']
+        decisions = result['decisions']
+        
+        print("\n" + "="*60)
+        print("🤖 AI Engine Replay Summary")
+        print("="*60)
+        print(f"Bars Analyzed:       {len(decisions):,} ({decisions.index[0]:%Y-%m-%d} to {decisions.index[-1]:%Y-%m-%d})")
+        print(f"Trade Signals:       {(decisions['strategy'] != 'WAIT').sum():,}")
+        print(f"Initial Capital:     ₹{result['initial_capital']:,.2f}")
+        print(f"Final Capital:       ₹{result['final_capital']:,.2f} ({result['return_percent']:.2f}%)")
+        print(f"Max Drawdown:        {performance['max_drawdown']:.2f}%")
+        print(f"Sharpe / Sortino:    {performance['sharpe_ratio']:.2f} / {performance['sortino_ratio']:.2f}")
+        print(f"\nTotal Trades:        {performance['total_trades']}")
+        print(f"Win Rate:            {performance['win_rate']:.2f}%")
+        print(f"Profit Factor:       {performance['profit_factor']:.2f}")
+        
+        if len(result['strategy_breakdown']):
+            print("\nBy Strategy:")
+            for strategy, row in result['strategy_breakdown'].iterrows():
+                print(f"   {strategy:<18} {int(row['trades']):>5} trades  "
+                      f"win {row['win_rate']:5.1f}%  P&L ₹{row['total_pnl']:>12,.2f}")
+        print("="*60 + "\n")
+
+
+# Test the replay
+if __name__ == "__main__":
+    print("🧪 Testing AI Engine Replay...\n")
+    
+    import time
+    
+    # Ten years of NIFTY-like daily bars (~15% annual volatility)
+    rng = np.random.default_rng(7)
+    n = 2500
+    close = 10000 * np.exp(np.cumsum(rng.normal(0.0004, 0.0095, n)))
+    open_ = np.concatenate([[10000], close[:-1]]) * (1 + rng.normal(0, 0.002, n))
+    data = pd.DataFrame({
+        'Date': pd.bdate_range('2015-01-01', periods=n),
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n))),
+        'Low': np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n))),
+        'Close': close,
+        'Volume': rng.lognormal(12, 0.4, n)
+    })
+    
+    replay = AIEngineReplay(AITradingEngine(capital=100000, max_positions=3))
+    start = time.perf_counter()
+    result = replay.run(data, 'NIFTY')
+    elapsed = time.perf_counter() - start
+    
+    decisions = result['decisions']
+    trades = result['trades'].to_frame()
+    engine = replay.engine
+    
+    # Per-bar decisions match the engine's own analysis of that window
+    for bar in (61, 500, 1234, n - 1):
+        window = data.iloc[bar - 61:bar + 1]
+        conditions = engine.analyzer.analyze_market(window)
+        expected = engine.selector.select_strategy(conditions, engine.capital)['strategy']
+        row = decisions.iloc[bar - 61]
+        assert (row['trend'], row['volatility'], row['strategy']) == (
+            conditions['trend'], conditions['volatility'], expected)
+        assert abs(row['confidence'] - conditions['confidence']) < 1e-12
+    
+    # Books balance and limits hold
+    assert abs(result['final_capital'] - (100000 + trades['pnl'].sum())) < 1e-6
+    assert result['open_positions'].max() <= 3
+    assert (trades['exit_time'] > trades['timestamp']).all()
+    assert set(trades['exit_reason']) <= {'STOP_LOSS', 'TARGET_HIT', 'EXPIRY', 'END_OF_DATA'}
+    
+    # Exit premiums are the engine's own repricing at the exit close
+    for trade in result['trades'][:20]:
+        exit_bar = trade['exit_bar']
+        premium = engine._price_position(trade, data['Close'].iloc[exit_bar], replay._bar_times(data)[exit_bar])
+        assert abs(premium - trade['current_premium']) < 1e-9
+    
+    # Equity marks every open position with the engine's own pricing
+    times = replay._bar_times(data)
+    for bar in (800, 1600, 2300):
+        marked = 100000 + trades.loc[trades['exit_bar'] <= bar, 'pnl'].sum()
+        for trade in result['trades']:
+            if trade['timestamp'] < times[bar] and trade['exit_bar'] > bar:
+                marked += (engine._price_position(trade, data['Close'].iloc[bar], times[bar])
+                           - trade['entry_premium']) * trade['quantity']
+        assert abs(result['equity'][times[bar]] - marked) < 1e-6
+    
+    print(f"✅ Replayed {len(decisions):,} daily decisions and {len(trades)} trades in {elapsed * 1000:.0f} ms")
+    replay.print_summary(result)
+    
+    print("✅ AI engine replay tests passed!")
@@ -0,0 +1,157 @@
+"""
+Transaction Cost Models
+Brokerage and statutory charges applied to every simulated fill
+"""
+from typing import Dict
+
+
+class CostModel:
+    """
+    Base cost model - no charges
+    
+    Subclasses override breakdown(); charges() sums it.
+    """
+    
+    name = "Zero Costs"
+    
+    def breakdown(self, side: str, price: float, quantity: int) -> Dict[str, float]:
+        """
+        Itemised charges for one fill
+        
+        Args:
+            side: 'BUY' or 'SELL'
+            price: Fill price
+            quantity: Number of shares
+        
+        Returns:
+            Dictionary of charge name -> amount in ₹
+        """
+        return {}
+    
+    def charges(self, side: str, price: float, quantity: int) -> float:
+        """
+        Total charges for one fill
+        
+        Args:
+            side: 'BUY' or 'SELL'
+            price: Fill price
+            quantity: Number of shares
+        
+        Returns:
+            Total charges in ₹
+        """
+        return sum(self.breakdown(side, price, quantity).values())
+
+
+class IndianEquityCosts(CostModel):
+    """
+    NSE cash-segment charges for a discount broker
+    
+    Charges per fill:
+    - Brokerage: percent of turnover, capped per order (0 for delivery)
+    - STT: both sides for delivery, sell side only for intraday
+    - Exchange transaction charges and SEBI turnover fee
+    - Stamp duty: buy side only
+    - GST: 18% on brokerage + exchange charges + SEBI fee
+    """
+    
+    # Rates as fractions of turnover
+    RATES = {
+        'delivery': {
+            'brokerage': 0.0,
+            'stt_buy': 0.001,
+            'stt_sell': 0.001,
+            'stamp_duty': 0.00015
+        },
+        'intraday': {
+            'brokerage': 0.0003,
+            'stt_buy': 0.0,
+            'stt_sell': 0.00025,
+            'stamp_duty': 0.00003
+        }
+    }
+    
+    EXCHANGE_CHARGES = {'NSE': 0.0000297, 'BSE': 0.0000375}
+    SEBI_FEE = 0.000001  # ₹10 per crore
+    GST = 0.18
+    
+    def __init__(self, segment: str = 'delivery', exchange: str = 'NSE',
+                 brokerage_percent: float = None, brokerage_cap: float = 20.0):
+        """
+        Initialize cost model
+        
+        Args:
+            segment: 'delivery' or 'intraday'
+            exchange: 'NSE' or 'BSE'
+            brokerage_percent: Override brokerage as percent of turnover
+                               (0.03 = 0.03%); None uses the segment default
+            brokerage_cap: Maximum brokerage per order in ₹
+        """
+        if segment not in self.RATES:
+            raise ValueError(f"Unknown segment '{segment}' (use 'delivery' or 'intraday')")
+        if exchange not in self.EXCHANGE_CHARGES:
+            raise ValueError(f"Unknown exchange '{exchange}' (use 'NSE' or 'BSE')")
+        
+        self.segment = segment
+        self.exchange = exchange
+        self.rates = dict(self.RATES[segment])
+        if brokerage_percent is not None:
+            self.rates['brokerage'] = brokerage_percent / 100
+        self.brokerage_cap = brokerage_cap
+        self.name = f"Indian Equity ({segment}, {exchange})"
+    
+    def breakdown(self, side: str, price: float, quantity: int) -> Dict[str, float]:
+        """
+        Itemised charges for one fill
+        
+        Args:
+            side: 'BUY' or 'SELL'
+            price: Fill price
+            quantity: Number of shares
+        
+        Returns:
+            Dictionary with brokerage, stt, exchange, sebi, stamp_duty and gst
+        """
+        turnover = price * quantity
+        rates = self.rates
+        buy = side == 'BUY'
+        
+        brokerage = min(turnover * rates['brokerage'], self.brokerage_cap)
+        stt = turnover * (rates['stt_buy'] if buy else rates['stt_sell'])
+        exchange = turnover * self.EXCHANGE_CHARGES[self.exchange]
+        sebi = turnover * self.SEBI_FEE
+        stamp_duty = turnover * rates['stamp_duty'] if buy else 0.0
+        gst = (brokerage + exchange + sebi) * self.GST
+        
+        return {
+            'brokerage': brokerage,
+            'stt': stt,
+            'exchange': exchange,
+            'sebi': sebi,
+            'stamp_duty': stamp_duty,
+            'gst': gst
+        }
+
+
+# Test the cost models
+if __name__ == "__main__":
+    print("🧪 Testing Cost Models...\n")
+    
+    delivery = IndianEquityCosts('delivery')
+    intraday = IndianEquityCosts('intraday')
+    
+    # ₹1,00,000 turnover each way
+    for model in (CostModel(), delivery, intraday):
+        buy = model.charges('BUY', 1000.0, 100)
+        sell = model.charges('SELL', 1000.0, 100)
+        print(f"{model.name:35s} buy ₹{buy:8.2f}  sell ₹{sell:8.2f}  round trip ₹{buy + sell:8.2f}")
+    
+    # Delivery: STT 0.1% both sides dominates
+    assert abs(delivery.breakdown('BUY', 1000.0, 100)['stt'] - 100.0) < 1e-9
+    assert delivery.breakdown('SELL', 1000.0, 100)['stamp_duty'] == 0.0
+    
+    # Intraday brokerage is capped at ₹20 per order
+    assert intraday.breakdown('BUY', 1000.0, 1000)['brokerage'] == 20.0
+    assert intraday.breakdown('BUY', 1000.0, 100)['stt'] == 0.0
+    
+    print("\n✅ Cost model tests passed!")
@@ -0,0 +1,570 @@
+"""
+Event-Driven Backtest Engine
+Drives any BaseStrategy through should_enter/should_exit bar by bar with
+next-bar-open fills, slippage, transaction costs and stop-loss/target orders
+
+Strategies see a lightweight window over the prepared columns instead of a
+fresh DataFrame slice per bar, so the loop costs microseconds per bar.
+"""
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.costs import CostModel, IndianEquityCosts
+
+# Event types on the queue
+MARKET, FILL, CHECK_ORDERS, SIGNAL = range(4)
+
+
+# ========================================
+# BAR WINDOW (what the strategy sees)
+# ========================================
+
+class BarRow:
+    """
+    One bar of prepared data - supports row['Close'], row.get() and row.Close
+    like the pandas Series returned by DataFrame.iloc[i]
+    """
+    
+    __slots__ = ('_columns', '_i')
+    
+    def __init__(self, columns: Dict[str, np.ndarray], i: int):
+        self._columns = columns
+        self._i = i
+    
+    def __getitem__(self, name):
+        return self._columns[name][self._i]
+    
+    def __getattr__(self, name):
+        try:
+            return self._columns[name][self._i]
+        except KeyError:
+            raise AttributeError(name) from None
+    
+    def __contains__(self, name):
+        return name in self._columns
+    
+    def get(self, name, default=None):
+        column = self._columns.get(name)
+        return default if column is None else column[self._i]
+    
+    def to_dict(self) -> Dict:
+        return {name: column[self._i] for name, column in self._columns.items()}
+
+
+class _ColumnIndexer:
+    """Positional indexer shared by BarWindow.iloc and ColumnWindow.iloc"""
+    
+    __slots__ = ('_owner',)
+    
+    def __init__(self, owner):
+        self._owner = owner
+    
+    def __getitem__(self, key):
+        return self._owner._iloc(key)
+
+
+class ColumnWindow:
+    """One prepared column up to the current bar (Series-like)"""
+    
+    __slots__ = ('_values', '_length', 'name')
+    
+    def __init__(self, values: np.ndarray, length: int, name: str):
+        self._values = values
+        self._length = length
+        self.name = name
+    
+    def __len__(self):
+        return self._length
+    
+    @property
+    def iloc(self):
+        return _ColumnIndexer(self)
+    
+    def _iloc(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self._length
+            if not 0 <= key < self._length:
+                raise IndexError("single positional indexer is out-of-bounds")
+            return self._values[key]
+        return self.to_numpy()[key]
+    
+    def to_numpy(self, dtype=None) -> np.ndarray:
+        values = self._values[:self._length]
+        return values if dtype is None else values.astype(dtype, copy=False)
+    
+    @property
+    def values(self) -> np.ndarray:
+        return self.to_numpy()
+
+
+class BarWindow:
+    """
+    Prepared data up to (and including) the current bar
+    
+    Covers what strategies read from the per-bar slice data.iloc[:i+1]:
+    len(), .iloc[-1], ['col'].iloc[-1] and .empty. Anything else falls back
+    to a real DataFrame slice, built only when asked for.
+    """
+    
+    def __init__(self, frame: pd.DataFrame, columns: Dict[str, np.ndarray]):
+        """
+        Initialize window
+        
+        Args:
+            frame: Prepared DataFrame (used only for the fallback)
+            columns: Column name -> NumPy array of the same frame
+        """
+        self._frame = frame
+        self._columns = columns
+        self._length = 0
+    
+    def _advance(self, i: int):
+        """Move the window end to bar i"""
+        self._length = i + 1
+    
+    def __len__(self):
+        return self._length
+    
+    @property
+    def empty(self) -> bool:
+        return self._length == 0
+    
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+    
+    @property
+    def iloc(self):
+        return _ColumnIndexer(self)
+    
+    def _iloc(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self._length
+            if not 0 <= key < self._length:
+                raise IndexError("single positional indexer is out-of-bounds")
+            return BarRow(self._columns, key)
+        return self.to_frame().iloc[key]
+    
+    def __getitem__(self, name):
+        if isinstance(name, str):
+            return ColumnWindow(self._columns[name], self._length, name)
+        return self.to_frame()[name]
+    
+    def __contains__(self, name):
+        return name in self._columns
+    
+    def to_frame(self) -> pd.DataFrame:
+        """The equivalent DataFrame slice (slow path)"""
+        return self._frame.iloc[:self._length]
+    
+    def __getattr__(self, name):
+        # Only reached for attributes not defined above
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.to_frame(), name)
+
+
+# ========================================
+# ENGINE
+# ========================================
+
+class BacktestEngine:
+    """
+    Event-driven single-symbol backtester
+    
+    Each bar goes through the event queue as:
+    MARKET (bar opens) -> FILL for orders placed on the previous bar, at
+    this bar's open +/- slippage -> CHECK_ORDERS (stop-loss/target against
+    the bar's low/high) -> SIGNAL at the close, where should_enter or
+    should_exit may place a market order for the next bar.
+    """
+    
+    def __init__(self, strategy, capital: Optional[float] = None,
+                 cost_model: Optional[CostModel] = None, slippage_bps: float = 5.0,
+                 stop_loss_percent: Optional[float] = 2.0,
+                 target_percent: Optional[float] = 5.0,
+                 risk_percent: float = 0.1):
+        """
+        Initialize engine
+        
+        Args:
+            strategy: Any BaseStrategy subclass instance
+            capital: Starting capital (default: strategy.current_capital)
+            cost_model: Transaction costs (default: IndianEquityCosts('delivery'))
+            slippage_bps: Adverse slippage on market and stop fills, in basis points
+            stop_loss_percent: Stop below the entry fill, in percent (None = no stop)
+            target_percent: Target above the entry fill, in percent (None = no target)
+            risk_percent: Fraction of capital passed to calculate_position_size
+        """
+        self.strategy = strategy
+        self.capital = capital
+        self.cost_model = cost_model if cost_model is not None else IndianEquityCosts('delivery')
+        self.slippage = slippage_bps / 10000
+        self.stop_loss_percent = stop_loss_percent
+        self.target_percent = target_percent
+        self.risk_percent = risk_percent
+    
+    # ========================================
+    # ORDERS AND FILLS
+    # ========================================
+    
+    def _buy_price(self, price: float) -> float:
+        return price * (1 + self.slippage)
+    
+    def _sell_price(self, price: float) -> float:
+        return price * (1 - self.slippage)
+    
+    def _size_order(self, price: float, cash: float) -> int:
+        """Position size from the strategy's own sizing rule"""
+        self.strategy.current_capital = cash
+        return self.strategy.calculate_position_size(price, self.risk_percent)
+    
+    def _affordable(self, price: float, quantity: int, cash: float):
+        """Shrink quantity until price * quantity + charges fits in cash"""
+        while quantity > 0:
+            charges = self.cost_model.charges('BUY', price, quantity)
+            total = price * quantity + charges
+            if total <= cash:
+                return quantity, charges
+            quantity -= 1
+        return 0, 0.0
+    
+    def _open_position(self, symbol: str, price: float, quantity: int,
+                       charges: float, bar: int, date) -> Dict:
+        """Position for a filled buy, with stop-loss/target set from the fill"""
+        return {
+            'symbol': symbol,
+            'entry_price': price,
+            'quantity': quantity,
+            'entry_date': date,
+            'entry_bar': bar,
+            'cost': price * quantity + charges,
+            'entry_charges': charges,
+            'signal': 'BUY',
+            'stop_loss': price * (1 - self.stop_loss_percent / 100)
+                         if self.stop_loss_percent is not None else None,
+            'target': price * (1 + self.target_percent / 100)
+                      if self.target_percent is not None else None
+        }
+    
+    def _close_position(self, position: Dict, price: float, bar: int, date, reason: str) -> Dict:
+        """Trade record for a filled sell (cash returned = cost + profit)"""
+        quantity = position['quantity']
+        charges = self.cost_model.charges('SELL', price, quantity)
+        profit = price * quantity - charges - position['cost']
+        
+        return {
+            'symbol': position['symbol'],
+            'entry_price': position['entry_price'],
+            'exit_price': price,
+            'quantity': quantity,
+            'entry_date': position['entry_date'],
+            'exit_date': date,
+            'entry_bar': position['entry_bar'],
+            'exit_bar': bar,
+            'profit': profit,
+            'profit_percent': (profit / position['cost']) * 100,
+            'charges': position['entry_charges'] + charges,
+            'exit_reason': reason,
+            'signal': position['signal']
+        }
+    
+    def _exit_order(self, position: Dict, open_price: float, high: float, low: float):
+        """
+        Stop-loss/target check for one bar
+        
+        Gaps through a level fill at the open; the stop wins when one bar
+        touches both.
+        
+        Returns:
+            (fill price, reason) or None
+        """
+        stop = position['stop_loss']
+        target = position['target']
+        
+        if stop is not None and low <= stop:
+            return self._sell_price(min(open_price, stop)), 'STOP_LOSS'
+        if target is not None and high >= target:
+            return max(open_price, target), 'TARGET'
+        return None
+    
+    @staticmethod
+    def _bar_arrays(frame: pd.DataFrame):
+        """Column arrays, float OHLC and bar dates of a prepared frame"""
+        columns = {name: frame[name].to_numpy() for name in frame.columns if isinstance(name, str)}
+        ohlc = [columns[name].astype(np.float64, copy=False) for name in ('Open', 'High', 'Low', 'Close')]
+        dates = frame['Date'] if 'Date' in frame.columns else frame.index
+        return columns, ohlc, pd.DatetimeIndex(dates)
+    
+    # ========================================
+    # SIMULATION
+    # ========================================
+    
+    def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add the strategy's indicator columns
+        
+        Args:
+            data: Raw OHLCV data
+        
+        Returns:
+            Prepared DataFrame (data itself if the strategy has no prepare_data)
+        """
+        prepare_data = getattr(self.strategy, 'prepare_data', None)
+        return prepare_data(data) if prepare_data is not None else data
+    
+    def simulate(self, symbol: str, data: pd.DataFrame, prepared: bool = False,
+                 start: int = 0) -> Dict:
+        """
+        Run the event loop over one symbol's bars
+        
+        Trades are appended to strategy.trades and strategy.current_capital
+        is left at the final cash, so print_performance() and
+        save_trades_to_csv() work as after the strategy's own backtest.
+        
+        Args:
+            symbol: Stock symbol
+            data: OHLCV data (with Date column or DatetimeIndex)
+            prepared: data already went through strategy.prepare_data
+            start: First bar on which signals are evaluated - earlier bars
+                   only warm up the window the strategy sees
+        
+        Returns:
+            Dictionary with trades, equity (Series, from start), final_capital,
+            total_charges and bars
+        """
+        frame = data if prepared else self.prepare(data)
+        n = len(frame)
+        
+        columns, (open_, high, low, close), dates = self._bar_arrays(frame)
+        
+        window = BarWindow(frame, columns)
+        strategy = self.strategy
+        should_enter = strategy.should_enter
+        should_exit = strategy.should_exit
+        
+        cash = float(self.capital if self.capital is not None else strategy.current_capital)
+        initial_capital = cash
+        position = None
+        pending = None  # (side, quantity) market order for the next open
+        trades: List[Dict] = []
+        
+        # (bar, cash, quantity) after every fill - equity is rebuilt from these
+        state_bars = [-1]
+        state_cash = [cash]
+        state_qty = [0]
+        
+        events = deque()
+        
+        for i in range(n):
+            events.append((MARKET, i, None))
+            
+            while events:
+                kind, bar, payload = events.popleft()
+                
+                if kind == MARKET:
+                    if pending is not None:
+                        side, quantity = pending
+                        pending = None
+                        price = self._buy_price(open_[bar]) if side == 'BUY' else self._sell_price(open_[bar])
+                        events.append((FILL, bar, (side, price, quantity, 'SIGNAL')))
+                    events.append((CHECK_ORDERS, bar, None))
+                
+                elif kind == FILL:
+                    side, price, quantity, reason = payload
+                    
+                    if side == 'BUY':
+                        quantity, charges = self._affordable(price, quantity, cash)
+                        if quantity == 0:
+                            continue
+                        position = self._open_position(symbol, price, quantity, charges, bar, dates[bar])
+                        cash -= position['cost']
+                    elif position is not None:
+                        trade = self._close_position(position, price, bar, dates[bar], reason)
+                        cash += position['cost'] + trade['profit']
+                        trades.append(trade)
+                        position = None
+                    else:
+                        continue
+                    
+                    state_bars.append(bar)
+                    state_cash.append(cash)
+                    state_qty.append(position['quantity'] if position is not None else 0)
+                
+                elif kind == CHECK_ORDERS:
+                    if position is not None:
+                        order = self._exit_order(position, open_[bar], high[bar], low[bar])
+                        if order is not None:
+                            events.append((FILL, bar, ('SELL', order[0], 0, order[1])))
+                    events.append((SIGNAL, bar, None))
+                
+                elif kind == SIGNAL:
+                    if bar == n - 1 or bar < start:
+                        continue
+                    window._advance(bar)
+                    
+                    if position is None:
+                        if should_enter(window):
+                            quantity = self._size_order(close[bar], cash)
+                            pending = ('BUY', quantity)
+                    elif should_exit(window, position):
+                        pending = ('SELL', position['quantity'])
+        
+        # Close any open position at the final close
+        if position is not None:
+            trade = self._close_position(position, close[n - 1], n - 1, dates[n - 1], 'END')
+            cash += position['cost'] + trade['profit']
+            trades.append(trade)
+            state_bars.append(n - 1)
+            state_cash.append(cash)
+            state_qty.append(0)
+        
+        # Mark to market at every close from the fill history
+        idx = np.searchsorted(np.array(state_bars), np.arange(n), side='right') - 1
+        equity = np.array(state_cash)[idx] + np.array(state_qty)[idx] * close
+        
+        strategy.trades.extend(trades)
+        strategy.current_capital = cash
+        
+        return {
+            'symbol': symbol,
+            'trades': trades,
+            'equity': pd.Series(equity[start:], index=dates[start:], name='Equity'),
+            'initial_capital': initial_capital,
+            'final_capital': cash,
+            'total_charges': sum(trade['charges'] for trade in trades),
+            'bars': n - start
+        }
+    
+    def run(self, symbol: str, from_date: str, to_date: str) -> Optional[Dict]:
+        """
+        Fetch data, prepare indicators and run the event-driven backtest
+        
+        Args:
+            symbol: Stock symbol
+            from_date: Start date
+            to_date: End date
+        
+        Returns:
+            Result dictionary from simulate() (None if no data)
+        """
+        print(f"\n🎯 Event-driven backtest of {self.strategy.name} on {symbol}")
+        print(f"   Period: {from_date} to {to_date}")
+        print(f"   Costs: {self.cost_model.name}, slippage {self.slippage * 10000:.1f} bps")
+        
+        data = self.strategy.data_fetcher.get_historical_data(symbol, from_date, to_date)
+        
+        if data.empty:
+            print("❌ No data available for backtesting")
+            return None
+        
+        result = self.simulate(symbol, data)
+        self.strategy.print_performance()
+        print(f"Total Charges:       ₹{result['total_charges']:,.2f}")
+        return result
+
+
+# Check the engine against a per-bar DataFrame loop with the same rules
+if __name__ == "__main__":
+    print("🧪 Testing Event-Driven Backtest Engine...\n")
+    
+    import contextlib
+    import io
+    import time
+    from benchmarks.synthetic import SyntheticFetcher, generate_ohlcv
+    from strategies.ma_crossover import MACrossoverStrategy
+    from strategies.rsi_strategy import RSIStrategy
+    
+    def reference_loop(strategy, data, costs, slippage, stop_pct, target_pct):
+        """Same rules, written the slow way with data.iloc[:i+1]"""
+        data = strategy.prepare_data(data)
+        cash = strategy.current_capital
+        position, pending, trades = None, None, []
+        n = len(data)
+        for i in range(n):
+            bar = data.iloc[i]
+            if pending is not None:
+                side, quantity = pending
+                pending = None
+                if side == 'BUY':
+                    price = bar['Open'] * (1 + slippage)
+                    charges = costs.charges('BUY', price, quantity)
+                    while price * quantity + charges > cash and quantity > 0:
+                        quantity -= 1
+                        charges = costs.charges('BUY', price, quantity)
+                    if quantity:
+                        cash -= price * quantity + charges
+                        position = (price, quantity, price * quantity + charges)
+                else:
+                    price = bar['Open'] * (1 - slippage)
+                    cash += price * position[1] - costs.charges('SELL', price, position[1])
+                    trades.append((position[0], price, 'SIGNAL'))
+                    position = None
+            if position is not None:
+                stop = position[0] * (1 - stop_pct / 100)
+                target = position[0] * (1 + target_pct / 100)
+                if bar['Low'] <= stop:
+                    price = min(bar['Open'], stop) * (1 - slippage)
+                    reason = 'STOP_LOSS'
+                elif bar['High'] >= target:
+                    price, reason = max(bar['Open'], target), 'TARGET'
+                else:
+                    price = None
+                if price is not None:
+                    cash += price * position[1] - costs.charges('SELL', price, position[1])
+                    trades.append((position[0], price, reason))
+                    position = None
+            if i == n - 1:
+                break
+            current = data.iloc[:i + 1]
+            strategy.current_capital = cash
+            if position is None:
+                if strategy.should_enter(current):
+                    pending = ('BUY', strategy.calculate_position_size(bar['Close']))
+            elif strategy.should_exit(current, {'entry_price': position[0], 'quantity': position[1]}):
+                pending = ('SELL', position[1])
+        if position is not None:
+            price = data['Close'].iloc[-1]
+            cash += price * position[1] - costs.charges('SELL', price, position[1])
+            trades.append((position[0], price, 'END'))
+        return trades, cash
+    
+    data = generate_ohlcv(3000, seed=11, freq='D')
+    fetcher = SyntheticFetcher(data)
+    costs = IndianEquityCosts('delivery')
+    
+    for strategy_class in (MACrossoverStrategy, RSIStrategy):
+        with contextlib.redirect_stdout(io.StringIO()):
+            fast = strategy_class(fetcher)
+            result = BacktestEngine(fast, cost_model=costs).simulate('TEST', data)
+            slow = strategy_class(fetcher)
+            expected_trades, expected_cash = reference_loop(slow, data, costs, 0.0005, 2.0, 5.0)
+        
+        got = [(t['entry_price'], t['exit_price'], t['exit_reason']) for t in result['trades']]
+        assert got == expected_trades, f"{fast.name}: trades differ"
+        assert abs(result['final_capital'] - expected_cash) < 1e-6
+        assert abs(result['equity'].iloc[-1] - result['final_capital']) < 1e-6
+        assert fast.current_capital == result['final_capital']
+        
+        reasons = pd.Series([t['exit_reason'] for t in result['trades']]).value_counts().to_dict()
+        print(f"✅ {fast.name}: {len(got)} trades {reasons}, "
+              f"charges ₹{result['total_charges']:,.2f}, final ₹{result['final_capital']:,.2f}")
+    
+    # Throughput on a long intraday series
+    big = generate_ohlcv(1_000_000, seed=3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        strategy = RSIStrategy(SyntheticFetcher(big))
+        engine = BacktestEngine(strategy)
+        prepared = engine.prepare(big)
+    start = time.perf_counter()
+    result = engine.simulate('BIG', prepared, prepared=True)
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ {len(big):,} bars in {elapsed:.2f}s "
+          f"({len(big) / elapsed * 60 / 1e6:.1f}M bars/minute, {len(result['trades'])} trades)")
+    
+    print("\n✅ Event-driven engine tests passed!")
@@ -0,0 +1,324 @@
+"""
+Monte Carlo Risk Analysis
+Resamples a backtest's trade returns (or bar returns) thousands of times to
+turn single point estimates into distributions of final capital, maximum
+drawdown and risk of ruin
+
+All simulations in a batch are one (simulations x steps) NumPy array -
+there is no Python loop per simulation.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.trade_ledger import TradeLedger
+
+# Cap on array elements per batch (~40 MB of float64)
+MAX_BATCH_ELEMENTS = 5_000_000
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def trade_returns(trades: List[Dict], capital: float) -> np.ndarray:
+    """
+    Each trade's profit as a fraction of the equity it was taken with
+    
+    Trades are ordered by exit date and compounded on the running equity,
+    so the returns reproduce the backtest's final capital when chained.
+    
+    Args:
+        trades: TradeLedger or trade dictionaries (need 'profit',
+                optionally 'exit_date')
+        capital: Starting capital
+    
+    Returns:
+        Array of per-trade returns
+    """
+    if not trades:
+        return np.empty(0)
+    
+    frame = trades.to_frame() if isinstance(trades, TradeLedger) else pd.DataFrame(trades)
+    if 'exit_date' in frame.columns:
+        frame = frame.sort_values('exit_date', kind='stable')
+    
+    profits = frame['profit'].to_numpy(dtype=np.float64)
+    equity_before = capital + np.concatenate(([0.0], np.cumsum(profits)[:-1]))
+    return profits / equity_before
+
+
+def bar_returns(equity: pd.Series) -> np.ndarray:
+    """
+    Bar-to-bar returns of an equity curve
+    
+    Args:
+        equity: Equity Series (e.g. BacktestEngine result['equity'])
+    
+    Returns:
+        Array of returns without the leading NaN
+    """
+    values = np.asarray(equity, dtype=np.float64)
+    return values[1:] / values[:-1] - 1
+
+
+class MonteCarloSimulator:
+    """
+    Vectorized Monte Carlo resampling of backtest results
+    
+    Methods:
+    - bootstrap: draw trade returns with replacement (final capital and
+      drawdown both vary)
+    - reshuffle: permute the trade order (final capital is fixed, only the
+      path - and so the drawdown - changes)
+    - block_bootstrap: resample blocks of bar returns, keeping short-term
+      autocorrelation such as volatility clusters
+    
+    Usage:
+        simulator = MonteCarloSimulator(n_simulations=20000, seed=7)
+        result = simulator.bootstrap(trade_returns(strategy.trades, 100000), 100000)
+    """
+    
+    def __init__(self, n_simulations: int = 10000, ruin_percent: float = 50.0,
+                 seed: Optional[int] = None):
+        """
+        Initialize simulator
+        
+        Args:
+            n_simulations: Number of simulated paths
+            ruin_percent: Drawdown from the starting capital that counts as
+                          ruin (50 = equity falls to half the capital)
+            seed: Random seed (same seed -> same distributions)
+        """
+        self.n_simulations = n_simulations
+        self.ruin_percent = ruin_percent
+        self.rng = np.random.default_rng(seed)
+    
+    # ========================================
+    # PATH STATISTICS
+    # ========================================
+    
+    def _batches(self, steps: int):
+        """Simulation counts per batch so each batch stays under MAX_BATCH_ELEMENTS"""
+        size = max(1, min(self.n_simulations, MAX_BATCH_ELEMENTS // max(steps, 1)))
+        remaining = self.n_simulations
+        while remaining > 0:
+            yield min(size, remaining)
+            remaining -= size
+    
+    @staticmethod
+    def _path_stats(returns: np.ndarray, capital: float):
+        """
+        Final capital, max drawdown and minimum equity of every path
+        
+        Args:
+            returns: (simulations x steps) return matrix
+        
+        Returns:
+            Tuple of (final capital, max drawdown %, minimum equity) arrays
+        """
+        equity = np.cumprod(1 + returns, axis=1)
+        equity *= capital
+        peaks = np.maximum.accumulate(equity, axis=1)
+        np.maximum(peaks, capital, out=peaks)
+        drawdown = (1 - equity / peaks).max(axis=1) * 100
+        return equity[:, -1], drawdown, np.minimum(equity.min(axis=1), capital)
+    
+    def _simulate(self, sampler, steps: int, capital: float, method: str) -> Dict:
+        """Run the sampler in batches and summarize all paths"""
+        finals, drawdowns, lows = [], [], []
+        
+        for size in self._batches(steps):
+            final, drawdown, low = self._path_stats(sampler(size), capital)
+            finals.append(final)
+            drawdowns.append(drawdown)
+            lows.append(low)
+        
+        final_capital = np.concatenate(finals)
+        max_drawdown = np.concatenate(drawdowns)
+        min_equity = np.concatenate(lows)
+        
+        ruin_level = capital * (1 - self.ruin_percent / 100)
+        returns = (final_capital / capital - 1) * 100
+        
+        percentiles = pd.DataFrame({
+            'final_capital': np.percentile(final_capital, PERCENTILES),
+            'return_percent': np.percentile(returns, PERCENTILES),
+            'max_drawdown': np.percentile(max_drawdown, PERCENTILES)
+        }, index=pd.Index(PERCENTILES, name='percentile'))
+        
+        return {
+            'method': method,
+            'simulations': self.n_simulations,
+            'steps': steps,
+            'initial_capital': capital,
+            'final_capital': final_capital,
+            'max_drawdown': max_drawdown,
+            'percentiles': percentiles,
+            'mean_final_capital': float(final_capital.mean()),
+            'probability_of_loss': float((final_capital < capital).mean() * 100),
+            'risk_of_ruin': float((min_equity <= ruin_level).mean() * 100)
+        }
+    
+    # ========================================
+    # RESAMPLING METHODS
+    # ========================================
+    
+    def bootstrap(self, returns: np.ndarray, capital: float, n_trades: Optional[int] = None) -> Dict:
+        """
+        Resample trade returns with replacement
+        
+        Args:
+            returns: Per-trade returns (see trade_returns)
+            capital: Starting capital
+            n_trades: Trades per simulated path (default: len(returns))
+        
+        Returns:
+            Result dictionary (distributions, percentiles, risk of ruin)
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size == 0:
+            raise ValueError("No trades to resample")
+        steps = n_trades or returns.size
+        
+        return self._simulate(
+            lambda size: returns[self.rng.integers(0, returns.size, (size, steps))],
+            steps, capital, 'bootstrap'
+        )
+    
+    def reshuffle(self, returns: np.ndarray, capital: float) -> Dict:
+        """
+        Random permutations of the trade sequence
+        
+        Args:
+            returns: Per-trade returns (see trade_returns)
+            capital: Starting capital
+        
+        Returns:
+            Result dictionary (distributions, percentiles, risk of ruin)
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size == 0:
+            raise ValueError("No trades to resample")
+        
+        return self._simulate(
+            lambda size: self.rng.permuted(np.broadcast_to(returns, (size, returns.size)), axis=1),
+            returns.size, capital, 'reshuffle'
+        )
+    
+    def block_bootstrap(self, returns: np.ndarray, capital: float, block_size: int = 20,
+                        n_bars: Optional[int] = None) -> Dict:
+        """
+        Resample blocks of consecutive bar returns with replacement
+        
+        Args:
+            returns: Bar returns (see bar_returns)
+            capital: Starting capital
+            block_size: Bars per block
+            n_bars: Bars per simulated path (default: len(returns))
+        
+        Returns:
+            Result dictionary (distributions, percentiles, risk of ruin)
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        returns = returns[np.isfinite(returns)]
+        if returns.size == 0:
+            raise ValueError("No bar returns to resample")
+        
+        block_size = max(1, min(block_size, returns.size))
+        steps = n_bars or returns.size
+        n_blocks = -(-steps // block_size)
+        offsets = np.arange(block_size)
+        
+        def sampler(size):
+            starts = self.rng.integers(0, returns.size - block_size + 1, (size, n_blocks, 1))
+            return returns[(starts + offsets).reshape(size, -1)[:, :steps]]
+        
+        return self._simulate(sampler, steps, capital, f'block bootstrap ({block_size} bars)')
+    
+    def analyze_trades(self, trades: List[Dict], capital: float) -> Dict[str, Dict]:
+        """
+        Bootstrap and reshuffle a trade list
+        
+        Args:
+            trades: Trade dictionaries (strategy.trades or an engine result)
+            capital: Starting capital of the backtest
+        
+        Returns:
+            Dictionary of method name -> result dictionary
+        """
+        returns = trade_returns(trades, capital)
+        return {
+            'bootstrap': self.bootstrap(returns, capital),
+            'reshuffle': self.reshuffle(returns, capital)
+        }
+    
+    @staticmethod
+    def print_summary(result: Dict):
+        """Print one method's distribution summary"""
+        table = result['percentiles'].copy()
+        table['final_capital'] = table['final_capital'].map(lambda x: f"₹{x:,.0f}")
+        table['return_percent'] = table['return_percent'].map(lambda x: f"{x:.2f}%")
+        table['max_drawdown'] = table['max_drawdown'].map(lambda x: f"{x:.2f}%")
+        
+        print("\n" + "="*60)
+        print(f"🎲 Monte Carlo - {result['method']} "
+              f"({result['simulations']:,} paths x {result['steps']:,} steps)")
+        print("="*60)
+        print(table.to_string())
+        print(f"\nMean Final Capital:  ₹{result['mean_final_capital']:,.2f}")
+        print(f"Probability of Loss: {result['probability_of_loss']:.2f}%")
+        print(f"Risk of Ruin:        {result['risk_of_ruin']:.2f}%")
+        print("="*60 + "\n")
+
+
+# Test the Monte Carlo engine
+if __name__ == "__main__":
+    print("🧪 Testing Monte Carlo Simulator...\n")
+    
+    import time
+    
+    rng = np.random.default_rng(1)
+    capital = 100000.0
+    
+    # 200 trades: 55% winners of +3%, losers of -2.5% on the equity used
+    returns = np.where(rng.random(200) < 0.55, 0.03, -0.025)
+    profits = []
+    equity = capital
+    for r in returns:
+        profits.append(equity * r)
+        equity += equity * r
+    trades = [{'profit': p, 'exit_date': pd.Timestamp('2020-01-01') + pd.Timedelta(days=k)}
+              for k, p in enumerate(profits)]
+    
+    # Per-trade returns compound back to the backtest's final capital
+    recovered = trade_returns(trades, capital)
+    assert np.allclose(recovered, returns)
+    
+    simulator = MonteCarloSimulator(n_simulations=50000, seed=42)
+    
+    start = time.perf_counter()
+    results = simulator.analyze_trades(trades, capital)
+    elapsed = time.perf_counter() - start
+    
+    # Reshuffling never changes the final capital
+    assert np.allclose(results['reshuffle']['final_capital'], equity)
+    assert results['bootstrap']['final_capital'].std() > 0
+    
+    for result in results.values():
+        MonteCarloSimulator.print_summary(result)
+    print(f"⏱️  2 x 50,000 trade paths in {elapsed:.2f}s")
+    
+    # Block bootstrap of 10 years of daily bar returns
+    bars = pd.Series(capital * np.cumprod(1 + rng.normal(0.0003, 0.01, 2500)))
+    start = time.perf_counter()
+    block = MonteCarloSimulator(n_simulations=20000, seed=3).block_bootstrap(bar_returns(bars), capital)
+    elapsed = time.perf_counter() - start
+    assert len(block['final_capital']) == 20000
+    MonteCarloSimulator.print_summary(block)
+    print(f"⏱️  20,000 x 2,500-bar block bootstrap in {elapsed:.2f}s")
+    
+    # Same seed, same distribution
+    again = MonteCarloSimulator(n_simulations=20000, seed=3).block_bootstrap(bar_returns(bars), capital)
+    assert np.array_equal(block['final_capital'], again['final_capital'])
+    
+    print("\n✅ Monte Carlo tests passed!")
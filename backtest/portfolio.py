@@ -0,0 +1,371 @@
+"""
+Portfolio Backtester
+Runs one strategy over many symbols on a merged time axis, allocating
+every entry from a single capital pool with a cap on open positions
+"""
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.costs import CostModel
+from backtest.engine import BacktestEngine, BarWindow, MARKET, FILL, CHECK_ORDERS, SIGNAL
+from utils.performance import performance_report
+from utils.trade_ledger import TradeLedger
+
+
+class PortfolioBacktester(BacktestEngine):
+    """
+    Event-driven multi-symbol backtester sharing one capital pool
+    
+    Fills, costs, slippage and stop-loss/target orders follow BacktestEngine.
+    On every timestamp of the merged axis, exits fill before entries so
+    freed cash is available, and new entries are taken in symbol order
+    while fewer than max_positions are open or pending.
+    """
+    
+    def __init__(self, strategy, capital: Optional[float] = None,
+                 max_positions: Optional[int] = 5,
+                 cost_model: Optional[CostModel] = None, slippage_bps: float = 5.0,
+                 stop_loss_percent: Optional[float] = 2.0,
+                 target_percent: Optional[float] = 5.0,
+                 risk_percent: float = 0.1):
+        """
+        Initialize portfolio backtester
+        
+        Args:
+            strategy: Any BaseStrategy subclass instance (shared by all symbols)
+            capital: Starting capital (default: strategy.capital)
+            max_positions: Maximum concurrent positions (None = no limit)
+            cost_model: Transaction costs (default: IndianEquityCosts('delivery'))
+            slippage_bps: Adverse slippage on market and stop fills, in basis points
+            stop_loss_percent: Stop below the entry fill, in percent (None = no stop)
+            target_percent: Target above the entry fill, in percent (None = no target)
+            risk_percent: Fraction of free cash passed to calculate_position_size
+        """
+        super().__init__(strategy, capital=capital, cost_model=cost_model,
+                         slippage_bps=slippage_bps, stop_loss_percent=stop_loss_percent,
+                         target_percent=target_percent, risk_percent=risk_percent)
+        self.max_positions = max_positions
+    
+    def simulate_portfolio(self, data: Dict[str, pd.DataFrame], prepared: bool = False) -> Dict:
+        """
+        Run the event loop over all symbols on their merged time axis
+        
+        The strategy's positions, trades and capital are replaced by this
+        run's results, so print_performance() reports the whole portfolio.
+        
+        Args:
+            data: Dictionary of symbol -> OHLCV DataFrame
+            prepared: DataFrames already went through strategy.prepare_data
+        
+        Returns:
+            Dictionary with trades, equity, cash, exposure, drawdown and
+            open_positions Series on the merged axis, plus summary numbers
+        """
+        symbols = [symbol for symbol, frame in data.items() if frame is not None and not frame.empty]
+        if not symbols:
+            raise ValueError("No data to backtest")
+        
+        # Per-symbol arrays and windows
+        windows, opens, highs, lows, closes, dates = [], [], [], [], [], []
+        for symbol in symbols:
+            frame = data[symbol] if prepared else self.prepare(data[symbol])
+            columns, (open_, high, low, close), bar_dates = self._bar_arrays(frame)
+            windows.append(BarWindow(frame, columns))
+            opens.append(open_)
+            highs.append(high)
+            lows.append(low)
+            closes.append(close)
+            dates.append(bar_dates)
+        
+        # Merged time axis and the (symbol, bar) pairs at each timestamp
+        timeline = dates[0].append(dates[1:]).unique().sort_values() if len(dates) > 1 else dates[0]
+        n_times, n_symbols = len(timeline), len(symbols)
+        bars_at: List[List] = [[] for _ in range(n_times)]
+        for s, bar_dates in enumerate(dates):
+            times = timeline.searchsorted(bar_dates)
+            for t, bar in zip(times.tolist(), range(len(bar_dates))):
+                bars_at[t].append((s, bar))
+        last_bar = [len(bar_dates) - 1 for bar_dates in dates]
+        
+        strategy = self.strategy
+        should_enter = strategy.should_enter
+        should_exit = strategy.should_exit
+        
+        cash = float(self.capital if self.capital is not None else strategy.capital)
+        initial_capital = cash
+        max_positions = self.max_positions if self.max_positions is not None else n_symbols
+        positions: List[Optional[Dict]] = [None] * n_symbols
+        pending: List[Optional[tuple]] = [None] * n_symbols
+        open_count = 0
+        pending_buys = 0
+        reserved = [0.0] * n_symbols  # estimated cost of pending buys
+        trades: List[Dict] = []
+        
+        # (time, cash) and (time, symbol, quantity) after every fill
+        cash_times, cash_values = [-1], [cash]
+        qty_times, qty_symbols, qty_values = [], [], []
+        
+        events = deque()
+        
+        for t in range(n_times):
+            events.append((MARKET, t, None))
+            
+            while events:
+                kind, time, payload = events.popleft()
+                
+                if kind == MARKET:
+                    # Sells before buys so the freed cash is available
+                    for buys in (False, True):
+                        for s, bar in bars_at[time]:
+                            order = pending[s]
+                            if order is None or (order[0] == 'BUY') != buys:
+                                continue
+                            pending[s] = None
+                            side, quantity = order
+                            price = self._buy_price(opens[s][bar]) if buys else self._sell_price(opens[s][bar])
+                            events.append((FILL, time, (side, s, bar, price, quantity, 'SIGNAL')))
+                    events.append((CHECK_ORDERS, time, None))
+                
+                elif kind == FILL:
+                    side, s, bar, price, quantity, reason = payload
+                    symbol = symbols[s]
+                    
+                    if side == 'BUY':
+                        pending_buys -= 1
+                        reserved[s] = 0.0
+                        quantity, charges = self._affordable(price, quantity, cash)
+                        if quantity == 0:
+                            continue
+                        position = self._open_position(symbol, price, quantity, charges, bar, dates[s][bar])
+                        positions[s] = position
+                        open_count += 1
+                        cash -= position['cost']
+                    elif positions[s] is not None:
+                        position = positions[s]
+                        trade = self._close_position(position, price, bar, dates[s][bar], reason)
+                        cash += position['cost'] + trade['profit']
+                        trades.append(trade)
+                        positions[s] = None
+                        open_count -= 1
+                        quantity = 0
+                    else:
+                        continue
+                    
+                    cash_times.append(time)
+                    cash_values.append(cash)
+                    qty_times.append(time)
+                    qty_symbols.append(s)
+                    qty_values.append(quantity)
+                
+                elif kind == CHECK_ORDERS:
+                    for s, bar in bars_at[time]:
+                        position = positions[s]
+                        if position is None:
+                            continue
+                        order = self._exit_order(position, opens[s][bar], highs[s][bar], lows[s][bar])
+                        if order is not None:
+                            events.append((FILL, time, ('SELL', s, bar, order[0], 0, order[1])))
+                    events.append((SIGNAL, time, None))
+                
+                elif kind == SIGNAL:
+                    for s, bar in bars_at[time]:
+                        position = positions[s]
+                        
+                        # Symbol's data ends here - close at this bar's close
+                        if bar == last_bar[s]:
+                            if position is not None:
+                                events.append((FILL, time, ('SELL', s, bar, closes[s][bar], 0, 'END')))
+                            continue
+                        
+                        window = windows[s]
+                        window._advance(bar)
+                        
+                        if position is not None:
+                            if pending[s] is None and should_exit(window, position):
+                                pending[s] = ('SELL', position['quantity'])
+                        elif pending[s] is None and open_count + pending_buys < max_positions:
+                            if should_enter(window):
+                                price = closes[s][bar]
+                                quantity = self._size_order(price, cash - sum(reserved))
+                                pending[s] = ('BUY', quantity)
+                                pending_buys += 1
+                                reserved[s] = price * quantity
+        
+        return self._portfolio_result(
+            symbols, timeline, dates, closes, trades, initial_capital, cash,
+            cash_times, cash_values, qty_times, qty_symbols, qty_values
+        )
+    
+    def _portfolio_result(self, symbols, timeline, dates, closes, trades, initial_capital, cash,
+                          cash_times, cash_values, qty_times, qty_symbols, qty_values) -> Dict:
+        """Rebuild equity, exposure and drawdown from the fill history"""
+        n_times = len(timeline)
+        steps = np.arange(n_times)
+        
+        cash_series = np.array(cash_values)[
+            np.searchsorted(np.array(cash_times), steps, side='right') - 1
+        ]
+        
+        qty_times = np.array(qty_times, dtype=np.int64)
+        qty_symbols = np.array(qty_symbols, dtype=np.int64)
+        qty_values = np.array(qty_values, dtype=np.float64)
+        market_value = np.zeros(n_times)
+        
+        for s in range(len(symbols)):
+            mine = qty_symbols == s
+            if not mine.any():
+                continue
+            
+            # Quantity held and last known close at every step
+            fill_times = qty_times[mine]
+            held = np.searchsorted(fill_times, steps, side='right') - 1
+            quantity = np.where(held >= 0, qty_values[mine][np.maximum(held, 0)], 0.0)
+            
+            last = timeline.searchsorted(dates[s], side='left')
+            price_idx = np.searchsorted(last, steps, side='right') - 1
+            price = np.where(price_idx >= 0, closes[s][np.maximum(price_idx, 0)], 0.0)
+            
+            market_value += quantity * price
+        
+        equity = cash_series + market_value
+        exposure = market_value / equity
+        peak = np.maximum.accumulate(equity)
+        drawdown = equity / peak - 1
+        
+        open_positions = np.zeros(n_times, dtype=np.int64)
+        opened = timeline.searchsorted(pd.DatetimeIndex([trade['entry_date'] for trade in trades]))
+        closed = timeline.searchsorted(pd.DatetimeIndex([trade['exit_date'] for trade in trades]))
+        np.add.at(open_positions, opened, 1)
+        np.add.at(open_positions, closed, -1)
+        open_positions = np.cumsum(open_positions)
+        
+        # Book the run on the strategy as one fresh portfolio
+        strategy = self.strategy
+        strategy.capital = initial_capital
+        strategy.current_capital = cash
+        strategy.positions = {}
+        strategy.trades = TradeLedger(trades)
+        
+        equity_series = pd.Series(equity, index=timeline, name='Equity')
+        
+        return {
+            'symbols': symbols,
+            'trades': trades,
+            'equity': equity_series,
+            'cash': pd.Series(cash_series, index=timeline, name='Cash'),
+            'exposure': pd.Series(exposure, index=timeline, name='Exposure'),
+            'drawdown': pd.Series(drawdown, index=timeline, name='Drawdown'),
+            'open_positions': pd.Series(open_positions, index=timeline, name='Open Positions'),
+            'initial_capital': initial_capital,
+            'final_capital': cash,
+            'return_percent': (cash / initial_capital - 1) * 100,
+            'max_drawdown_percent': float(drawdown.min()) * 100,
+            'avg_exposure_percent': float(np.mean(exposure)) * 100,
+            'total_charges': sum(trade['charges'] for trade in trades),
+            'performance': performance_report(
+                equity_series, [trade['profit'] for trade in trades], initial_capital, in_market=exposure
+            )
+        }
+    
+    def run_portfolio(self, symbols: List[str], from_date: str, to_date: str) -> Optional[Dict]:
+        """
+        Fetch data for all symbols and run the portfolio backtest
+        
+        Args:
+            symbols: List of stock symbols
+            from_date: Start date
+            to_date: End date
+        
+        Returns:
+            Result dictionary from simulate_portfolio() (None if no data)
+        """
+        print(f"\n💼 Portfolio backtest of {self.strategy.name}")
+        print(f"   Symbols: {len(symbols)}, max positions: {self.max_positions}")
+        print(f"   Period: {from_date} to {to_date}")
+        
+        data = self.strategy.data_fetcher.get_historical_data_bulk(symbols, from_date, to_date)
+        data = {symbol: frame for symbol, frame in data.items() if frame is not None and not frame.empty}
+        
+        if not data:
+            print("❌ No data available for backtesting")
+            return None
+        
+        result = self.simulate_portfolio(data)
+        self.print_summary(result)
+        return result
+    
+    def print_summary(self, result: Dict):
+        """Print portfolio performance summary"""
+        performance = result['performance']
+        
+        print("\n" + "="*60)
+        print(f"💼 {self.strategy.name} - Portfolio Summary")
+        print("="*60)
+        print(f"Symbols:             {len(result['symbols'])}")
+        print(f"Initial Capital:     ₹{result['initial_capital']:,.2f}")
+        print(f"Final Capital:       ₹{result['final_capital']:,.2f} ({result['return_percent']:.2f}%)")
+        print(f"CAGR:                {performance['cagr']:.2f}%")
+        print(f"Max Drawdown:        {result['max_drawdown_percent']:.2f}% "
+              f"({performance['max_drawdown_duration']} bars)")
+        print(f"Sharpe / Sortino:    {performance['sharpe_ratio']:.2f} / {performance['sortino_ratio']:.2f}")
+        print(f"Calmar:              {performance['calmar_ratio']:.2f}")
+        print(f"Avg Exposure:        {result['avg_exposure_percent']:.2f}%")
+        print(f"Max Open Positions:  {result['open_positions'].max()}")
+        print(f"\nTotal Trades:        {performance['total_trades']}")
+        print(f"Win Rate:            {performance['win_rate']:.2f}%")
+        print(f"Profit Factor:       {performance['profit_factor']:.2f}")
+        print(f"Total Charges:       ₹{result['total_charges']:,.2f}")
+        print("="*60 + "\n")
+
+
+# Test the portfolio backtester
+if __name__ == "__main__":
+    print("🧪 Testing Portfolio Backtester...\n")
+    
+    import contextlib
+    import io
+    import time
+    from benchmarks.synthetic import SyntheticFetcher, generate_ohlcv
+    from strategies.ma_crossover import MACrossoverStrategy
+    from strategies.rsi_strategy import RSIStrategy
+    
+    # 10 symbols x 10 years of daily bars, staggered listing dates
+    watchlist = {
+        f"SYM{k}": generate_ohlcv(2500 - 50 * k, seed=k, start=str(pd.Timestamp('2015-01-01') + pd.Timedelta(days=70 * k))[:10],
+                                  freq='B', start_price=500 + 100 * k)
+        for k in range(10)
+    }
+    fetcher = SyntheticFetcher(watchlist['SYM0'])
+    
+    for strategy_class in (MACrossoverStrategy, RSIStrategy):
+        with contextlib.redirect_stdout(io.StringIO()):
+            strategy = strategy_class(fetcher)
+            backtester = PortfolioBacktester(strategy, max_positions=3)
+            start = time.perf_counter()
+            result = backtester.simulate_portfolio(watchlist)
+            elapsed = time.perf_counter() - start
+        
+        equity = result['equity']
+        assert abs(equity.iloc[-1] - result['final_capital']) < 1e-6
+        assert result['open_positions'].max() <= 3
+        assert (result['cash'] >= -1e-9).all(), "capital pool overdrawn"
+        assert (result['drawdown'] <= 0).all()
+        assert strategy.get_performance_stats()['total_trades'] == len(result['trades'])
+        
+        # A single symbol run through the portfolio matches BacktestEngine
+        with contextlib.redirect_stdout(io.StringIO()):
+            single = PortfolioBacktester(strategy_class(fetcher), max_positions=1).simulate_portfolio(
+                {'SYM3': watchlist['SYM3']})
+            engine = BacktestEngine(strategy_class(fetcher)).simulate('SYM3', watchlist['SYM3'])
+        assert [t['exit_price'] for t in single['trades']] == [t['exit_price'] for t in engine['trades']]
+        assert abs(single['final_capital'] - engine['final_capital']) < 1e-6
+        
+        print(f"✅ {strategy.name}: {len(equity):,} timestamps x {len(watchlist)} symbols in {elapsed * 1000:.0f} ms")
+        print(f"   {len(result['trades'])} trades, return {result['return_percent']:.2f}%, "
+              f"max DD {result['max_drawdown_percent']:.2f}%, "
+              f"avg exposure {result['avg_exposure_percent']:.1f}%")
+    
+    print("\n✅ Portfolio backtester tests passed!")
@@ -0,0 +1,428 @@
+"""
+Walk-Forward Analysis
+Optimizes strategy parameters on rolling train windows and trades them on
+the following unseen test window, stitching the out-of-sample results into
+one equity curve
+"""
+import contextlib
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import BacktestEngine
+from strategies.optimizer import ParameterOptimizer, score_trades
+from strategies.vectorized_backtest import resolve_trades, simulate_capital
+
+# Signal masks and closes attached once per worker process
+_worker_data = {}
+
+
+def walk_forward_windows(n_bars: int, train_bars: int, test_bars: int,
+                         step_bars: Optional[int] = None,
+                         anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Split bar positions into train/test windows
+    
+    Args:
+        n_bars: Total number of bars
+        train_bars: Bars in each train window
+        test_bars: Bars in each test window
+        step_bars: Bars between window starts (default: test_bars, so the
+                   test windows tile the history without gaps)
+        anchored: Train windows all start at bar 0 and grow
+    
+    Returns:
+        List of (train_start, train_end, test_start, test_end) - end exclusive
+    """
+    step = step_bars or test_bars
+    windows = []
+    train_start = 0
+    
+    while train_start + train_bars < n_bars:
+        train_end = train_start + train_bars
+        test_end = min(train_end + test_bars, n_bars)
+        windows.append((0 if anchored else train_start, train_end, train_end, test_end))
+        train_start += step
+    
+    return windows
+
+
+def _attach_masks(masks_name: str, close_name: str, shape: tuple, combos: List[Dict],
+                  starts: np.ndarray, thresholds: np.ndarray):
+    """Worker initializer - map the shared mask block and closes without copying"""
+    shms = []
+    for name in (masks_name, close_name):
+        try:
+            shms.append(shared_memory.SharedMemory(name=name, track=False))
+        except TypeError:  # Python < 3.13
+            shms.append(shared_memory.SharedMemory(name=name))
+    
+    _worker_data['shm'] = shms
+    _worker_data['masks'] = np.ndarray(shape, dtype=bool, buffer=shms[0].buf)
+    _worker_data['close'] = np.ndarray(shape[2], dtype=np.float64, buffer=shms[1].buf)
+    _worker_data['combos'] = combos
+    _worker_data['starts'] = starts
+    _worker_data['thresholds'] = thresholds
+
+
+def _optimize_windows(windows: List[Tuple[int, Tuple[int, int]]], capital: float,
+                      rank_by: str) -> List[Tuple[int, Dict]]:
+    """
+    Best parameter set for each train window, from the precomputed masks
+    
+    Args:
+        windows: List of (window index, (train_start, train_end))
+        capital: Starting capital for each run
+        rank_by: Metric to maximize
+    
+    Returns:
+        List of (window index, metrics of the best parameter set)
+    """
+    masks = _worker_data['masks']
+    close = _worker_data['close']
+    combos = _worker_data['combos']
+    starts = _worker_data['starts']
+    thresholds = _worker_data['thresholds']
+    best = []
+    
+    for k, (a, b) in windows:
+        prices = close[a:b]
+        top = None
+        
+        for p, params in enumerate(combos):
+            profit_exits = masks[2, p, a:b] if not np.isnan(thresholds[p]) else None
+            entry_idx, exit_idx = resolve_trades(
+                masks[0, p, a:b], masks[1, p, a:b], max(0, int(starts[p]) - a),
+                close=prices, profit_exits=profit_exits,
+                profit_threshold=float(thresholds[p]) if profit_exits is not None else None
+            )
+            metrics = score_trades(params, simulate_capital(prices, entry_idx, exit_idx, capital), capital)
+            if top is None or metrics[rank_by] > top[rank_by]:
+                top = metrics
+        
+        best.append((k, top))
+    
+    return best
+
+
+class WalkForwardAnalyzer:
+    """
+    Rolling walk-forward optimization for MACrossoverStrategy / RSIStrategy
+    
+    Every parameter set's indicators and signal masks are computed once on
+    the full history (they only look backwards) and sliced per window, so
+    overlapping train windows reuse them. Train windows are optimized in
+    parallel with the vectorized backtest; each test window is then traded
+    with BacktestEngine (next-open fills, costs, stops) starting from the
+    previous window's final capital.
+    
+    Usage:
+        analyzer = WalkForwardAnalyzer(MACrossoverStrategy, train_bars=504, test_bars=126)
+        result = analyzer.analyze(data, 'RELIANCE')
+    """
+    
+    def __init__(self, strategy_class, param_grid: Optional[Dict] = None,
+                 train_bars: int = 252, test_bars: int = 63,
+                 step_bars: Optional[int] = None, anchored: bool = False,
+                 capital: float = 100000, rank_by: str = 'return_percent',
+                 max_workers: Optional[int] = None, **engine_kwargs):
+        """
+        Initialize analyzer
+        
+        Args:
+            strategy_class: MACrossoverStrategy, RSIStrategy or compatible class
+            param_grid: Mapping of constructor argument -> candidate values
+                        (default: ParameterOptimizer.DEFAULT_GRIDS)
+            train_bars: Bars in each train (in-sample) window
+            test_bars: Bars in each test (out-of-sample) window
+            step_bars: Bars between windows (default: test_bars)
+            anchored: Grow the train window from the first bar instead of rolling it
+            capital: Starting capital
+            rank_by: Train metric to maximize (any ParameterOptimizer metric)
+            max_workers: Worker processes (default: all cores, 1 = in-process)
+            **engine_kwargs: Passed to BacktestEngine for the test windows
+                             (cost_model, slippage_bps, stop_loss_percent, ...)
+        """
+        self.strategy_class = strategy_class
+        self.optimizer = ParameterOptimizer(strategy_class, param_grid, capital=capital, max_workers=1)
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step_bars = step_bars
+        self.anchored = anchored
+        self.capital = capital
+        self.rank_by = rank_by
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.engine_kwargs = engine_kwargs
+    
+    def _strategy(self, params: Dict):
+        # Strategy constructors print a banner
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.strategy_class(None, **params)
+    
+    @staticmethod
+    def _warmup(params: Dict) -> int:
+        """Bars the strategy needs before its first signal (longest period + 1)"""
+        periods = [int(value) for value in params.values() if isinstance(value, (int, np.integer))]
+        return max(periods, default=0) + 1
+    
+    # ========================================
+    # IN-SAMPLE OPTIMIZATION
+    # ========================================
+    
+    def _prepare_masks(self, data: pd.DataFrame, combos: List[Dict]):
+        """Signal masks of every parameter set over the full history"""
+        n = len(data)
+        masks = np.zeros((3, len(combos), n), dtype=bool)
+        starts = np.zeros(len(combos), dtype=np.int64)
+        thresholds = np.full(len(combos), np.nan)
+        
+        for p, params in enumerate(combos):
+            strategy = self._strategy(params)
+            signal_masks = strategy.get_signal_masks(strategy.prepare_data(data))
+            masks[0, p] = signal_masks['entries']
+            masks[1, p] = signal_masks['exits']
+            starts[p] = signal_masks['start']
+            if signal_masks.get('profit_exits') is not None:
+                masks[2, p] = signal_masks['profit_exits']
+                thresholds[p] = signal_masks['profit_threshold']
+        
+        return masks, starts, thresholds
+    
+    def optimize_windows(self, data: pd.DataFrame, windows: List[Tuple[int, int, int, int]]) -> List[Dict]:
+        """
+        Best parameters for every train window
+        
+        Args:
+            data: OHLCV DataFrame
+            windows: Output of walk_forward_windows
+        
+        Returns:
+            List of best-metrics dictionaries, one per window
+        """
+        combos = self.optimizer.grid()
+        if not combos:
+            raise ValueError("Parameter grid has no valid combinations")
+        
+        masks, starts, thresholds = self._prepare_masks(data, combos)
+        close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64))
+        tasks = [(k, (a, b)) for k, (a, b, _, _) in enumerate(windows)]
+        
+        print(f"🔬 Optimizing {len(combos)} parameter sets on {len(windows)} train windows "
+              f"({min(self.max_workers, len(windows))} worker(s))...")
+        
+        if self.max_workers == 1 or len(windows) == 1:
+            _worker_data.update(masks=masks, close=close, combos=combos,
+                                starts=starts, thresholds=thresholds)
+            try:
+                results = _optimize_windows(tasks, self.capital, self.rank_by)
+            finally:
+                _worker_data.clear()
+        else:
+            results = self._run_parallel(masks, close, combos, starts, thresholds, tasks)
+        
+        return [metrics for _, metrics in sorted(results, key=lambda item: item[0])]
+    
+    def _run_parallel(self, masks, close, combos, starts, thresholds, tasks) -> List:
+        """Optimize train windows on a process pool sharing one mask block"""
+        masks_shm = shared_memory.SharedMemory(create=True, size=max(masks.nbytes, 1))
+        close_shm = shared_memory.SharedMemory(create=True, size=max(close.nbytes, 1))
+        
+        try:
+            np.ndarray(masks.shape, dtype=bool, buffer=masks_shm.buf)[:] = masks
+            np.ndarray(close.shape, dtype=np.float64, buffer=close_shm.buf)[:] = close
+            
+            workers = min(self.max_workers, len(tasks))
+            chunk_size = max(1, math.ceil(len(tasks) / (workers * 2)))
+            chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+            
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_attach_masks,
+                initargs=(masks_shm.name, close_shm.name, masks.shape, combos, starts, thresholds)
+            ) as executor:
+                futures = [
+                    executor.submit(_optimize_windows, chunk, self.capital, self.rank_by)
+                    for chunk in chunks
+                ]
+                return [result for future in futures for result in future.result()]
+        finally:
+            for shm in (masks_shm, close_shm):
+                shm.close()
+                shm.unlink()
+    
+    # ========================================
+    # OUT-OF-SAMPLE
+    # ========================================
+    
+    def analyze(self, data: pd.DataFrame, symbol: str = 'SYMBOL') -> Dict:
+        """
+        Run the walk-forward analysis on one symbol's history
+        
+        Args:
+            data: OHLCV DataFrame (Date column or DatetimeIndex)
+            symbol: Stock symbol (for trade records)
+        
+        Returns:
+            Dictionary with windows (DataFrame), stitched out-of-sample
+            equity (Series), trades and summary numbers
+        """
+        data = data.reset_index(drop=True) if 'Date' in data.columns else data
+        windows = walk_forward_windows(len(data), self.train_bars, self.test_bars,
+                                       self.step_bars, self.anchored)
+        if not windows:
+            raise ValueError(f"Need more than {self.train_bars} bars for one train window "
+                             f"(got {len(data)})")
+        
+        best = self.optimize_windows(data, windows)
+        dates = pd.DatetimeIndex(data['Date'] if 'Date' in data.columns else data.index)
+        param_names = list(self.optimizer.param_grid)
+        
+        # Prepared frames are shared by windows that pick the same parameters
+        prepared_cache = {}
+        capital = self.capital
+        equity_parts, trades, rows = [], [], []
+        
+        for k, ((a, b, c, d), metrics) in enumerate(zip(windows, best)):
+            params = {name: metrics[name] for name in param_names}
+            key = tuple(params.values())
+            strategy = self._strategy(params)
+            
+            if key not in prepared_cache:
+                prepared_cache[key] = strategy.prepare_data(data)
+            prepared = prepared_cache[key]
+            
+            warm = max(0, c - self._warmup(params))
+            engine = BacktestEngine(strategy, capital=capital, **self.engine_kwargs)
+            result = engine.simulate(symbol, prepared.iloc[warm:d], prepared=True, start=c - warm)
+            
+            rows.append({
+                'window': k + 1,
+                'train_start': dates[a],
+                'train_end': dates[b - 1],
+                'test_start': dates[c],
+                'test_end': dates[d - 1],
+                **params,
+                'train_return': metrics['return_percent'],
+                'train_trades': metrics['total_trades'],
+                'test_return': (result['final_capital'] / capital - 1) * 100,
+                'test_trades': len(result['trades'])
+            })
+            equity_parts.append(result['equity'])
+            trades.extend(result['trades'])
+            capital = result['final_capital']
+        
+        equity = pd.concat(equity_parts)
+        drawdown = equity / equity.cummax() - 1
+        table = pd.DataFrame(rows)
+        
+        # Out-of-sample vs in-sample return per bar
+        train_rate = (table['train_return'] / [b - a for a, b, _, _ in windows]).mean()
+        test_rate = (table['test_return'] / [d - c for _, _, c, d in windows]).mean()
+        
+        return {
+            'symbol': symbol,
+            'windows': table,
+            'equity': equity,
+            'drawdown': drawdown,
+            'trades': trades,
+            'initial_capital': self.capital,
+            'final_capital': capital,
+            'return_percent': (capital / self.capital - 1) * 100,
+            'max_drawdown_percent': float(drawdown.min()) * 100,
+            'efficiency': float(test_rate / train_rate) if train_rate > 0 else float('nan')
+        }
+    
+    def run(self, data_fetcher, symbol: str, from_date: str, to_date: str) -> Optional[Dict]:
+        """
+        Fetch data and run the walk-forward analysis
+        
+        Args:
+            data_fetcher: Data fetcher instance
+            symbol: Stock symbol
+            from_date: Start date
+            to_date: End date
+        
+        Returns:
+            Result dictionary from analyze() (None if no data)
+        """
+        print(f"\n🚶 Walk-forward analysis of {self.strategy_class.__name__} on {symbol}")
+        print(f"   Period: {from_date} to {to_date}")
+        print(f"   Train {self.train_bars} bars, test {self.test_bars} bars"
+              f"{' (anchored)' if self.anchored else ''}")
+        
+        data = data_fetcher.get_historical_data(symbol, from_date, to_date)
+        
+        if data.empty:
+            print("❌ No data available for walk-forward analysis")
+            return None
+        
+        result = self.analyze(data, symbol)
+        self.print_summary(result)
+        return result
+    
+    @staticmethod
+    def print_summary(result: Dict):
+        """Print the per-window table and out-of-sample summary"""
+        print("\n" + "="*60)
+        print(f"🚶 Walk-Forward Summary - {result['symbol']}")
+        print("="*60)
+        print(result['windows'].drop(columns=['train_start', 'train_end']).to_string(index=False))
+        print(f"\nInitial Capital:     ₹{result['initial_capital']:,.2f}")
+        print(f"Final Capital (OOS): ₹{result['final_capital']:,.2f} ({result['return_percent']:.2f}%)")
+        print(f"Max Drawdown (OOS):  {result['max_drawdown_percent']:.2f}%")
+        print(f"OOS Trades:          {len(result['trades'])}")
+        print(f"WF Efficiency:       {result['efficiency']:.2f}")
+        print("="*60 + "\n")
+
+
+# Test the walk-forward runner on synthetic data
+if __name__ == "__main__":
+    print("🧪 Testing Walk-Forward Analysis...\n")
+    
+    import time
+    from benchmarks.synthetic import generate_ohlcv
+    from strategies.ma_crossover import MACrossoverStrategy
+    from strategies.rsi_strategy import RSIStrategy
+    
+    data = generate_ohlcv(2500, seed=5, freq='B')
+    
+    # Windows tile the history after the first train window
+    windows = walk_forward_windows(2500, 500, 250)
+    assert windows[0] == (0, 500, 500, 750) and windows[-1][3] == 2500
+    assert all(w[2] == prev[3] for prev, w in zip(windows, windows[1:]))
+    
+    for strategy_class in (MACrossoverStrategy, RSIStrategy):
+        serial = WalkForwardAnalyzer(strategy_class, train_bars=500, test_bars=250, max_workers=1)
+        start = time.perf_counter()
+        serial_result = serial.analyze(data, 'TEST')
+        serial_time = time.perf_counter() - start
+        
+        parallel = WalkForwardAnalyzer(strategy_class, train_bars=500, test_bars=250, max_workers=2)
+        start = time.perf_counter()
+        parallel_result = parallel.analyze(data, 'TEST')
+        parallel_time = time.perf_counter() - start
+        
+        pd.testing.assert_frame_equal(serial_result['windows'], parallel_result['windows'])
+        
+        # Reused masks pick the same winner as sweeping the first window itself
+        names = list(serial.optimizer.param_grid)
+        with contextlib.redirect_stdout(io.StringIO()):
+            direct = serial.optimizer.run(data.iloc[:500]).iloc[0]
+        first = serial_result['windows'].iloc[0]
+        assert all(first[name] == direct[name] for name in names)
+        assert abs(first['train_return'] - direct['return_percent']) < 1e-9
+        
+        equity = serial_result['equity']
+        assert equity.index.is_monotonic_increasing and equity.index[0] == data['Date'].iloc[500]
+        assert abs(equity.iloc[-1] - serial_result['final_capital']) < 1e-6
+        
+        WalkForwardAnalyzer.print_summary(serial_result)
+        print(f"⏱️  serial {serial_time:.2f}s, parallel {parallel_time:.2f}s\n")
+    
+    print("✅ Walk-forward tests passed!")
@@ -0,0 +1,5 @@
+"""Performance benchmarks package"""
+from .synthetic import generate_ohlcv, SyntheticFetcher
+from .runner import BenchmarkRunner, compare_results
+
+__all__ = ['generate_ohlcv', 'SyntheticFetcher', 'BenchmarkRunner', 'compare_results']
@@ -0,0 +1,45 @@
+"""
+Run the benchmark suite
+
+    python -m benchmarks                          # default sizes (1k - 1M)
+    python -m benchmarks --sizes 1k 100k 10M      # custom sizes
+    python -m benchmarks --only indicators        # subset of cases
+    python -m benchmarks --compare old.json new.json
+"""
+import argparse
+
+from benchmarks.runner import DEFAULT_SIZES, BenchmarkRunner, compare_results
+
+
+def parse_size(value: str) -> int:
+    """'10k' -> 10000, '10M' -> 10000000"""
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    value = value.strip().lower().replace('_', '')
+    if value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trading app benchmarks")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=DEFAULT_SIZES,
+                        help="Bar counts, e.g. 1k 100k 10M")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case")
+    parser.add_argument('--only', nargs='+', help="Only cases whose name contains one of these")
+    parser.add_argument('--output', help="Results JSON path")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two results files instead of running")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args()
+    
+    if args.compare:
+        regressions = compare_results(args.compare[0], args.compare[1], args.threshold)
+        raise SystemExit(1 if regressions else 0)
+    
+    runner = BenchmarkRunner(sizes=args.sizes, repeat=args.repeat, only=args.only)
+    runner.save(runner.run(), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmark Runner
+Times every registered case at several data sizes and saves the results
+as JSON for comparing versions offline
+"""
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import BASE_DIR
+from benchmarks.suite import BENCHMARKS
+from benchmarks.synthetic import generate_ohlcv
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+class BenchmarkRunner:
+    """
+    Run the benchmark suite
+    
+    For each case the best of `repeat` timed runs is reported, then one
+    extra run under tracemalloc measures peak Python/NumPy memory (kept
+    separate so tracing overhead doesn't skew the timings).
+    
+    Usage:
+        runner = BenchmarkRunner(sizes=[1_000, 100_000])
+        results = runner.run()
+        runner.save(results)
+    """
+    
+    def __init__(self, sizes: Iterable[int] = DEFAULT_SIZES, repeat: int = 3,
+                 only: Optional[List[str]] = None, seed: int = 42):
+        """
+        Initialize runner
+        
+        Args:
+            sizes: Bar counts to benchmark
+            repeat: Timed runs per case
+            only: Only run cases whose name contains one of these strings
+            seed: Seed for the synthetic data
+        """
+        self.sizes = sorted(sizes)
+        self.repeat = max(1, repeat)
+        self.only = only
+        self.seed = seed
+    
+    def _selected(self) -> Dict:
+        if not self.only:
+            return BENCHMARKS
+        return {name: case for name, case in BENCHMARKS.items()
+                if any(pattern in name for pattern in self.only)}
+    
+    def measure(self, name: str, setup, data: pd.DataFrame, workdir: Path) -> Optional[Dict]:
+        """
+        Time one case on one dataset
+        
+        Args:
+            name: Case name
+            setup: Case setup function (data, workdir) -> (run, reset)
+            data: Synthetic OHLCV data
+            workdir: Empty scratch directory for the case
+        
+        Returns:
+            Result dictionary, or None if the case is unavailable
+        """
+        run, reset = setup(data, workdir)
+        if run is None:
+            return None
+        
+        times = []
+        for _ in range(self.repeat):
+            if reset:
+                reset()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        
+        if reset:
+            reset()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        best = min(times)
+        n_bars = len(data)
+        
+        return {
+            'name': name,
+            'n_bars': n_bars,
+            'repeat': self.repeat,
+            'wall_time_s': best,
+            'mean_time_s': float(np.mean(times)),
+            'peak_memory_mb': peak / 1024 / 1024,
+            'bars_per_second': n_bars / best if best > 0 else float('inf')
+        }
+    
+    def run(self) -> Dict:
+        """
+        Run all selected cases at all sizes
+        
+        Returns:
+            Dictionary with environment info and a list of results
+        """
+        cases = self._selected()
+        results = []
+        
+        print(f"\n⏱️  Running {len(cases)} benchmarks at sizes: {', '.join(f'{n:,}' for n in self.sizes)}")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            for n_bars in self.sizes:
+                print(f"\n📊 {n_bars:,} bars")
+                data = generate_ohlcv(n_bars, seed=self.seed)
+                
+                for name, (setup, max_bars) in cases.items():
+                    if max_bars is not None and n_bars > max_bars:
+                        continue
+                    
+                    workdir = Path(tmp) / f"{name}_{n_bars}"
+                    workdir.mkdir()
+                    
+                    try:
+                        result = self.measure(name, setup, data, workdir)
+                    except Exception as e:
+                        print(f"   ❌ {name:40} {str(e)}")
+                        continue
+                    
+                    if result is None:
+                        print(f"   ⏭️  {name:40} unavailable")
+                        continue
+                    
+                    results.append(result)
+                    print(f"   {name:40} {result['wall_time_s'] * 1000:10.2f} ms  "
+                          f"{result['peak_memory_mb']:8.1f} MB  "
+                          f"{result['bars_per_second']:14,.0f} bars/s")
+        
+        return {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'environment': self._environment(),
+            'sizes': self.sizes,
+            'repeat': self.repeat,
+            'results': results
+        }
+    
+    @staticmethod
+    def _environment() -> Dict:
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                capture_output=True, text=True, timeout=5
+            ).stdout.strip() or None
+        except Exception:
+            commit = None
+        
+        return {
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine()
+        }
+    
+    def save(self, results: Dict, path: Optional[str] = None) -> Path:
+        """
+        Save results as JSON
+        
+        Args:
+            results: Output of run()
+            path: File path (default: reports/benchmarks/benchmark_<timestamp>.json)
+        
+        Returns:
+            Path of the written file
+        """
+        if path is None:
+            path = BASE_DIR / "reports" / "benchmarks" / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        
+        print(f"\n💾 Results saved to {path}")
+        return path
+
+
+def compare_results(baseline_path: str, current_path: str, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare two saved benchmark files
+    
+    Args:
+        baseline_path: Older results JSON
+        current_path: Newer results JSON
+        threshold: Relative slowdown reported as a regression (0.10 = 10%)
+    
+    Returns:
+        List of regressions (name, n_bars, baseline, current, change)
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['name'], r['n_bars']): r for r in json.load(f)['results']}
+    with open(current_path) as f:
+        current = {(r['name'], r['n_bars']): r for r in json.load(f)['results']}
+    
+    regressions = []
+    
+    print(f"\n{'Benchmark':40} {'Bars':>10} {'Before':>12} {'After':>12} {'Change':>9}")
+    print("-" * 87)
+    
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key]['wall_time_s']
+        after = current[key]['wall_time_s']
+        change = (after - before) / before if before > 0 else 0.0
+        
+        marker = ""
+        if change > threshold:
+            marker = " ⚠️"
+            regressions.append({
+                'name': key[0], 'n_bars': key[1],
+                'baseline_s': before, 'current_s': after, 'change': change
+            })
+        elif change < -threshold:
+            marker = " ✅"
+        
+        print(f"{key[0]:40} {key[1]:>10,} {before * 1000:>10.2f}ms {after * 1000:>10.2f}ms "
+              f"{change * 100:>+8.1f}%{marker}")
+    
+    print(f"\n{'⚠️ ' if regressions else '✅'} {len(regressions)} regression(s) above {threshold * 100:.0f}%")
+    return regressions
@@ -0,0 +1,396 @@
+"""
+Benchmark Cases
+Each case takes (data, workdir) and returns (run, reset): run() is timed,
+reset() (optional) restores state between runs and is not timed.
+workdir is an empty directory owned by the case.
+"""
+import contextlib
+import io
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticFetcher
+from indicators.technical import TechnicalIndicators
+
+Case = Callable[[pd.DataFrame, Path], Tuple[Callable, Optional[Callable]]]
+
+# Per-bar loops re-slice the DataFrame on every bar - keep them to sizes
+# that finish in seconds
+LOOP_MAX_BARS = 20_000
+
+# Row-at-a-time database inserts commit per row
+ROW_INSERT_MAX_BARS = 10_000
+
+# Rows written to the database per case (trades are built as dicts)
+TRADES_MAX_ROWS = 200_000
+BARS_MAX_ROWS = 1_000_000
+
+# Strikes per option chain case (each priced at 4 expiries)
+OPTIONS_MAX_STRIKES = 50_000
+
+
+def _quiet(func: Callable) -> Callable:
+    """Wrap a callable so its prints don't flood the benchmark output"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+
+# ========================================
+# INDICATORS
+# ========================================
+
+def _indicator_case(name: str) -> Case:
+    def setup(data, workdir):
+        method = getattr(TechnicalIndicators, name)
+        return lambda: method(data), None
+    return setup
+
+
+def _add_all_indicators(data, workdir):
+    return lambda: TechnicalIndicators.add_all_indicators(data), None
+
+
+def _add_signal_indicators(data, workdir):
+    # Only what generate_signals reads
+    columns = TechnicalIndicators.SIGNAL_COLUMNS
+    return lambda: TechnicalIndicators.add_all_indicators(data, columns=columns), None
+
+
+def _indicator_cache_hit(data, workdir):
+    from indicators.cache import IndicatorCache
+    
+    cache = IndicatorCache(max_memory_mb=4096)
+    cache.get(data, 'BENCH')
+    return lambda: cache.get(data, 'BENCH'), None
+
+
+def _add_all_indicators_panel(data, workdir):
+    # The same bars as a cross-sectional screen: 250 daily bars per symbol
+    n_bars = 250
+    n_symbols = max(1, len(data) // n_bars)
+    shape = (n_symbols, n_bars)
+    
+    def panel(column):
+        return data[column].to_numpy()[:n_symbols * n_bars].reshape(shape).T.copy()
+    
+    close, high, low, volume = panel('Close'), panel('High'), panel('Low'), panel('Volume')
+    return lambda: TechnicalIndicators.add_all_indicators_panel(close, high, low, volume), None
+
+
+def _generate_signals(data, workdir):
+    prepared = TechnicalIndicators.add_all_indicators(data)
+    return lambda: TechnicalIndicators.generate_signals(prepared), None
+
+
+# ========================================
+# STRATEGIES
+# ========================================
+
+def _backtest_case(strategy_name: str, vectorized: bool) -> Case:
+    def setup(data, workdir):
+        from strategies.ma_crossover import MACrossoverStrategy
+        from strategies.rsi_strategy import RSIStrategy
+        
+        strategy_class = {'ma_crossover': MACrossoverStrategy, 'rsi': RSIStrategy}[strategy_name]
+        fetcher = SyntheticFetcher(data)
+        
+        def run():
+            strategy = strategy_class(fetcher)
+            strategy.backtest('BENCH', '2000-01-01', '2100-01-01', vectorized=vectorized)
+        
+        return _quiet(run), None
+    return setup
+
+
+def _event_backtest_case(strategy_name: str) -> Case:
+    def setup(data, workdir):
+        from backtest.engine import BacktestEngine
+        from strategies.ma_crossover import MACrossoverStrategy
+        from strategies.rsi_strategy import RSIStrategy
+        
+        strategy_class = {'ma_crossover': MACrossoverStrategy, 'rsi': RSIStrategy}[strategy_name]
+        fetcher = SyntheticFetcher(data)
+        
+        def run():
+            strategy = strategy_class(fetcher)
+            BacktestEngine(strategy).simulate('BENCH', data)
+        
+        return _quiet(run), None
+    return setup
+
+
+def _portfolio_backtest(data, workdir):
+    from backtest.portfolio import PortfolioBacktester
+    from strategies.rsi_strategy import RSIStrategy
+    
+    # The bars as a 10-symbol watchlist sharing one date axis
+    n_symbols = 10
+    chunk = max(1, len(data) // n_symbols)
+    dates = data['Date'].iloc[:chunk].to_numpy()
+    watchlist = {
+        f"SYM{k}": data.iloc[k * chunk:(k + 1) * chunk].assign(Date=dates)
+        for k in range(n_symbols)
+    }
+    fetcher = SyntheticFetcher(data)
+    
+    def run():
+        PortfolioBacktester(RSIStrategy(fetcher)).simulate_portfolio(watchlist)
+    
+    return _quiet(run), None
+
+
+# ========================================
+# DATABASE
+# ========================================
+
+def _open_db(workdir: Path):
+    from utils.database import TradingDatabase
+    with contextlib.redirect_stdout(io.StringIO()):
+        return TradingDatabase(str(workdir / "bench.db"))
+
+
+def _make_trades(data: pd.DataFrame) -> List[Dict]:
+    data = data.iloc[:TRADES_MAX_ROWS]
+    close = data['Close'].to_numpy()
+    dates = data['Date'].dt.strftime('%Y-%m-%d %H:%M').to_numpy()
+    return [
+        {
+            'symbol': f"SYM{i % 50}",
+            'strategy': 'MA Crossover' if i % 2 else 'RSI Strategy',
+            'entry_date': dates[i],
+            'exit_date': dates[i],
+            'entry_price': float(close[i]),
+            'exit_price': float(close[i]) * 1.01,
+            'quantity': 10,
+            'profit': float(close[i]) * 0.1,
+            'profit_percent': 1.0,
+            'status': 'CLOSED'
+        }
+        for i in range(len(data))
+    ]
+
+
+def _db_insert_trade(data, workdir):
+    db = _open_db(workdir)
+    trades = _make_trades(data)
+    
+    def run():
+        for trade in trades:
+            db.insert_trade(trade)
+    
+    return run, _quiet(lambda: db.clear_table('trades'))
+
+
+def _db_insert_trades_bulk(data, workdir):
+    db = _open_db(workdir)
+    trades = _make_trades(data)
+    return lambda: db.insert_trades_bulk(trades), _quiet(lambda: db.clear_table('trades'))
+
+
+def _db_get_trades(data, workdir):
+    db = _open_db(workdir)
+    db.insert_trades_bulk(_make_trades(data))
+    return lambda: db.get_trades(symbol='SYM7', strategy='MA Crossover', limit=100), None
+
+
+def _db_get_trade_stats(data, workdir):
+    db = _open_db(workdir)
+    db.insert_trades_bulk(_make_trades(data))
+    return lambda: db.get_trade_stats(strategy='RSI Strategy'), None
+
+
+def _db_upsert_bars(data, workdir):
+    db = _open_db(workdir)
+    bars = data.iloc[:BARS_MAX_ROWS]
+    return lambda: db.upsert_bars('BENCH', bars), None
+
+
+def _db_get_bars(data, workdir):
+    db = _open_db(workdir)
+    db.upsert_bars('BENCH', data.iloc[:BARS_MAX_ROWS])
+    return lambda: db.get_bars('BENCH', '1d'), None
+
+
+# ========================================
+# FETCH (local paths only)
+# ========================================
+
+def _fetch_database(data, workdir):
+    from data.db_fetcher import DatabaseFetcher
+    db = _open_db(workdir)
+    db.upsert_bars('BENCH', data.iloc[:BARS_MAX_ROWS])
+    fetcher = _quiet(lambda: DatabaseFetcher(db))()
+    return lambda: fetcher.get_historical_data('BENCH', '1900-01-01', '2200-01-01'), None
+
+
+def _fetch_parquet_cache(data, workdir):
+    from data.cache import OHLCVCache
+    cache = _quiet(lambda: OHLCVCache(str(workdir / "cache")))()
+    
+    if not cache.enabled:
+        return None, None
+    
+    start = data['Date'].iloc[0].normalize()
+    end = data['Date'].iloc[-1].normalize() + pd.Timedelta(days=1)
+    cache.store('BENCH', '1d', data, start, end)
+    
+    return _quiet(lambda: cache.get('BENCH', '1d', start, end, fetch=None)), None
+
+
+# ========================================
+# TRADE LEDGER
+# ========================================
+
+def _ledger_trades(data: pd.DataFrame) -> List[Dict]:
+    # Same rows as _make_trades, with datetime dates as strategies record them
+    dates = data['Date'].iloc[:TRADES_MAX_ROWS].dt.to_pydatetime()
+    return [dict(trade, entry_date=date, exit_date=date) for trade, date in zip(_make_trades(data), dates)]
+
+
+def _ledger_append(data, workdir):
+    from utils.trade_ledger import TradeLedger
+    trades = _ledger_trades(data)
+    return lambda: TradeLedger(trades), None
+
+
+def _ledger_to_frame(data, workdir):
+    from utils.trade_ledger import TradeLedger
+    ledger = TradeLedger(_ledger_trades(data))
+    return ledger.to_frame, None
+
+
+# ========================================
+# PERFORMANCE ANALYTICS
+# ========================================
+
+def _performance_trade_statistics(data, workdir):
+    from utils.performance import trade_statistics
+    profits = data['Close'].diff().fillna(0).to_numpy()
+    return lambda: trade_statistics(profits, capital=1e7, trades_per_year=252), None
+
+
+def _performance_equity_statistics(data, workdir):
+    from utils.performance import equity_statistics
+    equity = data.set_index('Date')['Close']
+    return lambda: equity_statistics(equity), None
+
+
+def _performance_rolling_metrics(data, workdir):
+    from utils.performance import rolling_metrics
+    equity = data.set_index('Date')['Close']
+    return lambda: rolling_metrics(equity, window=63), None
+
+
+# ========================================
+# OPTIONS
+# ========================================
+
+def _option_chain(data: pd.DataFrame):
+    # Every bar's close is a strike around the last close, at weekly to monthly expiries
+    strikes = data['Close'].to_numpy()
+    expiries = (np.array([2, 7, 14, 28]) / 365)[:, None]
+    return float(strikes[-1]), strikes, expiries
+
+
+def _options_chain_greeks(data, workdir):
+    from options.pricing import chain_greeks
+    spot, strikes, expiries = _option_chain(data)
+    return lambda: chain_greeks(spot, strikes, expiries, 0.15), None
+
+
+def _options_implied_volatility(data, workdir):
+    from options.pricing import chain_greeks, implied_volatility
+    spot, strikes, expiries = _option_chain(data)
+    prices = chain_greeks(spot, strikes, expiries, 0.15)['call_price']
+    return lambda: implied_volatility(prices, spot, strikes, expiries), None
+
+
+def _options_implied_volatility_warm(data, workdir):
+    # Next tick: solve from the previous tick's surface
+    from options.pricing import chain_greeks, implied_volatility
+    spot, strikes, expiries = _option_chain(data)
+    previous = implied_volatility(chain_greeks(spot, strikes, expiries, 0.15)['call_price'], spot, strikes, expiries)
+    prices = chain_greeks(spot * 1.001, strikes, expiries, 0.15)['call_price']
+    return lambda: implied_volatility(prices, spot * 1.001, strikes, expiries, initial=previous), None
+
+
+# ========================================
+# AI ENGINE
+# ========================================
+
+def _ai_analyze_and_decide(data, workdir):
+    from ai_trading_engine import AITradingEngine
+    engine = AITradingEngine()
+    engine.start()
+    return lambda: engine.analyze_and_decide(data), None
+
+
+def _ai_analyze_history(data, workdir):
+    from ai_trading_engine import MarketConditionAnalyzer
+    analyzer = MarketConditionAnalyzer()
+    return lambda: analyzer.analyze_history(data), None
+
+
+def _ai_select_strategies(data, workdir):
+    from ai_trading_engine import AIStrategySelector, MarketConditionAnalyzer
+    conditions = MarketConditionAnalyzer().analyze_history(data)
+    selector = AIStrategySelector()
+    return lambda: selector.select_strategies(conditions), None
+
+
+def _ai_replay(data, workdir):
+    from backtest.ai_replay import AIEngineReplay
+    replay = AIEngineReplay()
+    return lambda: replay.run(data), None
+
+
+# ========================================
+# REGISTRY
+# ========================================
+
+# name -> (setup, max_bars or None)
+BENCHMARKS: Dict[str, Tuple[Case, Optional[int]]] = {}
+
+for _name in sorted(name for name in dir(TechnicalIndicators)
+                    if name.startswith('calculate_') and name != 'calculate_panel'):
+    BENCHMARKS[f"indicators.{_name}"] = (_indicator_case(_name), None)
+
+BENCHMARKS.update({
+    'indicators.add_all_indicators': (_add_all_indicators, None),
+    'indicators.add_all_indicators_panel': (_add_all_indicators_panel, None),
+    'indicators.add_signal_indicators': (_add_signal_indicators, None),
+    'indicators.cache_hit': (_indicator_cache_hit, None),
+    'indicators.generate_signals': (_generate_signals, None),
+    'backtest.ma_crossover.loop': (_backtest_case('ma_crossover', False), LOOP_MAX_BARS),
+    'backtest.ma_crossover.vectorized': (_backtest_case('ma_crossover', True), None),
+    'backtest.rsi.loop': (_backtest_case('rsi', False), LOOP_MAX_BARS),
+    'backtest.rsi.vectorized': (_backtest_case('rsi', True), None),
+    'backtest.ma_crossover.event': (_event_backtest_case('ma_crossover'), None),
+    'backtest.rsi.event': (_event_backtest_case('rsi'), None),
+    'backtest.portfolio': (_portfolio_backtest, None),
+    'trade_ledger.append': (_ledger_append, TRADES_MAX_ROWS),
+    'trade_ledger.to_frame': (_ledger_to_frame, TRADES_MAX_ROWS),
+    'performance.trade_statistics': (_performance_trade_statistics, TRADES_MAX_ROWS),
+    'performance.equity_statistics': (_performance_equity_statistics, None),
+    'performance.rolling_metrics': (_performance_rolling_metrics, None),
+    'database.insert_trade': (_db_insert_trade, ROW_INSERT_MAX_BARS),
+    'database.insert_trades_bulk': (_db_insert_trades_bulk, TRADES_MAX_ROWS),
+    'database.get_trades': (_db_get_trades, TRADES_MAX_ROWS),
+    'database.get_trade_stats': (_db_get_trade_stats, TRADES_MAX_ROWS),
+    'database.upsert_bars': (_db_upsert_bars, BARS_MAX_ROWS),
+    'database.get_bars': (_db_get_bars, BARS_MAX_ROWS),
+    'fetch.database': (_fetch_database, BARS_MAX_ROWS),
+    'fetch.parquet_cache': (_fetch_parquet_cache, None),
+    'options.chain_greeks': (_options_chain_greeks, OPTIONS_MAX_STRIKES),
+    'options.implied_volatility': (_options_implied_volatility, OPTIONS_MAX_STRIKES),
+    'options.implied_volatility.warm': (_options_implied_volatility_warm, OPTIONS_MAX_STRIKES),
+    'ai.analyze_and_decide': (_ai_analyze_and_decide, None),
+    'ai.analyze_history': (_ai_analyze_history, None),
+    'ai.replay': (_ai_replay, None),
+    'ai.select_strategies': (_ai_select_strategies, None),
+})
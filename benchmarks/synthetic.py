@@ -0,0 +1,96 @@
+"""
+Synthetic OHLCV Data
+Reproducible price series of any length for benchmarks - no network needed
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data.base_fetcher import BaseFetcher
+
+
+def generate_ohlcv(n_bars: int, seed: int = 42, start: str = '2000-01-03',
+                   freq: str = 'min', start_price: float = 1000.0) -> pd.DataFrame:
+    """
+    Generate a random-walk OHLCV DataFrame
+    
+    Args:
+        n_bars: Number of bars (1k - 10M+)
+        seed: Random seed (same seed -> same data)
+        start: First timestamp
+        freq: Bar frequency ('min' keeps 10M bars inside pandas' date range)
+        start_price: First open price
+    
+    Returns:
+        DataFrame with columns: Date, Open, High, Low, Close, Volume
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Geometric random walk with a small drift
+    returns = rng.normal(0.00002, 0.002, n_bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * (1 + rng.normal(0, 0.0005, n_bars - 1))
+    
+    # Wicks extend beyond the open/close range
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.001, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.001, n_bars)))
+    
+    volume = rng.lognormal(mean=10, sigma=0.5, size=n_bars).astype(np.int64)
+    
+    return pd.DataFrame({
+        'Date': pd.date_range(start, periods=n_bars, freq=freq),
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume
+    })
+
+
+class SyntheticFetcher(BaseFetcher):
+    """
+    Fetcher that serves the same synthetic DataFrame for every request
+    Lets strategies run their normal backtest() path offline
+    """
+    
+    def __init__(self, data: Optional[pd.DataFrame] = None, n_bars: int = 10000, seed: int = 42):
+        """
+        Initialize synthetic fetcher
+        
+        Args:
+            data: DataFrame to serve (generated if None)
+            n_bars: Bars to generate when data is None
+            seed: Random seed when data is None
+        """
+        self.data = data if data is not None else generate_ohlcv(n_bars, seed)
+        self.source = "synthetic"
+    
+    def get_historical_data(self, symbol: str, from_date: str, to_date: str, interval: str = "day") -> pd.DataFrame:
+        """Return the full synthetic series (dates are ignored)"""
+        return self.data.copy()
+    
+    def get_live_price(self, symbol: str) -> float:
+        """Last synthetic close"""
+        return float(self.data['Close'].iloc[-1])
+    
+    def get_quote(self, symbol: str) -> dict:
+        """Quote built from the last two synthetic bars"""
+        last = self.data.iloc[-1]
+        prev_close = float(self.data['Close'].iloc[-2]) if len(self.data) > 1 else float(last['Open'])
+        change = float(last['Close']) - prev_close
+        
+        return {
+            'symbol': symbol,
+            'last_price': float(last['Close']),
+            'open': float(last['Open']),
+            'high': float(last['High']),
+            'low': float(last['Low']),
+            'volume': int(last['Volume']),
+            'prev_close': prev_close,
+            'change': change,
+            'change_percent': (change / prev_close) * 100 if prev_close > 0 else 0
+        }
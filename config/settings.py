@@ -76,6 +76,14 @@ class Settings:
     # ========================================
     DATABASE_PATH = BASE_DIR / "data" / "trading.db"
     
+    # ========================================
+    # HISTORICAL DATA CACHE
+    # ========================================
+    # Downloaded bars are cached on disk (Parquet, needs pyarrow)
+    # so repeat requests only fetch the missing date range
+    USE_DATA_CACHE = True
+    HISTORICAL_DATA_DIR = BASE_DIR / "data" / "historical"
+    
     # ========================================
     # LOGGING SETTINGS
     # ========================================
@@ -123,7 +131,7 @@ class Settings:
         """Create necessary directories"""
         directories = [
             BASE_DIR / "data",
-            BASE_DIR / "data" / "historical",
+            cls.HISTORICAL_DATA_DIR,
             BASE_DIR / "logs",
             BASE_DIR / "reports"
         ]
@@ -2,6 +2,8 @@
 from .base_fetcher import BaseFetcher
 from .free_fetcher import FreeFetcher
 from .kite_fetcher import KiteFetcher
+from .cache import OHLCVCache
+from .db_fetcher import DatabaseFetcher
 
-__all__ = ['BaseFetcher', 'FreeFetcher', 'KiteFetcher']
+__all__ = ['BaseFetcher', 'FreeFetcher', 'KiteFetcher', 'OHLCVCache', 'DatabaseFetcher']
 
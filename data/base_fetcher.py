@@ -4,6 +4,7 @@ This interface ensures both Free and Kite fetchers work the same way
 """
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import Dict, List
 import pandas as pd
 
 class BaseFetcher(ABC):
@@ -54,6 +55,41 @@ class BaseFetcher(ABC):
         """
         pass
     
+    def get_historical_data_bulk(self, symbols: List[str], from_date: str, to_date: str,
+                                 interval: str = "day") -> Dict[str, pd.DataFrame]:
+        """
+        Get historical OHLCV data for many symbols
+        Default implementation fetches one symbol at a time - override
+        in child classes that can download many symbols in one request
+        
+        Args:
+            symbols: List of stock symbols
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            interval: Data interval (day, minute, etc.)
+        
+        Returns:
+            Dictionary with symbol as key and DataFrame as value
+        """
+        return {
+            symbol: self.get_historical_data(symbol, from_date, to_date, interval)
+            for symbol in symbols
+        }
+    
+    def get_quotes_bulk(self, symbols: List[str]) -> Dict[str, dict]:
+        """
+        Get quotes for many symbols
+        Default implementation fetches one symbol at a time - override
+        in child classes that can quote many symbols in one request
+        
+        Args:
+            symbols: List of stock symbols
+        
+        Returns:
+            Dictionary with symbol as key and quote dictionary as value
+        """
+        return {symbol: self.get_quote(symbol) for symbol in symbols}
+    
     def validate_data(self, data: pd.DataFrame) -> bool:
         """
         Validate if data has required columns
@@ -0,0 +1,355 @@
+"""
+On-disk OHLCV Cache
+Stores downloaded bars in data/historical so repeat requests only fetch
+the missing date range
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import Settings
+
+try:
+    import pyarrow  # noqa: F401 - required by pandas for Parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+class OHLCVCache:
+    """
+    Columnar (Parquet) cache of historical bars, one file per symbol and interval
+    
+    Each file has a small JSON sidecar recording the date range that has
+    already been downloaded, as a half-open [from, to) range like the
+    yfinance start/end arguments. Today is never marked as covered because
+    its bar is still forming.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize cache
+        
+        Args:
+            cache_dir: Directory for cache files (default: Settings.HISTORICAL_DATA_DIR)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Settings.HISTORICAL_DATA_DIR
+        self.enabled = PARQUET_AVAILABLE
+        
+        if not self.enabled:
+            print("⚠️  pyarrow not installed - historical data cache disabled")
+            print("   Install with: pip install pyarrow")
+            return
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+    
+    # ========================================
+    # FILES
+    # ========================================
+    
+    def _key(self, symbol: str, interval: str) -> str:
+        return f"{symbol.upper().strip()}_{interval}"
+    
+    def _data_path(self, symbol: str, interval: str) -> Path:
+        return self.cache_dir / f"{self._key(symbol, interval)}.parquet"
+    
+    def _meta_path(self, symbol: str, interval: str) -> Path:
+        return self.cache_dir / f"{self._key(symbol, interval)}.json"
+    
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = self._key(symbol, interval)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+    
+    def load(self, symbol: str, interval: str) -> Tuple[pd.DataFrame, Optional[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """
+        Load cached bars and their covered range
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+        
+        Returns:
+            Tuple of (DataFrame, (covered_from, covered_to) or None)
+        """
+        data_path = self._data_path(symbol, interval)
+        meta_path = self._meta_path(symbol, interval)
+        
+        if not data_path.exists() or not meta_path.exists():
+            return pd.DataFrame(), None
+        
+        try:
+            data = pd.read_parquet(data_path)
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            coverage = (pd.Timestamp(meta['from']), pd.Timestamp(meta['to']))
+            return data, coverage
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable cache for {symbol}: {str(e)}")
+            return pd.DataFrame(), None
+    
+    @staticmethod
+    def _write_atomic(path: Path, write: Callable[[Path], None]):
+        """Write to a temporary file next to path, then rename it into place"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _save(self, symbol: str, interval: str, data: pd.DataFrame,
+              coverage: Tuple[pd.Timestamp, pd.Timestamp]):
+        """
+        Save bars and coverage
+        
+        The sidecar is replaced last, so a crash in between leaves the old
+        coverage next to a superset of its bars - never coverage without bars.
+        """
+        meta = {
+            'from': coverage[0].strftime('%Y-%m-%d'),
+            'to': coverage[1].strftime('%Y-%m-%d'),
+            'updated_at': datetime.now().isoformat(timespec='seconds')
+        }
+        
+        def write_meta(path: Path):
+            with open(path, 'w') as f:
+                json.dump(meta, f)
+        
+        self._write_atomic(self._data_path(symbol, interval),
+                           lambda path: data.to_parquet(path, index=False))
+        self._write_atomic(self._meta_path(symbol, interval), write_meta)
+    
+    # ========================================
+    # RANGES
+    # ========================================
+    
+    @staticmethod
+    def _to_day(value) -> pd.Timestamp:
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        return ts.normalize()
+    
+    def missing_ranges(self, coverage: Optional[Tuple[pd.Timestamp, pd.Timestamp]],
+                       from_date, to_date) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Date ranges that must be downloaded to serve [from_date, to_date)
+        
+        Ranges are extended to touch the covered range so coverage stays
+        contiguous.
+        
+        Args:
+            coverage: Covered (from, to) range or None
+            from_date: Requested start date
+            to_date: Requested end date (exclusive)
+        
+        Returns:
+            List of (start, end) ranges
+        """
+        start = self._to_day(from_date)
+        end = self._to_day(to_date)
+        
+        if coverage is None:
+            return [(start, end)]
+        
+        covered_from, covered_to = coverage
+        ranges = []
+        
+        if start < covered_from:
+            ranges.append((start, covered_from))
+        if end > covered_to:
+            ranges.append((covered_to, end))
+        
+        return ranges
+    
+    def window(self, data: pd.DataFrame, from_date, to_date) -> pd.DataFrame:
+        """
+        Slice cached bars to [from_date, to_date)
+        
+        Args:
+            data: Cached DataFrame
+            from_date: Start date
+            to_date: End date (exclusive)
+        
+        Returns:
+            DataFrame for the requested window
+        """
+        if data.empty:
+            return data
+        
+        start = self._to_day(from_date)
+        end = self._to_day(to_date)
+        
+        tz = data['Date'].dt.tz
+        if tz is not None:
+            start = start.tz_localize(tz)
+            end = end.tz_localize(tz)
+        
+        mask = (data['Date'] >= start) & (data['Date'] < end)
+        return data.loc[mask].reset_index(drop=True)
+    
+    # ========================================
+    # READ-THROUGH
+    # ========================================
+    
+    def get(self, symbol: str, interval: str, from_date, to_date,
+            fetch: Callable[[str, str, str, str], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Return bars for [from_date, to_date), downloading only what is missing
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval (normalized, e.g. '1d')
+            from_date: Start date
+            to_date: End date (exclusive)
+            fetch: Callable(symbol, from_date, to_date, interval) -> DataFrame
+        
+        Returns:
+            DataFrame with OHLCV data
+        """
+        with self._lock(symbol, interval):
+            data, coverage = self.load(symbol, interval)
+            ranges = self.missing_ranges(coverage, from_date, to_date)
+            
+            if not ranges:
+                result = self.window(data, from_date, to_date)
+                print(f"⚡ Loaded {len(result)} rows for {symbol} from cache")
+                return result
+            
+            for start, end in ranges:
+                new_data = fetch(symbol, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), interval)
+                data, coverage = self._merge(data, coverage, new_data, start, end)
+            
+            if coverage is not None:
+                self._save(symbol, interval, data, coverage)
+            
+            return self.window(data, from_date, to_date)
+    
+    def store(self, symbol: str, interval: str, new_data: pd.DataFrame, from_date, to_date):
+        """
+        Merge bars downloaded elsewhere (e.g. a bulk download) into the cache
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval (normalized, e.g. '1d')
+            new_data: Downloaded DataFrame
+            from_date: Start of the downloaded range
+            to_date: End of the downloaded range (exclusive)
+        """
+        with self._lock(symbol, interval):
+            data, coverage = self.load(symbol, interval)
+            
+            start = self._to_day(from_date)
+            end = self._to_day(to_date)
+            
+            # Only merge when the result stays contiguous
+            if coverage is not None and (end < coverage[0] or start > coverage[1]):
+                return
+            
+            data, coverage = self._merge(data, coverage, new_data, start, end)
+            if coverage is not None:
+                self._save(symbol, interval, data, coverage)
+    
+    def _merge(self, data: pd.DataFrame, coverage, new_data: pd.DataFrame,
+               start: pd.Timestamp, end: pd.Timestamp):
+        """Merge downloaded bars and extend the covered range"""
+        if new_data is None or new_data.empty:
+            # A leading range that comes back empty is before the listing date -
+            # mark it covered so it isn't downloaded again on every request.
+            # Anything else could be a failed download, so leave it uncovered.
+            if coverage is not None and not data.empty and end <= coverage[0]:
+                coverage = (min(coverage[0], start), coverage[1])
+            return data, coverage
+        
+        if data.empty:
+            data = new_data
+        else:
+            data = pd.concat([data, new_data], ignore_index=True)
+        data = data.drop_duplicates(subset='Date', keep='last').sort_values('Date').reset_index(drop=True)
+        
+        # The current day's bar is still forming
+        today = pd.Timestamp(datetime.now().date())
+        end = min(end, today)
+        
+        if coverage is None:
+            coverage = (start, max(start, end))
+        else:
+            coverage = (min(coverage[0], start), max(coverage[1], end))
+        
+        return data, coverage
+    
+    def clear(self, symbol: Optional[str] = None):
+        """
+        Delete cached files
+        
+        Args:
+            symbol: Only clear this symbol (all symbols if None)
+        """
+        pattern = f"{symbol.upper().strip()}_*" if symbol else "*"
+        for path in self.cache_dir.glob(f"{pattern}.parquet"):
+            path.unlink()
+        for path in self.cache_dir.glob(f"{pattern}.json"):
+            path.unlink()
+        print(f"✅ Cleared cache{' for ' + symbol if symbol else ''}")
+
+
+# Test the cache with a fake downloader
+if __name__ == "__main__":
+    print("🧪 Testing OHLCV Cache...\n")
+    
+    import tempfile
+    import numpy as np
+    
+    calls = []
+    
+    def fake_fetch(symbol, from_date, to_date, interval):
+        calls.append((from_date, to_date))
+        dates = pd.date_range(from_date, to_date, inclusive='left', freq='B')
+        prices = np.linspace(100, 110, len(dates))
+        return pd.DataFrame({
+            'Date': dates, 'Open': prices, 'High': prices + 1,
+            'Low': prices - 1, 'Close': prices, 'Volume': 1000
+        })
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = OHLCVCache(tmp)
+        
+        first = cache.get('TEST', '1d', '2024-01-01', '2024-03-01', fake_fetch)
+        print(f"✅ First request: {len(first)} rows, {len(calls)} download(s)")
+        
+        second = cache.get('TEST', '1d', '2024-01-15', '2024-02-15', fake_fetch)
+        assert len(calls) == 1, "Cached window should not download"
+        print(f"✅ Sub-window from cache: {len(second)} rows")
+        
+        third = cache.get('TEST', '1d', '2023-12-01', '2024-04-01', fake_fetch)
+        assert calls[1:] == [('2023-12-01', '2024-01-01'), ('2024-03-01', '2024-04-01')]
+        print(f"✅ Extended window: {len(third)} rows, only missing ranges downloaded")
+        
+        # Nothing traded before the listing date - the empty leading range is covered
+        def listed_fetch(symbol, from_date, to_date, interval):
+            if to_date <= '2024-01-01':
+                calls.append((from_date, to_date))
+                return pd.DataFrame()
+            return fake_fetch(symbol, max(from_date, '2024-01-01'), to_date, interval)
+        
+        cache.get('IPO', '1d', '2024-01-01', '2024-02-01', listed_fetch)
+        calls.clear()
+        cache.get('IPO', '1d', '2023-06-01', '2024-02-01', listed_fetch)
+        cache.get('IPO', '1d', '2023-06-01', '2024-02-01', listed_fetch)
+        assert calls == [('2023-06-01', '2024-01-01')], "Pre-listing range should be downloaded once"
+        assert not list(Path(tmp).glob('*.tmp')), "Temporary files should be renamed into place"
+        print("✅ Empty pre-listing range marked covered")
+    
+    print("\n✅ Cache test complete!")
@@ -5,11 +5,13 @@ No API costs - Perfect for development and backtesting
 import pandas as pd
 from datetime import datetime, date, timedelta
 import yfinance as yf
-from typing import Optional
+from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from config.settings import Settings
 from data.base_fetcher import BaseFetcher
+from data.cache import OHLCVCache
 
 class FreeFetcher(BaseFetcher):
     """
@@ -17,15 +19,38 @@ class FreeFetcher(BaseFetcher):
     No API key required - completely FREE!
     """
     
-    def __init__(self):
-        """Initialize free data fetcher"""
+    # Map interval names to yfinance intervals
+    INTERVAL_MAP = {
+        'day': '1d',
+        'hour': '1h',
+        'minute': '1m',
+        '1d': '1d',
+        '1h': '1h',
+        '1m': '1m'
+    }
+    
+    def __init__(self, use_cache: bool = Settings.USE_DATA_CACHE):
+        """
+        Initialize free data fetcher
+        
+        Args:
+            use_cache: Cache downloaded bars on disk (data/historical)
+        """
         self.source = "yfinance"  # Primary source
+        self.cache = OHLCVCache() if use_cache else None
+        if self.cache is not None and not self.cache.enabled:
+            self.cache = None
+        
         print("✅ Free Data Fetcher initialized (using yfinance)")
         print("💡 Note: Data may be delayed by 15-20 minutes")
+        if self.cache is not None:
+            print(f"💾 Historical data cache: {self.cache.cache_dir}")
     
     def get_historical_data(self, symbol: str, from_date: str, to_date: str, interval: str = "day") -> pd.DataFrame:
         """
         Get historical OHLCV data from yfinance
+        Served from the on-disk cache when enabled - only missing
+        date ranges are downloaded
         
         Args:
             symbol: Stock symbol (e.g., 'RELIANCE')
@@ -33,6 +58,30 @@ class FreeFetcher(BaseFetcher):
             to_date: End date (YYYY-MM-DD)
             interval: Data interval (1d, 1h, 1m, etc.)
         
+        Returns:
+            DataFrame with OHLCV data
+        """
+        yf_interval = self.INTERVAL_MAP.get(interval, '1d')
+        
+        if self.cache is None:
+            return self._download_history(symbol, from_date, to_date, yf_interval)
+        
+        try:
+            return self.cache.get(symbol, yf_interval, from_date, to_date, self._download_history)
+        except Exception as e:
+            print(f"⚠️  Cache error for {symbol}, downloading directly: {str(e)}")
+            return self._download_history(symbol, from_date, to_date, yf_interval)
+    
+    def _download_history(self, symbol: str, from_date: str, to_date: str, yf_interval: str = "1d") -> pd.DataFrame:
+        """
+        Download historical OHLCV data from yfinance (no cache)
+        
+        Args:
+            symbol: Stock symbol (e.g., 'RELIANCE')
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            yf_interval: yfinance interval (1d, 1h, 1m)
+        
         Returns:
             DataFrame with OHLCV data
         """
@@ -40,17 +89,6 @@ class FreeFetcher(BaseFetcher):
             # Format symbol for NSE
             formatted_symbol = self._format_nse_symbol(symbol)
             
-            # Map interval
-            interval_map = {
-                'day': '1d',
-                'hour': '1h',
-                'minute': '1m',
-                '1d': '1d',
-                '1h': '1h',
-                '1m': '1m'
-            }
-            yf_interval = interval_map.get(interval, '1d')
-            
             # Download data
             data = yf.download(
                 formatted_symbol,
@@ -64,29 +102,134 @@ class FreeFetcher(BaseFetcher):
                 print(f"⚠️  No data found for {symbol}")
                 return pd.DataFrame()
             
-            # Clean and format data
-            data = data.reset_index()
-            data.columns = [col[0] if isinstance(col, tuple) else col for col in data.columns]
-            
-            # Ensure required columns exist
-            if 'Date' in data.columns:
-                data['Date'] = pd.to_datetime(data['Date'])
-            elif 'Datetime' in data.columns:
-                data['Date'] = pd.to_datetime(data['Datetime'])
-                data = data.drop('Datetime', axis=1)
-            
-            # Validate data
-            if self.validate_data(data):
-                print(f"✅ Fetched {len(data)} rows for {symbol}")
-                return data
-            else:
-                print(f"⚠️  Invalid data format for {symbol}")
-                return pd.DataFrame()
+            return self._clean_history(data, symbol)
                 
         except Exception as e:
             print(f"❌ Error fetching data for {symbol}: {str(e)}")
             return pd.DataFrame()
     
+    def _clean_history(self, data: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """
+        Flatten a yfinance download into Date, Open, High, Low, Close, Volume
+        
+        Args:
+            data: Raw yfinance DataFrame for one symbol
+            symbol: Stock symbol (for messages)
+        
+        Returns:
+            Cleaned DataFrame, or empty DataFrame if invalid
+        """
+        # Clean and format data
+        data = data.reset_index()
+        data.columns = [col[0] if isinstance(col, tuple) else col for col in data.columns]
+        
+        # Ensure required columns exist
+        if 'Date' in data.columns:
+            data['Date'] = pd.to_datetime(data['Date'])
+        elif 'Datetime' in data.columns:
+            data['Date'] = pd.to_datetime(data['Datetime'])
+            data = data.drop('Datetime', axis=1)
+        
+        # Validate data
+        if self.validate_data(data):
+            print(f"✅ Fetched {len(data)} rows for {symbol}")
+            return data
+        else:
+            print(f"⚠️  Invalid data format for {symbol}")
+            return pd.DataFrame()
+    
+    def get_historical_data_bulk(self, symbols: List[str], from_date: str, to_date: str,
+                                 interval: str = "day") -> Dict[str, pd.DataFrame]:
+        """
+        Get historical OHLCV data for many symbols in one yfinance request
+        Symbols already covered by the cache are not downloaded
+        
+        Args:
+            symbols: List of stock symbols
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            interval: Data interval (1d, 1h, 1m, etc.)
+        
+        Returns:
+            Dictionary with symbol as key and DataFrame as value
+        """
+        if not symbols:
+            return {}
+        
+        yf_interval = self.INTERVAL_MAP.get(interval, '1d')
+        results = {}
+        to_download = []
+        
+        # Serve fully cached symbols from disk
+        for symbol in symbols:
+            if self.cache is not None:
+                cached, coverage = self.cache.load(symbol, yf_interval)
+                if not self.cache.missing_ranges(coverage, from_date, to_date):
+                    results[symbol] = self.cache.window(cached, from_date, to_date)
+                    continue
+            to_download.append(symbol)
+        
+        if to_download:
+            if len(to_download) > 1:
+                print(f"📥 Downloading {len(to_download)} symbols in one request...")
+            
+            downloaded = self._download_history_bulk(to_download, from_date, to_date, yf_interval)
+            
+            for symbol in to_download:
+                data = downloaded.get(symbol, pd.DataFrame())
+                if self.cache is not None and not data.empty:
+                    self.cache.store(symbol, yf_interval, data, from_date, to_date)
+                results[symbol] = data
+        
+        # Keep the caller's symbol order
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    def _download_history_bulk(self, symbols: List[str], from_date: str, to_date: str,
+                               yf_interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """
+        Download historical data for many symbols with one yf.download call
+        
+        Args:
+            symbols: List of stock symbols
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            yf_interval: yfinance interval (1d, 1h, 1m)
+        
+        Returns:
+            Dictionary with symbol as key and DataFrame as value
+        """
+        tickers = {self._format_nse_symbol(symbol): symbol for symbol in symbols}
+        
+        try:
+            raw = yf.download(
+                list(tickers.keys()),
+                start=from_date,
+                end=to_date,
+                interval=yf_interval,
+                group_by='ticker',
+                progress=False
+            )
+        except Exception as e:
+            print(f"❌ Error in bulk download: {str(e)}")
+            return {symbol: pd.DataFrame() for symbol in symbols}
+        
+        results = {}
+        for ticker, symbol in tickers.items():
+            try:
+                if raw.empty or ticker not in raw.columns.get_level_values(0):
+                    print(f"⚠️  No data found for {symbol}")
+                    results[symbol] = pd.DataFrame()
+                    continue
+                
+                # Dates are aligned across tickers - drop rows this one didn't trade
+                data = raw[ticker].dropna(how='all')
+                results[symbol] = self._clean_history(data, symbol) if not data.empty else pd.DataFrame()
+            except Exception as e:
+                print(f"❌ Error processing bulk data for {symbol}: {str(e)}")
+                results[symbol] = pd.DataFrame()
+        
+        return results
+    
     def get_live_price(self, symbol: str) -> float:
         """
         Get latest closing price (simulated live price)
@@ -166,9 +309,70 @@ class FreeFetcher(BaseFetcher):
         Returns:
             Dictionary with symbol as key and quote as value
         """
+        return self.get_quotes_bulk(symbols)
+    
+    def get_quotes_bulk(self, symbols: List[str]) -> Dict[str, dict]:
+        """
+        Get quotes for many symbols with one yfinance request
+        Uses the last two daily bars for last price and previous close
+        
+        Args:
+            symbols: List of stock symbols
+        
+        Returns:
+            Dictionary with symbol as key and quote as value
+        """
+        # yf.download raises on an empty ticker list (e.g. no open positions)
+        if not symbols:
+            return {}
+        
+        tickers = {self._format_nse_symbol(symbol): symbol for symbol in symbols}
         quotes = {}
-        for symbol in symbols:
-            quotes[symbol] = self.get_quote(symbol)
+        
+        try:
+            raw = yf.download(
+                list(tickers.keys()),
+                period='5d',
+                interval='1d',
+                group_by='ticker',
+                progress=False
+            )
+        except Exception as e:
+            print(f"❌ Error fetching bulk quotes: {str(e)}")
+            return {symbol: {'symbol': symbol, 'last_price': 0} for symbol in symbols}
+        
+        for ticker, symbol in tickers.items():
+            try:
+                hist = raw[ticker].dropna(how='all')
+                if hist.empty:
+                    raise ValueError("no data")
+                
+                latest = hist.iloc[-1]
+                prev_close = float(hist['Close'].iloc[-2]) if len(hist) > 1 else 0
+                
+                quote = {
+                    'symbol': symbol,
+                    'last_price': float(latest['Close']),
+                    'open': float(latest['Open']),
+                    'high': float(latest['High']),
+                    'low': float(latest['Low']),
+                    'volume': int(latest['Volume']),
+                    'prev_close': prev_close,
+                    'change': 0,
+                    'change_percent': 0
+                }
+                
+                # Calculate change
+                if quote['prev_close'] > 0:
+                    quote['change'] = quote['last_price'] - quote['prev_close']
+                    quote['change_percent'] = (quote['change'] / quote['prev_close']) * 100
+                
+                quotes[symbol] = quote
+            
+            except Exception as e:
+                print(f"❌ Error fetching quote for {symbol}: {str(e)}")
+                quotes[symbol] = {'symbol': symbol, 'last_price': 0}
+        
         return quotes
     
     def _format_nse_symbol(self, symbol: str) -> str:
@@ -182,7 +386,8 @@ class FreeFetcher(BaseFetcher):
             Formatted symbol (e.g., RELIANCE.NS)
         """
         symbol = symbol.upper().strip()
-        if not symbol.endswith('.NS') and not symbol.endswith('.BO'):
+        # Index tickers (^NSEI, ^NSEBANK) are used as-is
+        if not symbol.startswith('^') and not symbol.endswith('.NS') and not symbol.endswith('.BO'):
             symbol = f"{symbol}.NS"  # NSE by default
         return symbol
     
@@ -155,6 +155,55 @@ class KiteFetcher(BaseFetcher):
         print("⚠️  Kite Connect not configured.")
         return {'symbol': symbol, 'last_price': 0}
     
+    def get_quotes_bulk(self, symbols: List[str]) -> Dict[str, dict]:
+        """
+        Get quotes for many symbols with a single Kite quote() call
+        Kite accepts up to 500 instruments per request
+        
+        Args:
+            symbols: List of stock symbols
+        
+        Returns:
+            Dictionary with symbol as key and quote as value
+        """
+        # Uncomment when ready:
+        """
+        quotes = {}
+        
+        for i in range(0, len(symbols), 500):
+            batch = symbols[i:i + 500]
+            
+            try:
+                response = self.kite.quote(batch)
+            except Exception as e:
+                print(f"❌ Error fetching quotes: {str(e)}")
+                response = {}
+            
+            for symbol in batch:
+                quote = response.get(symbol)
+                if not quote:
+                    quotes[symbol] = {'symbol': symbol, 'last_price': 0}
+                    continue
+                
+                quotes[symbol] = {
+                    'symbol': symbol,
+                    'last_price': quote['last_price'],
+                    'open': quote['ohlc']['open'],
+                    'high': quote['ohlc']['high'],
+                    'low': quote['ohlc']['low'],
+                    'close': quote['ohlc']['close'],
+                    'volume': quote['volume'],
+                    'prev_close': quote['ohlc']['close'],
+                    'change': quote['last_price'] - quote['ohlc']['close'],
+                    'change_percent': ((quote['last_price'] - quote['ohlc']['close']) / quote['ohlc']['close']) * 100
+                }
+        
+        return quotes
+        """
+        
+        print("⚠️  Kite Connect not configured.")
+        return {symbol: {'symbol': symbol, 'last_price': 0} for symbol in symbols}
+    
     def place_order(self, symbol: str, transaction_type: str, quantity: int, 
                     order_type: str = "MARKET", product: str = "CNC", 
                     price: float = None) -> dict:
@@ -207,6 +207,30 @@ def example_7_custom_parameters():
               f"Trades: {stats['total_trades']}")
 
 
+def example_8_parameter_sweep():
+    """Example 8: Parameter Sweep"""
+    print("\n" + "="*60)
+    print("Example 8: Grid Search Over Strategy Parameters")
+    print("="*60)
+    
+    from data.free_fetcher import FreeFetcher
+    from strategies.ma_crossover import MACrossoverStrategy
+    from strategies.optimizer import ParameterOptimizer
+    
+    fetcher = FreeFetcher()
+    data = fetcher.get_historical_data('HDFCBANK', '2020-01-01', '2024-12-31')
+    
+    # Every valid short/long pair, spread across all CPU cores
+    optimizer = ParameterOptimizer(MACrossoverStrategy, {
+        'short_period': range(5, 55, 5),
+        'long_period': range(20, 210, 10)
+    })
+    results = optimizer.run(data)
+    
+    print("\n🏆 Top 10 Parameter Sets:\n")
+    print(results.head(10).to_string(index=False))
+
+
 def main():
     """Run all examples"""
     print("\n" + "="*60)
@@ -220,10 +244,11 @@ def main():
     print("5. Database Usage")
     print("6. Get Live Data")
     print("7. Custom Parameters")
-    print("8. Run All Examples")
+    print("8. Parameter Sweep")
+    print("9. Run All Examples")
     print("="*60)
     
-    choice = input("\nEnter choice (1-8): ").strip()
+    choice = input("\nEnter choice (1-9): ").strip()
     
     examples = {
         '1': example_1_basic_backtest,
@@ -233,11 +258,12 @@ def main():
         '5': example_5_database_usage,
         '6': example_6_get_live_data,
         '7': example_7_custom_parameters,
+        '8': example_8_parameter_sweep,
     }
     
     if choice in examples:
         examples[choice]()
-    elif choice == '8':
+    elif choice == '9':
         for func in examples.values():
             func()
             input("\nPress Enter to continue...")
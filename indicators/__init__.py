@@ -1,5 +1,7 @@
 """Technical indicators package"""
 from .technical import TechnicalIndicators
+from .streaming import StreamingIndicators
+from .cache import IndicatorCache, get_indicator_cache
 
-__all__ = ['TechnicalIndicators']
+__all__ = ['TechnicalIndicators', 'StreamingIndicators', 'IndicatorCache', 'get_indicator_cache']
 
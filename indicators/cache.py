@@ -0,0 +1,369 @@
+"""
+Indicator Cache
+Process-wide memo of add_all_indicators results, so the Stock Details page,
+Buy Recommendations and the autotrader share work on the same symbol
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from indicators.technical import TechnicalIndicators
+from indicators.streaming import StreamingIndicators
+
+# Appends longer than this are recomputed in batch (faster than per-bar updates)
+EXTEND_MAX_BARS = 500
+
+
+class _Entry:
+    """One cached result plus what is needed to validate and extend it"""
+    
+    __slots__ = ('frame', 'fingerprint', 'data_columns', 'stream', 'nbytes')
+    
+    def __init__(self, frame: pd.DataFrame, fingerprint: Tuple, data_columns: list,
+                 stream: Optional[StreamingIndicators] = None):
+        self.frame = frame
+        self.fingerprint = fingerprint
+        self.data_columns = data_columns
+        self.stream = stream
+        self.nbytes = int(frame.memory_usage(index=True).sum())
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator DataFrames
+    
+    Entries are keyed by (symbol, interval, last bar timestamp, row count,
+    smoothing, columns). The last bar's close and volume are checked on
+    every hit, so a still-forming bar that changed is recomputed. When the
+    data is a cached series with new bars appended, only the new bars are
+    computed (through StreamingIndicators), and a request for a subset of
+    the default columns is served from a cached full result.
+    
+    Usage:
+        cache = get_indicator_cache()
+        data_with_indicators = cache.get(data, 'RELIANCE')
+        print(cache.stats())
+    """
+    
+    def __init__(self, max_entries: int = 256, max_memory_mb: float = 256):
+        """
+        Initialize cache
+        
+        Args:
+            max_entries: Maximum cached results
+            max_memory_mb: Memory ceiling for cached DataFrames
+        """
+        self.max_entries = max_entries
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        
+        self._entries: 'OrderedDict[Tuple, _Entry]' = OrderedDict()
+        # (symbol, interval, params) -> key of the newest entry, for extensions
+        self._latest: Dict[Tuple, Tuple] = {}
+        self._lock = threading.Lock()
+        
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+    
+    # ========================================
+    # KEYS
+    # ========================================
+    
+    @staticmethod
+    def _params(smoothing: str, columns: Optional[Iterable[str]]) -> Tuple:
+        return (smoothing, None if columns is None else tuple(columns))
+    
+    @staticmethod
+    def _fingerprint(data: pd.DataFrame) -> Tuple:
+        """(first timestamp, last timestamp, rows, last close, last volume)"""
+        if 'Date' in data.columns:
+            first, last = data['Date'].iloc[0], data['Date'].iloc[-1]
+        else:
+            first, last = data.index[0], data.index[-1]
+        
+        bar = data.iloc[-1]
+        return (first, last, len(data), float(bar['Close']), float(bar['Volume']))
+    
+    @staticmethod
+    def _key(symbol: str, interval: str, fingerprint: Tuple, params: Tuple) -> Tuple:
+        return (symbol, interval, fingerprint[1], fingerprint[2], params)
+    
+    # ========================================
+    # LOOKUP
+    # ========================================
+    
+    def get(self, data: pd.DataFrame, symbol: str, interval: str = 'day',
+            smoothing: str = 'simple', columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Cached TechnicalIndicators.add_all_indicators
+        
+        Args:
+            data: DataFrame with OHLCV data
+            symbol: Stock symbol
+            interval: Data interval
+            smoothing: RSI/ATR smoothing - 'simple' or 'wilder'
+            columns: Indicator columns (default: all)
+        
+        Returns:
+            DataFrame with the indicators added (a copy - safe to modify)
+        """
+        columns = None if columns is None else list(columns)
+        
+        result = self.lookup(data, symbol, interval, smoothing, columns)
+        if result is not None:
+            return result
+        
+        result = TechnicalIndicators.add_all_indicators(data, smoothing=smoothing, columns=columns)
+        self.put(data, symbol, result, interval, smoothing, columns)
+        return result.copy()
+    
+    def lookup(self, data: pd.DataFrame, symbol: str, interval: str = 'day',
+               smoothing: str = 'simple', columns: Optional[Iterable[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Cached result without computing a miss
+        
+        Args:
+            data: DataFrame with OHLCV data
+            symbol: Stock symbol
+            interval: Data interval
+            smoothing: RSI/ATR smoothing
+            columns: Indicator columns (default: all)
+        
+        Returns:
+            DataFrame copy, or None on a miss
+        """
+        if data is None or data.empty:
+            return None
+        
+        columns = None if columns is None else list(columns)
+        params = self._params(smoothing, columns)
+        fingerprint = self._fingerprint(data)
+        
+        with self._lock:
+            # Exact hit, or a subset of a cached full result
+            candidates = [params]
+            if columns is not None and set(columns) <= set(TechnicalIndicators.COLUMNS):
+                candidates.append(self._params(smoothing, None))
+            
+            for candidate in candidates:
+                key = self._key(symbol, interval, fingerprint, candidate)
+                entry = self._entries.get(key)
+                if entry is not None and entry.fingerprint == fingerprint:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._select(entry.frame, columns)
+            
+            # Appended bars - take the entry out while it is being extended
+            entry = self._extendable(data, symbol, interval, params, fingerprint)
+            if entry is None:
+                self.misses += 1
+                return None
+        
+        result = self._extend(entry, data, symbol, smoothing, columns)
+        
+        with self._lock:
+            self._store(symbol, interval, params, fingerprint, result)
+            self.extensions += 1
+        
+        return result.frame.copy()
+    
+    def _select(self, frame: pd.DataFrame, columns: Optional[list]) -> pd.DataFrame:
+        if columns is None:
+            return frame.copy()
+        base = [c for c in frame.columns if c not in TechnicalIndicators.COLUMNS]
+        return frame[base + [c for c in columns if c not in base]].copy()
+    
+    def _extendable(self, data: pd.DataFrame, symbol: str, interval: str, params: Tuple,
+                    fingerprint: Tuple) -> Optional[_Entry]:
+        """Pop the entry `data` extends by appending bars, if any (lock held)"""
+        columns = params[1]
+        if columns is not None and not set(columns) <= set(StreamingIndicators.COLUMNS):
+            return None
+        
+        key = self._latest.get((symbol, interval, params))
+        entry = self._entries.get(key) if key is not None else None
+        if entry is None:
+            return None
+        
+        first, last, rows, last_close, last_volume = entry.fingerprint
+        new_bars = fingerprint[2] - rows
+        if not 0 < new_bars <= EXTEND_MAX_BARS or list(data.columns) != entry.data_columns:
+            return None
+        
+        # Same first bar, and the cached last bar is unchanged at its position
+        if (first, last, rows, last_close, last_volume) != self._fingerprint(data.iloc[:rows]):
+            return None
+        
+        self._remove(key)
+        return entry
+    
+    def _extend(self, entry: _Entry, data: pd.DataFrame, symbol: str, smoothing: str,
+                columns: Optional[list]) -> _Entry:
+        """Compute indicators for the appended bars only"""
+        rows = entry.fingerprint[2]
+        stream = entry.stream
+        if stream is None:
+            stream = StreamingIndicators.from_history(entry.frame, symbol, smoothing=smoothing)
+        
+        new_bars = data.iloc[rows:]
+        fields = ['Open', 'High', 'Low', 'Close', 'Volume']
+        updates = [stream.update(bar) for bar in new_bars[fields].to_dict('records')]
+        
+        values = pd.DataFrame({column: [update[column] for update in updates]
+                               for column in (TechnicalIndicators.COLUMNS if columns is None else columns)},
+                              index=new_bars.index)
+        frame = pd.concat([entry.frame, pd.concat([new_bars, values], axis=1)])
+        frame.index = data.index
+        return _Entry(frame, self._fingerprint(data), entry.data_columns, stream)
+    
+    # ========================================
+    # STORAGE
+    # ========================================
+    
+    def put(self, data: pd.DataFrame, symbol: str, result: pd.DataFrame, interval: str = 'day',
+            smoothing: str = 'simple', columns: Optional[Iterable[str]] = None):
+        """
+        Store a computed result
+        
+        Args:
+            data: The OHLCV data the result was computed from
+            symbol: Stock symbol
+            result: add_all_indicators(data, smoothing, columns) output
+            interval: Data interval
+            smoothing: RSI/ATR smoothing
+            columns: Indicator columns (default: all)
+        """
+        if data is None or data.empty:
+            return
+        
+        params = self._params(smoothing, columns)
+        fingerprint = self._fingerprint(data)
+        entry = _Entry(result.copy(), fingerprint, list(data.columns))
+        
+        with self._lock:
+            self._store(symbol, interval, params, fingerprint, entry)
+    
+    def _store(self, symbol: str, interval: str, params: Tuple, fingerprint: Tuple, entry: _Entry):
+        """Insert and evict down to the limits (lock held)"""
+        if entry.nbytes > self.max_bytes:
+            return
+        
+        key = self._key(symbol, interval, fingerprint, params)
+        self._remove(key)
+        
+        self._entries[key] = entry
+        self._latest[(symbol, interval, params)] = key
+        self.memory_bytes += entry.nbytes
+        
+        while len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        
+        self.memory_bytes -= entry.nbytes
+        latest_key = key[:2] + (key[4],)
+        if self._latest.get(latest_key) == key:
+            del self._latest[latest_key]
+    
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self.memory_bytes = 0
+            self.hits = self.misses = self.extensions = self.evictions = 0
+    
+    def stats(self) -> Dict:
+        """
+        Counters for tuning the cache size
+        
+        Returns:
+            Dictionary with hits, misses, extensions, evictions, entries,
+            memory_mb and hit_rate (extensions count as hits)
+        """
+        with self._lock:
+            lookups = self.hits + self.extensions + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'extensions': self.extensions,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'memory_mb': self.memory_bytes / 1024 / 1024,
+                'hit_rate': (self.hits + self.extensions) / lookups if lookups else 0.0
+            }
+
+
+# Process-wide cache instance
+_global_cache: Optional[IndicatorCache] = None
+_global_cache_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """
+    Get the process-wide indicator cache
+    
+    Returns:
+        IndicatorCache instance
+    """
+    global _global_cache
+    
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = IndicatorCache()
+        return _global_cache
+
+
+# Test the cache
+if __name__ == "__main__":
+    print("🧪 Testing Indicator Cache...\n")
+    
+    import time
+    import numpy as np
+    from benchmarks.synthetic import generate_ohlcv
+    
+    data = generate_ohlcv(20000, freq='D', start='1950-01-02')
+    cache = IndicatorCache(max_entries=8)
+    
+    start = time.perf_counter()
+    first = cache.get(data.iloc[:-10], 'TEST')
+    miss_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    cache.get(data.iloc[:-10], 'TEST')
+    hit_time = time.perf_counter() - start
+    print(f"✅ Miss {miss_time * 1000:.1f} ms, hit {hit_time * 1000:.1f} ms")
+    
+    # Subset of a cached full result
+    subset = cache.get(data.iloc[:-10], 'TEST', columns=['RSI'])
+    assert 'RSI' in subset.columns and 'MACD' not in subset.columns
+    
+    # Ten new bars appended - only those are computed
+    start = time.perf_counter()
+    extended = cache.get(data, 'TEST')
+    extend_time = time.perf_counter() - start
+    expected = TechnicalIndicators.add_all_indicators(data)
+    for column in TechnicalIndicators.COLUMNS:
+        assert np.allclose(expected[column].to_numpy(dtype=float), extended[column].to_numpy(dtype=float),
+                           rtol=1e-9, atol=1e-9, equal_nan=True), column
+    print(f"✅ 10 appended bars extended in {extend_time * 1000:.1f} ms and match a full recompute")
+    
+    # A changed last bar (still forming) is not served from the cache
+    revised = data.copy()
+    revised.loc[revised.index[-1], 'Close'] += 1
+    assert cache.get(revised, 'TEST')['Close'].iloc[-1] == revised['Close'].iloc[-1]
+    
+    # Returned frames are copies
+    extended['RSI'] = 0
+    assert not (cache.get(data, 'TEST')['RSI'] == 0).all()
+    
+    print(f"✅ Stats: {cache.stats()}")
+    print("\n✅ Indicator cache test complete!")
@@ -0,0 +1,445 @@
+"""
+Streaming Technical Indicators
+Incremental counterpart of TechnicalIndicators.add_all_indicators -
+each new bar updates every indicator in O(1) instead of recomputing
+the whole history
+"""
+import copy
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from indicators import kernels
+
+NAN = float('nan')
+
+
+class _RollingWindow:
+    """Fixed-size window with running sum and sum of squares"""
+    
+    # Re-add the window every N updates to stop floating point drift
+    RESYNC_EVERY = 10000
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self.updates = 0
+    
+    def push(self, value: float):
+        self.values.append(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+            self.total_sq += value * value
+        
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+                self.total_sq -= old * old
+        
+        self.updates += 1
+        if self.updates % self.RESYNC_EVERY == 0:
+            finite = [v for v in self.values if not math.isnan(v)]
+            self.total = math.fsum(finite)
+            self.total_sq = math.fsum(v * v for v in finite)
+    
+    @property
+    def ready(self) -> bool:
+        # Same as pandas rolling(window) - full window, no NaN inside
+        return len(self.values) == self.size and self.nan_count == 0
+    
+    def mean(self) -> float:
+        return self.total / self.size if self.ready else NAN
+    
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1) like pandas"""
+        if not self.ready or self.size < 2:
+            return NAN
+        variance = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class _EMA:
+    """Exponential moving average matching pandas ewm(span, adjust=False)"""
+    
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = NAN
+    
+    def push(self, value: float) -> float:
+        if math.isnan(self.value):
+            self.value = value
+        elif not math.isnan(value):
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class _WilderAverage:
+    """Wilder's smoothing - SMA of the first `period` values, then a recursive average"""
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+    
+    def push(self, value: float):
+        # Leading NaNs (no previous close yet) are skipped, as in kernels.wilder_mean
+        if math.isnan(value) and self.count == 0:
+            return
+        
+        self.count += 1
+        if self.count < self.size:
+            self.total += value
+        elif self.count == self.size:
+            self.value = (self.total + value) / self.size
+        else:
+            self.value += (value - self.value) / self.size
+    
+    def mean(self) -> float:
+        return self.value
+
+
+class _RollingExtreme:
+    """Rolling min or max with a monotonic deque (amortized O(1))"""
+    
+    def __init__(self, size: int, mode: str = 'max'):
+        self.size = size
+        self.is_max = mode == 'max'
+        self.window = deque()  # (index, value), values monotonic
+        self.index = -1
+    
+    def push(self, value: float) -> float:
+        self.index += 1
+        
+        if self.is_max:
+            while self.window and self.window[-1][1] <= value:
+                self.window.pop()
+        else:
+            while self.window and self.window[-1][1] >= value:
+                self.window.pop()
+        self.window.append((self.index, value))
+        
+        while self.window[0][0] <= self.index - self.size:
+            self.window.popleft()
+        
+        return self.window[0][1] if self.index >= self.size - 1 else NAN
+
+
+def _divide(a: float, b: float) -> float:
+    """Float division with pandas/NumPy semantics (x/0 = ±inf, 0/0 = NaN)"""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+class StreamingIndicators:
+    """
+    Stateful indicator engine for one symbol
+    
+    Keeps running sums, EMA state and monotonic deques so that each new
+    bar is processed in constant time. Values match add_all_indicators
+    column for column.
+    
+    Usage:
+        stream = StreamingIndicators.from_history(data, 'RELIANCE')
+        latest = stream.update({'Open': ..., 'High': ..., 'Low': ...,
+                                'Close': ..., 'Volume': ...})
+        print(latest['RSI'], latest['MACD'])
+    """
+    
+    COLUMNS = [
+        'SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI',
+        'MACD', 'MACD_Signal', 'MACD_Hist', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+        'ATR', 'Stoch_K', 'Stoch_D', 'OBV', 'VWAP'
+    ]
+    
+    def __init__(self, symbol: Optional[str] = None, rsi_period: int = 14,
+                 atr_period: int = 14, stoch_period: int = 14, smoothing: str = 'simple'):
+        """
+        Initialize empty indicator state
+        
+        Args:
+            symbol: Stock symbol (informational)
+            rsi_period: RSI period
+            atr_period: ATR period
+            stoch_period: Stochastic lookback period
+            smoothing: RSI/ATR smoothing - 'simple' or 'wilder'
+                       (same as add_all_indicators)
+        """
+        if smoothing not in ('simple', 'wilder'):
+            raise ValueError(f"Unknown smoothing '{smoothing}'")
+        
+        self.symbol = symbol
+        self.smoothing = smoothing
+        self.bars = 0
+        self.prev_close = NAN
+        
+        # Moving averages (SMA_20 doubles as the Bollinger middle band)
+        self.sma_20 = _RollingWindow(20)
+        self.sma_50 = _RollingWindow(50)
+        self.sma_200 = _RollingWindow(200)
+        self.ema_12 = _EMA(12)
+        self.ema_26 = _EMA(26)
+        self.macd_signal = _EMA(9)
+        
+        # RSI and ATR averages
+        average = _WilderAverage if smoothing == 'wilder' else _RollingWindow
+        self.gains = average(rsi_period)
+        self.losses = average(rsi_period)
+        self.true_range = average(atr_period)
+        
+        # Stochastic
+        self.low_min = _RollingExtreme(stoch_period, 'min')
+        self.high_max = _RollingExtreme(stoch_period, 'max')
+        self.stoch_raw = _RollingWindow(3)
+        self.stoch_k = _RollingWindow(3)
+        
+        # Volume
+        self.obv = 0.0
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+        
+        self.latest = {}
+    
+    @classmethod
+    def from_history(cls, data: pd.DataFrame, symbol: Optional[str] = None, **kwargs) -> 'StreamingIndicators':
+        """
+        Build state from historical bars
+        
+        Long histories aren't replayed bar by bar: the recursive state
+        (EMAs, Wilder averages, OBV, VWAP sums) is computed with the array
+        kernels, and only the last few hundred bars are replayed to fill the
+        rolling windows.
+        
+        Args:
+            data: DataFrame with OHLCV data
+            symbol: Stock symbol
+            **kwargs: Indicator periods passed to the constructor
+        
+        Returns:
+            StreamingIndicators ready for live updates
+        """
+        stream = cls(symbol, **kwargs)
+        columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        
+        replay_from = stream._seed(data) if len(data) > 2 * stream.warmup else 0
+        
+        for open_, high, low, close, volume in data[columns].iloc[replay_from:].itertuples(index=False, name=None):
+            stream.update({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume})
+        
+        return stream
+    
+    @property
+    def warmup(self) -> int:
+        """Bars that fill every rolling window"""
+        return max(self.sma_200.size, self.gains.size + 1, self.true_range.size + 1,
+                   self.low_min.size + self.stoch_raw.size + self.stoch_k.size)
+    
+    def _seed(self, data: pd.DataFrame) -> int:
+        """
+        Set the recursive state as of the bar before the warm-up window
+        
+        Returns:
+            Row to start replaying from
+        """
+        last = len(data) - self.warmup - 1
+        close = kernels.as_float_array(data['Close'])
+        high = kernels.as_float_array(data['High'])
+        low = kernels.as_float_array(data['Low'])
+        volume = kernels.as_float_array(data['Volume'])
+        head = slice(0, last + 1)
+        
+        self.bars = last + 1
+        self.prev_close = float(close[last])
+        
+        # EMAs and the MACD signal line
+        ema_12 = kernels.ema(close[head], 12)
+        ema_26 = kernels.ema(close[head], 26)
+        self.ema_12.value = float(ema_12[-1])
+        self.ema_26.value = float(ema_26[-1])
+        self.macd_signal.value = float(kernels.ema(ema_12 - ema_26, 9)[-1])
+        
+        # Cumulative volume indicators
+        self.obv = float(kernels.obv(close[head], volume[head])[-1])
+        typical = (high[head] + low[head] + close[head]) / 3
+        self.cum_pv = float(np.nansum(typical * volume[head]))
+        self.cum_volume = float(np.nansum(volume[head]))
+        
+        # Wilder averages (rolling windows are filled by the replay instead)
+        if self.smoothing == 'wilder':
+            delta = kernels.diff(close[head])
+            tr = kernels.true_range(high[head], low[head], close[head])
+            tr[0] = NAN
+            for average, values in ((self.gains, np.maximum(delta, 0.0)),
+                                    (self.losses, np.maximum(-delta, 0.0)),
+                                    (self.true_range, tr)):
+                average.count = last
+                average.value = float(kernels.wilder_mean(values, average.size)[-1])
+        
+        return last + 1
+    
+    def update(self, bar) -> Dict:
+        """
+        Add a completed bar and return the latest indicator values
+        
+        Args:
+            bar: Dict or Series with Open, High, Low, Close, Volume (Date optional)
+        
+        Returns:
+            Dictionary with the bar's OHLCV and all indicator columns
+        """
+        high = float(bar['High'])
+        low = float(bar['Low'])
+        close = float(bar['Close'])
+        volume = float(bar['Volume'])
+        prev_close = self.prev_close
+        
+        # Moving averages
+        self.sma_20.push(close)
+        self.sma_50.push(close)
+        self.sma_200.push(close)
+        ema_12 = self.ema_12.push(close)
+        ema_26 = self.ema_26.push(close)
+        
+        # MACD
+        macd = ema_12 - ema_26
+        macd_signal = self.macd_signal.push(macd)
+        
+        # RSI (first bar has no change - a zero gain/loss for 'simple',
+        # skipped for 'wilder', like the batch kernels)
+        delta = close - prev_close if self.bars else NAN
+        if math.isnan(delta) and self.smoothing == 'wilder':
+            self.gains.push(NAN)
+            self.losses.push(NAN)
+        else:
+            self.gains.push(delta if delta > 0 else 0.0)
+            self.losses.push(-delta if delta < 0 else 0.0)
+        rs = _divide(self.gains.mean(), self.losses.mean())
+        rsi = 100 - (100 / (1 + rs)) if not math.isnan(rs) else NAN
+        
+        # Bollinger Bands
+        middle = self.sma_20.mean()
+        std = self.sma_20.std()
+        
+        # ATR
+        if self.bars:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        else:
+            true_range = high - low if self.smoothing == 'simple' else NAN
+        self.true_range.push(true_range)
+        
+        # Stochastic
+        low_min = self.low_min.push(low)
+        high_max = self.high_max.push(high)
+        self.stoch_raw.push(100 * _divide(close - low_min, high_max - low_min))
+        stoch_k = self.stoch_raw.mean()
+        self.stoch_k.push(stoch_k)
+        
+        # OBV
+        if self.bars and close != prev_close:
+            self.obv += volume if close > prev_close else -volume
+        
+        # VWAP
+        typical_price = (high + low + close) / 3
+        self.cum_pv += typical_price * volume
+        self.cum_volume += volume
+        
+        self.prev_close = close
+        self.bars += 1
+        
+        latest = {key: bar[key] for key in ('Date', 'Open', 'High', 'Low', 'Close', 'Volume') if key in bar}
+        latest.update({
+            'SMA_20': middle,
+            'SMA_50': self.sma_50.mean(),
+            'SMA_200': self.sma_200.mean(),
+            'EMA_12': ema_12,
+            'EMA_26': ema_26,
+            'RSI': rsi,
+            'MACD': macd,
+            'MACD_Signal': macd_signal,
+            'MACD_Hist': macd - macd_signal,
+            'BB_Upper': middle + std * 2,
+            'BB_Middle': middle,
+            'BB_Lower': middle - std * 2,
+            'ATR': self.true_range.mean(),
+            'Stoch_K': stoch_k,
+            'Stoch_D': self.stoch_k.mean(),
+            'OBV': self.obv,
+            'VWAP': _divide(self.cum_pv, self.cum_volume)
+        })
+        
+        self.latest = latest
+        return latest
+    
+    def preview(self, bar) -> Dict:
+        """
+        Indicator values if the still-forming bar closed now
+        State is not modified - use for intra-bar ticks
+        
+        Args:
+            bar: Dict or Series with the in-progress bar's OHLCV
+        
+        Returns:
+            Dictionary with indicator values
+        """
+        return copy.deepcopy(self).update(bar)
+    
+    def to_series(self) -> pd.Series:
+        """Latest values as a Series (same shape as add_all_indicators().iloc[-1])"""
+        return pd.Series(self.latest)
+
+
+# Test the streaming engine against the batch calculation
+if __name__ == "__main__":
+    print("🧪 Testing Streaming Indicators...\n")
+    
+    from indicators.technical import TechnicalIndicators
+    
+    rng = np.random.default_rng(1)
+    n = 600
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    sample_data = pd.DataFrame({
+        'Date': pd.date_range('2023-01-01', periods=n),
+        'Open': close + rng.normal(0, 0.5, n),
+        'High': close + np.abs(rng.normal(0, 1, n)),
+        'Low': close - np.abs(rng.normal(0, 1, n)),
+        'Close': close,
+        'Volume': rng.integers(1000, 10000, n)
+    })
+    
+    batch = TechnicalIndicators.add_all_indicators(sample_data)
+    
+    # Warm up on all but the last 100 bars, then stream the rest
+    stream = StreamingIndicators.from_history(sample_data.iloc[:-100], 'TEST')
+    streamed = [stream.update(row) for _, row in sample_data.iloc[-100:].iterrows()]
+    streamed = pd.DataFrame(streamed)
+    
+    for column in StreamingIndicators.COLUMNS:
+        expected = batch[column].iloc[-100:].to_numpy(dtype=float)
+        actual = streamed[column].to_numpy(dtype=float)
+        assert np.allclose(expected, actual, rtol=1e-9, atol=1e-9, equal_nan=True), column
+    
+    print(f"✅ {len(StreamingIndicators.COLUMNS)} columns match add_all_indicators")
+    
+    # Wilder smoothing matches the batch kernels too
+    wilder_batch = TechnicalIndicators.add_all_indicators(sample_data, smoothing='wilder')
+    wilder_stream = StreamingIndicators.from_history(sample_data, 'TEST', smoothing='wilder')
+    for column in ('RSI', 'ATR'):
+        assert np.isclose(wilder_batch[column].iloc[-1], wilder_stream.latest[column], rtol=1e-9), column
+    print("✅ Wilder RSI/ATR match add_all_indicators(smoothing='wilder')")
+    print(f"✅ Latest RSI: {stream.latest['RSI']:.2f}, MACD: {stream.latest['MACD']:.4f}")
+    
+    print("\n✅ Streaming indicators test complete!")
@@ -4,7 +4,53 @@ Calculate all popular technical indicators for trading strategies
 """
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from indicators import kernels
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Indicator dependency graph: column -> (dependencies, compute(values, smoothing))
+# Dependencies are price fields or other columns. Each node is computed
+# once per request and shared - MACD reuses EMA_12/EMA_26, ADX reuses ATR,
+# BB_Middle is SMA_20. Names starting with '_' are intermediates.
+INDICATOR_GRAPH = {
+    'RSI': (['Close'], lambda v, s: kernels.rsi(v['Close'], 14, s)),
+    'MACD': (['EMA_12', 'EMA_26'], lambda v, s: v['EMA_12'] - v['EMA_26']),
+    'MACD_Signal': (['MACD'], lambda v, s: kernels.ema(v['MACD'], 9)),
+    'MACD_Hist': (['MACD', 'MACD_Signal'], lambda v, s: v['MACD'] - v['MACD_Signal']),
+    'BB_Middle': (['SMA_20'], lambda v, s: v['SMA_20'].copy()),
+    '_BB_Width': (['Close'], lambda v, s: kernels.rolling_std(v['Close'], 20) * 2),
+    'BB_Upper': (['BB_Middle', '_BB_Width'], lambda v, s: v['BB_Middle'] + v['_BB_Width']),
+    'BB_Lower': (['BB_Middle', '_BB_Width'], lambda v, s: v['BB_Middle'] - v['_BB_Width']),
+    'ATR': (['High', 'Low', 'Close'], lambda v, s: kernels.atr(v['High'], v['Low'], v['Close'], 14, s)),
+    'ADX': (['High', 'Low', 'Close', 'ATR'],
+            lambda v, s: kernels.adx(v['High'], v['Low'], v['Close'], 14, s, average_range=v['ATR'])),
+    'Stoch_K': (['High', 'Low', 'Close'], lambda v, s: kernels.stochastic_k(v['High'], v['Low'], v['Close'])),
+    'Stoch_D': (['Stoch_K'], lambda v, s: kernels.rolling_mean(v['Stoch_K'], 3)),
+    'OBV': (['Close', 'Volume'], lambda v, s: kernels.obv(v['Close'], v['Volume'])),
+    'VWAP': (['High', 'Low', 'Close', 'Volume'],
+             lambda v, s: kernels.vwap(v['High'], v['Low'], v['Close'], v['Volume'])),
+}
+
+# Families with the period in the column name: SMA_200, EMA_9, RSI_21, ...
+INDICATOR_FAMILIES = {
+    'SMA': lambda period: (['Close'], lambda v, s: kernels.rolling_mean(v['Close'], period)),
+    'EMA': lambda period: (['Close'], lambda v, s: kernels.ema(v['Close'], period)),
+    'RSI': lambda period: (['Close'], lambda v, s: kernels.rsi(v['Close'], period, s)),
+}
+
+
+def _indicator_node(name: str):
+    """(dependencies, compute) for a column, from the graph or a family"""
+    if name in INDICATOR_GRAPH:
+        return INDICATOR_GRAPH[name]
+    
+    family, _, period = name.partition('_')
+    if family in INDICATOR_FAMILIES and period.isdigit() and int(period) > 0:
+        return INDICATOR_FAMILIES[family](int(period))
+    
+    raise ValueError(f"Unknown indicator '{name}'")
 
 class TechnicalIndicators:
     """
@@ -12,6 +58,16 @@ class TechnicalIndicators:
     All methods are static - no need to instantiate
     """
     
+    # Columns add_all_indicators() adds by default
+    COLUMNS = [
+        'SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI',
+        'MACD', 'MACD_Signal', 'MACD_Hist', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+        'ATR', 'Stoch_K', 'Stoch_D', 'OBV', 'VWAP'
+    ]
+    
+    # Columns generate_signals() reads
+    SIGNAL_COLUMNS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'BB_Upper', 'BB_Lower']
+    
     @staticmethod
     def calculate_sma(data: pd.DataFrame, period: int = 20, column: str = 'Close') -> pd.Series:
         """
@@ -43,7 +99,8 @@ class TechnicalIndicators:
         return data[column].ewm(span=period, adjust=False).mean()
     
     @staticmethod
-    def calculate_rsi(data: pd.DataFrame, period: int = 14, column: str = 'Close') -> pd.Series:
+    def calculate_rsi(data: pd.DataFrame, period: int = 14, column: str = 'Close',
+                      smoothing: str = 'simple') -> pd.Series:
         """
         Relative Strength Index (RSI)
         
@@ -51,22 +108,13 @@ class TechnicalIndicators:
             data: DataFrame with price data
             period: RSI period (default 14)
             column: Column to calculate RSI on
+            smoothing: 'simple' (rolling mean) or 'wilder'
         
         Returns:
             Series with RSI values (0-100)
         """
-        delta = data[column].diff()
-        
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        rsi = kernels.rsi(kernels.as_float_array(data[column]), period, smoothing)
+        return pd.Series(rsi, index=data.index)
     
     @staticmethod
     def calculate_macd(data: pd.DataFrame, fast: int = 12, slow: int = 26, 
@@ -117,7 +165,7 @@ class TechnicalIndicators:
         return upper_band, middle_band, lower_band
     
     @staticmethod
-    def calculate_atr(data: pd.DataFrame, period: int = 14) -> pd.Series:
+    def calculate_atr(data: pd.DataFrame, period: int = 14, smoothing: str = 'simple') -> pd.Series:
         """
         Average True Range (ATR)
         Measures volatility
@@ -125,22 +173,18 @@ class TechnicalIndicators:
         Args:
             data: DataFrame with OHLC data
             period: ATR period
+            smoothing: 'simple' (rolling mean) or 'wilder'
         
         Returns:
             Series with ATR values
         """
-        high = data['High']
-        low = data['Low']
-        close = data['Close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr
+        atr = kernels.atr(
+            kernels.as_float_array(data['High']),
+            kernels.as_float_array(data['Low']),
+            kernels.as_float_array(data['Close']),
+            period, smoothing
+        )
+        return pd.Series(atr, index=data.index)
     
     @staticmethod
     def calculate_stochastic(data: pd.DataFrame, period: int = 14, 
@@ -157,17 +201,16 @@ class TechnicalIndicators:
         Returns:
             Tuple of (%K line, %D line)
         """
-        low_min = data['Low'].rolling(window=period).min()
-        high_max = data['High'].rolling(window=period).max()
-        
-        k = 100 * (data['Close'] - low_min) / (high_max - low_min)
-        k = k.rolling(window=smooth_k).mean()
-        d = k.rolling(window=smooth_d).mean()
-        
-        return k, d
+        k, d = kernels.stochastic(
+            kernels.as_float_array(data['High']),
+            kernels.as_float_array(data['Low']),
+            kernels.as_float_array(data['Close']),
+            period, smooth_k, smooth_d
+        )
+        return pd.Series(k, index=data.index), pd.Series(d, index=data.index)
     
     @staticmethod
-    def calculate_adx(data: pd.DataFrame, period: int = 14) -> pd.Series:
+    def calculate_adx(data: pd.DataFrame, period: int = 14, smoothing: str = 'simple') -> pd.Series:
         """
         Average Directional Index (ADX)
         Measures trend strength
@@ -175,29 +218,18 @@ class TechnicalIndicators:
         Args:
             data: DataFrame with OHLC data
             period: ADX period
+            smoothing: 'simple' (rolling mean) or 'wilder'
         
         Returns:
             Series with ADX values
         """
-        high = data['High']
-        low = data['Low']
-        close = data['Close']
-        
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm < 0] = 0
-        
-        tr = TechnicalIndicators.calculate_atr(data, period)
-        
-        plus_di = 100 * (plus_dm.rolling(window=period).mean() / tr)
-        minus_di = 100 * (minus_dm.rolling(window=period).mean() / tr)
-        
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=period).mean()
-        
-        return adx
+        adx = kernels.adx(
+            kernels.as_float_array(data['High']),
+            kernels.as_float_array(data['Low']),
+            kernels.as_float_array(data['Close']),
+            period, smoothing
+        )
+        return pd.Series(adx, index=data.index)
     
     @staticmethod
     def calculate_obv(data: pd.DataFrame) -> pd.Series:
@@ -230,55 +262,243 @@ class TechnicalIndicators:
         return vwap
     
     @staticmethod
-    def add_all_indicators(data: pd.DataFrame) -> pd.DataFrame:
+    def resolve_indicators(columns: Iterable[str]) -> List[str]:
+        """
+        Plan the work for a set of indicator columns
+        
+        Args:
+            columns: Requested columns (see COLUMNS, INDICATOR_GRAPH, and the
+                     SMA_<n> / EMA_<n> / RSI_<n> families)
+        
+        Returns:
+            Columns and intermediates to compute, dependencies first, each once
+        """
+        order = []
+        
+        def visit(name):
+            if name in order or name in PANEL_FIELDS:
+                return
+            dependencies, _ = _indicator_node(name)
+            for dependency in dependencies:
+                visit(dependency)
+            order.append(name)
+        
+        for name in columns:
+            visit(name)
+        return order
+    
+    @staticmethod
+    def required_fields(columns: Iterable[str]) -> List[str]:
+        """
+        Price fields (High, Low, Close, Volume) a set of columns needs
+        
+        Args:
+            columns: Requested columns
+        
+        Returns:
+            List of price field names
+        """
+        fields = set()
+        for name in TechnicalIndicators.resolve_indicators(columns):
+            fields.update(d for d in _indicator_node(name)[0] if d in PANEL_FIELDS)
+        return [f for f in PANEL_FIELDS if f in fields]
+    
+    @staticmethod
+    def compute_indicators(prices: Dict[str, np.ndarray], columns: Iterable[str],
+                           smoothing: str = 'simple') -> Dict[str, np.ndarray]:
+        """
+        Compute indicator columns from price arrays via the dependency graph
+        
+        Args:
+            prices: Dictionary of price field -> float array, 1-D (one symbol)
+                    or 2-D (bars x symbols)
+            columns: Requested columns
+            smoothing: RSI/ATR/ADX smoothing - 'simple' (rolling mean) or 'wilder'
+        
+        Returns:
+            Dictionary of requested column -> array
+        """
+        columns = list(columns)
+        values = dict(prices)
+        
+        for name in TechnicalIndicators.resolve_indicators(columns):
+            _, compute = _indicator_node(name)
+            values[name] = compute(values, smoothing)
+        
+        return {name: values[name] for name in columns}
+    
+    @staticmethod
+    def add_all_indicators(data: pd.DataFrame, smoothing: str = 'simple',
+                           columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
         """
-        Add all common indicators to DataFrame
+        Add common indicators to DataFrame
+        
+        Only the requested columns and what they depend on are computed,
+        e.g. columns=['RSI'] skips the moving averages, MACD, VWAP, ...
         
         Args:
             data: DataFrame with OHLC data
+            smoothing: RSI/ATR smoothing - 'simple' (rolling mean) or 'wilder'
+            columns: Indicator columns to add (default: all of COLUMNS)
         
         Returns:
-            DataFrame with all indicators added
+            DataFrame with the indicators added
         """
         df = data.copy()
+        columns = TechnicalIndicators.COLUMNS if columns is None else list(columns)
         
-        # Moving Averages
-        df['SMA_20'] = TechnicalIndicators.calculate_sma(df, 20)
-        df['SMA_50'] = TechnicalIndicators.calculate_sma(df, 50)
-        df['SMA_200'] = TechnicalIndicators.calculate_sma(df, 200)
-        df['EMA_12'] = TechnicalIndicators.calculate_ema(df, 12)
-        df['EMA_26'] = TechnicalIndicators.calculate_ema(df, 26)
+        prices = {field: kernels.as_float_array(df[field])
+                  for field in TechnicalIndicators.required_fields(columns)}
         
-        # RSI
-        df['RSI'] = TechnicalIndicators.calculate_rsi(df, 14)
+        for name, values in TechnicalIndicators.compute_indicators(prices, columns, smoothing).items():
+            df[name] = values
         
-        # MACD
-        macd, signal, hist = TechnicalIndicators.calculate_macd(df)
-        df['MACD'] = macd
-        df['MACD_Signal'] = signal
-        df['MACD_Hist'] = hist
+        return df
+    
+    # ========================================
+    # PANELS (MANY SYMBOLS AT ONCE)
+    # ========================================
+    
+    @staticmethod
+    def to_panel(data: Dict[str, pd.DataFrame], align: str = 'date') -> pd.DataFrame:
+        """
+        Combine per-symbol OHLCV DataFrames into one wide panel
         
-        # Bollinger Bands
-        upper, middle, lower = TechnicalIndicators.calculate_bollinger_bands(df)
-        df['BB_Upper'] = upper
-        df['BB_Middle'] = middle
-        df['BB_Lower'] = lower
+        Args:
+            data: Dictionary of symbol -> DataFrame (with a Date column)
+            align: 'date' - rows are the union of all dates, missing bars are NaN
+                   'end'  - each symbol's bars are right-aligned by position, so
+                            the last row is every symbol's latest bar and each
+                            column's indicators equal its own add_all_indicators
         
-        # ATR
-        df['ATR'] = TechnicalIndicators.calculate_atr(df, 14)
+        Returns:
+            DataFrame with (field, symbol) MultiIndex columns
+        """
+        if align not in ('date', 'end'):
+            raise ValueError(f"Unknown align '{align}' (use 'date' or 'end')")
+        
+        frames = {}
+        for symbol, df in data.items():
+            if df is None or df.empty:
+                continue
+            fields = df[[f for f in PANEL_FIELDS if f in df.columns]]
+            if align == 'date':
+                frames[symbol] = fields.set_index(df['Date']) if 'Date' in df.columns else fields
+            else:
+                frames[symbol] = fields.reset_index(drop=True)
+        
+        if not frames:
+            return pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=['field', 'symbol']))
+        
+        if align == 'end':
+            n_rows = max(len(df) for df in frames.values())
+            frames = {symbol: df.set_axis(range(n_rows - len(df), n_rows)) for symbol, df in frames.items()}
+        
+        panel = pd.concat(frames, axis=1, names=['symbol', 'field']).swaplevel(axis=1)
+        fields = [f for f in PANEL_FIELDS if f in panel.columns.get_level_values(0)]
+        return panel[fields].sort_index()
+    
+    @staticmethod
+    def calculate_panel(close: np.ndarray, high: Optional[np.ndarray] = None,
+                        low: Optional[np.ndarray] = None, volume: Optional[np.ndarray] = None,
+                        smoothing: str = 'simple',
+                        columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Compute indicator columns for a (bars x symbols) panel
         
-        # Stochastic
-        k, d = TechnicalIndicators.calculate_stochastic(df)
-        df['Stoch_K'] = k
-        df['Stoch_D'] = d
+        Each indicator is one vectorized pass over all symbols. By default
+        every column in COLUMNS whose price fields were given is computed
+        (no highs/lows: no ATR, Stochastic or VWAP; no volume: no OBV/VWAP).
         
-        # OBV
-        df['OBV'] = TechnicalIndicators.calculate_obv(df)
+        Args:
+            close: 2-D array of closes (bars x symbols)
+            high: 2-D array of highs
+            low: 2-D array of lows
+            volume: 2-D array of volumes
+            smoothing: RSI/ATR smoothing - 'simple' (rolling mean) or 'wilder'
+            columns: Indicator columns to compute
         
-        # VWAP (if intraday data)
-        df['VWAP'] = TechnicalIndicators.calculate_vwap(df)
+        Returns:
+            Dictionary of indicator name -> 2-D array
+        """
+        prices = {'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+        prices = {field: kernels.as_float_array(values) for field, values in prices.items() if values is not None}
         
-        return df
+        if columns is None:
+            columns = [name for name in TechnicalIndicators.COLUMNS
+                       if set(TechnicalIndicators.required_fields([name])) <= prices.keys()]
+        
+        return TechnicalIndicators.compute_indicators(prices, columns, smoothing)
+    
+    @staticmethod
+    def add_all_indicators_panel(data: Union[pd.DataFrame, np.ndarray],
+                                 high: Union[pd.DataFrame, np.ndarray, None] = None,
+                                 low: Union[pd.DataFrame, np.ndarray, None] = None,
+                                 volume: Union[pd.DataFrame, np.ndarray, None] = None,
+                                 smoothing: str = 'simple',
+                                 columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Add all common indicators to a multi-symbol panel in one pass
+        
+        Args:
+            data: One of
+                  - (field, symbol) MultiIndex DataFrame, e.g. from to_panel()
+                    or a yfinance multi-ticker download
+                  - wide DataFrame of closes (one column per symbol)
+                  - 2-D array of closes (bars x symbols)
+            high: Highs in the same layout as a wide/array `data`
+            low: Lows in the same layout as a wide/array `data`
+            volume: Volumes in the same layout as a wide/array `data`
+            smoothing: RSI/ATR smoothing - 'simple' (rolling mean) or 'wilder'
+            columns: Indicator columns to compute (default: all available)
+        
+        Returns:
+            DataFrame with (field/indicator, symbol) MultiIndex columns -
+            panel['RSI'] is a bars x symbols frame of RSI values
+        """
+        inputs = {}
+        
+        if isinstance(data, pd.DataFrame) and isinstance(data.columns, pd.MultiIndex):
+            # yfinance group_by='ticker' puts the symbol first
+            if 'Close' not in data.columns.get_level_values(0):
+                data = data.swaplevel(axis=1)
+            close = data['Close']
+            for field in PANEL_FIELDS:
+                if field in data.columns.get_level_values(0):
+                    inputs[field] = data[field].reindex(columns=close.columns)
+        else:
+            inputs = {'High': high, 'Low': low, 'Close': data, 'Volume': volume}
+            inputs = {field: values for field, values in inputs.items() if values is not None}
+            close = data
+        
+        if isinstance(close, pd.DataFrame):
+            index, symbols = close.index, close.columns
+        else:
+            index, symbols = pd.RangeIndex(len(close)), pd.RangeIndex(np.shape(close)[1])
+        
+        arrays = {field: kernels.as_float_array(values) for field, values in inputs.items()}
+        arrays.update(TechnicalIndicators.calculate_panel(
+            arrays['Close'], arrays.get('High'), arrays.get('Low'), arrays.get('Volume'),
+            smoothing, columns
+        ))
+        
+        # One contiguous block instead of concatenating dozens of frames
+        columns = pd.MultiIndex.from_product([list(arrays.keys()), symbols], names=['field', 'symbol'])
+        return pd.DataFrame(np.concatenate(list(arrays.values()), axis=1), index=index, columns=columns)
+    
+    @staticmethod
+    def panel_snapshot(panel: pd.DataFrame, row: int = -1) -> pd.DataFrame:
+        """
+        One row of a panel as a symbols x indicators table (for screens)
+        
+        Args:
+            panel: Output of add_all_indicators_panel()
+            row: Row position (default: latest bar)
+        
+        Returns:
+            DataFrame indexed by symbol, one column per field/indicator
+        """
+        return panel.iloc[row].unstack(level=0)[panel.columns.unique(level=0)]
     
     @staticmethod
     def generate_signals(data: pd.DataFrame) -> pd.DataFrame:
@@ -286,12 +506,13 @@ class TechnicalIndicators:
         Generate basic buy/sell signals based on indicators
         
         Args:
-            data: DataFrame with indicators
+            data: DataFrame with indicators (missing SIGNAL_COLUMNS are computed)
         
         Returns:
             DataFrame with signal columns added
         """
-        df = data.copy()
+        missing = [c for c in TechnicalIndicators.SIGNAL_COLUMNS if c not in data.columns]
+        df = TechnicalIndicators.add_all_indicators(data, columns=missing) if missing else data.copy()
         
         # MA Crossover Signal
         df['MA_Signal'] = 0
@@ -363,11 +584,50 @@ if __name__ == "__main__":
     print(f"✅ Total columns: {len(data_with_indicators.columns)}")
     print(f"✅ Indicators added: {list(data_with_indicators.columns)}")
     
+    # Test selective indicators
+    print("\n📈 Requesting only RSI and MACD_Hist...")
+    selected = TechnicalIndicators.add_all_indicators(sample_data, columns=['RSI', 'MACD_Hist'])
+    assert [c for c in selected.columns if c not in sample_data.columns] == ['RSI', 'MACD_Hist']
+    assert np.allclose(selected['MACD_Hist'], data_with_indicators['MACD_Hist'], equal_nan=True)
+    print(f"✅ Work plan: {TechnicalIndicators.resolve_indicators(['RSI', 'MACD_Hist'])}")
+    
     # Test signals
     print("\n📈 Generating signals...")
     data_with_signals = TechnicalIndicators.generate_signals(data_with_indicators)
     print(f"✅ Signals generated!")
     print(data_with_signals[['Close', 'MA_Signal', 'RSI_Signal', 'Combined_Signal']].tail())
     
+    # Test panel (many symbols at once)
+    print("\n📈 Testing panel indicators...")
+    import time
+    from benchmarks.synthetic import generate_ohlcv
+    
+    history = {f"SYM{i}": generate_ohlcv(300 - 40 * i, seed=i, freq='D') for i in range(4)}
+    for smoothing in ('simple', 'wilder'):
+        panel = TechnicalIndicators.add_all_indicators_panel(
+            TechnicalIndicators.to_panel(history, align='end'), smoothing=smoothing
+        )
+        for symbol, data in history.items():
+            expected = TechnicalIndicators.add_all_indicators(data, smoothing=smoothing)
+            actual = panel.xs(symbol, axis=1, level='symbol').iloc[-len(data):]
+            for column in actual.columns:
+                assert np.allclose(expected[column].to_numpy(dtype=float), actual[column].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, equal_nan=True), (smoothing, symbol, column)
+    print(f"✅ Panel matches add_all_indicators per symbol (simple + wilder)")
+    
+    n_bars, n_symbols = 250, 2000
+    rng = np.random.default_rng(0)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_bars, n_symbols)), axis=0))
+    highs, lows = closes * 1.01, closes * 0.99
+    volumes = rng.integers(1000, 100000, (n_bars, n_symbols))
+    
+    start = time.perf_counter()
+    panel = TechnicalIndicators.add_all_indicators_panel(closes, highs, lows, volumes)
+    screen = TechnicalIndicators.panel_snapshot(panel)
+    oversold = screen[screen['RSI'] < 30]
+    elapsed = time.perf_counter() - start
+    print(f"✅ {n_symbols} symbols x {n_bars} bars screened in {elapsed * 1000:.0f} ms "
+          f"({len(oversold)} oversold)")
+    
     print("\n✅ All tests passed!")
 
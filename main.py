@@ -8,6 +8,11 @@ Usage:
 import sys
 from datetime import datetime, timedelta
 
+import pandas as pd
+
+from backtest.monte_carlo import MonteCarloSimulator
+from backtest.portfolio import PortfolioBacktester
+from backtest.walk_forward import WalkForwardAnalyzer
 from config.settings import Settings
 from data.free_fetcher import FreeFetcher
 from data.kite_fetcher import KiteFetcher
@@ -135,13 +140,12 @@ class TradingApp:
         print(f"Symbol: {symbol}")
         print(f"Period: {from_date} to {to_date}\n")
         
-        # Run backtest
-        strategy.backtest(symbol, from_date, to_date)
+        # Run backtest (vectorized mode gives the same trades as the per-bar loop)
+        strategy.backtest(symbol, from_date, to_date, vectorized=True)
         
-        # Save trades to database
-        for trade in strategy.trades:
-            trade['strategy'] = strategy_name
-            self.db.insert_trade(trade)
+        # Save trades to database (one transaction for the whole backtest).
+        # Iterating a TradeLedger yields copies, so tag the copies we save.
+        self.db.insert_trades_bulk([dict(trade, strategy=strategy_name) for trade in strategy.trades])
         
         # Save to CSV
         if strategy.trades:
@@ -161,6 +165,15 @@ class TradingApp:
         print(f"Strategy: {strategy_name}")
         print(f"Symbols: {Settings.WATCHLIST}\n")
         
+        # Warm the historical data cache with one bulk download so each
+        # backtest below reads from disk instead of its own request
+        if getattr(self.data_fetcher, 'cache', None) is not None:
+            self.data_fetcher.get_historical_data_bulk(
+                Settings.WATCHLIST,
+                Settings.BACKTEST_START_DATE,
+                Settings.BACKTEST_END_DATE
+            )
+        
         for symbol in Settings.WATCHLIST:
             print(f"\n{'='*60}")
             print(f"Testing {symbol}...")
@@ -176,6 +189,125 @@ class TradingApp:
         
         print("\n✅ All backtests completed!")
     
+    def run_portfolio_backtest(self, strategy_name: str, max_positions: int = 5):
+        """
+        Backtest a strategy on the whole watchlist with one shared capital pool
+        
+        Args:
+            strategy_name: Name of strategy
+            max_positions: Maximum concurrent positions
+        """
+        if strategy_name not in self.strategies:
+            print(f"❌ Strategy '{strategy_name}' not found!")
+            return
+        
+        strategy = self.strategies[strategy_name]
+        self.logger.info(f"💼 Starting portfolio backtest: {strategy_name} on {len(Settings.WATCHLIST)} symbols")
+        
+        backtester = PortfolioBacktester(
+            strategy,
+            capital=Settings.INITIAL_CAPITAL,
+            max_positions=max_positions,
+            stop_loss_percent=Settings.STOP_LOSS_PERCENT * 100,
+            target_percent=Settings.TARGET_PERCENT * 100,
+            risk_percent=Settings.POSITION_SIZE_PERCENT
+        )
+        result = backtester.run_portfolio(
+            Settings.WATCHLIST,
+            Settings.BACKTEST_START_DATE,
+            Settings.BACKTEST_END_DATE
+        )
+        
+        if result is None:
+            return
+        
+        # Save trades and the equity curve
+        self.db.insert_trades_bulk([dict(trade, strategy=strategy_name) for trade in result['trades']])
+        
+        if result['trades']:
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            strategy.save_trades_to_csv(f"reports/{strategy_name}_portfolio_{stamp}.csv")
+            curves = pd.concat([result['equity'], result['exposure'], result['drawdown']], axis=1)
+            curves.to_csv(f"reports/{strategy_name}_portfolio_equity_{stamp}.csv")
+        
+        self.logger.info("✅ Portfolio backtest completed!")
+    
+    def run_walk_forward(self, strategy_name: str, symbol: str,
+                         train_bars: int = 252, test_bars: int = 63):
+        """
+        Walk-forward analysis: optimize on rolling train windows, trade the
+        following test windows out of sample
+        
+        Args:
+            strategy_name: Name of strategy
+            symbol: Stock symbol
+            train_bars: Bars per train window
+            test_bars: Bars per test window
+        """
+        if strategy_name not in self.strategies:
+            print(f"❌ Strategy '{strategy_name}' not found!")
+            return
+        
+        strategy_class = type(self.strategies[strategy_name])
+        self.logger.info(f"🚶 Starting walk-forward: {strategy_name} on {symbol}")
+        
+        analyzer = WalkForwardAnalyzer(
+            strategy_class,
+            train_bars=train_bars,
+            test_bars=test_bars,
+            capital=Settings.INITIAL_CAPITAL,
+            stop_loss_percent=Settings.STOP_LOSS_PERCENT * 100,
+            target_percent=Settings.TARGET_PERCENT * 100,
+            risk_percent=Settings.POSITION_SIZE_PERCENT
+        )
+        
+        try:
+            result = analyzer.run(self.data_fetcher, symbol,
+                                  Settings.BACKTEST_START_DATE, Settings.BACKTEST_END_DATE)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            return
+        
+        if result is None:
+            return
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        result['windows'].to_csv(f"reports/{strategy_name}_{symbol}_walk_forward_{stamp}.csv", index=False)
+        result['equity'].to_csv(f"reports/{strategy_name}_{symbol}_walk_forward_equity_{stamp}.csv")
+        
+        self.logger.info("✅ Walk-forward analysis completed!")
+    
+    def run_monte_carlo(self, strategy_name: str, symbol: str, n_simulations: int = 10000):
+        """
+        Backtest a strategy, then bootstrap and reshuffle its trades to get
+        distributions of final capital, max drawdown and risk of ruin
+        
+        Args:
+            strategy_name: Name of strategy
+            symbol: Stock symbol
+            n_simulations: Simulated paths per method
+        """
+        if strategy_name not in self.strategies:
+            print(f"❌ Strategy '{strategy_name}' not found!")
+            return
+        
+        strategy = self.strategies[strategy_name]
+        start_capital = strategy.current_capital
+        first_trade = len(strategy.trades)
+        
+        self.run_backtest(strategy_name, symbol)
+        trades = strategy.trades[first_trade:]
+        
+        if not trades:
+            print("⚠️  No trades to resample")
+            return
+        
+        self.logger.info(f"🎲 Monte Carlo: {n_simulations:,} paths on {len(trades)} trades")
+        simulator = MonteCarloSimulator(n_simulations=n_simulations)
+        
+        for result in simulator.analyze_trades(trades, start_capital).values():
+            simulator.print_summary(result)
+    
     def compare_strategies(self, symbol: str):
         """
         Compare all strategies on a single symbol
@@ -211,6 +343,9 @@ class TradingApp:
             print(f"  Return: {stats['return_percent']:.2f}%")
             print(f"  Win Rate: {stats['win_rate']:.2f}%")
             print(f"  Total Trades: {stats['total_trades']}")
+            print(f"  Profit Factor: {stats['profit_factor']:.2f}")
+            print(f"  Expectancy: ₹{stats['expectancy']:,.2f}")
+            print(f"  Max Drawdown: {stats['max_drawdown']:.2f}%")
             print(f"  Total Profit: ₹{stats['total_profit']:,.2f}\n")
         
         # Find best strategy
@@ -231,7 +366,10 @@ class TradingApp:
         print("4. View Trade History")
         print("5. View Database Stats")
         print("6. Test Data Connection")
-        print("7. Exit")
+        print("7. Portfolio Backtest (Shared Capital)")
+        print("8. Walk-Forward Analysis")
+        print("9. Monte Carlo Risk Analysis")
+        print("10. Exit")
         print("="*60)
     
     def test_data_connection(self):
@@ -292,6 +430,8 @@ class TradingApp:
         print(f"  Win Rate: {stats['win_rate']:.2f}%")
         print(f"  Total Profit: ₹{stats['total_profit']:,.2f}")
         print(f"  Avg Profit: ₹{stats['avg_profit']:,.2f}")
+        print(f"  Profit Factor: {stats['profit_factor']:.2f}")
+        print(f"  Expectancy: ₹{stats['expectancy']:,.2f}")
         print("="*60)
     
     def view_database_stats(self):
@@ -309,7 +449,7 @@ class TradingApp:
             self.show_menu()
             
             try:
-                choice = input("\nEnter your choice (1-7): ").strip()
+                choice = input("\nEnter your choice (1-10): ").strip()
                 
                 if choice == '1':
                     # Single backtest
@@ -349,6 +489,36 @@ class TradingApp:
                     self.test_data_connection()
                 
                 elif choice == '7':
+                    # Whole watchlist, one capital pool
+                    print("\nAvailable strategies:")
+                    for i, name in enumerate(self.strategies.keys(), 1):
+                        print(f"  {i}. {name}")
+                    
+                    strategy = input("\nEnter strategy name: ").strip()
+                    max_positions = input("Max concurrent positions (default 5): ").strip()
+                    self.run_portfolio_backtest(strategy, int(max_positions) if max_positions else 5)
+                
+                elif choice == '8':
+                    # Out-of-sample validation
+                    print("\nAvailable strategies:")
+                    for i, name in enumerate(self.strategies.keys(), 1):
+                        print(f"  {i}. {name}")
+                    
+                    strategy = input("\nEnter strategy name: ").strip()
+                    symbol = input("Enter stock symbol (e.g., RELIANCE): ").strip().upper()
+                    self.run_walk_forward(strategy, symbol)
+                
+                elif choice == '9':
+                    # Distribution of outcomes instead of one backtest
+                    print("\nAvailable strategies:")
+                    for i, name in enumerate(self.strategies.keys(), 1):
+                        print(f"  {i}. {name}")
+                    
+                    strategy = input("\nEnter strategy name: ").strip()
+                    symbol = input("Enter stock symbol (e.g., RELIANCE): ").strip().upper()
+                    self.run_monte_carlo(strategy, symbol)
+                
+                elif choice == '10':
                     # Exit
                     print("\n👋 Thank you for using the Trading Application!")
                     print("="*60 + "\n")
@@ -0,0 +1,12 @@
+"""Options pricing package"""
+from .pricing import (
+    ImpliedVolatilitySurface, atr_volatility, black76, black_scholes, chain_greeks,
+    generalized_black_scholes, implied_volatility, next_expiry, realized_volatility,
+    solve_implied_volatility, strike_grid, strike_interval, volatility_estimate, years_to_expiry
+)
+
+__all__ = [
+    'ImpliedVolatilitySurface', 'atr_volatility', 'black76', 'black_scholes', 'chain_greeks',
+    'generalized_black_scholes', 'implied_volatility', 'next_expiry', 'realized_volatility',
+    'solve_implied_volatility', 'strike_grid', 'strike_interval', 'volatility_estimate', 'years_to_expiry'
+]
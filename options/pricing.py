@@ -0,0 +1,697 @@
+"""
+Options Pricing
+Vectorized Black-Scholes / Black-76 prices and Greeks for whole option
+chains (every strike x expiry in one call)
+
+All functions broadcast their inputs like NumPy ufuncs: pass strikes as a
+row (K,) and times to expiry as a column (E, 1) to get (E, K) surfaces.
+
+Conventions:
+    t      - time to expiry in years (calendar days / 365)
+    sigma  - annualized volatility as a fraction (0.15 = 15%)
+    rate   - continuously compounded risk-free rate (0.065 = 6.5%)
+    theta  - change in value per calendar day
+    vega   - change in value per 1 volatility point (0.01)
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+RISK_FREE_RATE = 0.065  # ~91-day T-bill yield
+DAYS_PER_YEAR = 365.0
+TRADING_DAYS = 252
+
+# Parkinson: E[high - low] = 2 * sqrt(2 / pi) * sigma for a driftless day
+RANGE_TO_SIGMA = 2 * np.sqrt(2 / np.pi)
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+# ========================================
+# NORMAL DISTRIBUTION
+# ========================================
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal density"""
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def norm_cdf(x) -> np.ndarray:
+    """
+    Standard normal CDF to double precision (Hart 1968, as in West 2005)
+    
+    NumPy has no erf, and the pricing path should not need SciPy.
+    
+    Args:
+        x: Array-like
+    
+    Returns:
+        N(x) with the shape of x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    
+    # Infinite x (expired options) resolves through the branches below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponential = np.exp(-0.5 * z * z)
+        
+        # |x| < 7.07: rational approximation
+        numerator = 3.52624965998911e-02 * z + 0.700383064443688
+        numerator = numerator * z + 6.37396220353165
+        numerator = numerator * z + 33.912866078383
+        numerator = numerator * z + 112.079291497871
+        numerator = numerator * z + 221.213596169931
+        numerator = numerator * z + 220.206867912376
+        denominator = 8.83883476483184e-02 * z + 1.75566716318264
+        denominator = denominator * z + 16.064177579207
+        denominator = denominator * z + 86.7807322029461
+        denominator = denominator * z + 296.564248779674
+        denominator = denominator * z + 637.333633378831
+        denominator = denominator * z + 793.826512519948
+        denominator = denominator * z + 440.413735824752
+        tail = exponential * numerator / denominator
+        
+        # Further out: continued fraction
+        fraction = z + 0.65
+        for k in (4, 3, 2, 1):
+            fraction = z + k / fraction
+        far = exponential / fraction / 2.506628274631
+    tail = np.where(z < 7.07106781186547, tail, far)
+    tail = np.where(z > 37, 0.0, tail)
+    
+    return np.where(x > 0, 1 - tail, tail)
+
+
+# ========================================
+# PRICING
+# ========================================
+
+def generalized_black_scholes(underlying, strike, t, sigma, rate=RISK_FREE_RATE, carry=None,
+                              is_call=True) -> Dict[str, np.ndarray]:
+    """
+    Price and Greeks under the generalized Black-Scholes model
+    
+    carry = rate - dividend gives Black-Scholes on a spot price,
+    carry = 0 gives Black-76 on a futures/forward price.
+    
+    Args:
+        underlying: Spot (or forward when carry = 0)
+        strike: Strike prices
+        t: Years to expiry
+        sigma: Annualized volatility
+        rate: Risk-free rate
+        carry: Cost of carry (default: rate, i.e. no dividend)
+        is_call: True for calls, False for puts (may be a boolean array)
+    
+    Returns:
+        Dictionary of arrays: price, delta, gamma, theta, vega, d1, d2
+    """
+    if carry is None:
+        carry = rate
+    
+    underlying, strike, t, sigma, rate, carry, is_call = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (underlying, strike, t, sigma, rate, carry)),
+        np.asarray(is_call, dtype=bool)
+    )
+    
+    t_pos = np.maximum(t, 0.0)
+    discount = np.exp(-rate * t_pos)
+    carry_discount = np.exp((carry - rate) * t_pos)  # dF/dS * discount
+    forward = underlying * np.exp(carry * t_pos)
+    
+    vol_time = sigma * np.sqrt(t_pos)
+    live = vol_time > 0
+    safe = np.where(live, vol_time, 1.0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = np.log(forward / strike) / safe + 0.5 * safe
+    # Expired / zero vol: the option is worth its discounted intrinsic value
+    d1 = np.where(live, d1, np.where(forward > strike, np.inf, -np.inf))
+    d2 = d1 - np.where(live, safe, 0.0)
+    
+    sign = np.where(is_call, 1.0, -1.0)
+    n_d1 = norm_cdf(sign * d1)
+    n_d2 = norm_cdf(sign * d2)
+    pdf_d1 = np.where(live, norm_pdf(np.where(np.isfinite(d1), d1, 0.0)), 0.0)
+    
+    price = sign * discount * (forward * n_d1 - strike * n_d2)
+    delta = sign * carry_discount * n_d1
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = np.where(live, carry_discount * pdf_d1 / (underlying * safe), 0.0)
+        decay = np.where(live, discount * forward * pdf_d1 * sigma / (2 * np.sqrt(np.where(live, t_pos, 1.0))), 0.0)
+    
+    vega = discount * forward * pdf_d1 * np.sqrt(t_pos)
+    theta = rate * price - carry * underlying * delta - decay
+    
+    return {
+        'price': price,
+        'delta': delta,
+        'gamma': gamma,
+        'theta': theta / DAYS_PER_YEAR,
+        'vega': vega / 100,
+        'd1': d1,
+        'd2': d2
+    }
+
+
+def black_scholes(spot, strike, t, sigma, rate=RISK_FREE_RATE, dividend=0.0,
+                  is_call=True) -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes on a spot price (index options priced off the index)
+    
+    Args:
+        spot: Underlying spot price
+        strike: Strike prices
+        t: Years to expiry
+        sigma: Annualized volatility
+        rate: Risk-free rate
+        dividend: Continuous dividend yield
+        is_call: True for calls, False for puts
+    
+    Returns:
+        Dictionary of arrays: price, delta, gamma, theta, vega, d1, d2
+    """
+    return generalized_black_scholes(spot, strike, t, sigma, rate, np.asarray(rate) - dividend, is_call)
+
+
+def black76(forward, strike, t, sigma, rate=RISK_FREE_RATE, is_call=True) -> Dict[str, np.ndarray]:
+    """
+    Black-76 on a futures/forward price (Greeks are w.r.t. the forward)
+    
+    Args:
+        forward: Futures price for the option's expiry
+        strike: Strike prices
+        t: Years to expiry
+        sigma: Annualized volatility
+        rate: Risk-free rate (discounting only)
+        is_call: True for calls, False for puts
+    
+    Returns:
+        Dictionary of arrays: price, delta, gamma, theta, vega, d1, d2
+    """
+    return generalized_black_scholes(forward, strike, t, sigma, rate, 0.0, is_call)
+
+
+def chain_greeks(underlying, strikes, t, sigma, rate=RISK_FREE_RATE, carry=None) -> Dict[str, np.ndarray]:
+    """
+    Calls and puts of a whole chain from one set of d1/d2
+    
+    Puts come from put-call parity, so a 200-strike x 4-expiry chain is
+    a single pass over 800 points.
+    
+    Args:
+        underlying: Spot (or forward with carry = 0)
+        strikes: Strike array, e.g. shape (K,)
+        t: Years to expiry, e.g. shape (E, 1)
+        sigma: Volatility - scalar, per expiry (E, 1) or a surface (E, K)
+        rate: Risk-free rate
+        carry: Cost of carry (default: rate)
+    
+    Returns:
+        Dictionary of arrays broadcast to the chain's shape: call_price,
+        put_price, call_delta, put_delta, gamma, vega, call_theta,
+        put_theta
+    """
+    if carry is None:
+        carry = rate
+    
+    call = generalized_black_scholes(underlying, strikes, t, sigma, rate, carry, True)
+    
+    t_pos = np.maximum(np.asarray(t, dtype=np.float64), 0.0)
+    discount = np.exp(-np.asarray(rate) * t_pos)
+    carry_discount = np.exp((np.asarray(carry) - rate) * t_pos)
+    forward = np.asarray(underlying, dtype=np.float64) * np.exp(np.asarray(carry) * t_pos)
+    strikes = np.asarray(strikes, dtype=np.float64)
+    
+    # Put-call parity: P = C - D (F - K), delta_P = delta_C - e^{(b-r)t}
+    put_price = call['price'] - discount * (forward - strikes)
+    put_delta = call['delta'] - carry_discount
+    parity_theta = (np.asarray(rate) * discount * (forward - strikes)
+                    - np.asarray(carry) * np.asarray(underlying) * carry_discount) / DAYS_PER_YEAR
+    
+    return {
+        'call_price': call['price'],
+        'put_price': put_price,
+        'call_delta': call['delta'],
+        'put_delta': put_delta,
+        'gamma': call['gamma'],
+        'vega': call['vega'],
+        'call_theta': call['theta'],
+        'put_theta': call['theta'] - parity_theta
+    }
+
+
+# ========================================
+# IMPLIED VOLATILITY
+# ========================================
+
+def _price_and_vega(forward, strike, discount, sqrt_t, sigma, sign):
+    """Price and raw vega for the solver (requires sigma, t > 0)"""
+    vol_time = sigma * sqrt_t
+    d1 = np.log(forward / strike) / vol_time + 0.5 * vol_time
+    d2 = d1 - vol_time
+    price = sign * discount * (forward * norm_cdf(sign * d1) - strike * norm_cdf(sign * d2))
+    vega = discount * forward * norm_pdf(d1) * sqrt_t
+    return price, vega
+
+
+def solve_implied_volatility(price, underlying, strike, t, rate=RISK_FREE_RATE, carry=None, is_call=True,
+                             initial=None, low: float = 1e-4, high: float = 5.0, tol: float = 1e-9,
+                             max_iterations: int = 100) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Implied volatility of every price by safeguarded Newton iteration
+    
+    Each quote keeps a [low, high] volatility bracket that shrinks with
+    every model evaluation; Newton steps that leave the bracket (or have
+    no vega to work with) fall back to bisection. Converged quotes are
+    dropped from the working set, so late iterations only touch the few
+    slow ones.
+    
+    Cold starts use the Manaster-Koehler point sqrt(2|ln(F/K)| / t), from
+    which Newton converges monotonically; `initial` (e.g. the previous
+    tick's surface) replaces it wherever it is finite and inside the bracket.
+    
+    Args:
+        price: Observed option prices
+        underlying, strike, t, rate, carry, is_call: As generalized_black_scholes
+        initial: Optional starting volatilities (broadcast like price)
+        low: Lower volatility bound
+        high: Upper volatility bound
+        tol: Price tolerance relative to max(price, 1)
+        max_iterations: Iteration cap
+    
+    Returns:
+        Tuple of (volatility array, converged mask, iterations used).
+        Volatility is NaN where the price is outside the model's
+        no-arbitrage bounds or the solver did not converge.
+    """
+    if carry is None:
+        carry = rate
+    if initial is None:
+        initial = np.nan
+    
+    arrays = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (price, underlying, strike, t, rate, carry, initial)),
+        np.asarray(is_call, dtype=bool)
+    )
+    shape = arrays[0].shape
+    price, underlying, strike, t, rate, carry, initial, is_call = (a.ravel() for a in arrays)
+    
+    iv = np.full(price.size, np.nan)
+    converged = np.zeros(price.size, dtype=bool)
+    
+    # Working set: live quotes inside the no-arbitrage bounds
+    rows = np.flatnonzero((t > 0) & (strike > 0) & (underlying > 0) & np.isfinite(price))
+    target = price[rows]
+    forward = underlying[rows] * np.exp(carry[rows] * t[rows])
+    discount = np.exp(-rate[rows] * t[rows])
+    sqrt_t = np.sqrt(t[rows])
+    sign = np.where(is_call[rows], 1.0, -1.0)
+    
+    floor, _ = _price_and_vega(forward, strike[rows], discount, sqrt_t, low, sign)
+    cap, _ = _price_and_vega(forward, strike[rows], discount, sqrt_t, high, sign)
+    inside = (target > floor) & (target <= cap)
+    rows, target, forward, discount, sqrt_t, sign = (
+        a[inside] for a in (rows, target, forward, discount, sqrt_t, sign)
+    )
+    moneyness = strike[rows]
+    
+    # Warm start where available, Manaster-Koehler otherwise
+    sigma = initial[rows]
+    cold = ~((sigma > low) & (sigma < high))
+    inflection = np.sqrt(2 * np.abs(np.log(forward / moneyness))) / sqrt_t
+    sigma = np.where(cold, np.clip(inflection, low, high), sigma)
+    lo = np.full(rows.size, low)
+    hi = np.full(rows.size, high)
+    
+    iterations = 0
+    while rows.size and iterations < max_iterations:
+        iterations += 1
+        model, vega = _price_and_vega(forward, moneyness, discount, sqrt_t, sigma, sign)
+        diff = model - target
+        
+        done = (np.abs(diff) <= tol * np.maximum(target, 1.0)) | (hi - lo <= 1e-12)
+        iv[rows[done]] = sigma[done]
+        converged[rows[done]] = True
+        
+        # Shrink the bracket, then Newton inside it or bisect
+        above = diff > 0
+        hi = np.where(above, sigma, hi)
+        lo = np.where(above, lo, sigma)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = sigma - diff / vega
+        sigma = np.where((newton > lo) & (newton < hi), newton, 0.5 * (lo + hi))
+        
+        keep = ~done
+        rows, target, forward, moneyness, discount, sqrt_t, sign, sigma, lo, hi = (
+            a[keep] for a in (rows, target, forward, moneyness, discount, sqrt_t, sign, sigma, lo, hi)
+        )
+    
+    return iv.reshape(shape), converged.reshape(shape), iterations
+
+
+def implied_volatility(price, underlying, strike, t, rate=RISK_FREE_RATE, carry=None, is_call=True,
+                       initial=None, **kwargs) -> np.ndarray:
+    """
+    Implied volatility of every price (see solve_implied_volatility)
+    
+    Args:
+        price: Observed option prices
+        underlying, strike, t, rate, carry, is_call: As generalized_black_scholes
+        initial: Optional starting volatilities
+        **kwargs: Solver options (low, high, tol, max_iterations)
+    
+    Returns:
+        Volatility array (NaN where no volatility reproduces the price)
+    """
+    return solve_implied_volatility(price, underlying, strike, t, rate, carry, is_call, initial, **kwargs)[0]
+
+
+class ImpliedVolatilitySurface:
+    """
+    Implied volatilities of an option chain, warm-started tick to tick
+    
+    Quotes are keyed by (expiry, strike, option type), so the previous
+    surface seeds the solver even when strikes are added or dropped as the
+    underlying moves.
+    """
+    
+    def __init__(self, rate: float = RISK_FREE_RATE, carry: Optional[float] = None):
+        """
+        Initialize an empty surface
+        
+        Args:
+            rate: Risk-free rate
+            carry: Cost of carry (default: rate; 0 for futures)
+        """
+        self.rate = rate
+        self.carry = carry
+        self.surface: Optional[pd.Series] = None
+        self.iterations = 0
+        self.converged = 0
+    
+    def update(self, underlying: float, expiry, strike, premium, is_call,
+               now: Optional[datetime] = None) -> np.ndarray:
+        """
+        Solve the chain's implied volatilities from fresh premiums
+        
+        Args:
+            underlying: Spot (or forward with carry = 0)
+            expiry: Expiry datetime per quote
+            strike: Strike per quote
+            premium: Option price per quote
+            is_call: Boolean per quote
+            now: Valuation time (default: now)
+        
+        Returns:
+            Implied volatility per quote (NaN where unsolved)
+        """
+        key = pd.MultiIndex.from_arrays([pd.DatetimeIndex(expiry), np.asarray(strike, dtype=np.float64),
+                                         np.asarray(is_call, dtype=bool)])
+        initial = None
+        if self.surface is not None:
+            initial = self.surface.reindex(key).to_numpy()
+        
+        iv, converged, self.iterations = solve_implied_volatility(
+            premium, underlying, key.get_level_values(1), years_to_expiry(key.get_level_values(0), now),
+            self.rate, self.carry, key.get_level_values(2), initial
+        )
+        self.converged = int(converged.sum())
+        self.surface = pd.Series(iv, index=key).dropna()
+        return iv
+    
+    def atm_volatility(self, underlying: float, now: Optional[datetime] = None) -> float:
+        """
+        At-the-money implied volatility of the nearest live expiry
+        
+        Calls and puts are averaged per strike and interpolated at the
+        underlying price.
+        
+        Args:
+            underlying: Current underlying price
+            now: Reference time (default: now)
+        
+        Returns:
+            Annualized volatility fraction (NaN before the first update)
+        """
+        if self.surface is None or self.surface.empty:
+            return np.nan
+        
+        expiries = self.surface.index.get_level_values(0)
+        live = expiries > pd.Timestamp(now or datetime.now())
+        if not live.any():
+            return np.nan
+        nearest = self.surface[expiries == expiries[live].min()]
+        
+        smile = nearest.groupby(level=1).mean()
+        return float(np.interp(underlying, smile.index.to_numpy(), smile.to_numpy()))
+
+
+# ========================================
+# MARKET INPUTS
+# ========================================
+
+def realized_volatility(close, window: int = 20, periods_per_year: int = TRADING_DAYS) -> float:
+    """
+    Annualized close-to-close volatility of the last `window` bars
+    
+    Args:
+        close: Close prices
+        window: Returns used
+        periods_per_year: Bars per year
+    
+    Returns:
+        Volatility fraction (NaN with fewer than 2 returns)
+    """
+    close = np.asarray(close, dtype=np.float64)[-(window + 1):]
+    returns = np.diff(np.log(close))
+    if returns.size < 2:
+        return np.nan
+    return float(returns.std(ddof=1) * np.sqrt(periods_per_year))
+
+
+def atr_volatility(atr, price, periods_per_year: int = TRADING_DAYS):
+    """
+    Annualized volatility implied by an ATR (Parkinson range estimator)
+    
+    Args:
+        atr: Average true range (scalar or array)
+        price: Current price (scalar or array)
+        periods_per_year: Bars per year
+    
+    Returns:
+        Volatility fraction (NaN where the price is not positive)
+    """
+    price = np.asarray(price, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volatility = np.where(price > 0, np.asarray(atr, dtype=np.float64) / price, np.nan)
+    volatility = volatility / RANGE_TO_SIGMA * np.sqrt(periods_per_year)
+    return float(volatility) if volatility.ndim == 0 else volatility
+
+
+def volatility_estimate(indicators, floor: float = 0.08, default: float = 0.15):
+    """
+    Pricing volatility from MarketConditionAnalyzer indicators
+    
+    Prefers the option chain's implied volatility, then realized volatility,
+    then the ATR estimate, floored so a quiet week never prices options
+    near zero.
+    
+    Args:
+        indicators: analyze_market()['indicators'], or an analyze_history()
+            DataFrame for one estimate per bar
+        floor: Minimum volatility
+        default: Used when no estimate is available
+    
+    Returns:
+        Annualized volatility fraction (an array for a DataFrame)
+    """
+    estimate = np.nan
+    for key in ('implied_volatility', 'realized_volatility', 'atr_volatility'):
+        value = indicators.get(key)
+        if value is None:
+            continue
+        value = np.asarray(value, dtype=np.float64)
+        usable = np.isnan(estimate) & np.isfinite(value) & (value > 0)
+        estimate = np.where(usable, value, estimate)
+    
+    estimate = np.where(np.isnan(estimate), default, np.maximum(estimate, floor))
+    return float(estimate) if estimate.ndim == 0 else estimate
+
+
+def strike_interval(index: str) -> int:
+    """Strike spacing of NSE index options (100 for BANKNIFTY, else 50)"""
+    return 100 if 'BANK' in index.upper() else 50
+
+
+def strike_grid(spot: float, interval: float, n_each_side: int) -> np.ndarray:
+    """
+    Strikes centred on the at-the-money strike
+    
+    Args:
+        spot: Underlying price
+        interval: Strike spacing (50 for NIFTY, 100 for BANKNIFTY)
+        n_each_side: Strikes above and below ATM
+    
+    Returns:
+        Array of 2 * n_each_side + 1 strikes
+    """
+    atm = round(spot / interval) * interval
+    return atm + interval * np.arange(-n_each_side, n_each_side + 1, dtype=np.float64)
+
+
+def next_expiry(now=None, weekday: int = 3, close_time: str = "15:30"):
+    """
+    Next weekly expiry at the market close
+    
+    Args:
+        now: Reference time, or a DatetimeIndex for one expiry per time
+            (default: now)
+        weekday: Expiry weekday (0 = Monday, 3 = Thursday)
+        close_time: Expiry time "HH:MM"
+    
+    Returns:
+        Expiry datetime (today's if before the close on expiry day), or a
+        DatetimeIndex for DatetimeIndex input
+    """
+    if isinstance(now, pd.DatetimeIndex):
+        expiry = (now.normalize() + pd.to_timedelta((weekday - now.weekday) % 7, unit='D')
+                  + pd.Timedelta(f"{close_time}:00"))
+        return expiry.where(expiry > now, expiry + pd.Timedelta(days=7))
+    
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in close_time.split(':'))
+    expiry = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    expiry += timedelta(days=(weekday - now.weekday()) % 7)
+    if expiry <= now:
+        expiry += timedelta(days=7)
+    return expiry
+
+
+def years_to_expiry(expiry, now=None) -> np.ndarray:
+    """
+    Calendar time to expiry in years
+    
+    Args:
+        expiry: Expiry datetime(s)
+        now: Reference time(s) (default: now); arrays broadcast against expiry
+    
+    Returns:
+        Years (0 once expired)
+    """
+    if now is None:
+        now = datetime.now()
+    remaining = np.asarray(expiry, dtype='datetime64[ns]') - np.asarray(now, dtype='datetime64[ns]')
+    years = np.maximum(remaining.astype(np.int64), 0) / (DAYS_PER_YEAR * 86400e9)
+    return float(years) if years.ndim == 0 else years
+
+
+# Test the pricing engine
+if __name__ == "__main__":
+    print("🧪 Testing Options Pricing...\n")
+    
+    import math
+    import time
+    
+    # CDF against math.erfc
+    x = np.linspace(-40, 40, 20001)
+    exact = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    assert np.max(np.abs(norm_cdf(x) - exact)) < 1e-14
+    
+    # Textbook example (Hull): S=42, K=40, r=10%, sigma=20%, t=0.5
+    call = black_scholes(42, 40, 0.5, 0.2, rate=0.1, is_call=True)
+    put = black_scholes(42, 40, 0.5, 0.2, rate=0.1, is_call=False)
+    assert abs(call['price'] - 4.7594) < 1e-4 and abs(put['price'] - 0.8086) < 1e-4
+    
+    # Greeks against central finite differences
+    spot, strike, t, sigma, h = 19500.0, 19600.0, 7 / 365, 0.14, 1e-4
+    for is_call in (True, False):
+        base = black_scholes(spot, strike, t, sigma, is_call=is_call)
+        bump = lambda **kw: black_scholes(**{'spot': spot, 'strike': strike, 't': t, 'sigma': sigma,
+                                              'is_call': is_call, **kw})['price']
+        delta = (bump(spot=spot + 1) - bump(spot=spot - 1)) / 2
+        gamma = bump(spot=spot + 1) - 2 * base['price'] + bump(spot=spot - 1)
+        vega = (bump(sigma=sigma + h) - bump(sigma=sigma - h)) / (2 * h) / 100
+        theta = -(bump(t=t + h) - bump(t=t - h)) / (2 * h) / DAYS_PER_YEAR
+        for name, numeric in (('delta', delta), ('gamma', gamma), ('vega', vega), ('theta', theta)):
+            assert abs(base[name] - numeric) < 1e-4 * max(1, abs(numeric)), (name, base[name], numeric)
+    
+    # Black-76 with F = S e^{rt} is the same option
+    forward = spot * np.exp(RISK_FREE_RATE * t)
+    assert abs(black76(forward, strike, t, sigma)['price'] - black_scholes(spot, strike, t, sigma)['price']) < 1e-9
+    
+    # Whole chain: 200 strikes x 4 expiries, puts by parity
+    strikes = strike_grid(spot, 50, 100)[:200]
+    expiries = (np.array([2, 7, 14, 28]) / 365)[:, None]
+    chain = chain_greeks(spot, strikes, expiries, sigma)
+    direct_put = black_scholes(spot, strikes, expiries, sigma, is_call=False)
+    assert chain['put_price'].shape == (4, 200)
+    assert np.allclose(chain['put_price'], direct_put['price'], atol=1e-8)
+    assert np.allclose(chain['put_delta'], direct_put['delta'], atol=1e-12)
+    assert np.allclose(chain['put_theta'], direct_put['theta'], atol=1e-8)
+    
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        chain_greeks(spot, strikes, expiries, sigma)
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"✅ 200 strikes x 4 expiries priced with Greeks in {elapsed * 1000:.2f} ms")
+    
+    # Implied volatility recovers the input surface
+    surface = 0.12 + 0.4 * ((strikes / spot - 1) ** 2)
+    quotes = chain_greeks(spot, strikes, expiries, surface)
+    prices = quotes['call_price']
+    iv = implied_volatility(prices, spot, strikes, expiries)
+    priced = quotes['vega'] > 0.01  # Deep ITM/OTM quotes carry no volatility information
+    assert np.nanmax(np.abs(iv - surface)[priced]) < 1e-6
+    print(f"✅ Implied volatility of {priced.sum()} quotes recovered")
+    
+    # Warm start from the previous tick's surface converges in fewer iterations
+    _, _, cold_iterations = solve_implied_volatility(prices, spot, strikes, expiries)
+    next_prices = chain_greeks(spot * 1.001, strikes, expiries - 1 / 365 / 375, surface)['call_price']
+    warm, converged, warm_iterations = solve_implied_volatility(
+        next_prices, spot * 1.001, strikes, expiries - 1 / 365 / 375, initial=iv
+    )
+    assert warm_iterations < cold_iterations and np.nanmax(np.abs(warm - surface)[priced]) < 1e-6
+    
+    runs = 50
+    start = time.perf_counter()
+    for _ in range(runs):
+        solve_implied_volatility(next_prices, spot * 1.001, strikes, expiries - 1 / 365 / 375, initial=iv)
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"✅ Warm-started IV: {warm_iterations} iterations (cold {cold_iterations}), "
+          f"{converged.sum()} quotes in {elapsed * 1000:.2f} ms")
+    
+    # Prices outside the no-arbitrage bounds have no implied volatility
+    bad = implied_volatility([0.0, 1e6, np.nan], spot, strike, t)
+    assert np.isnan(bad).all()
+    
+    # Surface keyed by (expiry, strike, type) across a chain whose strikes shift
+    now = datetime(2024, 1, 1, 10, 0)
+    expiry_dates = np.array([datetime(2024, 1, 4, 15, 30), datetime(2024, 1, 25, 15, 30)])
+    iv_surface = ImpliedVolatilitySurface()
+    for tick, level in enumerate((spot, spot + 60)):
+        grid = strike_grid(level, 50, 20)
+        expiry_col = np.repeat(expiry_dates, 2 * grid.size)
+        strike_col = np.tile(np.repeat(grid, 2), 2)
+        call_col = np.tile([True, False], 2 * grid.size)
+        true_iv = 0.13 + 0.3 * (strike_col / level - 1) ** 2
+        quotes = black_scholes(level, strike_col, years_to_expiry(expiry_col, now), true_iv, is_call=call_col)
+        solved = iv_surface.update(level, expiry_col, strike_col, quotes['price'], call_col, now)
+        informative = quotes['vega'] > 0.01
+        assert np.nanmax(np.abs(solved - true_iv)[informative]) < 1e-6
+    assert abs(iv_surface.atm_volatility(spot + 60, now) - 0.13) < 1e-3
+    print(f"✅ Surface of {solved.size} quotes, ATM IV {iv_surface.atm_volatility(spot + 60, now) * 100:.2f}%")
+    
+    # Expired options are worth intrinsic value
+    expired = black_scholes(spot, np.array([19000.0, 20000.0]), 0.0, sigma)
+    assert np.allclose(expired['price'], [500.0, 0.0]) and np.allclose(expired['delta'], [1.0, 0.0])
+    
+    print(f"   ATM {strikes[100]:.0f} weekly call ₹{chain['call_price'][1, 100]:.2f}, "
+          f"put ₹{chain['put_price'][1, 100]:.2f}, delta {chain['call_delta'][1, 100]:.3f}, "
+          f"theta ₹{chain['call_theta'][1, 100]:.2f}/day")
+    
+    print("\n✅ Options pricing tests passed!")
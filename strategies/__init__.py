@@ -2,6 +2,7 @@
 from .base_strategy import BaseStrategy
 from .ma_crossover import MACrossoverStrategy
 from .rsi_strategy import RSIStrategy
+from .vectorized_backtest import VectorizedBacktester
+from .optimizer import ParameterOptimizer
 
-__all__ = ['BaseStrategy', 'MACrossoverStrategy', 'RSIStrategy']
-
+__all__ = ['BaseStrategy', 'MACrossoverStrategy', 'RSIStrategy', 'VectorizedBacktester', 'ParameterOptimizer']
@@ -7,11 +7,17 @@ import pandas as pd
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from utils.performance import trade_statistics
+from utils.trade_ledger import TradeLedger
+
 class BaseStrategy(ABC):
     """
     Abstract base class for all trading strategies
     """
     
+    # TechnicalIndicators columns the strategy reads with default parameters (None = all)
+    INDICATORS: Optional[List[str]] = None
+    
     def __init__(self, data_fetcher, name: str = "Base Strategy"):
         """
         Initialize strategy
@@ -23,7 +29,7 @@ class BaseStrategy(ABC):
         self.data_fetcher = data_fetcher
         self.name = name
         self.positions = {}  # Current positions
-        self.trades = []  # Trade history
+        self.trades = TradeLedger()  # Trade history (columnar)
         self.capital = 100000  # Starting capital
         self.current_capital = self.capital
         
@@ -67,6 +73,32 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def required_indicators(self) -> Optional[List[str]]:
+        """
+        Indicator columns this strategy's signals need, so scans can call
+        TechnicalIndicators.add_all_indicators(data, columns=...) and skip
+        everything else
+        
+        Returns:
+            List of column names (None = all indicators)
+        """
+        return self.INDICATORS
+    
+    def get_signal_masks(self, data: pd.DataFrame) -> Dict:
+        """
+        Compute entry/exit masks over the whole prepared DataFrame
+        Override in child classes to support the vectorized backtest
+        
+        Args:
+            data: DataFrame returned by prepare_data
+        
+        Returns:
+            Dictionary with 'start' (first bar to evaluate), 'entries' and
+            'exits' boolean arrays, and optionally 'profit_exits' with
+            'profit_threshold' for exits that require a minimum profit
+        """
+        raise NotImplementedError(f"{self.name} does not support vectorized backtesting")
+    
     def calculate_position_size(self, price: float, risk_percent: float = 0.1) -> int:
         """
         Calculate position size based on available capital
@@ -163,33 +195,9 @@ class BaseStrategy(ABC):
         Returns:
             Dictionary with performance metrics
         """
-        if not self.trades:
-            return {
-                'total_trades': 0,
-                'win_rate': 0,
-                'total_profit': 0,
-                'avg_profit': 0,
-                'max_profit': 0,
-                'max_loss': 0
-            }
-        
-        profits = [trade['profit'] for trade in self.trades]
-        winning_trades = [p for p in profits if p > 0]
-        
-        stats = {
-            'total_trades': len(self.trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(profits) - len(winning_trades),
-            'win_rate': (len(winning_trades) / len(self.trades)) * 100,
-            'total_profit': sum(profits),
-            'avg_profit': sum(profits) / len(profits),
-            'avg_win': sum(winning_trades) / len(winning_trades) if winning_trades else 0,
-            'avg_loss': sum([p for p in profits if p < 0]) / len([p for p in profits if p < 0]) if any(p < 0 for p in profits) else 0,
-            'max_profit': max(profits),
-            'max_loss': min(profits),
-            'final_capital': self.current_capital,
-            'return_percent': ((self.current_capital - self.capital) / self.capital) * 100
-        }
+        stats = trade_statistics(self.trades.column('profit'), self.capital)
+        stats['final_capital'] = self.current_capital
+        stats['return_percent'] = ((self.current_capital - self.capital) / self.capital) * 100
         
         return stats
     
@@ -212,6 +220,9 @@ class BaseStrategy(ABC):
         print(f"Average Loss:        ₹{stats['avg_loss']:,.2f}")
         print(f"Max Profit:          ₹{stats['max_profit']:,.2f}")
         print(f"Max Loss:            ₹{stats['max_loss']:,.2f}")
+        print(f"\nProfit Factor:       {stats['profit_factor']:.2f}")
+        print(f"Expectancy:          ₹{stats['expectancy']:,.2f}")
+        print(f"Max Drawdown:        {stats['max_drawdown']:.2f}% ({stats['max_drawdown_duration']} trades)")
         print("="*60 + "\n")
     
     def save_trades_to_csv(self, filename: str):
@@ -225,7 +236,7 @@ class BaseStrategy(ABC):
             print("⚠️  No trades to save")
             return
         
-        df = pd.DataFrame(self.trades)
+        df = self.trades.to_frame()
         df.to_csv(filename, index=False)
         print(f"✅ Trades saved to {filename}")
 
@@ -3,7 +3,9 @@ Moving Average Crossover Strategy
 Classic and popular trading strategy
 """
 import pandas as pd
+from typing import Dict
 from strategies.base_strategy import BaseStrategy
+from strategies.vectorized_backtest import VectorizedBacktester
 from indicators.technical import TechnicalIndicators
 
 class MACrossoverStrategy(BaseStrategy):
@@ -19,6 +21,8 @@ class MACrossoverStrategy(BaseStrategy):
     - long_period: Long MA period (default: 50)
     """
     
+    INDICATORS = ['SMA_20', 'SMA_50']
+    
     def __init__(self, data_fetcher, short_period: int = 20, long_period: int = 50):
         """
         Initialize MA Crossover Strategy
@@ -35,6 +39,10 @@ class MACrossoverStrategy(BaseStrategy):
         print(f"✅ {self.name} initialized")
         print(f"   Short MA: {short_period}, Long MA: {long_period}")
     
+    def required_indicators(self):
+        """Short and long SMAs at this strategy's periods"""
+        return [f'SMA_{self.short_period}', f'SMA_{self.long_period}']
+    
     def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Add indicators to data
@@ -110,7 +118,23 @@ class MACrossoverStrategy(BaseStrategy):
         signal = self.generate_signal(data)
         return signal == 'SELL'
     
-    def backtest(self, symbol: str, from_date: str, to_date: str):
+    def get_signal_masks(self, data: pd.DataFrame) -> Dict:
+        """
+        Entry/exit masks for the vectorized backtest
+        
+        Args:
+            data: DataFrame with indicators
+        
+        Returns:
+            Dictionary of masks (see BaseStrategy.get_signal_masks)
+        """
+        return {
+            'start': self.long_period,
+            'entries': data['Golden_Cross'].to_numpy(dtype=bool),
+            'exits': data['Death_Cross'].to_numpy(dtype=bool)
+        }
+    
+    def backtest(self, symbol: str, from_date: str, to_date: str, vectorized: bool = False):
         """
         Backtest the strategy on historical data
         
@@ -118,6 +142,8 @@ class MACrossoverStrategy(BaseStrategy):
             symbol: Stock symbol
             from_date: Start date
             to_date: End date
+            vectorized: Resolve trades with array operations instead of
+                        re-evaluating the signal on every bar
         """
         print(f"\n📊 Backtesting {self.name} on {symbol}")
         print(f"   Period: {from_date} to {to_date}")
@@ -132,6 +158,11 @@ class MACrossoverStrategy(BaseStrategy):
         # Prepare data with indicators
         data = self.prepare_data(data)
         
+        if vectorized:
+            VectorizedBacktester(self).simulate(symbol, data)
+            self.print_performance()
+            return
+        
         # Simulate trading
         in_position = False
         
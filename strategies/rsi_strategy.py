@@ -3,7 +3,9 @@ RSI (Relative Strength Index) Strategy
 Mean reversion strategy based on RSI indicator
 """
 import pandas as pd
+from typing import Dict
 from strategies.base_strategy import BaseStrategy
+from strategies.vectorized_backtest import VectorizedBacktester
 from indicators.technical import TechnicalIndicators
 
 class RSIStrategy(BaseStrategy):
@@ -17,6 +19,8 @@ class RSIStrategy(BaseStrategy):
     This is a mean reversion strategy
     """
     
+    INDICATORS = ['RSI']
+    
     def __init__(self, data_fetcher, rsi_period: int = 14, 
                  oversold: int = 30, overbought: int = 70):
         """
@@ -37,6 +41,10 @@ class RSIStrategy(BaseStrategy):
         print(f"   RSI Period: {rsi_period}")
         print(f"   Oversold: {oversold}, Overbought: {overbought}")
     
+    def required_indicators(self):
+        """RSI at this strategy's period"""
+        return ['RSI'] if self.rsi_period == 14 else [f'RSI_{self.rsi_period}']
+    
     def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Add RSI indicator to data
@@ -140,7 +148,34 @@ class RSIStrategy(BaseStrategy):
         
         return False
     
-    def backtest(self, symbol: str, from_date: str, to_date: str):
+    def get_signal_masks(self, data: pd.DataFrame) -> Dict:
+        """
+        Entry/exit masks for the vectorized backtest
+        
+        Args:
+            data: DataFrame with indicators
+        
+        Returns:
+            Dictionary of masks (see BaseStrategy.get_signal_masks)
+        """
+        rsi = data['RSI'].to_numpy(dtype=float)
+        
+        # generate_signal returns BUY whenever RSI is in the oversold zone
+        entries = rsi < self.oversold
+        
+        # Overbought exits always; the neutral zone only exits with 2% profit
+        exits = rsi > self.overbought
+        profit_exits = (rsi > 45) & (rsi < 55)
+        
+        return {
+            'start': self.rsi_period + 1,
+            'entries': entries,
+            'exits': exits,
+            'profit_exits': profit_exits,
+            'profit_threshold': 1.02
+        }
+    
+    def backtest(self, symbol: str, from_date: str, to_date: str, vectorized: bool = False):
         """
         Backtest the strategy
         
@@ -148,6 +183,8 @@ class RSIStrategy(BaseStrategy):
             symbol: Stock symbol
             from_date: Start date
             to_date: End date
+            vectorized: Resolve trades with array operations instead of
+                        re-evaluating the signal on every bar
         """
         print(f"\n📊 Backtesting {self.name} on {symbol}")
         print(f"   Period: {from_date} to {to_date}")
@@ -162,6 +199,11 @@ class RSIStrategy(BaseStrategy):
         # Prepare data with RSI
         data = self.prepare_data(data)
         
+        if vectorized:
+            VectorizedBacktester(self).simulate(symbol, data)
+            self.print_performance()
+            return
+        
         # Simulate trading
         in_position = False
         
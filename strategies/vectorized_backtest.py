@@ -0,0 +1,276 @@
+"""
+Vectorized Backtest Engine
+Runs a strategy over the full prepared DataFrame in one pass instead of
+re-slicing the data and calling generate_signal on every bar
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+
+def next_true_index(mask: np.ndarray) -> np.ndarray:
+    """
+    For every bar, find the index of the next True value at or after it
+    
+    Args:
+        mask: Boolean array
+    
+    Returns:
+        Integer array of length len(mask) + 1. Positions with no later True
+        value (including the trailing sentinel) hold len(mask).
+    """
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    idx = np.append(idx, n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def resolve_trades(entries: np.ndarray, exits: np.ndarray, start: int,
+                   close: Optional[np.ndarray] = None,
+                   profit_exits: Optional[np.ndarray] = None,
+                   profit_threshold: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn entry/exit masks into (entry bar, exit bar) pairs
+    
+    Mirrors the per-bar loop: entries are only taken while flat, exits are
+    only checked from the bar after the entry, and a position still open on
+    the last bar is closed there.
+    
+    Args:
+        entries: Boolean entry mask
+        exits: Boolean exit mask (independent of the open position)
+        start: First bar the loop evaluates
+        close: Close prices (required with profit_exits)
+        profit_exits: Boolean mask of bars where the position is closed only
+                      if close > entry price * profit_threshold
+        profit_threshold: Multiplier applied to the entry price
+    
+    Returns:
+        Tuple of (entry indices, exit indices)
+    """
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    n = len(entries)
+    
+    entries = entries.copy()
+    entries[:start] = False
+    
+    next_entry = next_true_index(entries)
+    next_exit = next_true_index(exits)
+    
+    entry_idx = []
+    exit_idx = []
+    i = start
+    
+    # One iteration per trade, not per bar
+    while i < n:
+        e = next_entry[i]
+        if e >= n:
+            break
+        
+        x = next_exit[e + 1]
+        
+        if profit_exits is not None:
+            # Only the bars before the unconditional exit need checking
+            window = slice(e + 1, min(x, n))
+            hits = np.flatnonzero(
+                profit_exits[window] & (close[window] > close[e] * profit_threshold)
+            )
+            if hits.size:
+                x = e + 1 + hits[0]
+        
+        if x >= n:
+            # Still open at the end - closed on the final bar
+            entry_idx.append(e)
+            exit_idx.append(n - 1)
+            break
+        
+        entry_idx.append(e)
+        exit_idx.append(x)
+        i = x + 1
+    
+    return np.array(entry_idx, dtype=np.int64), np.array(exit_idx, dtype=np.int64)
+
+
+def simulate_capital(close: np.ndarray, entry_idx: np.ndarray, exit_idx: np.ndarray,
+                     capital: float, risk_percent: float = 0.1) -> Dict:
+    """
+    Size and settle trades without creating strategy state
+    
+    Uses the same sizing rule as BaseStrategy.calculate_position_size.
+    Trades that cannot be afforded are skipped, as enter_position does.
+    
+    Args:
+        close: Close prices
+        entry_idx: Entry bar indices
+        exit_idx: Exit bar indices
+        capital: Starting capital
+        risk_percent: Fraction of current capital per trade
+    
+    Returns:
+        Dictionary with filled trade indices, quantities, profits and final capital
+    """
+    entry_prices = close[entry_idx]
+    exit_prices = close[exit_idx]
+    
+    quantities = np.zeros(len(entry_idx), dtype=np.int64)
+    profits = np.zeros(len(entry_idx), dtype=np.float64)
+    filled = np.zeros(len(entry_idx), dtype=bool)
+    current_capital = capital
+    
+    # Sizing depends on the capital left by the previous trade
+    for k in range(len(entry_idx)):
+        price = entry_prices[k]
+        quantity = max(1, int(current_capital * risk_percent / price))
+        cost = price * quantity
+        if cost > current_capital:
+            continue
+        
+        revenue = exit_prices[k] * quantity
+        current_capital += revenue - cost
+        quantities[k] = quantity
+        profits[k] = revenue - cost
+        filled[k] = True
+    
+    return {
+        'entry_idx': entry_idx[filled],
+        'exit_idx': exit_idx[filled],
+        'entry_price': entry_prices[filled],
+        'exit_price': exit_prices[filled],
+        'quantity': quantities[filled],
+        'profit': profits[filled],
+        'final_capital': current_capital
+    }
+
+
+class VectorizedBacktester:
+    """
+    Vectorized backtest mode for strategies that implement get_signal_masks
+    
+    Produces the same trades list and get_performance_stats output as the
+    strategy's own per-bar backtest loop.
+    """
+    
+    def __init__(self, strategy):
+        """
+        Initialize backtester
+        
+        Args:
+            strategy: Strategy instance (MACrossoverStrategy, RSIStrategy, ...)
+        """
+        self.strategy = strategy
+    
+    def get_trade_indices(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve entry/exit bars for prepared data
+        
+        Args:
+            data: DataFrame returned by strategy.prepare_data
+        
+        Returns:
+            Tuple of (entry indices, exit indices)
+        """
+        masks = self.strategy.get_signal_masks(data)
+        
+        return resolve_trades(
+            masks['entries'],
+            masks['exits'],
+            masks['start'],
+            close=data['Close'].to_numpy(dtype=np.float64),
+            profit_exits=masks.get('profit_exits'),
+            profit_threshold=masks.get('profit_threshold')
+        )
+    
+    def simulate(self, symbol: str, data: pd.DataFrame):
+        """
+        Run the simulation on prepared data, recording trades on the strategy
+        
+        Args:
+            symbol: Stock symbol
+            data: DataFrame returned by strategy.prepare_data
+        """
+        entry_idx, exit_idx = self.get_trade_indices(data)
+        close = data['Close'].to_numpy()
+        
+        # Book the (few) resolved trades through the strategy itself
+        for e, x in zip(entry_idx, exit_idx):
+            price = close[e]
+            quantity = self.strategy.calculate_position_size(price)
+            self.strategy.enter_position(symbol, price, quantity)
+            self.strategy.exit_position(symbol, close[x])
+    
+    def run(self, symbol: str, from_date: str, to_date: str):
+        """
+        Fetch data, prepare indicators and run the vectorized backtest
+        
+        Args:
+            symbol: Stock symbol
+            from_date: Start date
+            to_date: End date
+        """
+        print(f"\n⚡ Vectorized backtest of {self.strategy.name} on {symbol}")
+        print(f"   Period: {from_date} to {to_date}")
+        
+        data = self.strategy.data_fetcher.get_historical_data(symbol, from_date, to_date)
+        
+        if data.empty:
+            print("❌ No data available for backtesting")
+            return
+        
+        data = self.strategy.prepare_data(data)
+        self.simulate(symbol, data)
+        self.strategy.print_performance()
+
+
+# Check the vectorized engine against the per-bar loop
+if __name__ == "__main__":
+    print("🧪 Testing Vectorized Backtest Engine...\n")
+    
+    import contextlib
+    import io
+    from strategies.ma_crossover import MACrossoverStrategy
+    from strategies.rsi_strategy import RSIStrategy
+    
+    class _StaticFetcher:
+        """Serves the same synthetic data to every strategy"""
+        def __init__(self, data):
+            self.data = data
+        
+        def get_historical_data(self, symbol, from_date, to_date, interval="day"):
+            return self.data.copy()
+    
+    rng = np.random.default_rng(7)
+    n = 1500
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    sample_data = pd.DataFrame({
+        'Date': pd.date_range('2018-01-01', periods=n),
+        'Open': close * (1 + rng.normal(0, 0.003, n)),
+        'High': close * (1 + np.abs(rng.normal(0, 0.01, n))),
+        'Low': close * (1 - np.abs(rng.normal(0, 0.01, n))),
+        'Close': close,
+        'Volume': rng.integers(1000, 10000, n)
+    })
+    fetcher = _StaticFetcher(sample_data)
+    
+    keys = ['symbol', 'entry_price', 'exit_price', 'quantity', 'profit', 'profit_percent', 'signal']
+    
+    for strategy_class in (MACrossoverStrategy, RSIStrategy):
+        with contextlib.redirect_stdout(io.StringIO()):
+            loop_strategy = strategy_class(fetcher)
+            loop_strategy.backtest('TEST', '2018-01-01', '2022-12-31')
+            fast_strategy = strategy_class(fetcher)
+            fast_strategy.backtest('TEST', '2018-01-01', '2022-12-31', vectorized=True)
+        
+        loop_trades = [{k: t[k] for k in keys} for t in loop_strategy.trades]
+        fast_trades = [{k: t[k] for k in keys} for t in fast_strategy.trades]
+        
+        assert loop_trades == fast_trades, f"{loop_strategy.name}: trades differ"
+        
+        loop_stats = loop_strategy.get_performance_stats()
+        fast_stats = fast_strategy.get_performance_stats()
+        assert loop_stats == fast_stats, f"{loop_strategy.name}: stats differ"
+        
+        print(f"✅ {loop_strategy.name}: {len(fast_trades)} identical trades, "
+              f"return {fast_stats['return_percent']:.2f}%")
+    
+    print("\n✅ Vectorized backtest matches the per-bar loop!")
@@ -0,0 +1,596 @@
+"""
+Trading Daemon
+Runs the auto-traders and the AI engine on a scheduler thread of their own,
+independent of Streamlit reruns and open browser tabs
+
+After every job the daemon publishes a JSON snapshot per component to the
+SQLite database (daemon_state table) and it picks up UI requests from the
+daemon_commands table. The UI only reads snapshots (DaemonClient), so
+monitoring latency no longer depends on page rendering.
+
+Usage:
+    python trading_daemon.py                      # monitor positions, scan on request
+    python trading_daemon.py --scan nifty --ai    # also scan NIFTY stocks and run the AI engine
+"""
+import argparse
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from autotrader import AutoTrader
+from ai_trading_engine import AITradingEngine
+from data.free_fetcher import FreeFetcher
+from utils.database import TradingDatabase
+from utils.logger import get_logger
+
+# Watchlist the NIFTY Trading page starts from
+NIFTY_STOCKS = [
+    'RELIANCE', 'TCS', 'HDFCBANK', 'INFY', 'ICICIBANK',
+    'HINDUNILVR', 'BHARTIARTL', 'ITC', 'SBIN', 'KOTAKBANK',
+    'LT', 'AXISBANK', 'BAJFINANCE', 'ASIANPAINT', 'MARUTI'
+]
+
+# A heartbeat older than this (seconds) means the daemon is not running
+HEARTBEAT_TIMEOUT = 10
+
+# AITradingEngine attributes the 'ai' settings payload may change
+AI_SETTINGS = ['max_positions', 'max_trades_per_day', 'max_loss_per_day', 'max_loss_per_trade']
+
+
+def trader_snapshot(trader: AutoTrader, **extra) -> Dict:
+    """
+    AutoTrader.get_status() with positions marked to market
+    
+    Each position gains current_price (the latest check_positions quote, the
+    entry price before the first check), current_value and unrealized P&L;
+    all_trades keeps the last 10 trades.
+    
+    Args:
+        trader: AutoTrader instance
+        **extra: Additional fields for the snapshot
+    
+    Returns:
+        Status dictionary (same keys as get_status)
+    """
+    status = trader.get_status()
+    
+    positions = {}
+    for symbol, position in trader.positions.items():
+        current_price = trader.last_prices.get(symbol, position['entry_price'])
+        unrealized_pnl = (current_price - position['entry_price']) * position['quantity']
+        positions[symbol] = {
+            **position,
+            'current_price': current_price,
+            'current_value': current_price * position['quantity'],
+            'unrealized_pnl': unrealized_pnl,
+            'unrealized_pnl_pct': unrealized_pnl / position['cost'] * 100 if position['cost'] else 0.0
+        }
+    
+    status.update(
+        positions=positions,
+        all_trades=trader.all_trades[-10:],
+        last_check=trader.last_check,
+        config=trader.config,
+        **extra
+    )
+    return status
+
+
+def engine_snapshot(engine: AITradingEngine, **extra) -> Dict:
+    """
+    AITradingEngine.get_status() with its open positions
+    
+    Args:
+        engine: AITradingEngine instance
+        **extra: Additional fields for the snapshot
+    
+    Returns:
+        Status dictionary
+    """
+    status = engine.get_status()
+    status.update(positions=engine.positions, last_spot=engine.last_spot, **extra)
+    return status
+
+
+class TradingDaemon:
+    """
+    Background host for AutoTrader instances and the AI engine
+    
+    All jobs run on one scheduler thread, so a trader is never used by two
+    threads at once. Jobs and their intervals:
+    - <trader>.scan: run_once() every scan_interval_minutes while scanning
+    - <trader>.monitor: check_positions() every monitor_interval seconds
+    - ai.decide: analyze_and_decide() + execute_trade() every ai_interval
+      seconds while the engine is active
+    - ai.monitor: monitor_positions() every ai_monitor_interval seconds
+    - commands: apply queued UI commands
+    
+    The heartbeat is published from its own thread every command_interval
+    seconds, so a long scan or AI decision never makes the daemon look dead
+    to the UI. While a job runs, the heartbeat names it under 'busy'.
+    """
+    
+    def __init__(self, db_path: str = "data/trading.db", traders: Optional[Dict[str, AutoTrader]] = None,
+                 ai_engine: Optional[AITradingEngine] = None, monitor_interval: float = 5,
+                 ai_interval: float = 60, ai_monitor_interval: float = 30, command_interval: float = 1):
+        """
+        Initialize the daemon
+        
+        Args:
+            db_path: SQLite database shared with the UI
+            traders: AutoTrader per component name (default: 'autotrader'
+                and 'nifty', the two UI pages)
+            ai_engine: AI engine (default: a new AITradingEngine)
+            monitor_interval: Seconds between position checks
+            ai_interval: Seconds between AI decisions
+            ai_monitor_interval: Seconds between AI position checks
+            command_interval: Seconds between command polls and heartbeats
+        """
+        self.logger = get_logger("TradingDaemon")
+        self.db = TradingDatabase(db_path, background_writer=True)
+        self.fetcher = FreeFetcher()
+        
+        if traders is None:
+            traders = {name: AutoTrader(mode="SIMULATION", db_path=db_path) for name in ('autotrader', 'nifty')}
+            traders['nifty'].config['stocks_to_trade'] = list(NIFTY_STOCKS)
+        self.traders = traders
+        self.ai_engine = ai_engine if ai_engine is not None else AITradingEngine()
+        
+        # Per-trader switches (scanning starts off, like the UI pages)
+        self.scanning = {name: False for name in traders}
+        self.monitoring = {name: True for name in traders}
+        self.checks = {name: 0 for name in traders}
+        
+        # AI engine state
+        self.min_confidence = 0.0
+        self.last_decision = None
+        
+        self.intervals = {'commands': command_interval, 'ai.decide': ai_interval,
+                          'ai.monitor': ai_monitor_interval}
+        for name in traders:
+            self.intervals[f"{name}.monitor"] = monitor_interval
+        
+        # Scheduler: heap of (due, sequence, job); _due holds each job's live entry
+        self._jobs = []
+        self._due = {}
+        self._sequence = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+        self._heartbeat_thread = None
+        self.started_at = None
+        
+        # Job running on the scheduler thread: {'job', 'since'} or None
+        self._busy = None
+        
+        self.logger.info(f"TradingDaemon initialized with traders {list(traders)}")
+    
+    # ========================================
+    # SCHEDULER
+    # ========================================
+    
+    def _interval(self, job: str) -> float:
+        """Seconds until a job's next run"""
+        component, _, action = job.partition('.')
+        if action == 'scan':
+            return self.traders[component].config['scan_interval_minutes'] * 60
+        return self.intervals[job]
+    
+    def _schedule(self, job: str, delay: Optional[float] = None):
+        """(Re)schedule a job; an earlier heap entry for it becomes stale"""
+        due = time.monotonic() + (self._interval(job) if delay is None else delay)
+        self._due[job] = due
+        heapq.heappush(self._jobs, (due, next(self._sequence), job))
+    
+    def _run(self):
+        """Scheduler loop: run the next due job, sleep until the one after"""
+        jobs = ['commands', 'ai.decide', 'ai.monitor']
+        for name in self.traders:
+            jobs += [f"{name}.scan", f"{name}.monitor"]
+        for job in jobs:
+            self._schedule(job, 0)
+        
+        while not self._stop.is_set():
+            due, _, job = self._jobs[0]
+            if self._due.get(job) != due:
+                heapq.heappop(self._jobs)
+                continue
+            
+            wait = due - time.monotonic()
+            if wait > 0:
+                # Wakes up early on stop()
+                self._stop.wait(wait)
+                continue
+            
+            heapq.heappop(self._jobs)
+            self._run_job(job)
+            
+            # The next run counts from the end of this one, unless a command
+            # already rescheduled the job while it ran
+            if self._due.get(job) == due:
+                self._schedule(job)
+    
+    def _run_job(self, job: str):
+        """Run one job and publish the snapshot it changed"""
+        component, _, action = job.partition('.')
+        
+        try:
+            if job == 'commands':
+                self._apply_commands()
+                return
+            
+            if component == 'ai':
+                changed = self._ai_decide() if action == 'decide' else self._ai_monitor()
+            elif action == 'scan':
+                changed = self._scan(component)
+            else:
+                changed = self._monitor(component)
+        
+        except Exception as e:
+            self.logger.error(f"Job {job} failed: {str(e)}")
+            changed = True
+        
+        finally:
+            # Set by _announce in long jobs, including ones a command ran inline
+            self._busy = None
+        
+        if changed:
+            self.publish(component)
+    
+    # ========================================
+    # JOBS
+    # ========================================
+    
+    def _announce(self, job: str):
+        """Mark a long job as running and publish the heartbeat right away"""
+        self._busy = {'job': job, 'since': time.time()}
+        self.publish_heartbeat()
+    
+    def _scan(self, name: str, force: bool = False) -> bool:
+        """Scan a trader's watchlist and execute its signals"""
+        if not (self.scanning[name] or force):
+            return False
+        
+        self._announce(f"{name}.scan")
+        self.traders[name].run_once()
+        return True
+    
+    def _monitor(self, name: str) -> bool:
+        """Check a trader's open positions for stop-loss / target"""
+        trader = self.traders[name]
+        if not (self.monitoring[name] and trader.positions):
+            return False
+        
+        trader.check_positions()
+        self.checks[name] += 1
+        return True
+    
+    def _ai_decide(self, force: bool = False) -> bool:
+        """Analyze NIFTY and execute the engine's decision"""
+        engine = self.ai_engine
+        if not (engine.is_active or force):
+            return False
+        
+        self._announce('ai.decide')
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=90)
+        nifty_data = self.fetcher.get_historical_data(
+            "^NSEI",
+            start_date.strftime('%Y-%m-%d'),
+            end_date.strftime('%Y-%m-%d')
+        )
+        if nifty_data.empty:
+            return False
+        
+        decision = engine.analyze_and_decide(nifty_data, 'NIFTY 50')
+        if decision is None:
+            return True
+        
+        result = None
+        if decision['decision'] == 'TRADE' and decision['confidence'] >= self.min_confidence:
+            result = engine.execute_trade(decision)
+        
+        conditions = decision.get('market_conditions', {})
+        self.last_decision = {
+            'time': datetime.now(),
+            'decision': decision['decision'],
+            'strategy': decision.get('strategy'),
+            'confidence': decision.get('confidence', conditions.get('confidence')),
+            'trend': conditions.get('trend'),
+            'volatility': conditions.get('volatility'),
+            'reason': decision.get('reason'),
+            'status': result['status'] if result else None
+        }
+        return True
+    
+    def _ai_monitor(self) -> bool:
+        """Reprice the engine's positions and apply stop-loss / target"""
+        if not self.ai_engine.positions:
+            return False
+        
+        try:
+            spot = self.fetcher.get_quote("^NSEI")['last_price'] or None
+        except Exception:
+            spot = None
+        
+        self.ai_engine.monitor_positions(spot=spot)
+        return True
+    
+    # ========================================
+    # COMMANDS
+    # ========================================
+    
+    def _apply_commands(self):
+        """Apply every command queued by the UI, oldest first"""
+        for command in self.db.take_commands():
+            try:
+                self.handle_command(command['component'], command['command'], command['payload'])
+            except Exception as e:
+                self.logger.error(f"Command {command['component']}.{command['command']} failed: {str(e)}")
+    
+    def handle_command(self, component: str, command: str, payload: Optional[Dict] = None):
+        """
+        Apply one UI request
+        
+        Queued commands run on the scheduler thread; call this directly only
+        before start().
+        
+        Traders ('autotrader', 'nifty'):
+            start / stop: periodic scanning on or off
+            scan: one scan now
+            monitor: {'enabled': bool, 'interval': seconds}
+            reset: clear positions, trades and statistics
+            start and scan accept {'config': {...}} to update the trader config
+        'ai':
+            start / stop: engine on or off; analyze: one decision now
+            start accepts {'settings': {...}} (capital, min_confidence and
+            the AI_SETTINGS limits)
+        'daemon':
+            shutdown: stop the scheduler
+        
+        Args:
+            component: Target component
+            command: Command name
+            payload: Command arguments
+        """
+        payload = payload or {}
+        self.logger.info(f"Command {component}.{command} {payload}")
+        
+        if component == 'daemon':
+            if command == 'shutdown':
+                self._stop.set()
+            return
+        
+        if component == 'ai':
+            self._handle_ai_command(command, payload)
+            self.publish('ai')
+            return
+        
+        if component not in self.traders:
+            raise ValueError(f"Unknown component: {component}")
+        
+        trader = self.traders[component]
+        if 'config' in payload:
+            self._configure(trader, payload['config'])
+        
+        if command == 'start':
+            self.scanning[component] = trader.is_running = True
+            self._schedule(f"{component}.scan", 0)
+        elif command == 'stop':
+            self.scanning[component] = trader.is_running = False
+        elif command == 'scan':
+            self._scan(component, force=True)
+        elif command == 'monitor':
+            self.monitoring[component] = payload.get('enabled', True)
+            if 'interval' in payload:
+                self.intervals[f"{component}.monitor"] = float(payload['interval'])
+            self._schedule(f"{component}.monitor", 0)
+        elif command == 'reset':
+            trader.reset()
+            self.checks[component] = 0
+        else:
+            raise ValueError(f"Unknown command: {command}")
+        
+        self.publish(component)
+    
+    @staticmethod
+    def _configure(trader: AutoTrader, config: Dict):
+        """Apply a UI config; capital only changes while flat"""
+        capital = config.get('starting_capital', trader.config['starting_capital'])
+        trader.config.update(config)
+        
+        if capital != trader.capital and not trader.positions:
+            trader.capital = capital
+            trader.available_capital = capital
+    
+    def _handle_ai_command(self, command: str, payload: Dict):
+        """Apply an 'ai' command"""
+        engine = self.ai_engine
+        settings = payload.get('settings', {})
+        
+        if 'capital' in settings and settings['capital'] != engine.capital and not engine.positions:
+            engine.capital = engine.available_capital = settings['capital']
+        if 'min_confidence' in settings:
+            self.min_confidence = settings['min_confidence']
+        for name in AI_SETTINGS:
+            if name in settings:
+                setattr(engine, name, settings[name])
+        
+        if command == 'start':
+            engine.start()
+            self._schedule('ai.decide', 0)
+        elif command == 'stop':
+            engine.stop()
+        elif command == 'analyze':
+            self._ai_decide(force=True)
+        else:
+            raise ValueError(f"Unknown command: {command}")
+    
+    # ========================================
+    # SNAPSHOTS
+    # ========================================
+    
+    def snapshot(self, component: str) -> Dict:
+        """Current state of one component"""
+        if component == 'ai':
+            return engine_snapshot(self.ai_engine, min_confidence=self.min_confidence,
+                                   last_decision=self.last_decision)
+        
+        return trader_snapshot(
+            self.traders[component],
+            scanning=self.scanning[component],
+            monitoring=self.monitoring[component],
+            monitor_interval=self.intervals[f"{component}.monitor"],
+            checks=self.checks[component]
+        )
+    
+    def publish(self, component: str):
+        """Publish a component's snapshot (non-blocking, via the writer thread)"""
+        self.db.publish_state(component, self.snapshot(component))
+    
+    def publish_heartbeat(self, running: bool = True):
+        """Publish daemon liveness, the running job and the time until each job runs next"""
+        now = time.monotonic()
+        busy = self._busy
+        
+        # Called from the heartbeat thread while the scheduler updates _due
+        due = self._due.copy()
+        
+        self.db.publish_state('daemon', {
+            'running': running,
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'components': list(self.traders) + ['ai'],
+            'busy': dict(busy, seconds=time.time() - busy['since']) if busy else None,
+            'next_run': {job: max(0.0, at - now) for job, at in due.items()}
+        })
+    
+    def _heartbeat(self, scheduler: threading.Thread):
+        """Heartbeat loop; reports not running if the scheduler thread died"""
+        while not self._stop.wait(self.intervals['commands']):
+            self.publish_heartbeat(running=scheduler.is_alive())
+    
+    # ========================================
+    # LIFECYCLE
+    # ========================================
+    
+    def start(self):
+        """Start the scheduler thread and publish initial snapshots"""
+        if self._thread is not None:
+            return
+        
+        self.started_at = datetime.now()
+        self._stop.clear()
+        for component in list(self.traders) + ['ai']:
+            self.publish(component)
+        self.publish_heartbeat()
+        
+        self._thread = threading.Thread(target=self._run, name="TradingDaemon", daemon=True)
+        self._thread.start()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, args=(self._thread,),
+                                                  name="TradingDaemonHeartbeat", daemon=True)
+        self._heartbeat_thread.start()
+        self.logger.info("TradingDaemon started")
+    
+    def stop(self):
+        """Stop the scheduler, flush the traders and publish final snapshots"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+        
+        for name, trader in self.traders.items():
+            self.scanning[name] = False
+            trader.stop()
+        
+        for component in list(self.traders) + ['ai']:
+            self.publish(component)
+        self.publish_heartbeat(running=False)
+        self.db.flush()
+        self.logger.info("TradingDaemon stopped")
+    
+    def run_forever(self):
+        """Run until Ctrl+C or a daemon.shutdown command"""
+        self.start()
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Stopped by user")
+        finally:
+            self.stop()
+
+
+class DaemonClient:
+    """
+    UI-side view of a TradingDaemon: reads snapshots, queues commands
+    """
+    
+    def __init__(self, db: Optional[TradingDatabase] = None, db_path: str = "data/trading.db"):
+        """
+        Args:
+            db: Open database to share (e.g. the UI's session database)
+            db_path: Database to open when db is not given
+        """
+        self.db = db if db is not None else TradingDatabase(db_path)
+    
+    def is_alive(self, timeout: float = HEARTBEAT_TIMEOUT) -> bool:
+        """True if a daemon published a heartbeat within the last timeout seconds"""
+        heartbeat = self.db.get_state('daemon')
+        return (heartbeat is not None and heartbeat.get('running', False)
+                and time.time() - heartbeat['updated_at'] < timeout)
+    
+    def busy(self) -> Optional[Dict]:
+        """Job the daemon is running ({'job', 'since', 'seconds'}) or None"""
+        heartbeat = self.db.get_state('daemon')
+        return heartbeat.get('busy') if heartbeat else None
+    
+    def status(self, component: str) -> Optional[Dict]:
+        """Latest snapshot of a component ('autotrader', 'nifty', 'ai', 'daemon')"""
+        return self.db.get_state(component)
+    
+    def send(self, component: str, command: str, **payload) -> int:
+        """Queue a command for the daemon (see TradingDaemon.handle_command)"""
+        return self.db.queue_command(component, command, payload)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the daemon from the command line"""
+    parser = argparse.ArgumentParser(description="Background trading daemon")
+    parser.add_argument('--db', default="data/trading.db", help="SQLite database shared with the UI")
+    parser.add_argument('--monitor-interval', type=float, default=5, help="Seconds between position checks")
+    parser.add_argument('--scan', nargs='*', choices=['autotrader', 'nifty'], default=[],
+                        help="Traders that scan for signals from the start")
+    parser.add_argument('--ai', action='store_true', help="Start the AI engine")
+    parser.add_argument('--ai-interval', type=float, default=60, help="Seconds between AI decisions")
+    args = parser.parse_args(argv)
+    
+    print("\n" + "="*60)
+    print("🛰️  TRADING DAEMON")
+    print("="*60)
+    
+    daemon = TradingDaemon(args.db, monitor_interval=args.monitor_interval, ai_interval=args.ai_interval)
+    for name in args.scan:
+        daemon.handle_command(name, 'start')
+    if args.ai:
+        daemon.handle_command('ai', 'start')
+    
+    print(f"\nDatabase: {args.db}")
+    print(f"Position checks every {args.monitor_interval:g}s, scanning: {', '.join(args.scan) or 'on request'}")
+    print(f"AI engine: {'ACTIVE' if args.ai else 'on request'}")
+    print("Press Ctrl+C to stop\n")
+    
+    daemon.run_forever()
+    
+    print("\n✅ Trading daemon stopped")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 """Utilities package"""
 from .database import TradingDatabase
 from .logger import TradingLogger, get_logger
+from .performance import (
+    equity_statistics, max_drawdown, performance_report, rolling_metrics,
+    sharpe_ratio, sortino_ratio, trade_statistics
+)
+from .trade_ledger import TradeLedger
 
-__all__ = ['TradingDatabase', 'TradingLogger', 'get_logger']
-
+__all__ = [
+    'TradingDatabase', 'TradingLogger', 'get_logger',
+    'equity_statistics', 'max_drawdown', 'performance_report', 'rolling_metrics',
+    'sharpe_ratio', 'sortino_ratio', 'trade_statistics', 'TradeLedger'
+]
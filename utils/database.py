@@ -2,24 +2,92 @@
 Database module for storing trades, positions, and logs
 Uses SQLite - no external database needed
 """
+import atexit
+import json
+import queue
 import sqlite3
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from utils.performance import trade_statistics
+
+INSERT_TRADE_SQL = """
+    INSERT INTO trades (
+        symbol, strategy, entry_date, exit_date, 
+        entry_price, exit_price, quantity, profit, profit_percent, status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SIGNAL_SQL = """
+    INSERT INTO signals (symbol, strategy, signal_type, price, indicators)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+INSERT_LOG_SQL = """
+    INSERT INTO logs (level, message, module)
+    VALUES (?, ?, ?)
+"""
+
+UPSERT_BAR_SQL = """
+    INSERT OR REPLACE INTO bars (symbol_id, interval, epoch, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_STATE_SQL = """
+    INSERT OR REPLACE INTO daemon_state (component, state, updated_at)
+    VALUES (?, ?, ?)
+"""
+
+# Row layout returned by TradingDatabase.get_bars(as_frame=False)
+BAR_DTYPE = np.dtype([
+    ('epoch', np.int64),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('volume', np.int64)
+])
+
+
 class TradingDatabase:
     """
     SQLite database for trading application
     Stores trades, positions, signals, and logs
+    
+    The database runs in WAL mode with synchronous=NORMAL, so commits don't
+    wait for a full fsync. For hot paths, use the *_bulk methods (one
+    transaction per batch) or the background writer (queue_trade /
+    queue_signal / queue_log).
     """
     
-    def __init__(self, db_path: str = "data/trading.db"):
+    # Max rows the background writer commits in one transaction
+    WRITER_BATCH_SIZE = 500
+    
+    # Sentinel telling the writer thread to exit
+    _STOP = object()
+    
+    # Schema migrations, applied in order. PRAGMA user_version stores the
+    # number of migrations already applied to the file.
+    MIGRATIONS = [
+        '_migrate_v1_indexes',
+        '_migrate_v2_bars',
+        '_migrate_v3_daemon',
+        '_migrate_v4_trade_dates',
+    ]
+    
+    def __init__(self, db_path: str = "data/trading.db", background_writer: bool = False,
+                 queue_size: int = 10000):
         """
         Initialize database connection
         
         Args:
             db_path: Path to SQLite database file
+            background_writer: Start a writer thread for queue_* calls
+            queue_size: Max pending writes before queue_* calls block
         """
         self.db_path = db_path
         
@@ -27,14 +95,33 @@ class TradingDatabase:
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
         # Connect to database
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn = self._connect()
         self.cursor = self.conn.cursor()
         
-        # Create tables
+        # Create tables and bring the schema up to date
         self.create_tables()
+        self.migrate()
+        
+        # Background writer (see start_writer)
+        self._queue = None
+        self._writer = None
+        
+        if background_writer:
+            self.start_writer(queue_size)
         
         print(f"✅ Database initialized: {db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with WAL journaling"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        
+        # WAL lets readers (UI) and the writer work concurrently; NORMAL
+        # only syncs at checkpoints, which is still crash-safe in WAL mode
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        return conn
+    
     def create_tables(self):
         """Create database tables if they don't exist"""
         
@@ -111,6 +198,212 @@ class TradingDatabase:
         
         self.conn.commit()
     
+    # ========================================
+    # MIGRATIONS
+    # ========================================
+    
+    @property
+    def schema_version(self) -> int:
+        """Number of migrations applied to this database"""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+    
+    def migrate(self):
+        """Apply pending schema migrations in place"""
+        for version, name in enumerate(self.MIGRATIONS, start=1):
+            if self.schema_version >= version:
+                continue
+            
+            # IMMEDIATE takes the write lock up front, so two processes
+            # opening the same file can't both run a migration
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.schema_version < version:
+                    getattr(self, name)()
+                    self.conn.execute(f"PRAGMA user_version = {version}")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            
+            print(f"✅ Database schema migrated to v{version}")
+    
+    def _migrate_v1_indexes(self):
+        """
+        v1: secondary indexes and integer signal timestamps
+        
+        - trades (symbol, strategy, id): history lookups, newest first
+        - trades (status, strategy, profit): stats aggregate from the index alone
+        - signals (symbol, id) and (timestamp)
+        - signals.timestamp TEXT -> INTEGER epoch seconds (UTC)
+        """
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_symbol_strategy_id
+            ON trades (symbol, strategy, id)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_status_strategy
+            ON trades (status, strategy, profit)
+        """)
+        
+        # SQLite can't change a column type - rebuild the table
+        self.conn.execute("""
+            CREATE TABLE signals_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                signal_type TEXT NOT NULL,
+                price REAL NOT NULL,
+                indicators TEXT,
+                timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+            )
+        """)
+        self.conn.execute("""
+            INSERT INTO signals_new (id, symbol, strategy, signal_type, price, indicators, timestamp)
+            SELECT id, symbol, strategy, signal_type, price, indicators,
+                   COALESCE(CAST(strftime('%s', timestamp) AS INTEGER),
+                            CAST(strftime('%s', 'now') AS INTEGER))
+            FROM signals
+        """)
+        self.conn.execute("DROP TABLE signals")
+        self.conn.execute("ALTER TABLE signals_new RENAME TO signals")
+        
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_signals_symbol_id
+            ON signals (symbol, id)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_signals_timestamp
+            ON signals (timestamp)
+        """)
+    
+    def _migrate_v2_bars(self):
+        """
+        v2: OHLCV time-series store
+        
+        WITHOUT ROWID makes the primary key the table's B-tree, so bars are
+        stored clustered by (symbol, interval, time) and a range query is
+        one contiguous scan.
+        """
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS symbols (
+                id INTEGER PRIMARY KEY,
+                symbol TEXT NOT NULL UNIQUE
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS bars (
+                symbol_id INTEGER NOT NULL REFERENCES symbols (id),
+                interval TEXT NOT NULL,
+                epoch INTEGER NOT NULL,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume INTEGER NOT NULL,
+                PRIMARY KEY (symbol_id, interval, epoch)
+            ) WITHOUT ROWID
+        """)
+    
+    def _migrate_v3_daemon(self):
+        """
+        v3: trading daemon IPC
+        
+        - daemon_state: latest JSON snapshot per component, written by the
+          daemon and read by the UI
+        - daemon_commands: UI -> daemon requests, consumed in id order
+        """
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daemon_state (
+                component TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daemon_commands (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                component TEXT NOT NULL,
+                command TEXT NOT NULL,
+                payload TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+    
+    def _migrate_v4_trade_dates(self):
+        """
+        v4: integer trade dates
+        
+        - trades.entry_date / exit_date TEXT -> INTEGER epoch seconds (UTC),
+          like signals.timestamp in v1, so date sorts and range filters
+          compare integers instead of strings in mixed formats
+        - trades (exit_date, id): stats in exit order and date-range queries
+        """
+        self.conn.execute("""
+            CREATE TABLE trades_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                strategy TEXT NOT NULL,
+                entry_date INTEGER NOT NULL,
+                exit_date INTEGER,
+                entry_price REAL NOT NULL,
+                exit_price REAL,
+                quantity INTEGER NOT NULL,
+                profit REAL,
+                profit_percent REAL,
+                status TEXT DEFAULT 'OPEN',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.execute("""
+            INSERT INTO trades_new (id, symbol, strategy, entry_date, exit_date, entry_price,
+                                    exit_price, quantity, profit, profit_percent, status, created_at)
+            SELECT id, symbol, strategy,
+                   COALESCE(CAST(strftime('%s', entry_date) AS INTEGER),
+                            CAST(strftime('%s', created_at) AS INTEGER),
+                            CAST(strftime('%s', 'now') AS INTEGER)),
+                   CAST(strftime('%s', exit_date) AS INTEGER),
+                   entry_price, exit_price, quantity, profit, profit_percent, status, created_at
+            FROM trades
+        """)
+        self.conn.execute("DROP TABLE trades")
+        self.conn.execute("ALTER TABLE trades_new RENAME TO trades")
+        
+        # Dropping the table dropped its v1 indexes
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_symbol_strategy_id
+            ON trades (symbol, strategy, id)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_status_strategy
+            ON trades (status, strategy, profit)
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trades_exit_date
+            ON trades (exit_date, id)
+        """)
+    
+    @staticmethod
+    def _to_epoch(value) -> int:
+        """Date/datetime/string -> epoch seconds (naive values are UTC)"""
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is None:
+            ts = ts.tz_localize('UTC')
+        return int(ts.timestamp())
+    
+    @classmethod
+    def _to_epoch_or_none(cls, value) -> Optional[int]:
+        """Like _to_epoch, but missing values (None/NaT/'') stay NULL"""
+        if value is None or value == '' or pd.isna(value):
+            return None
+        return cls._to_epoch(value)
+    
+    @staticmethod
+    def _to_epochs(values: List) -> List[Optional[int]]:
+        """Vectorized _to_epoch_or_none for a list of mixed date values"""
+        stamps = pd.to_datetime(pd.Series(values, dtype=object), utc=True, format='mixed')
+        seconds = (stamps - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+        return [None if pd.isna(value) else int(value) for value in seconds]
+    
     # ========================================
     # TRADES
     # ========================================
@@ -125,29 +418,54 @@ class TradingDatabase:
         Returns:
             Trade ID
         """
-        self.cursor.execute("""
-            INSERT INTO trades (
-                symbol, strategy, entry_date, exit_date, 
-                entry_price, exit_price, quantity, profit, profit_percent, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        self.cursor.execute(INSERT_TRADE_SQL, self._trade_row(trade))
+        
+        self.conn.commit()
+        return self.cursor.lastrowid
+    
+    def insert_trades_bulk(self, trades: List[Dict]) -> int:
+        """
+        Insert many trades in a single transaction
+        
+        Args:
+            trades: List of trade dictionaries
+        
+        Returns:
+            Number of trades inserted
+        """
+        # Parse each date column in one pass rather than row by row
+        entry_dates = self._to_epochs([trade.get('entry_date') for trade in trades])
+        exit_dates = self._to_epochs([trade.get('exit_date') for trade in trades])
+        rows = [self._trade_row(trade, dates) for trade, dates in zip(trades, zip(entry_dates, exit_dates))]
+        
+        if rows:
+            with self.conn:
+                self.conn.executemany(INSERT_TRADE_SQL, rows)
+        
+        return len(rows)
+    
+    @classmethod
+    def _trade_row(cls, trade: Dict, dates: Optional[tuple] = None) -> tuple:
+        """Trade dictionary -> INSERT_TRADE_SQL parameters (dates: pre-parsed epochs)"""
+        if dates is None:
+            dates = (cls._to_epoch_or_none(trade.get('entry_date')),
+                     cls._to_epoch_or_none(trade.get('exit_date')))
+        
+        return (
             trade.get('symbol'),
             trade.get('strategy', 'Unknown'),
-            trade.get('entry_date'),
-            trade.get('exit_date'),
+            dates[0],
+            dates[1],
             trade.get('entry_price'),
             trade.get('exit_price'),
             trade.get('quantity'),
             trade.get('profit'),
             trade.get('profit_percent'),
             trade.get('status', 'CLOSED')
-        ))
-        
-        self.conn.commit()
-        return self.cursor.lastrowid
+        )
     
     def get_trades(self, symbol: str = None, strategy: str = None, 
-                   limit: int = 100) -> pd.DataFrame:
+                   limit: int = 100, start=None, end=None) -> pd.DataFrame:
         """
         Get trades from database
         
@@ -155,9 +473,11 @@ class TradingDatabase:
             symbol: Filter by symbol
             strategy: Filter by strategy
             limit: Max number of trades
+            start: Only trades closed at or after this time (naive = UTC)
+            end: Only trades closed before this time (naive = UTC)
         
         Returns:
-            DataFrame with trades
+            DataFrame with trades (entry_date / exit_date as UTC datetimes)
         """
         query = "SELECT * FROM trades WHERE 1=1"
         params = []
@@ -170,49 +490,52 @@ class TradingDatabase:
             query += " AND strategy = ?"
             params.append(strategy)
         
-        query += f" ORDER BY id DESC LIMIT {limit}"
+        if start is not None:
+            query += " AND exit_date >= ?"
+            params.append(self._to_epoch(start))
         
-        return pd.read_sql_query(query, self.conn, params=params)
+        if end is not None:
+            query += " AND exit_date < ?"
+            params.append(self._to_epoch(end))
+        
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+        
+        trades = pd.read_sql_query(query, self.conn, params=params)
+        for column in ('entry_date', 'exit_date'):
+            trades[column] = pd.to_datetime(trades[column], unit='s')
+        return trades
     
-    def get_trade_stats(self, strategy: str = None) -> Dict:
+    def get_trade_stats(self, strategy: str = None, capital: float = None) -> Dict:
         """
         Get trade statistics
         
         Args:
             strategy: Filter by strategy
+            capital: Starting capital - adds max drawdown of the closed trades
         
         Returns:
-            Dictionary with stats
-        """
-        query = """
-            SELECT 
-                COUNT(*) as total_trades,
-                SUM(CASE WHEN profit > 0 THEN 1 ELSE 0 END) as winning_trades,
-                SUM(profit) as total_profit,
-                AVG(profit) as avg_profit,
-                MAX(profit) as max_profit,
-                MIN(profit) as min_loss
-            FROM trades 
-            WHERE status = 'CLOSED'
+            Dictionary with stats (see utils.performance.trade_statistics)
         """
+        query = "SELECT profit FROM trades WHERE status = 'CLOSED'"
+        params = []
         
         if strategy:
             query += " AND strategy = ?"
-            self.cursor.execute(query, (strategy,))
-        else:
-            self.cursor.execute(query)
+            params.append(strategy)
         
-        result = self.cursor.fetchone()
+        # Only the drawdown depends on trade order - skip the sort otherwise
+        if capital is not None:
+            query += " ORDER BY exit_date, id"
         
-        return {
-            'total_trades': result[0] or 0,
-            'winning_trades': result[1] or 0,
-            'total_profit': result[2] or 0,
-            'avg_profit': result[3] or 0,
-            'max_profit': result[4] or 0,
-            'min_loss': result[5] or 0,
-            'win_rate': (result[1] / result[0] * 100) if result[0] else 0
-        }
+        # One float column straight into NumPy - no DataFrame per call
+        cursor = self.conn.execute(query, params)
+        profits = np.fromiter((row[0] or 0.0 for row in cursor), dtype=np.float64)
+        
+        stats = trade_statistics(profits, capital)
+        stats['min_loss'] = stats['max_loss']
+        
+        return stats
     
     # ========================================
     # SIGNALS
@@ -228,22 +551,54 @@ class TradingDatabase:
         Returns:
             Signal ID
         """
-        self.cursor.execute("""
-            INSERT INTO signals (symbol, strategy, signal_type, price, indicators)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
+        self.cursor.execute(INSERT_SIGNAL_SQL, self._signal_row(signal))
+        
+        self.conn.commit()
+        return self.cursor.lastrowid
+    
+    def insert_signals_bulk(self, signals: List[Dict]) -> int:
+        """
+        Insert many signals in a single transaction
+        
+        Args:
+            signals: List of signal dictionaries
+        
+        Returns:
+            Number of signals inserted
+        """
+        rows = [self._signal_row(signal) for signal in signals]
+        
+        if rows:
+            with self.conn:
+                self.conn.executemany(INSERT_SIGNAL_SQL, rows)
+        
+        return len(rows)
+    
+    @staticmethod
+    def _signal_row(signal: Dict) -> tuple:
+        """Signal dictionary -> INSERT_SIGNAL_SQL parameters"""
+        return (
             signal.get('symbol'),
             signal.get('strategy'),
             signal.get('signal_type'),
             signal.get('price'),
             signal.get('indicators', '')
-        ))
-        
-        self.conn.commit()
-        return self.cursor.lastrowid
+        )
     
-    def get_signals(self, symbol: str = None, limit: int = 100) -> pd.DataFrame:
-        """Get recent signals"""
+    def get_signals(self, symbol: str = None, limit: int = 100,
+                    start=None, end=None) -> pd.DataFrame:
+        """
+        Get recent signals
+        
+        Args:
+            symbol: Filter by symbol
+            limit: Max number of signals
+            start: Only signals at or after this time (naive = UTC)
+            end: Only signals before this time (naive = UTC)
+        
+        Returns:
+            DataFrame with signals (timestamp as UTC datetime)
+        """
         query = "SELECT * FROM signals WHERE 1=1"
         params = []
         
@@ -251,9 +606,152 @@ class TradingDatabase:
             query += " AND symbol = ?"
             params.append(symbol)
         
-        query += f" ORDER BY id DESC LIMIT {limit}"
+        if start is not None:
+            query += " AND timestamp >= ?"
+            params.append(self._to_epoch(start))
         
-        return pd.read_sql_query(query, self.conn, params=params)
+        if end is not None:
+            query += " AND timestamp < ?"
+            params.append(self._to_epoch(end))
+        
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+        
+        signals = pd.read_sql_query(query, self.conn, params=params)
+        signals['timestamp'] = pd.to_datetime(signals['timestamp'], unit='s')
+        return signals
+    
+    # ========================================
+    # MARKET DATA (BARS)
+    # ========================================
+    
+    def _symbol_id(self, symbol: str, create: bool = False) -> Optional[int]:
+        """Look up (or create) the integer id used in the bars table"""
+        symbol = symbol.upper().strip()
+        row = self.conn.execute("SELECT id FROM symbols WHERE symbol = ?", (symbol,)).fetchone()
+        
+        if row is None and create:
+            with self.conn:
+                cursor = self.conn.execute("INSERT INTO symbols (symbol) VALUES (?)", (symbol,))
+            return cursor.lastrowid
+        
+        return row[0] if row else None
+    
+    def upsert_bars(self, symbol: str, data: pd.DataFrame, interval: str = "1d") -> int:
+        """
+        Insert or replace OHLCV bars in a single transaction
+        
+        Args:
+            symbol: Stock symbol
+            data: DataFrame with Date, Open, High, Low, Close, Volume
+            interval: Bar interval (e.g. '1d', '1h')
+        
+        Returns:
+            Number of bars written
+        """
+        if data is None or data.empty:
+            return 0
+        
+        # yfinance pads halted days with NaN bars - the OHLC columns are NOT NULL
+        valid = data[['Open', 'High', 'Low', 'Close']].notna().all(axis=1) & data['Date'].notna()
+        if not valid.all():
+            print(f"⚠️  Skipping {int((~valid).sum())} bars with missing prices for {symbol}")
+            data = data.loc[valid]
+            if data.empty:
+                return 0
+        
+        # Naive dates are stored as UTC, aware ones are converted to UTC
+        dates = pd.to_datetime(data['Date'])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+        epochs = dates.to_numpy(dtype='datetime64[s]').astype(np.int64)
+        
+        # Column-wise tolist() converts in C - no per-row Python code
+        symbol_id = self._symbol_id(symbol, create=True)
+        rows = zip(
+            [symbol_id] * len(data),
+            [interval] * len(data),
+            epochs.tolist(),
+            data['Open'].to_numpy(dtype=np.float64).tolist(),
+            data['High'].to_numpy(dtype=np.float64).tolist(),
+            data['Low'].to_numpy(dtype=np.float64).tolist(),
+            data['Close'].to_numpy(dtype=np.float64).tolist(),
+            data['Volume'].fillna(0).to_numpy(dtype=np.int64).tolist()
+        )
+        
+        with self.conn:
+            self.conn.executemany(UPSERT_BAR_SQL, rows)
+        
+        return len(data)
+    
+    def get_bars(self, symbol: str, interval: str = "1d", start=None, end=None,
+                 as_frame: bool = True, latest: Optional[int] = None):
+        """
+        Range query over stored bars
+        
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval
+            start: First bar time, inclusive (naive = UTC)
+            end: Last bar time, exclusive (naive = UTC)
+            as_frame: Return a DataFrame (True) or a BAR_DTYPE structured array
+            latest: Only the last `latest` bars of the range (still oldest first)
+        
+        Returns:
+            DataFrame with Date, Open, High, Low, Close, Volume (naive UTC
+            dates), or a NumPy structured array with epoch seconds
+        """
+        symbol_id = self._symbol_id(symbol)
+        
+        if symbol_id is None:
+            bars = np.empty(0, dtype=BAR_DTYPE)
+        else:
+            query = """
+                SELECT epoch, open, high, low, close, volume FROM bars
+                WHERE symbol_id = ? AND interval = ?
+            """
+            params = [symbol_id, interval]
+            
+            if start is not None:
+                query += " AND epoch >= ?"
+                params.append(self._to_epoch(start))
+            
+            if end is not None:
+                query += " AND epoch < ?"
+                params.append(self._to_epoch(end))
+            
+            if latest is None:
+                query += " ORDER BY epoch"
+            else:
+                # Walks the primary key backwards - reads only `latest` rows
+                query += " ORDER BY epoch DESC LIMIT ?"
+                params.append(int(latest))
+            
+            # np.fromiter fills the array straight from the cursor - no intermediate lists
+            bars = np.fromiter(self.conn.execute(query, params), dtype=BAR_DTYPE)
+            if latest is not None:
+                bars = bars[::-1].copy()
+        
+        if not as_frame:
+            return bars
+        
+        return pd.DataFrame({
+            'Date': pd.to_datetime(bars['epoch'], unit='s'),
+            'Open': bars['open'],
+            'High': bars['high'],
+            'Low': bars['low'],
+            'Close': bars['close'],
+            'Volume': bars['volume']
+        })
+    
+    def get_bar_symbols(self, interval: str = "1d") -> List[str]:
+        """Symbols with at least one stored bar for the interval"""
+        rows = self.conn.execute("""
+            SELECT symbol FROM symbols s
+            WHERE EXISTS (SELECT 1 FROM bars b WHERE b.symbol_id = s.id AND b.interval = ?)
+            ORDER BY symbol
+        """, (interval,)).fetchall()
+        return [row[0] for row in rows]
     
     # ========================================
     # POSITIONS
@@ -311,10 +809,7 @@ class TradingDatabase:
             message: Log message
             module: Module name
         """
-        self.cursor.execute("""
-            INSERT INTO logs (level, message, module)
-            VALUES (?, ?, ?)
-        """, (level, message, module))
+        self.cursor.execute(INSERT_LOG_SQL, (level, message, module))
         
         self.conn.commit()
     
@@ -327,10 +822,222 @@ class TradingDatabase:
             query += " AND level = ?"
             params.append(level)
         
-        query += f" ORDER BY id DESC LIMIT {limit}"
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
         
         return pd.read_sql_query(query, self.conn, params=params)
     
+    # ========================================
+    # DAEMON STATE & COMMANDS
+    # ========================================
+    
+    @staticmethod
+    def _json_default(value):
+        """JSON fallback for datetimes and NumPy scalars"""
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if isinstance(value, np.generic):
+            return value.item()
+        return str(value)
+    
+    def publish_state(self, component: str, state: Dict):
+        """
+        Replace a component's snapshot (through the background writer if running)
+        
+        Args:
+            component: Snapshot name, e.g. 'nifty' or 'ai'
+            state: JSON-serializable dict (datetimes become ISO strings)
+        """
+        self._enqueue(UPSERT_STATE_SQL, (
+            component, json.dumps(state, default=self._json_default), datetime.now().timestamp()
+        ))
+    
+    def get_state(self, component: str) -> Optional[Dict]:
+        """
+        Latest snapshot of a component
+        
+        Returns:
+            The published dict plus 'updated_at' (epoch seconds), or None
+        """
+        row = self.conn.execute(
+            "SELECT state, updated_at FROM daemon_state WHERE component = ?", (component,)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        state = json.loads(row[0])
+        state['updated_at'] = row[1]
+        return state
+    
+    def queue_command(self, component: str, command: str, payload: Dict = None) -> int:
+        """
+        Ask the daemon to run a command
+        
+        Args:
+            component: Target component ('autotrader', 'nifty', 'ai', 'daemon')
+            command: Command name, e.g. 'scan' or 'stop'
+            payload: Optional JSON-serializable arguments
+        
+        Returns:
+            Command id
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO daemon_commands (component, command, payload, created_at) VALUES (?, ?, ?, ?)",
+                (component, command, json.dumps(payload or {}, default=self._json_default),
+                 datetime.now().timestamp())
+            )
+        return cursor.lastrowid
+    
+    def take_commands(self) -> List[Dict]:
+        """
+        Remove and return pending commands, oldest first
+        
+        Reading and deleting happen in one IMMEDIATE transaction, so a
+        command is handed out exactly once.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT id, component, command, payload, created_at FROM daemon_commands ORDER BY id"
+            ).fetchall()
+            if rows:
+                self.conn.execute("DELETE FROM daemon_commands WHERE id <= ?", (rows[-1][0],))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        return [
+            {'id': row[0], 'component': row[1], 'command': row[2],
+             'payload': json.loads(row[3]) if row[3] else {}, 'created_at': row[4]}
+            for row in rows
+        ]
+    
+    # ========================================
+    # BACKGROUND WRITER
+    # ========================================
+    
+    def start_writer(self, queue_size: int = 10000):
+        """
+        Start the background writer thread
+        
+        queue_* calls then return immediately; rows are committed in
+        batches on the writer's own connection. The queue is bounded, so
+        callers only block if the writer falls queue_size rows behind.
+        
+        Args:
+            queue_size: Max pending writes
+        """
+        if self._writer is not None:
+            return
+        
+        if self.db_path == ":memory:":
+            raise ValueError("Background writer needs a file database")
+        
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="TradingDatabaseWriter", daemon=True
+        )
+        self._writer.start()
+        
+        # Make sure queued rows reach disk on interpreter shutdown
+        atexit.register(self.stop_writer)
+    
+    def _writer_loop(self):
+        """Drain the queue, committing each batch in one transaction"""
+        conn = self._connect()
+        running = True
+        
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Group rows by statement (dicts keep first-seen order)
+            grouped = {}
+            for item in batch:
+                if item is self._STOP:
+                    running = False
+                else:
+                    sql, row = item
+                    grouped.setdefault(sql, []).append(row)
+            
+            try:
+                if grouped:
+                    with conn:
+                        for sql, rows in grouped.items():
+                            conn.executemany(sql, rows)
+            except sqlite3.Error as e:
+                # The batch was rolled back - retry row by row so only bad rows are lost
+                print(f"⚠️  Background batch write failed, retrying row by row: {str(e)}")
+                self._write_rows(conn, grouped)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        
+        conn.close()
+    
+    @staticmethod
+    def _write_rows(conn: sqlite3.Connection, grouped: Dict[str, List[tuple]]):
+        """Write each row in its own statement, dropping only the rows that fail"""
+        failed = 0
+        
+        try:
+            with conn:
+                for sql, rows in grouped.items():
+                    for row in rows:
+                        try:
+                            conn.execute(sql, row)
+                        except sqlite3.Error as e:
+                            failed += 1
+                            print(f"❌ Dropped background write: {str(e)} - {row!r:.200}")
+        except sqlite3.Error as e:
+            print(f"❌ Background write failed: {str(e)}")
+            return
+        
+        if failed:
+            print(f"⚠️  {failed} background write(s) dropped")
+    
+    def _enqueue(self, sql: str, row: tuple):
+        """Queue a row for the writer, or write it now if no writer is running"""
+        if self._writer is None:
+            with self.conn:
+                self.conn.execute(sql, row)
+        else:
+            self._queue.put((sql, row))
+    
+    def queue_trade(self, trade: Dict):
+        """Insert a trade without waiting for disk I/O"""
+        self._enqueue(INSERT_TRADE_SQL, self._trade_row(trade))
+    
+    def queue_signal(self, signal: Dict):
+        """Insert a signal without waiting for disk I/O"""
+        self._enqueue(INSERT_SIGNAL_SQL, self._signal_row(signal))
+    
+    def queue_log(self, level: str, message: str, module: str = None):
+        """Add a log entry without waiting for disk I/O"""
+        self._enqueue(INSERT_LOG_SQL, (level, message, module))
+    
+    def flush(self):
+        """Block until every queued write has been committed"""
+        if self._writer is not None:
+            self._queue.join()
+    
+    def stop_writer(self):
+        """Flush the queue and stop the writer thread"""
+        if self._writer is None:
+            return
+        
+        self._queue.put(self._STOP)
+        self._writer.join()
+        self._writer = None
+        atexit.unregister(self.stop_writer)
+    
     # ========================================
     # UTILITY
     # ========================================
@@ -347,7 +1054,8 @@ class TradingDatabase:
         return self.cursor.fetchone()[0]
     
     def close(self):
-        """Close database connection"""
+        """Flush pending writes and close database connection"""
+        self.stop_writer()
         self.conn.close()
         print("✅ Database connection closed")
     
@@ -388,6 +1096,10 @@ if __name__ == "__main__":
     trades = db.get_trades()
     print(trades)
     
+    closed = db.get_trades(start='2024-01-10', end='2024-01-11')
+    assert (closed['exit_date'] == pd.Timestamp('2024-01-10')).all() and not closed.empty
+    print(f"✅ {len(closed)} trades closed on 2024-01-10")
+    
     # Test 3: Insert signal
     print("\n📡 Test 3: Inserting signal...")
     signal = {
@@ -399,17 +1111,54 @@ if __name__ == "__main__":
     signal_id = db.insert_signal(signal)
     print(f"✅ Signal inserted with ID: {signal_id}")
     
-    # Test 4: Get stats
-    print("\n📈 Test 4: Trade statistics...")
+    # Test 4: Bulk insert
+    print("\n📦 Test 4: Bulk inserting trades...")
+    inserted = db.insert_trades_bulk([dict(trade, symbol=f"TEST{i}") for i in range(1000)])
+    print(f"✅ {inserted} trades inserted in one transaction")
+    
+    # Test 5: Background writer
+    print("\n🧵 Test 5: Background writer...")
+    before = db.get_table_count('signals')
+    db.start_writer()
+    for i in range(1000):
+        db.queue_signal(dict(signal, price=3500 + i))
+    db.flush()
+    print(f"✅ {db.get_table_count('signals') - before} queued signals committed")
+    
+    before = db.get_table_count('signals')
+    for i in range(10):
+        db.queue_signal(dict(signal, price=None if i == 5 else 3500 + i))
+    db.flush()
+    assert db.get_table_count('signals') - before == 9, "Only the bad row should be dropped"
+    print("✅ Failed batch retried row by row")
+    
+    recent = db.get_signals(symbol='TCS', start=pd.Timestamp.now('UTC').normalize(), limit=5)
+    print(f"✅ {len(recent)} signals since midnight UTC (schema v{db.schema_version})")
+    
+    # Test 6: Get stats
+    print("\n📈 Test 6: Trade statistics...")
     stats = db.get_trade_stats()
     print(stats)
     
-    # Test 5: Logging
-    print("\n📝 Test 5: Logging...")
+    # Test 7: Logging
+    print("\n📝 Test 7: Logging...")
     db.log('INFO', 'Database test successful', 'database.py')
     logs = db.get_logs()
     print(logs)
     
+    # Test 8: Daemon snapshots and commands
+    print("\n📡 Test 8: Daemon state...")
+    db.publish_state('test', {'positions': 2, 'checked_at': datetime.now(), 'pnl': np.float64(12.5)})
+    db.flush()
+    state = db.get_state('test')
+    assert state['positions'] == 2 and state['pnl'] == 12.5
+    db.queue_command('test', 'scan')
+    db.queue_command('test', 'monitor', {'interval': 5})
+    commands = db.take_commands()
+    assert [c['command'] for c in commands][-2:] == ['scan', 'monitor'] and commands[-1]['payload'] == {'interval': 5}
+    assert db.take_commands() == []
+    print(f"✅ Snapshot round-trip and {len(commands)} commands taken once")
+    
     print("\n✅ All database tests passed!")
     
     # Cleanup
@@ -0,0 +1,360 @@
+"""
+Performance Analytics
+Vectorized trade and equity-curve statistics shared by strategies, the
+database, backtesters and the UI
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+SESSION_MINUTES = 375  # NSE 09:15 - 15:30
+
+
+def infer_periods_per_year(index) -> float:
+    """
+    Bars per year from the spacing of a DatetimeIndex
+    
+    Args:
+        index: DatetimeIndex (or anything pd.DatetimeIndex accepts)
+    
+    Returns:
+        252 for daily bars, scaled by the NSE session length for intraday
+        bars, 52 / 12 for weekly / monthly
+    """
+    index = pd.DatetimeIndex(index)
+    if len(index) < 2:
+        return TRADING_DAYS
+    
+    spacing = np.median(np.diff(index.values)) / np.timedelta64(1, 'm')
+    if spacing >= 20 * 24 * 60:
+        return 12
+    if spacing >= 5 * 24 * 60:
+        return 52
+    if spacing >= 24 * 60:
+        return TRADING_DAYS
+    return TRADING_DAYS * SESSION_MINUTES / spacing
+
+
+# ========================================
+# EQUITY CURVE
+# ========================================
+
+def drawdown_series(equity) -> np.ndarray:
+    """
+    Drawdown from the running peak at every bar
+    
+    Args:
+        equity: Equity values
+    
+    Returns:
+        Array of drawdowns as fractions (0 at a new high, negative below it)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity / np.maximum.accumulate(equity) - 1
+
+
+def max_drawdown(equity) -> Dict:
+    """
+    Deepest drawdown and longest time spent below a previous peak
+    
+    Args:
+        equity: Equity values
+    
+    Returns:
+        Dictionary with max_drawdown (percent, positive) and
+        max_drawdown_duration (bars from a peak to its recovery or the end)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        return {'max_drawdown': 0.0, 'max_drawdown_duration': 0}
+    
+    peaks = np.maximum.accumulate(equity)
+    positions = np.arange(equity.size)
+    
+    # Bars since the most recent peak
+    last_peak = np.maximum.accumulate(np.where(equity >= peaks, positions, 0))
+    
+    return {
+        'max_drawdown': float((1 - equity / peaks).max() * 100),
+        'max_drawdown_duration': int((positions - last_peak).max())
+    }
+
+
+def sharpe_ratio(returns, periods_per_year: float = TRADING_DAYS, risk_free_rate: float = 0.0) -> float:
+    """
+    Annualized Sharpe ratio
+    
+    Args:
+        returns: Per-period returns
+        periods_per_year: Periods per year for annualization
+        risk_free_rate: Annual risk-free rate (0.065 = 6.5%)
+    
+    Returns:
+        Sharpe ratio (0 when returns have no variance)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.size < 2:
+        return 0.0
+    
+    excess = returns - risk_free_rate / periods_per_year
+    std = excess.std(ddof=1)
+    return float(excess.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+
+
+def sortino_ratio(returns, periods_per_year: float = TRADING_DAYS, risk_free_rate: float = 0.0) -> float:
+    """
+    Annualized Sortino ratio (only downside deviation is penalized)
+    
+    Args:
+        returns: Per-period returns
+        periods_per_year: Periods per year for annualization
+        risk_free_rate: Annual risk-free rate
+    
+    Returns:
+        Sortino ratio (0 when there is no downside)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.size < 2:
+        return 0.0
+    
+    excess = returns - risk_free_rate / periods_per_year
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+    return float(excess.mean() / downside * np.sqrt(periods_per_year)) if downside > 0 else 0.0
+
+
+def exposure(in_market) -> float:
+    """
+    Share of bars with capital at risk
+    
+    Args:
+        in_market: Boolean mask of bars holding a position, or the fraction
+                   of equity invested at every bar
+    
+    Returns:
+        Average exposure in percent
+    """
+    in_market = np.asarray(in_market, dtype=np.float64)
+    return float(in_market.mean() * 100) if in_market.size else 0.0
+
+
+def equity_statistics(equity, periods_per_year: Optional[float] = None,
+                      risk_free_rate: float = 0.0, in_market=None) -> Dict:
+    """
+    Risk/return statistics of an equity curve
+    
+    Args:
+        equity: Equity values (Series with a DatetimeIndex lets
+                periods_per_year be inferred)
+        periods_per_year: Bars per year (default: inferred, else 252)
+        risk_free_rate: Annual risk-free rate
+        in_market: Optional exposure mask/fractions (see exposure())
+    
+    Returns:
+        Dictionary with total_return, cagr, volatility, sharpe_ratio,
+        sortino_ratio, calmar_ratio, max_drawdown, max_drawdown_duration
+        and exposure (percentages in percent)
+    """
+    if periods_per_year is None:
+        periods_per_year = (infer_periods_per_year(equity.index)
+                            if isinstance(equity, pd.Series) and isinstance(equity.index, pd.DatetimeIndex)
+                            else TRADING_DAYS)
+    
+    values = np.asarray(equity, dtype=np.float64)
+    if values.size < 2:
+        return {
+            'total_return': 0.0, 'cagr': 0.0, 'volatility': 0.0, 'sharpe_ratio': 0.0,
+            'sortino_ratio': 0.0, 'calmar_ratio': 0.0, 'max_drawdown': 0.0,
+            'max_drawdown_duration': 0, 'exposure': exposure(in_market) if in_market is not None else None
+        }
+    
+    returns = values[1:] / values[:-1] - 1
+    growth = values[-1] / values[0]
+    years = (values.size - 1) / periods_per_year
+    cagr = (growth ** (1 / years) - 1) * 100 if growth > 0 and years > 0 else -100.0
+    drawdown = max_drawdown(values)
+    
+    return {
+        'total_return': (growth - 1) * 100,
+        'cagr': cagr,
+        'volatility': float(returns.std(ddof=1) * np.sqrt(periods_per_year) * 100),
+        'sharpe_ratio': sharpe_ratio(returns, periods_per_year, risk_free_rate),
+        'sortino_ratio': sortino_ratio(returns, periods_per_year, risk_free_rate),
+        'calmar_ratio': cagr / drawdown['max_drawdown'] if drawdown['max_drawdown'] > 0 else 0.0,
+        **drawdown,
+        'exposure': exposure(in_market) if in_market is not None else None
+    }
+
+
+def rolling_metrics(equity: pd.Series, window: int = 63,
+                    periods_per_year: Optional[float] = None) -> pd.DataFrame:
+    """
+    Rolling return, volatility, Sharpe ratio and drawdown
+    
+    Args:
+        equity: Equity Series
+        window: Bars per rolling window
+        periods_per_year: Bars per year (default: inferred from the index)
+    
+    Returns:
+        DataFrame indexed like equity with return, volatility and drawdown
+        in percent and the annualized sharpe
+    """
+    if periods_per_year is None:
+        periods_per_year = (infer_periods_per_year(equity.index)
+                            if isinstance(equity.index, pd.DatetimeIndex) else TRADING_DAYS)
+    
+    returns = equity.pct_change()
+    mean = returns.rolling(window).mean()
+    std = returns.rolling(window).std()
+    scale = np.sqrt(periods_per_year)
+    
+    return pd.DataFrame({
+        'return': (equity / equity.shift(window) - 1) * 100,
+        'volatility': std * scale * 100,
+        'sharpe': (mean / std.where(std > 0)) * scale,
+        'drawdown': drawdown_series(equity.to_numpy()) * 100
+    }, index=equity.index)
+
+
+# ========================================
+# TRADES
+# ========================================
+
+def trade_statistics(profits, capital: Optional[float] = None,
+                     trades_per_year: Optional[float] = None) -> Dict:
+    """
+    Trade-level statistics from an array of per-trade profits
+    
+    Args:
+        profits: Profit of each closed trade in ₹, in order
+        capital: Starting capital - adds the drawdown of the trade-by-trade
+                 equity curve
+        trades_per_year: With capital, also annualize per-trade Sharpe and
+                         Sortino ratios at this trade frequency
+    
+    Returns:
+        Dictionary with counts, win rate, totals, averages, extremes,
+        gross profit/loss, profit_factor and expectancy
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    n = profits.size
+    
+    wins = profits[profits > 0]
+    losses = profits[profits < 0]
+    gross_profit = float(wins.sum())
+    gross_loss = float(np.abs(losses).sum())
+    
+    win_rate = wins.size / n if n else 0.0
+    loss_rate = losses.size / n if n else 0.0
+    avg_win = float(wins.mean()) if wins.size else 0.0
+    avg_loss = float(losses.mean()) if losses.size else 0.0
+    
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = float('inf') if gross_profit > 0 else 0.0
+    
+    stats = {
+        'total_trades': n,
+        'winning_trades': int(wins.size),
+        'losing_trades': n - int(wins.size),
+        'win_rate': win_rate * 100,
+        'total_profit': float(profits.sum()),
+        'avg_profit': float(profits.mean()) if n else 0.0,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'max_profit': float(profits.max()) if n else 0.0,
+        'max_loss': float(profits.min()) if n else 0.0,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'profit_factor': profit_factor,
+        'expectancy': win_rate * avg_win + loss_rate * avg_loss
+    }
+    
+    if capital is not None:
+        equity = capital + np.concatenate(([0.0], np.cumsum(profits)))
+        stats.update(max_drawdown(equity))
+        
+        if trades_per_year:
+            returns = profits / equity[:-1]
+            stats['sharpe_ratio'] = sharpe_ratio(returns, trades_per_year)
+            stats['sortino_ratio'] = sortino_ratio(returns, trades_per_year)
+    
+    return stats
+
+
+def performance_report(equity: Optional[pd.Series] = None, profits=None,
+                       capital: Optional[float] = None, periods_per_year: Optional[float] = None,
+                       in_market=None, risk_free_rate: float = 0.0) -> Dict:
+    """
+    Equity and trade statistics in one dictionary
+    
+    Args:
+        equity: Equity curve (e.g. BacktestEngine / PortfolioBacktester result['equity'])
+        profits: Per-trade profits
+        capital: Starting capital (default: first equity value)
+        periods_per_year: Bars per year (default: inferred from equity)
+        in_market: Exposure mask/fractions
+        risk_free_rate: Annual risk-free rate
+    
+    Returns:
+        Merged dictionary (equity keys win on overlap, e.g. max_drawdown)
+    """
+    report = {}
+    
+    if profits is not None:
+        if capital is None and equity is not None and len(equity):
+            capital = float(np.asarray(equity)[0])
+        report.update(trade_statistics(profits, capital))
+    
+    if equity is not None:
+        report.update(equity_statistics(equity, periods_per_year, risk_free_rate, in_market))
+    
+    return report
+
+
+# Test the analytics
+if __name__ == "__main__":
+    print("🧪 Testing Performance Analytics...\n")
+    
+    import time
+    
+    # Drawdown of a hand-made curve: peak 120 -> trough 90 (25%), 3 bars under
+    curve = [100, 110, 120, 100, 90, 115, 125, 130]
+    dd = max_drawdown(curve)
+    assert abs(dd['max_drawdown'] - 25.0) < 1e-12 and dd['max_drawdown_duration'] == 3
+    
+    # Trade stats agree with the plain-Python definitions
+    rng = np.random.default_rng(0)
+    profits = rng.normal(50, 1000, 300_000)
+    start = time.perf_counter()
+    stats = trade_statistics(profits, capital=1e7, trades_per_year=250)
+    elapsed = time.perf_counter() - start
+    
+    wins = [p for p in profits if p > 0]
+    losses = [p for p in profits if p < 0]
+    assert stats['winning_trades'] == len(wins)
+    assert abs(stats['profit_factor'] - sum(wins) / -sum(losses)) < 1e-9
+    assert abs(stats['expectancy'] - profits.mean()) < 1e-6
+    print(f"✅ {len(profits):,} trades in {elapsed * 1000:.1f} ms: "
+          f"PF {stats['profit_factor']:.3f}, expectancy ₹{stats['expectancy']:.2f}, "
+          f"max DD {stats['max_drawdown']:.2f}% over {stats['max_drawdown_duration']:,} trades")
+    
+    # 10 years of daily equity
+    dates = pd.bdate_range('2015-01-01', periods=2520)
+    equity = pd.Series(1e5 * np.cumprod(1 + rng.normal(0.0004, 0.01, len(dates))), index=dates)
+    assert infer_periods_per_year(dates) == TRADING_DAYS
+    start = time.perf_counter()
+    report = equity_statistics(equity, in_market=rng.random(len(dates)) < 0.4)
+    rolling = rolling_metrics(equity, window=63)
+    elapsed = time.perf_counter() - start
+    
+    for key in ('cagr', 'volatility', 'sharpe_ratio', 'sortino_ratio', 'calmar_ratio',
+                'max_drawdown', 'max_drawdown_duration', 'exposure'):
+        print(f"   {key:22s} {report[key]:10.2f}")
+    assert len(rolling) == len(equity) and rolling['drawdown'].max() <= 0
+    print(f"✅ Equity statistics + rolling metrics in {elapsed * 1000:.1f} ms")
+    
+    print("\n✅ Performance analytics tests passed!")
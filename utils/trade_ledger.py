@@ -0,0 +1,496 @@
+"""
+Trade Ledger
+Compact, columnar trade log - one growable NumPy buffer per field instead
+of one Python dict (plus datetime objects) per trade
+"""
+import numbers
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+EPOCH = datetime(1970, 1, 1)
+
+# Storage per column kind: buffer dtype and the value of an unset slot
+DTYPES = {
+    'float': np.float64,
+    'int': np.int64,
+    'bool': np.bool_,
+    'time': np.int64,      # epoch nanoseconds (UTC for tz-aware values)
+    'category': np.int32,  # codes into the column's interned strings
+}
+MISSING = {'float': np.nan, 'int': 0, 'bool': False, 'time': NAT, 'category': -1}
+FAST_TYPES = {'float': float, 'int': int, 'bool': bool, 'category': str}
+
+
+def _epoch_ns(value) -> int:
+    """Epoch nanoseconds of a datetime-like (UTC for tz-aware values)"""
+    if type(value) is pd.Timestamp:
+        return value.value
+    if type(value) is datetime:
+        offset = value.utcoffset()
+        delta = value.replace(tzinfo=None) - EPOCH
+        if offset:
+            delta -= offset
+        return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+    
+    stamp = pd.Timestamp(value)
+    return NAT if stamp is pd.NaT else stamp.value
+
+
+def _infer_kind(value) -> str:
+    """Column kind for the first value seen in a field"""
+    if isinstance(value, (bool, np.bool_)):
+        return 'bool'
+    if isinstance(value, numbers.Integral):
+        return 'int'
+    if isinstance(value, numbers.Real):
+        return 'float'
+    if isinstance(value, (datetime, np.datetime64)):
+        return 'time'
+    if isinstance(value, str):
+        return 'category'
+    return 'object'
+
+
+class _Column:
+    """One field of the ledger"""
+    
+    __slots__ = ('kind', 'data', 'categories', 'lookup', 'tz')
+    
+    def __init__(self, kind: str, capacity: int):
+        self.kind = kind
+        self.categories: List[str] = []
+        self.lookup: Dict[str, int] = {}
+        self.tz = None
+        
+        if kind == 'object':
+            self.data = [None] * capacity
+        else:
+            self.data = np.full(capacity, MISSING[kind], dtype=DTYPES[kind])
+    
+    def grow(self, capacity: int):
+        """Extend the buffer to capacity slots (unset slots are missing)"""
+        extra = capacity - len(self.data)
+        if self.kind == 'object':
+            self.data.extend([None] * extra)
+        else:
+            self.data = np.concatenate((self.data, np.full(extra, MISSING[self.kind], dtype=self.data.dtype)))
+    
+    def set(self, i: int, value) -> bool:
+        """
+        Store value at slot i
+        
+        Returns:
+            False if the column's kind can't hold the value (caller promotes)
+        """
+        kind = self.kind
+        cls = type(value)
+        
+        # Exact-type fast paths for the common cases
+        if cls is FAST_TYPES.get(kind):
+            if kind == 'category':
+                code = self.lookup.get(value)
+                if code is None:
+                    code = self.lookup[value] = len(self.categories)
+                    self.categories.append(value)
+                value = code
+            self.data[i] = value
+            return True
+        
+        if kind == 'float':
+            if value is None:
+                value = np.nan
+            elif not isinstance(value, numbers.Real):
+                return False
+        elif kind == 'int':
+            if isinstance(value, (bool, np.bool_)) or not isinstance(value, numbers.Integral):
+                return False
+        elif kind == 'bool':
+            if not isinstance(value, (bool, np.bool_)):
+                return False
+        elif kind == 'time':
+            if value is None:
+                value = NAT
+            elif isinstance(value, (datetime, np.datetime64)):
+                if self.tz is None and getattr(value, 'tzinfo', None) is not None:
+                    self.tz = value.tzinfo
+                value = _epoch_ns(value)
+            else:
+                return False
+        elif kind == 'category':
+            if value is None:
+                value = -1
+            elif isinstance(value, str):
+                code = self.lookup.get(value)
+                if code is None:
+                    code = self.lookup[value] = len(self.categories)
+                    self.categories.append(value)
+                value = code
+            else:
+                return False
+        
+        self.data[i] = value
+        return True
+    
+    def scalar(self, i: int):
+        """Python value at slot i (None for a missing time/category)"""
+        value = self.data[i]
+        kind = self.kind
+        
+        if kind == 'time':
+            if value == NAT:
+                return None
+            stamp = pd.Timestamp(int(value))
+            if self.tz is not None:
+                stamp = stamp.tz_localize('UTC').tz_convert(self.tz)
+            return stamp.to_pydatetime()
+        if kind == 'category':
+            return self.categories[value] if value >= 0 else None
+        if kind == 'object':
+            return value
+        return value.item()
+    
+    def values(self, n: int) -> list:
+        """Python values of the first n slots"""
+        kind = self.kind
+        
+        if kind == 'time':
+            stamps = pd.DatetimeIndex(self.export(n))
+            return [None if stamp is pd.NaT else stamp for stamp in stamps.to_pydatetime()]
+        if kind == 'category':
+            lookup = self.categories + [None]
+            return [lookup[code] for code in self.data[:n].tolist()]
+        if kind == 'object':
+            return self.data[:n]
+        return self.data[:n].tolist()
+    
+    def export(self, n: int):
+        """Array-like of the first n slots for a DataFrame (views where possible)"""
+        kind = self.kind
+        
+        if kind == 'time':
+            stamps = self.data[:n].view('M8[ns]')
+            if self.tz is None:
+                return stamps
+            return pd.DatetimeIndex(stamps).tz_localize('UTC').tz_convert(self.tz)
+        if kind == 'category':
+            return pd.Categorical.from_codes(self.data[:n], categories=self.categories)
+        if kind == 'object':
+            values = np.empty(n, dtype=object)
+            values[:] = self.data[:n]
+            return values
+        return self.data[:n]
+
+
+class TradeLedger:
+    """
+    Append-only, struct-of-arrays trade log
+    
+    Each field is a NumPy buffer that doubles when full (O(1) amortized
+    append): numbers as float64/int64, datetimes as int64 epoch
+    nanoseconds, strings (symbol, strategy, signal...) as int32 codes into
+    a per-field table of interned strings. Fields are discovered from the
+    dictionaries appended; int/bool fields become float (NaN) once a trade
+    lacks them, as in pandas.
+    
+    Behaves like the list of trade dictionaries it replaces - len(),
+    iteration, indexing and slicing return dictionaries (datetimes come
+    back as datetime, missing values as None / NaN) - and to_frame()
+    exports the buffers to a DataFrame without copying the numeric and
+    datetime columns.
+    
+    Usage:
+        ledger = TradeLedger()
+        ledger.append({'symbol': 'TCS', 'profit': 1250.0, 'exit_date': datetime.now()})
+        ledger.column('profit')   # float64 view
+        ledger.to_frame()         # DataFrame
+    """
+    
+    def __init__(self, trades: Optional[Iterable[Dict]] = None, capacity: int = 1024):
+        """
+        Initialize ledger
+        
+        Args:
+            trades: Trade dictionaries to start with
+            capacity: Initial slots per field
+        """
+        self._initial_capacity = max(1, capacity)
+        self.clear()
+        
+        if trades is not None:
+            self.extend(trades)
+    
+    def clear(self):
+        """Remove all trades and fields"""
+        self._columns: Dict[str, _Column] = {}
+        self._capacity = self._initial_capacity
+        self._size = 0
+    
+    # ========================================
+    # WRITING
+    # ========================================
+    
+    def _add_column(self, name: str, value) -> _Column:
+        """Create a field, backfilling earlier trades with missing values"""
+        kind = _infer_kind(value)
+        if self._size and kind in ('int', 'bool'):
+            kind = 'float'
+        
+        column = self._columns[name] = _Column(kind, self._capacity)
+        return column
+    
+    def _promote(self, name: str, value) -> _Column:
+        """Widen a field to a kind that can hold value (int/bool -> float, else object)"""
+        old = self._columns[name]
+        numeric = value is None or (isinstance(value, numbers.Real) and not isinstance(value, (bool, np.bool_)))
+        
+        if old.kind in ('int', 'bool') and numeric:
+            column = _Column('float', 0)
+            column.data = old.data.astype(np.float64)
+            column.data[self._size:] = np.nan
+        else:
+            column = _Column('object', self._capacity)
+            column.data[:self._size] = old.values(self._size)
+        
+        self._columns[name] = column
+        return column
+    
+    def _set(self, name: str, i: int, value):
+        """Store one value, creating or widening the field as needed"""
+        column = self._columns.get(name)
+        if column is None:
+            column = self._add_column(name, value)
+        if not column.set(i, value):
+            self._promote(name, value).set(i, value)
+    
+    def append(self, trade: Dict):
+        """
+        Add one trade
+        
+        Args:
+            trade: Trade dictionary
+        """
+        i = self._size
+        if i == self._capacity:
+            self._capacity *= 2
+            for column in self._columns.values():
+                column.grow(self._capacity)
+        
+        columns = self._columns
+        for name, value in trade.items():
+            column = columns.get(name)
+            if column is None:
+                column = self._add_column(name, value)
+            if not column.set(i, value):
+                self._promote(name, value).set(i, value)
+        
+        # Fields this trade doesn't have stay missing; ints/bools can't be
+        if len(trade) < len(self._columns):
+            for name, column in list(self._columns.items()):
+                if column.kind in ('int', 'bool') and name not in trade:
+                    self._promote(name, None)
+        
+        self._size = i + 1
+    
+    def extend(self, trades: Iterable[Dict]):
+        """Add several trades"""
+        for trade in trades:
+            self.append(trade)
+    
+    def update(self, index: int, values: Dict):
+        """
+        Change fields of a recorded trade (e.g. when an open trade closes)
+        
+        Args:
+            index: Trade position (negative counts from the end)
+            values: Field -> new value
+        """
+        index = self._index(index)
+        for name, value in values.items():
+            self._set(name, index, value)
+    
+    # ========================================
+    # READING
+    # ========================================
+    
+    def _index(self, index: int) -> int:
+        """Bounds-checked non-negative position"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        return index
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        names = list(self._columns)
+        columns = [column.values(self._size) for column in self._columns.values()]
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        
+        index = self._index(index)
+        return {name: column.scalar(index) for name, column in self._columns.items()}
+    
+    def __repr__(self) -> str:
+        return f"TradeLedger({self._size} trades, fields={list(self._columns)})"
+    
+    @property
+    def columns(self) -> List[str]:
+        """Field names in the order they were first seen"""
+        return list(self._columns)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the field buffers (allocated capacity)"""
+        return sum(column.data.nbytes for column in self._columns.values()
+                   if column.kind != 'object')
+    
+    def column(self, name: str) -> np.ndarray:
+        """
+        One field as an array
+        
+        Numeric fields are views of the buffer, datetimes a datetime64[ns]
+        view (UTC for tz-aware fields), strings an object array.
+        
+        Args:
+            name: Field name
+        
+        Returns:
+            Array of length len(self) (empty float array if no trades yet)
+        """
+        if not self._size and name not in self._columns:
+            return np.empty(0)
+        
+        column = self._columns[name]
+        if column.kind == 'time':
+            return column.data[:self._size].view('M8[ns]')
+        if column.kind in ('category', 'object'):
+            return np.asarray(column.export(self._size), dtype=object)
+        return column.data[:self._size]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        All trades as a DataFrame
+        
+        Numeric and naive datetime columns share memory with the ledger,
+        string fields become categoricals. Use .copy() for a snapshot that
+        later update() calls can't touch.
+        """
+        if not self._columns:
+            return pd.DataFrame()
+        
+        return pd.DataFrame(
+            {name: column.export(self._size) for name, column in self._columns.items()},
+            copy=False
+        )
+
+
+# Test the ledger
+if __name__ == "__main__":
+    print("🧪 Testing Trade Ledger...\n")
+    
+    import sys
+    import time
+    
+    rng = np.random.default_rng(5)
+    n = 200_000
+    symbols = [f"SYM{k}" for k in range(50)]
+    start = datetime(2020, 1, 1)
+    
+    trades = [{
+        'symbol': symbols[k % 50],
+        'entry_price': 100.0 + k % 97,
+        'exit_price': 101.0 + k % 89,
+        'quantity': 10 + k % 7,
+        'entry_date': start + pd.Timedelta(minutes=k),
+        'exit_date': start + pd.Timedelta(minutes=k + 30),
+        'profit': float(rng.normal(10, 100)),
+        'profit_percent': 0.5,
+        'signal': 'BUY'
+    } for k in range(n)]
+    
+    started = time.perf_counter()
+    ledger = TradeLedger()
+    for trade in trades:
+        ledger.append(trade)
+    elapsed = time.perf_counter() - started
+    
+    # Dict-like access round-trips every field
+    assert len(ledger) == n and ledger[0] == trades[0] and ledger[-1] == trades[-1]
+    assert ledger[10:13] == trades[10:13]
+    assert all(a == b for a, b in zip(ledger, trades))
+    
+    # Zero-copy export
+    frame = ledger.to_frame()
+    assert np.shares_memory(frame['profit'].to_numpy(), ledger.column('profit'))
+    assert frame['exit_date'].dtype == 'datetime64[ns]' and frame['symbol'].dtype == 'category'
+    assert np.allclose(frame['profit'].to_numpy(), [t['profit'] for t in trades])
+    
+    dict_bytes = sum(sys.getsizeof(t) + sum(sys.getsizeof(v) for v in t.values()) for t in trades)
+    print(f"✅ {n:,} trades appended in {elapsed:.2f}s "
+          f"({ledger.nbytes / 1e6:.1f} MB vs ~{dict_bytes / 1e6:.1f} MB as dicts)")
+    
+    # Open trades get fields when they close; ints widen to float when missing
+    log = TradeLedger([{'id': 1, 'strategy': 'STRADDLE', 'status': 'OPEN', 'pnl': 0}])
+    log.update(0, {'pnl': 125.5, 'status': 'CLOSED', 'exit_time': datetime(2024, 1, 1, 10)})
+    log.append({'id': 2, 'strategy': 'IRON_CONDOR', 'status': 'OPEN'})
+    assert log[0] == {'id': 1, 'strategy': 'STRADDLE', 'status': 'CLOSED', 'pnl': 125.5,
+                      'exit_time': datetime(2024, 1, 1, 10)}
+    assert log[1]['exit_time'] is None and np.isnan(log[1]['pnl']) and log[1]['id'] == 2
+    
+    # Time zones survive the round trip
+    aware = TradeLedger([{'exit_date': pd.Timestamp('2024-03-01 15:29', tz='Asia/Kolkata')}])
+    assert aware[0]['exit_date'] == pd.Timestamp('2024-03-01 15:29', tz='Asia/Kolkata')
+    assert str(aware.to_frame()['exit_date'].dt.tz) == 'Asia/Kolkata'
+    print("✅ Updates, missing fields and time zones round-trip")
+    
+    # Ledger-backed backtest saved through the CLI keeps its strategy name
+    import contextlib
+    import io
+    import logging
+    import os
+    import tempfile
+    from main import TradingApp
+    from strategies.ma_crossover import MACrossoverStrategy
+    from utils.database import TradingDatabase
+    
+    class SampleFetcher:
+        def get_historical_data(self, symbol, from_date, to_date, interval="day"):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+            return pd.DataFrame({
+                'Date': pd.date_range(from_date, periods=400, freq='B'),
+                'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                'Close': close, 'Volume': 1000
+            })
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)
+        os.makedirs('reports')
+        try:
+            app = TradingApp.__new__(TradingApp)
+            app.logger = logging.getLogger("TradeLedgerTest")
+            app.db = TradingDatabase(os.path.join(tmp, "ledger.db"))
+            app.strategies = {'ma_crossover': MACrossoverStrategy(SampleFetcher(), 10, 30)}
+            app.run_backtest('ma_crossover', 'TEST', '2020-01-01', '2021-06-30')
+            
+            # Strategies use the package class (this file may be running as __main__)
+            assert type(app.strategies['ma_crossover'].trades).__name__ == 'TradeLedger'
+            saved = app.db.get_trades(limit=1000)
+            app.db.close()
+        finally:
+            os.chdir(cwd)
+    
+    assert not saved.empty and (saved['strategy'] == 'ma_crossover').all()
+    print(f"✅ {len(saved)} backtest trades saved under their strategy name")
+    
+    print("\n✅ Trade ledger tests passed!")